@@ -0,0 +1,110 @@
+"""
+Synthetic but realistic models shared by the benchmarks: sizes of texts, attributes and nested lists follow the
+ones observed on the platform, values are deterministic so that runs are comparable.
+"""
+from __future__ import absolute_import, annotations
+
+from datetime import datetime
+from typing import List
+
+from wenet.model.callback_message.message import AnsweredQuestionMessage, IncentiveMessage, Message, \
+    QuestionToAnswerMessage, TaskProposalNotification, TaskVolunteerNotification, TextualMessage
+from wenet.model.logging_message.content import Card, CarouselContent, TextualContent
+from wenet.model.logging_message.message import BaseMessage, NotificationMessage, RequestMessage, ResponseMessage
+from wenet.model.norm import Norm, NormOperator
+from wenet.model.task.task import Task, TaskGoal, TaskPage
+from wenet.model.task.transaction import TaskTransaction, TaskTransactionPage
+from wenet.model.user.common import Date, Gender
+from wenet.model.user.profile import UserName, WeNetUserProfile, WeNetUserProfilesPage
+
+
+def build_task(index: int) -> Task:
+    return Task(
+        f"task_{index}", 1577833100 + index, 1577833200 + index, "task_type_id", f"requester_{index % 50}", "app_id", "community_id",
+        TaskGoal(f"goal {index}", "A realistic description of what the requester needs " * 3, ["keyword", "other"]),
+        [Norm(f"norm_{index}", "gender", NormOperator.EQUALS, "F", False)],
+        {"domain": "basic_needs", "anonymous": False, "positionOfAnswerer": "nearby", "maxUsers": 5}
+    )
+
+
+def build_tasks(size: int) -> List[Task]:
+    return [build_task(index) for index in range(size)]
+
+
+def build_task_page(size: int) -> TaskPage:
+    return TaskPage(0, size, build_tasks(size))
+
+
+def build_message(index: int) -> Message:
+    attributes = {"communityId": "community_id", "taskId": f"task_{index % 100}"}
+    kind = index % 6
+    if kind == 0:
+        return TextualMessage("app_id", f"user_{index}", "A title", "A textual message sent to the user " * 2, attributes)
+    elif kind == 1:
+        return TaskProposalNotification("app_id", f"user_{index}", attributes)
+    elif kind == 2:
+        return TaskVolunteerNotification("app_id", f"user_{index}", f"volunteer_{index}", attributes)
+    elif kind == 3:
+        return QuestionToAnswerMessage("app_id", f"user_{index}", attributes, "Where can I find a good pizza?", f"requester_{index}")
+    elif kind == 4:
+        return AnsweredQuestionMessage("app_id", f"user_{index}", "Try the one near the station", f"transaction_{index}", f"user_{index + 1}", attributes)
+    return IncentiveMessage("app_id", f"user_{index}", "issuer", "Well done, keep on answering!", attributes)
+
+
+def build_messages(size: int) -> List[Message]:
+    return [build_message(index) for index in range(size)]
+
+
+def build_transaction(index: int) -> TaskTransaction:
+    return TaskTransaction(
+        f"transaction_{index}", f"task_{index % 100}", "answerTransaction", 1577833100 + index, 1577833200 + index, f"user_{index}",
+        {"answer": "An answer to the question of the requester " * 2, "anonymous": False},
+        build_messages(2)
+    )
+
+
+def build_transaction_page(size: int) -> TaskTransactionPage:
+    return TaskTransactionPage(0, size, [build_transaction(index) for index in range(size)])
+
+
+def build_profile(index: int) -> WeNetUserProfile:
+    profile = WeNetUserProfile.empty(f"user_{index}")
+    profile.name = UserName("first", None, "last", None, None)
+    profile.date_of_birth = Date(1990, 1, 1 + index % 28)
+    profile.gender = Gender.FEMALE
+    profile.locale = "en_US"
+    profile.competences = [{"name": f"competence_{item}", "ontology": "esco", "level": 0.5} for item in range(10)]
+    profile.meanings = [{"name": f"meaning_{item}", "category": "big_five", "level": 0.5} for item in range(5)]
+    return profile
+
+
+def build_profiles(size: int) -> List[WeNetUserProfile]:
+    return [build_profile(index) for index in range(size)]
+
+
+def build_profile_page(size: int) -> WeNetUserProfilesPage:
+    return WeNetUserProfilesPage(0, size, build_profiles(size))
+
+
+def build_carousel(size: int) -> CarouselContent:
+    return CarouselContent([
+        Card(f"card {index}", f"https://wenet.eu/images/{index}.png", "A short subtitle", {"type": "postback", "payload": f"card_{index}"})
+        .with_button("Select", f"select_{index}").with_button("More", f"more_{index}")
+        for index in range(size)
+    ])
+
+
+def build_logging_message(index: int) -> BaseMessage:
+    timestamp = datetime(2021, 1, 1, 12, 0, index % 60)
+    metadata = {"conversationId": f"conversation_{index % 10}"}
+    kind = index % 3
+    if kind == 0:
+        return RequestMessage(f"message_{index}", "telegram", f"user_{index}", "wenet", TextualContent("/question"), timestamp, metadata)
+    elif kind == 1:
+        return ResponseMessage(f"message_{index}", "telegram", f"user_{index}", "wenet", build_carousel(3), f"message_{index - 1}", timestamp, metadata)
+    content = TextualContent("You have a new question to answer").with_button("Answer", "answer").with_button("Skip", "skip")
+    return NotificationMessage(f"message_{index}", "telegram", f"user_{index}", "wenet", content, timestamp, metadata)
+
+
+def build_logging_messages(size: int) -> List[BaseMessage]:
+    return [build_logging_message(index) for index in range(size)]
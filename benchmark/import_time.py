@@ -0,0 +1,74 @@
+"""
+Measure the time needed to import the entry points of the library in a fresh interpreter, with `python -X importtime`,
+and list the heavy optional dependencies each entry point pulls in. Exits with an error when an entry point takes
+longer than its budget, so that it can track the start up time in CI.
+
+Usage:
+    PYTHONPATH=src python -m benchmark.import_time [--runs 5] [--budget 50] [--module wenet.interface.wenet]
+"""
+from __future__ import absolute_import, annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# The modules applications start from
+ENTRY_POINTS = [
+    "wenet.interface.wenet",
+    "wenet.interface.client",
+    "wenet.model.callback_message.builder",
+    "wenet.model.logging_message.message",
+    "wenet.model.task.task",
+    "wenet.model.user.profile",
+    "wenet.callback.dispatcher",
+]
+
+# Dependencies that should only be imported when used
+HEAVY_DEPENDENCIES = ["requests", "urllib3", "redis", "babel", "iso639", "pytz", "msgspec"]
+
+
+def import_time(module: str) -> Dict[str, object]:
+    """
+    Import a module in a new interpreter
+
+    :return: the cumulative import time of the module in microseconds and the heavy dependencies it imported
+    """
+    code = f"import sys, {module}; print(','.join(name for name in {HEAVY_DEPENDENCIES!r} if name in sys.modules))"
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=os.environ.copy(), check=True)
+    cumulative = None
+    for line in process.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative = int(parts[1])
+    if cumulative is None:
+        raise RuntimeError(f"Import time of [{module}] not found in the output of the interpreter")
+    dependencies = process.stdout.strip()
+    return {"microseconds": cumulative, "dependencies": dependencies.split(",") if dependencies else []}
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", action="append", default=None, help="the module to import, all the entry points by default")
+    parser.add_argument("--runs", type=int, default=5, help="the number of imports of each module, the median is reported")
+    parser.add_argument("--budget", type=float, default=None, help="the maximum import time of each module, in milliseconds")
+    args = parser.parse_args(arguments)
+
+    over_budget = []
+    for module in args.module or ENTRY_POINTS:
+        measures = [import_time(module) for _ in range(args.runs)]
+        median = statistics.median(measure["microseconds"] for measure in measures) / 1000
+        dependencies = ", ".join(measures[-1]["dependencies"]) or "-"
+        print(f"{module:<42} {median:>8.1f} ms   {dependencies}")
+        if args.budget is not None and median > args.budget:
+            over_budget.append(module)
+
+    for module in over_budget:
+        print(f"Over budget: {module}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
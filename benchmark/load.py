@@ -0,0 +1,214 @@
+"""
+Exercise the interfaces built with `WeNet.build` end to end against a platform, by default a local mock platform,
+with concurrent workers running a weighted mix of operations; report the throughput and the latency percentiles
+of each operation, and the requests performed for each endpoint.
+
+Usage:
+    PYTHONPATH=src python -m benchmark.load [--workers 8] [--duration 10] [--client apikey|oauth2]
+        [--size 1000] [--latency 0.02] [--error-rate 0.01] [--max-requests-per-second 500] [--url http://...]
+"""
+from __future__ import absolute_import, annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from benchmark import fixtures
+from benchmark.mock_platform import MockPlatformData, MockPlatformServer
+from wenet.interface.client import ApikeyClient, Oauth2Client, RestClient
+from wenet.interface.metrics import ClientMetrics
+from wenet.interface.wenet import WeNet
+
+
+class Operation(NamedTuple):
+    name: str
+    weight: int
+    run: Callable[[WeNet, random.Random, int], object]
+
+
+def _user_id(rng: random.Random, size: int) -> str:
+    return f"user_{rng.randrange(size)}"
+
+
+def _task_id(rng: random.Random, size: int) -> str:
+    return f"task_{rng.randrange(size)}"
+
+
+OPERATIONS: List[Operation] = [
+    Operation("task_manager.get_task", 20, lambda wenet, rng, size: wenet.task_manager.get_task(_task_id(rng, size))),
+    Operation("task_manager.get_task_page", 10, lambda wenet, rng, size: wenet.task_manager.get_task_page(app_id="app_id", offset=rng.randrange(size), limit=20)),
+    Operation("task_manager.get_transaction_page", 5, lambda wenet, rng, size: wenet.task_manager.get_transaction_page(offset=rng.randrange(size), limit=20)),
+    Operation("task_manager.create_task_transaction", 5, lambda wenet, rng, size: wenet.task_manager.create_task_transaction(fixtures.build_transaction(rng.randrange(size)))),
+    Operation("profile_manager.get_user_profile", 20, lambda wenet, rng, size: wenet.profile_manager.get_user_profile(_user_id(rng, size))),
+    Operation("profile_manager.update_user_profile", 5, lambda wenet, rng, size: wenet.profile_manager.update_user_profile(fixtures.build_profile(rng.randrange(size)))),
+    Operation("service_api.get_user_profile", 10, lambda wenet, rng, size: wenet.service_api.get_user_profile(_user_id(rng, size))),
+    Operation("service_api.get_task", 5, lambda wenet, rng, size: wenet.service_api.get_task(_task_id(rng, size))),
+    Operation("hub.get_app_details", 5, lambda wenet, rng, size: wenet.hub.get_app_details("app_id")),
+    Operation("logger.post_messages", 5, lambda wenet, rng, size: wenet.logger.post_messages(fixtures.build_logging_messages(5))),
+    Operation("incentive_server.get_cohorts", 1, lambda wenet, rng, size: wenet.incentive_server.get_cohorts()),
+    Operation("profile_manager.get_profiles", 1, lambda wenet, rng, size: wenet.profile_manager.get_profiles()),
+]
+
+
+def percentile(sorted_values: List[float], ratio: float) -> float:
+    """
+    :return: the nearest rank percentile of values sorted in ascending order
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(ratio * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class LoadTestResults:
+    """
+    The latencies and the errors of the operations run by the workers
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+        self.elapsed = 0.0
+
+    def record(self, operation: str, latency: float, error: Optional[Exception]) -> None:
+        with self._lock:
+            self.latencies.setdefault(operation, []).append(latency)
+            if error is not None:
+                errors = self.errors.setdefault(operation, {})
+                errors[type(error).__name__] = errors.get(type(error).__name__, 0) + 1
+
+    def to_repr(self) -> dict:
+        operations = {}
+        total = 0
+        for operation, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            total += len(latencies)
+            operations[operation] = {
+                "count": len(latencies),
+                "errors": self.errors.get(operation, {}),
+                "throughput": len(latencies) / self.elapsed if self.elapsed else 0.0,
+                "p50": percentile(latencies, 0.5),
+                "p90": percentile(latencies, 0.9),
+                "p99": percentile(latencies, 0.99),
+                "max": latencies[-1],
+            }
+        return {
+            "elapsed": self.elapsed,
+            "operations": total,
+            "throughput": total / self.elapsed if self.elapsed else 0.0,
+            "errors": sum(sum(errors.values()) for errors in self.errors.values()),
+            "perOperation": operations
+        }
+
+
+def run_load(wenet: WeNet, operations: List[Operation], workers: int, duration: float, size: int, seed: int = 0) -> LoadTestResults:
+    """
+    Run the operations, chosen at random according to their weight, with concurrent workers for a given duration
+
+    :param wenet: the interfaces to exercise
+    :param operations: the operations to run
+    :param workers: the number of concurrent workers
+    :param duration: the duration of the test, in seconds
+    :param size: the number of tasks and profiles of the platform, from which identifiers are picked
+    :param seed: the seed of the random choices of the workers
+    :return: the latencies and errors of the operations
+    """
+    results = LoadTestResults()
+    weights = [operation.weight for operation in operations]
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            operation = rng.choices(operations, weights)[0]
+            start = time.perf_counter()
+            error = None
+            try:
+                operation.run(wenet, rng, size)
+            except Exception as e:
+                error = e
+            results.record(operation.name, time.perf_counter() - start, error)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(worker, index) for index in range(workers)]:
+            future.result()
+    results.elapsed = time.perf_counter() - start
+    return results
+
+
+def build_client(kind: str, platform_url: str, metrics: ClientMetrics) -> RestClient:
+    if kind == "apikey":
+        return ApikeyClient("apikey", metrics=metrics)
+    token_endpoint_url = f"{platform_url}/api/oauth2/token"
+    client = Oauth2Client.initialize_with_code("clientId", "clientSecret", "code", "http://localhost/redirect", "resourceId", None,
+                                               token_endpoint_url=token_endpoint_url)
+    client.metrics = metrics
+    return client
+
+
+def print_report(results: dict, metrics: dict) -> None:
+    print(f"{results['operations']} operations in {results['elapsed']:.1f} s: {results['throughput']:.1f} operations/s, {results['errors']} errors")
+    print(f"{'operation':<42} {'count':>7} {'ops/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}  errors")
+    for operation, stats in results["perOperation"].items():
+        print(f"{operation:<42} {stats['count']:>7} {stats['throughput']:>8.1f} {stats['p50'] * 1000:>8.1f} {stats['p90'] * 1000:>8.1f} "
+              f"{stats['p99'] * 1000:>8.1f} {stats['max'] * 1000:>8.1f}  {stats['errors'] or ''}")
+    print()
+    print(f"retries: {metrics['retries']}, token refreshes: {metrics['refreshes']}")
+    print(f"{'endpoint':<58} {'requests':>8} {'KiB in':>8}  statuses")
+    for endpoint, stats in sorted(metrics["endpoints"].items()):
+        print(f"{endpoint:<58} {stats['requests']:>8} {stats['responseBytes'] / 1024:>8.1f}  {stats['statuses']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8, help="the number of concurrent workers")
+    parser.add_argument("--duration", type=float, default=10.0, help="the duration of the test, in seconds")
+    parser.add_argument("--client", choices=["apikey", "oauth2"], default="apikey", help="the client used for the requests")
+    parser.add_argument("--url", default=None, help="the URL of the platform, by default a local mock platform is started")
+    parser.add_argument("--size", type=int, default=1000, help="the number of tasks, transactions and profiles of the mock platform")
+    parser.add_argument("--latency", type=float, default=0.0, help="the latency of the mock platform, in seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="the maximum random latency added by the mock platform, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="the ratio of requests failing on the mock platform")
+    parser.add_argument("--max-requests-per-second", type=float, default=None, help="the throttling of the mock platform")
+    parser.add_argument("--token-ttl", type=float, default=3600.0, help="the duration of the oauth2 tokens of the mock platform, in seconds")
+    parser.add_argument("--operations", default=None, help="the comma separated operations to run, all by default")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the random choices")
+    parser.add_argument("--save", default=None, help="the path of the JSON file where to save the results")
+    args = parser.parse_args()
+
+    operations = OPERATIONS
+    if args.operations:
+        names = set(args.operations.split(","))
+        operations = [operation for operation in OPERATIONS if operation.name in names]
+
+    server = None
+    platform_url = args.url
+    if platform_url is None:
+        server = MockPlatformServer(MockPlatformData(args.size), latency=args.latency, latency_jitter=args.latency_jitter,
+                                    error_rate=args.error_rate, max_requests_per_second=args.max_requests_per_second,
+                                    token_ttl=args.token_ttl, seed=args.seed).start()
+        platform_url = server.url
+
+    try:
+        metrics = ClientMetrics()
+        wenet = WeNet.build(build_client(args.client, platform_url, metrics), platform_url=platform_url)
+        results = run_load(wenet, operations, args.workers, args.duration, args.size, args.seed).to_repr()
+    finally:
+        if server is not None:
+            server.stop()
+
+    metrics_repr = metrics.to_repr()
+    print_report(results, metrics_repr)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"results": results, "metrics": metrics_repr}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,597 @@
+"""
+A local stand-in of the WeNet platform, serving the endpoints used by the interfaces (task manager, profile manager,
+hub, service api, logger, incentive server and the oauth2 token endpoint) from an in memory dataset.
+
+Latency, error rate and throttling can be configured to reproduce the behaviour of the real platform under load.
+Large responses are gzip compressed when the client accepts it, and gzip compressed request bodies are accepted.
+
+Usage:
+    PYTHONPATH=src python -m benchmark.mock_platform [--port 8080] [--size 1000] [--latency 0.02] [--error-rate 0.01]
+"""
+from __future__ import absolute_import, annotations
+
+import argparse
+import gzip
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmark import fixtures
+from wenet.model.app import App, AppStatus
+from wenet.model.user.token import TokenDetails
+
+
+logger = logging.getLogger("benchmark.mock_platform")
+
+
+class MockPlatformData:
+    """
+    The dataset served by the mock platform, as the representations of the models
+    """
+
+    def __init__(self, size: int = 1000, app_ids: Optional[List[str]] = None) -> None:
+        """
+        :param size: the number of tasks, transactions and profiles
+        :param app_ids: the identifiers of the applications, the tasks of the fixtures belong to `app_id`
+        """
+        self.lock = threading.Lock()
+        self.tasks: Dict[str, dict] = {}
+        for index in range(size):
+            task = fixtures.build_task(index).to_repr()
+            if index % 3 == 0:
+                task["closeTs"] = task["_lastUpdateTs"]
+            self.tasks[task["id"]] = task
+        self.transactions: List[dict] = [fixtures.build_transaction(index).to_repr() for index in range(size)]
+        self.profiles: Dict[str, dict] = {}
+        for index in range(size):
+            profile = fixtures.build_profile(index).to_repr()
+            self.profiles[profile["id"]] = profile
+        self.apps: Dict[str, dict] = {}
+        for app_id in app_ids or ["app_id"]:
+            app = App(1577833100, 1577833200, app_id, AppStatus.STATUS_ACTIVE, f"app {app_id}", 1, None, f"https://{app_id}.wenet.eu/callback", {})
+            self.apps[app_id] = app.to_repr()
+        self.cohorts = [{"cohort": index, "users": list(self.profiles)[index::4]} for index in range(4)]
+        self.messages = 0
+
+
+class MockPlatformServer(ThreadingHTTPServer):
+    """
+    The mock platform, serving the requests in a thread for each connection.
+
+    The server accepts any apikey in the `x-wenet-component-apikey` header and the tokens it released through its
+    oauth2 endpoint, which expire after `token_ttl` seconds.
+    """
+
+    daemon_threads = True
+
+    def __init__(self,
+                 data: Optional[MockPlatformData] = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: float = 0.0,
+                 latency_jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 max_requests_per_second: Optional[float] = None,
+                 page_size: int = 20,
+                 token_ttl: float = 3600.0,
+                 compression_threshold: Optional[int] = 1024,
+                 seed: Optional[int] = None,
+                 max_page_size: Optional[int] = None
+                 ) -> None:
+        """
+        :param data: the dataset to serve, by default a dataset of 1000 items
+        :param host: the host to bind
+        :param port: the port to bind, 0 for a free port
+        :param latency: the time added to each response, in seconds
+        :param latency_jitter: the maximum random time added to the latency, in seconds
+        :param error_rate: the ratio of requests failing with a 500 or a 503
+        :param max_requests_per_second: the requests accepted each second, the exceeding ones are refused with a 429
+        :param page_size: the size of the pages when the request does not specify a limit
+        :param token_ttl: the duration of the oauth2 access tokens, in seconds
+        :param compression_threshold: the size from which responses are gzip compressed for the clients accepting it, None to never compress them
+        :param seed: the seed of the random generator of latencies and errors
+        :param max_page_size: the maximum size of the pages, whatever the limit of the request, None for no maximum
+        """
+        super().__init__((host, port), MockPlatformRequestHandler)
+        self.data = data if data is not None else MockPlatformData()
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.max_requests_per_second = max_requests_per_second
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.token_ttl = token_ttl
+        self.compression_threshold = compression_threshold
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        # The expiration of the access tokens, and the latest access token of each refresh token
+        self._tokens: Dict[str, float] = {}
+        self._refresh_tokens: Dict[str, str] = {}
+        self._tokens_lock = threading.Lock()
+        self._allowance = max_requests_per_second or 0.0
+        self._allowance_ts = time.monotonic()
+        self._throttling_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> MockPlatformServer:
+        """
+        Serve the requests in a background thread
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-platform", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> MockPlatformServer:
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def random(self) -> float:
+        with self._random_lock:
+            return self._random.random()
+
+    def response_delay(self) -> float:
+        if self.latency_jitter:
+            return self.latency + self.random() * self.latency_jitter
+        return self.latency
+
+    def throttled(self) -> bool:
+        """
+        :return: True if the request exceeds the allowed rate, following a token bucket holding one second of requests
+        """
+        if not self.max_requests_per_second:
+            return False
+        with self._throttling_lock:
+            now = time.monotonic()
+            self._allowance = min(self.max_requests_per_second, self._allowance + (now - self._allowance_ts) * self.max_requests_per_second)
+            self._allowance_ts = now
+            if self._allowance < 1:
+                return True
+            self._allowance -= 1
+            return False
+
+    def release_token(self, refresh_token: Optional[str] = None) -> Optional[dict]:
+        """
+        Release a new access token; refresh tokens are not rotated, so that clients refreshing concurrently all succeed
+
+        :param refresh_token: the refresh token of a previous token, None for a new authorization
+        :return: the body of the token response, None if the refresh token is not valid
+        """
+        access_token = uuid.uuid4().hex
+        with self._tokens_lock:
+            if refresh_token is None:
+                refresh_token = uuid.uuid4().hex
+            elif refresh_token not in self._refresh_tokens:
+                return None
+            self._refresh_tokens[refresh_token] = access_token
+            self._tokens[access_token] = time.monotonic() + self.token_ttl
+        return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer", "expires_in": int(self.token_ttl)}
+
+    def is_authorized(self, headers) -> bool:
+        if headers.get("x-wenet-component-apikey"):
+            return True
+        authorization = headers.get("authorization", "")
+        if not authorization.lower().startswith("bearer "):
+            return False
+        with self._tokens_lock:
+            expiration = self._tokens.get(authorization[7:])
+        return expiration is not None and expiration > time.monotonic()
+
+
+Route = Tuple[str, Pattern, Callable]
+
+
+class MockPlatformRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    server: MockPlatformServer
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(format, *args)
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def do_PATCH(self) -> None:
+        self._handle("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        body = self._read_body()
+
+        delay = self.server.response_delay()
+        if delay:
+            time.sleep(delay)
+
+        if self.server.throttled():
+            self._respond(429, {"code": "too_many_requests", "message": "Too many requests"}, {"Retry-After": "1"})
+            return
+        if self.server.error_rate and self.server.random() < self.server.error_rate:
+            status = 503 if self.server.random() < 0.5 else 500
+            self._respond(status, {"code": "unavailable", "message": "Simulated error"})
+            return
+
+        for route_method, pattern, handler in ROUTES:
+            if route_method != method:
+                continue
+            match = pattern.match(url.path)
+            if match is None:
+                continue
+            if handler is not _token and not self.server.is_authorized(self.headers):
+                self._respond(401, {"code": "unauthorized", "message": "Missing or expired credentials"})
+                return
+            try:
+                status, response_body = handler(self.server, query, body, *match.groups())
+            except (KeyError, TypeError, ValueError) as e:
+                status, response_body = 400, {"code": "bad_request", "message": str(e)}
+            self._respond(status, response_body)
+            return
+
+        self._respond(404, {"code": "not_found", "message": f"No endpoint for [{method} {url.path}]"})
+
+    def _read_body(self) -> Optional[object]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        data = self.rfile.read(length)
+        if self.headers.get("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        return json.loads(data)
+
+    def _respond(self, status: int, body: Optional[object], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        threshold = self.server.compression_threshold
+        if threshold is not None and len(data) >= threshold and "gzip" in self.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data, compresslevel=6)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _page(server: MockPlatformServer, query: dict, items: list) -> Tuple[int, list]:
+    offset = int(query.get("offset", 0))
+    limit = int(query.get("limit", server.page_size))
+    if server.max_page_size is not None:
+        limit = min(limit, server.max_page_size)
+    return offset, items[offset:offset + limit]
+
+
+def _not_found(kind: str, identifier: str) -> Tuple[int, dict]:
+    return 404, {"code": "not_found", "message": f"{kind} [{identifier}] does not exist"}
+
+
+# The query parameters filtering the items by timestamp: the field of the timestamp, and whether it is a lower bound
+_TIMESTAMP_FILTERS = {
+    "creationFrom": ("_creationTs", True),
+    "creationTo": ("_creationTs", False),
+    "updateFrom": ("_lastUpdateTs", True),
+    "updateTo": ("_lastUpdateTs", False)
+}
+
+
+def _in_time_range(item: dict, query: dict) -> bool:
+    for name, (field, lower) in _TIMESTAMP_FILTERS.items():
+        if name in query:
+            bound = int(query[name])
+            if item.get(field) is None or (item[field] < bound if lower else item[field] > bound):
+                return False
+    return True
+
+
+def _sort(items: List[dict], query: dict) -> List[dict]:
+    """
+    Sort the items by the fields of the `order` query parameter, e.g. `_creationTs,-id`
+    """
+    for field in reversed(query.get("order", "").split(",")):
+        field = field.strip()
+        if field:
+            name = field.lstrip("+-")
+            items.sort(key=lambda item: (item.get(name) is not None, item.get(name)), reverse=field.startswith("-"))
+    return items
+
+
+def _filter_tasks(server: MockPlatformServer, query: dict) -> List[dict]:
+    has_close_ts = query.get("hasCloseTs")
+    with server.data.lock:
+        tasks = list(server.data.tasks.values())
+    return _sort([
+        task for task in tasks
+        if ("appId" not in query or task["appId"] == query["appId"])
+        and ("requesterId" not in query or task["requesterId"] == query["requesterId"])
+        and ("taskTypeId" not in query or task["taskTypeId"] == query["taskTypeId"])
+        and (has_close_ts is None or (task.get("closeTs") is not None) == (has_close_ts.lower() == "true"))
+        and _in_time_range(task, query)
+    ], query)
+
+
+def _token(server: MockPlatformServer, query: dict, body: dict) -> Tuple[int, dict]:
+    if body.get("grant_type") == "refresh_token":
+        token = server.release_token(body["refresh_token"])
+        if token is None:
+            return 400, {"error": "invalid_grant"}
+        return 200, token
+    return 200, server.release_token()
+
+
+def _get_tasks(server: MockPlatformServer, query: dict, body: None) -> Tuple[int, dict]:
+    tasks = _filter_tasks(server, query)
+    offset, page = _page(server, query, tasks)
+    return 200, {"offset": offset, "total": len(tasks), "tasks": page}
+
+
+def _get_task(server: MockPlatformServer, query: dict, body: None, task_id: str) -> Tuple[int, dict]:
+    task = server.data.tasks.get(task_id)
+    if task is None:
+        return _not_found("Task", task_id)
+    return 200, task
+
+
+def _create_task(server: MockPlatformServer, query: dict, body: dict) -> Tuple[int, dict]:
+    task = dict(body, id=body.get("id") or uuid.uuid4().hex)
+    with server.data.lock:
+        server.data.tasks[task["id"]] = task
+    return 201, task
+
+
+def _update_task(server: MockPlatformServer, query: dict, body: dict, task_id: str) -> Tuple[int, dict]:
+    with server.data.lock:
+        if task_id not in server.data.tasks:
+            return _not_found("Task", task_id)
+        server.data.tasks[task_id] = dict(server.data.tasks[task_id], **body)
+        return 200, server.data.tasks[task_id]
+
+
+def _get_transactions(server: MockPlatformServer, query: dict, body: None) -> Tuple[int, dict]:
+    with server.data.lock:
+        transactions = [
+            transaction for transaction in server.data.transactions
+            if ("taskId" not in query or transaction["taskId"] == query["taskId"]) and _in_time_range(transaction, query)
+        ]
+    transactions = _sort(transactions, query)
+    offset, page = _page(server, query, transactions)
+    return 200, {"offset": offset, "total": len(transactions), "transactions": page}
+
+
+def _create_transaction(server: MockPlatformServer, query: dict, body: dict) -> Tuple[int, dict]:
+    transaction = dict(body, id=body.get("id") or uuid.uuid4().hex)
+    with server.data.lock:
+        server.data.transactions.append(transaction)
+    return 201, transaction
+
+
+def _get_profiles(server: MockPlatformServer, query: dict, body: None) -> Tuple[int, dict]:
+    with server.data.lock:
+        profiles = list(server.data.profiles.values())
+    offset, page = _page(server, query, profiles)
+    return 200, {"offset": offset, "total": len(profiles), "profiles": page}
+
+
+def _get_user_ids(server: MockPlatformServer, query: dict, body: None) -> Tuple[int, dict]:
+    with server.data.lock:
+        user_ids = list(server.data.profiles)
+    offset, page = _page(server, query, user_ids)
+    return 200, {"offset": offset, "total": len(user_ids), "userIds": page}
+
+
+def _get_profile(server: MockPlatformServer, query: dict, body: None, user_id: str) -> Tuple[int, dict]:
+    profile = server.data.profiles.get(user_id)
+    if profile is None:
+        return _not_found("Profile", user_id)
+    return 200, profile
+
+
+def _create_profile(server: MockPlatformServer, query: dict, body: dict, user_id: Optional[str] = None) -> Tuple[int, dict]:
+    user_id = user_id or body["id"]
+    profile = fixtures.build_profile(0).to_repr()
+    profile.update({"id": user_id, "competences": [], "meanings": []})
+    with server.data.lock:
+        server.data.profiles.setdefault(user_id, profile)
+        return 201, server.data.profiles[user_id]
+
+
+def _update_profile(server: MockPlatformServer, query: dict, body: dict, user_id: str) -> Tuple[int, dict]:
+    """
+    Replace a profile, keeping only its identifier and creation timestamp
+    """
+    with server.data.lock:
+        profile = server.data.profiles.get(user_id)
+        if profile is None:
+            return _not_found("Profile", user_id)
+        body = {key: value for key, value in body.items() if key not in ("id", "_creationTs", "_lastUpdateTs")}
+        server.data.profiles[user_id] = dict(body, id=user_id, _creationTs=profile.get("_creationTs"), _lastUpdateTs=int(time.time()))
+        return 200, server.data.profiles[user_id]
+
+
+def _merge_profile(server: MockPlatformServer, query: dict, body: dict, user_id: str) -> Tuple[int, dict]:
+    """
+    Merge the fields of the body into a profile, keeping the other ones
+    """
+    with server.data.lock:
+        if user_id not in server.data.profiles:
+            return _not_found("Profile", user_id)
+        body = {key: value for key, value in body.items() if key not in ("id", "_creationTs", "_lastUpdateTs")}
+        server.data.profiles[user_id] = dict(server.data.profiles[user_id], _lastUpdateTs=int(time.time()), **body)
+        return 200, server.data.profiles[user_id]
+
+
+def _delete_profile(server: MockPlatformServer, query: dict, body: None, user_id: str) -> Tuple[int, Optional[dict]]:
+    with server.data.lock:
+        if server.data.profiles.pop(user_id, None) is None:
+            return _not_found("Profile", user_id)
+    return 204, None
+
+
+def _get_profile_field(server: MockPlatformServer, query: dict, body: None, user_id: str, field: str) -> Tuple[int, list]:
+    profile = server.data.profiles.get(user_id)
+    if profile is None:
+        return _not_found("Profile", user_id)
+    return 200, profile.get(field) or []
+
+
+def _update_profile_field(server: MockPlatformServer, query: dict, body: list, user_id: str, field: str) -> Tuple[int, list]:
+    with server.data.lock:
+        if user_id not in server.data.profiles:
+            return _not_found("Profile", user_id)
+        server.data.profiles[user_id] = dict(server.data.profiles[user_id], **{field: body})
+    return 200, body
+
+
+def _get_app(server: MockPlatformServer, query: dict, body: None, app_id: str) -> Tuple[int, dict]:
+    app = server.data.apps.get(app_id)
+    if app is None:
+        return _not_found("App", app_id)
+    return 200, app
+
+
+def _get_app_dto(server: MockPlatformServer, query: dict, body: None, app_id: str) -> Tuple[int, dict]:
+    app = server.data.apps.get(app_id)
+    if app is None:
+        return _not_found("App", app_id)
+    return 200, {"appId": app_id, "creationTs": app["createdAt"], "lastUpdateTs": app["updatedAt"],
+                 "messageCallbackUrl": app["messageCallbackUrl"], "metadata": app["metadata"]}
+
+
+def _get_app_users(server: MockPlatformServer, query: dict, body: None, app_id: str) -> Tuple[int, list]:
+    if app_id not in server.data.apps:
+        return _not_found("App", app_id)
+    return 200, list(server.data.profiles)
+
+
+def _get_app_developers(server: MockPlatformServer, query: dict, body: None, app_id: str) -> Tuple[int, list]:
+    if app_id not in server.data.apps:
+        return _not_found("App", app_id)
+    return 200, list(server.data.profiles)[:2]
+
+
+def _get_users(server: MockPlatformServer, query: dict, body: None) -> Tuple[int, list]:
+    return 200, list(server.data.profiles)
+
+
+def _get_token_details(server: MockPlatformServer, query: dict, body: None) -> Tuple[int, dict]:
+    return 200, TokenDetails(next(iter(server.data.profiles), "user_0"), next(iter(server.data.apps)), ["first_name", "last_name"]).to_repr()
+
+
+def _get_user_tasks(server: MockPlatformServer, query: dict, body: None) -> Tuple[int, dict]:
+    return _get_tasks(server, query, body)
+
+
+def _log_messages(server: MockPlatformServer, query: dict, body: list) -> Tuple[int, dict]:
+    messages = body if isinstance(body, list) else [body]
+    with server.data.lock:
+        server.data.messages += len(messages)
+    return 201, {"traceIds": [uuid.uuid4().hex for _ in messages]}
+
+
+def _get_cohorts(server: MockPlatformServer, query: dict, body: None) -> Tuple[int, list]:
+    return 200, server.data.cohorts
+
+
+def _routes() -> List[Route]:
+    routes = [
+        ("POST", r"/api/oauth2/token", _token),
+        ("GET", r"/task_manager/tasks", _get_tasks),
+        ("POST", r"/task_manager/tasks", _create_task),
+        ("POST", r"/task_manager/tasks/transactions", _create_transaction),
+        ("GET", r"/task_manager/tasks/([^/]+)", _get_task),
+        ("PUT", r"/task_manager/tasks/([^/]+)", _update_task),
+        ("GET", r"/task_manager/taskTransactions", _get_transactions),
+        ("GET", r"/profile_manager/profiles", _get_profiles),
+        ("PUT", r"/profile_manager/profiles", _create_profile),
+        ("GET", r"/profile_manager/userIdentifiers", _get_user_ids),
+        ("GET", r"/profile_manager/profiles/([^/]+)", _get_profile),
+        ("PUT", r"/profile_manager/profiles/([^/]+)", _update_profile),
+        ("PATCH", r"/profile_manager/profiles/([^/]+)", _merge_profile),
+        ("DELETE", r"/profile_manager/profiles/([^/]+)", _delete_profile),
+        ("GET", r"/hub/frontend/data/app/([^/]+)", _get_app),
+        ("GET", r"/hub/frontend/data/app/([^/]+)/user", _get_app_users),
+        ("GET", r"/hub/frontend/data/app/([^/]+)/developer", _get_app_developers),
+        ("GET", r"/hub/frontend/data/user", _get_users),
+        ("POST", r"/logger/messages", _log_messages),
+        ("GET", r"/incentive_server/api/UsersCohorts/", _get_cohorts),
+    ]
+    # The service api is exposed on two paths, for apikey and for oauth2 clients
+    for prefix in ["/service", "/api/service"]:
+        routes.extend([
+            ("GET", prefix + r"/token", _get_token_details),
+            ("GET", prefix + r"/app/([^/]+)", _get_app_dto),
+            ("GET", prefix + r"/app/([^/]+)/users", _get_app_users),
+            ("POST", prefix + r"/task", _create_task),
+            ("POST", prefix + r"/task/transaction", _create_transaction),
+            ("GET", prefix + r"/task/([^/]+)", _get_task),
+            ("GET", prefix + r"/tasks", _get_user_tasks),
+            ("GET", prefix + r"/user/profile/([^/]+)", _get_profile),
+            ("POST", prefix + r"/user/profile/([^/]+)", _create_profile),
+            ("PUT", prefix + r"/user/profile/([^/]+)", _update_profile),
+            ("PATCH", prefix + r"/user/profile/([^/]+)", _merge_profile),
+            ("GET", prefix + r"/user/profile/([^/]+)/(competences|materials|meanings)", _get_profile_field),
+            ("PUT", prefix + r"/user/profile/([^/]+)/(competences|materials|meanings)", _update_profile_field),
+            ("POST", prefix + r"/log/messages", _log_messages),
+        ])
+    return [(method, re.compile(f"^{pattern}/?$"), handler) for method, pattern, handler in routes]
+
+
+ROUTES: List[Route] = _routes()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="the host to bind")
+    parser.add_argument("--port", type=int, default=8080, help="the port to bind")
+    parser.add_argument("--size", type=int, default=1000, help="the number of tasks, transactions and profiles")
+    parser.add_argument("--latency", type=float, default=0.0, help="the latency added to each response, in seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="the maximum random latency added to the latency, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="the ratio of requests failing with a server error")
+    parser.add_argument("--max-requests-per-second", type=float, default=None, help="the requests accepted each second, the others get a 429")
+    parser.add_argument("--page-size", type=int, default=20, help="the default size of the pages")
+    parser.add_argument("--max-page-size", type=int, default=None, help="the maximum size of the pages, whatever the requested limit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockPlatformServer(MockPlatformData(args.size), args.host, args.port, args.latency, args.latency_jitter,
+                                args.error_rate, args.max_requests_per_second, args.page_size, max_page_size=args.max_page_size)
+    print(f"Mock platform serving {args.size} items at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
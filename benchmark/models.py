@@ -0,0 +1,181 @@
+"""
+Measure the time and the memory spent building the models from their representation and back, for increasing sizes.
+
+Each case is run for each size: the time is the best average over a few repeats, the memory is the peak allocated
+by a single run and the memory still held by its result, as traced by tracemalloc.
+Results can be saved and compared with a previous run, failing when a case got slower than the allowed threshold.
+
+Usage:
+    PYTHONPATH=src python -m benchmark.models [--sizes 1,10,100,1000] [--filter Task] [--save results.json]
+    PYTHONPATH=src python -m benchmark.models --compare results.json [--threshold 0.2]
+"""
+from __future__ import absolute_import, annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from benchmark import fixtures
+from wenet.model.callback_message.builder import MessageBuilder
+from wenet.model.logging_message.content import CarouselContent
+from wenet.model.logging_message.message import BaseMessage
+from wenet.model.task.task import Task, TaskPage
+from wenet.model.task.transaction import TaskTransactionPage
+from wenet.model.user.profile import WeNetUserProfile, WeNetUserProfilesPage
+
+
+class Case(NamedTuple):
+    name: str
+    # Builds the function to measure for a given size, preparing its input outside of the measure
+    setup: Callable[[int], Callable[[], object]]
+
+
+def _decoding(build: Callable[[int], object], from_repr: Callable[[dict], object]) -> Callable[[int], Callable[[], object]]:
+    def setup(size: int) -> Callable[[], object]:
+        raw = build(size).to_repr()
+        return lambda: from_repr(raw)
+    return setup
+
+
+def _encoding(build: Callable[[int], object]) -> Callable[[int], Callable[[], object]]:
+    def setup(size: int) -> Callable[[], object]:
+        item = build(size)
+        return item.to_repr
+    return setup
+
+
+def _many_decoding(build: Callable[[int], list], from_repr: Callable[[dict], object]) -> Callable[[int], Callable[[], object]]:
+    def setup(size: int) -> Callable[[], object]:
+        raws = [item.to_repr() for item in build(size)]
+        return lambda: [from_repr(raw) for raw in raws]
+    return setup
+
+
+def _many_encoding(build: Callable[[int], list]) -> Callable[[int], Callable[[], object]]:
+    def setup(size: int) -> Callable[[], object]:
+        items = build(size)
+        return lambda: [item.to_repr() for item in items]
+    return setup
+
+
+CASES: List[Case] = [
+    Case("Task.from_repr", _many_decoding(fixtures.build_tasks, Task.from_repr)),
+    Case("Task.to_repr", _many_encoding(fixtures.build_tasks)),
+    Case("TaskPage.from_repr", _decoding(fixtures.build_task_page, TaskPage.from_repr)),
+    Case("TaskPage.to_repr", _encoding(fixtures.build_task_page)),
+    Case("TaskTransactionPage.from_repr", _decoding(fixtures.build_transaction_page, TaskTransactionPage.from_repr)),
+    Case("TaskTransactionPage.to_repr", _encoding(fixtures.build_transaction_page)),
+    Case("WeNetUserProfile.from_repr", _many_decoding(fixtures.build_profiles, WeNetUserProfile.from_repr)),
+    Case("WeNetUserProfile.to_repr", _many_encoding(fixtures.build_profiles)),
+    Case("WeNetUserProfilesPage.from_repr", _decoding(fixtures.build_profile_page, WeNetUserProfilesPage.from_repr)),
+    Case("WeNetUserProfilesPage.to_repr", _encoding(fixtures.build_profile_page)),
+    Case("MessageBuilder.build", _many_decoding(fixtures.build_messages, MessageBuilder.build)),
+    Case("BaseMessage.from_repr", _many_decoding(fixtures.build_logging_messages, BaseMessage.from_repr)),
+    Case("BaseMessage.to_repr", _many_encoding(fixtures.build_logging_messages)),
+    Case("CarouselContent.from_repr", _decoding(fixtures.build_carousel, CarouselContent.from_repr)),
+    Case("CarouselContent.to_repr", _encoding(fixtures.build_carousel)),
+]
+
+
+def measure_time(function: Callable[[], object], number: Optional[int], repeat: int) -> float:
+    """
+    :return: the best average time of a run of the function, in seconds
+    """
+    timer = timeit.Timer(function)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def measure_memory(function: Callable[[], object]) -> Dict[str, int]:
+    """
+    :return: the peak of memory allocated by a run of the function and the memory still held by its result, in bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        result = function()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del result
+    return {
+        "peakBytes": peak - start,
+        "retainedBytes": current - start,
+    }
+
+
+def run(cases: List[Case], sizes: List[int], number: Optional[int], repeat: int) -> List[dict]:
+    results = []
+    for case in cases:
+        for size in sizes:
+            function = case.setup(size)
+            elapsed = measure_time(function, number, repeat)
+            memory = measure_memory(function)
+            result = dict(case=case.name, size=size, seconds=elapsed, **memory)
+            results.append(result)
+            print(f"{case.name:<34} {size:>6} {elapsed * 1000:>10.4f} ms {memory['peakBytes'] / 1024:>10.1f} KiB peak "
+                  f"{memory['retainedBytes'] / 1024:>10.1f} KiB retained", flush=True)
+    return results
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> List[str]:
+    """
+    :return: the description of the cases slower, or allocating more memory at their peak, than in the baseline by more than the threshold
+    """
+    previous = {(result["case"], result["size"]): result for result in baseline}
+    regressions = []
+    for result in results:
+        reference = previous.get((result["case"], result["size"]))
+        if reference is None:
+            continue
+        for metric, unit, scale in [("seconds", "ms", 1000), ("peakBytes", "KiB", 1 / 1024)]:
+            if reference[metric] <= 0:
+                continue
+            change = result[metric] / reference[metric] - 1
+            if change > threshold:
+                regressions.append(f"{result['case']} [{result['size']}] {metric}: {reference[metric] * scale:.4f} {unit} -> "
+                                   f"{result[metric] * scale:.4f} {unit} (+{change:.0%})")
+    return regressions
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,10,100,1000", help="the comma separated sizes of the pages and lists")
+    parser.add_argument("--filter", default=None, help="only run the cases containing this text")
+    parser.add_argument("--number", type=int, default=None, help="the number of runs of each measure, calibrated by default")
+    parser.add_argument("--repeat", type=int, default=5, help="the number of measures of each case, the best one is kept")
+    parser.add_argument("--save", default=None, help="the path of the JSON file where to save the results")
+    parser.add_argument("--compare", default=None, help="the path of the JSON file of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="the relative slowdown considered a regression")
+    args = parser.parse_args(arguments)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    cases = [case for case in CASES if args.filter is None or args.filter in case.name]
+    print(f"Python {platform.python_version()} on {platform.platform()}")
+    results = run(cases, sizes, args.number, args.repeat)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"python": platform.python_version(), "results": results}, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+Compare the decoding of platform pages through the models (`json` + `from_repr`) with the typed structs.
+
+Usage: PYTHONPATH=src python -m benchmark.structs_decoding [--size 500] [--number 20]
+"""
+from __future__ import absolute_import, annotations
+
+import argparse
+import json
+import timeit
+
+from benchmark.fixtures import build_profile_page, build_task_page
+from wenet.model import structs
+from wenet.model.task.task import TaskPage
+from wenet.model.user.profile import WeNetUserProfilesPage
+from wenet.utils import codec
+
+
+def measure(name: str, function, number: int) -> None:
+    elapsed = min(timeit.repeat(function, number=number, repeat=3)) / number
+    print(f"{name:<40} {elapsed * 1000:8.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=500, help="the number of items in each page")
+    parser.add_argument("--number", type=int, default=20, help="the number of decodings for each measure")
+    args = parser.parse_args()
+
+    for model_type, page in [(TaskPage, build_task_page(args.size)), (WeNetUserProfilesPage, build_profile_page(args.size))]:
+        raw = json.dumps(page.to_repr()).encode("utf-8")
+        struct_type = structs.STRUCTS[model_type]
+        print(f"{model_type.__name__}: {args.size} items, {len(raw)} bytes")
+        measure("json.loads + from_repr", lambda: model_type.from_repr(json.loads(raw)), args.number)
+        measure(f"{codec.get_codec().name} codec + from_repr", lambda: model_type.from_repr(codec.loads(raw)), args.number)
+        measure("struct decode", lambda: structs.decode(raw, struct_type), args.number)
+        measure("struct decode + to_model", lambda: structs.decode_model(raw, model_type), args.number)
+        print()
+
+
+if __name__ == "__main__":
+    main()
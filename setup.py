@@ -19,5 +19,10 @@ setuptools.setup(
     package_dir={"": "src"},
     packages=setuptools.find_packages(where="src"),
     python_requires=">=3.6",
-    install_requires=requirements
+    install_requires=requirements,
+    extras_require={
+        "structs": ["msgspec>=0.18"],
+        # Runs the Lua scripts of the export coordinator in the tests
+        "test": ["fakeredis[lua]>=2.20"]
+    }
 )
@@ -0,0 +1,456 @@
+from __future__ import absolute_import, annotations
+
+import asyncio
+import hashlib
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from wenet.model.callback_message.builder import EventBuilder, MessageBuilder
+from wenet.model.callback_message.event import Event
+from wenet.model.callback_message.message import Message
+from wenet.utils import codec
+
+
+logger = logging.getLogger("wenet.callback.dispatcher")
+
+
+Callback = Union[Message, Event]
+
+
+class DispatcherMetrics:
+    """
+    Thread-safe counters describing the activity of a callback dispatcher.
+
+    Attributes:
+        - received: the number of callbacks submitted to the dispatcher
+        - duplicated: the number of callbacks discarded because already received
+        - rejected: the number of callbacks refused because the queue was full
+        - processed: the number of callbacks handled without errors
+        - failed: the number of callbacks whose handler raised an exception
+        - unhandled: the number of callbacks without a registered handler
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.received = 0
+        self.duplicated = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+        self.unhandled = 0
+        self._handlers: Dict[str, dict] = {}
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def observe_handler(self, route: str, latency: float, failed: bool) -> None:
+        """
+        Record the execution of the handlers of a route
+
+        :param route: the label of the message or the type of the event
+        :param latency: the time spent by the handlers, in seconds
+        :param failed: whether a handler raised an exception
+        """
+        with self._lock:
+            stats = self._handlers.get(route)
+            if stats is None:
+                stats = {"count": 0, "failed": 0, "totalLatency": 0.0, "maxLatency": 0.0}
+                self._handlers[route] = stats
+            stats["count"] += 1
+            stats["totalLatency"] += latency
+            stats["maxLatency"] = max(stats["maxLatency"], latency)
+            if failed:
+                stats["failed"] += 1
+                self.failed += 1
+            else:
+                self.processed += 1
+
+    def to_repr(self) -> dict:
+        with self._lock:
+            handlers = {}
+            for route, stats in self._handlers.items():
+                handlers[route] = dict(stats, averageLatency=stats["totalLatency"] / stats["count"])
+            return {
+                "received": self.received,
+                "duplicated": self.duplicated,
+                "rejected": self.rejected,
+                "processed": self.processed,
+                "failed": self.failed,
+                "unhandled": self.unhandled,
+                "handlers": handlers
+            }
+
+
+def _canonical(value):
+    """
+    :return: the value with the keys of its objects as strings and sorted, so that the order of the keys of a callback does not change its encoding
+    """
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in sorted(((str(key), item) for key, item in value.items()), key=lambda pair: pair[0])}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+class _DeduplicationWindow:
+    """
+    Remembers the keys of the latest callbacks, up to a maximum number of keys and for a limited amount of time
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._keys: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, key: str) -> bool:
+        """
+        :return: False if the key was already in the window, True otherwise
+        """
+        if self._max_size <= 0:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            while self._keys:
+                added_at = next(iter(self._keys.values()))
+                if now - added_at < self._ttl and len(self._keys) < self._max_size:
+                    break
+                self._keys.popitem(last=False)
+
+            if key in self._keys:
+                return False
+            self._keys[key] = now
+            return True
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._keys.pop(key, None)
+
+
+class _BaseCallbackDispatcher:
+
+    def __init__(self, workers: int, max_queue_size: int, deduplication_window: int, deduplication_ttl: float,
+                 deduplication_key: Optional[Callable[[dict], str]]) -> None:
+        if workers < 1:
+            raise ValueError("The dispatcher needs at least one worker")
+        if max_queue_size < workers:
+            raise ValueError("The maximum queue size should not be lower than the number of workers")
+
+        self._workers = workers
+        self._shard_size = -(-max_queue_size // workers)
+        self._deduplication = _DeduplicationWindow(deduplication_window, deduplication_ttl)
+        self._deduplication_key = deduplication_key if deduplication_key is not None else self.default_deduplication_key
+        self._message_handlers: Dict[str, List[Callable]] = {}
+        self._event_handlers: Dict[str, List[Callable]] = {}
+        self._default_handlers: List[Callable] = []
+        self.metrics = DispatcherMetrics()
+
+    def on_message(self, label: str, handler: Callable) -> None:
+        """
+        Register a handler for the callback messages with the given label (e.g. `TextualMessage.LABEL`)
+        """
+        self._message_handlers.setdefault(label, []).append(handler)
+
+    def on_event(self, event_type: str, handler: Callable) -> None:
+        """
+        Register a handler for the callback events with the given type (e.g. `WeNetAuthenticationEvent.TYPE`)
+        """
+        self._event_handlers.setdefault(event_type, []).append(handler)
+
+    def on_default(self, handler: Callable) -> None:
+        """
+        Register a handler for the callbacks not matching any other registered handler
+        """
+        self._default_handlers.append(handler)
+
+    @staticmethod
+    def default_deduplication_key(raw_callback: dict) -> str:
+        """
+        The platform re-delivers the very same body, so the digest of the canonical representation identifies a callback.
+        The representation is encoded with the configured codec, so the keys depend on it and are only comparable within a process.
+        """
+        return hashlib.sha1(codec.dumps(_canonical(raw_callback))).hexdigest()
+
+    @staticmethod
+    def _parse(raw_callback: Union[dict, str, bytes]) -> dict:
+        if isinstance(raw_callback, (str, bytes)):
+            raw_callback = codec.loads(raw_callback)
+        if not isinstance(raw_callback, dict):
+            raise ValueError(f"A callback should be a JSON object, got [{type(raw_callback).__name__}]")
+        return raw_callback
+
+    @staticmethod
+    def _build(raw_callback: dict) -> Callback:
+        if "label" in raw_callback:
+            return MessageBuilder.build(raw_callback)
+        elif "type" in raw_callback:
+            return EventBuilder.build(raw_callback)
+        raise ValueError("A callback should be either a message with a label or an event with a type")
+
+    @staticmethod
+    def _ordering_key(callback: Callback) -> str:
+        if isinstance(callback, Message):
+            return callback.receiver_id
+        return getattr(callback, "external_id", callback.event_type)
+
+    def _prepare(self, raw_callback: Union[dict, str, bytes]) -> Optional[Tuple[Callback, str, int]]:
+        """
+        Parse and build a callback, checking whether it has already been received
+
+        :return: the callback, its deduplication key and the index of the shard that has to process it; None for duplicated callbacks
+        :raises ValueError KeyError: if the callback is not valid
+        """
+        raw_callback = self._parse(raw_callback)
+        # the key is computed before building the callback, since models may update the raw attributes
+        deduplication_key = self._deduplication_key(raw_callback)
+        callback = self._build(raw_callback)
+        self.metrics.increment("received")
+
+        if not self._deduplication.add(deduplication_key):
+            logger.debug("Discarding duplicated callback [%s]", deduplication_key)
+            self.metrics.increment("duplicated")
+            return None
+
+        shard = hash(self._ordering_key(callback)) % self._workers
+        return callback, deduplication_key, shard
+
+    def _reject(self, deduplication_key: str) -> None:
+        # the callback was not accepted, a redelivery should not be considered a duplicate
+        self._deduplication.discard(deduplication_key)
+        self.metrics.increment("rejected")
+
+    def _handlers_for(self, callback: Callback) -> Tuple[str, List[Callable]]:
+        if isinstance(callback, Message):
+            route, handlers = callback.label, self._message_handlers.get(callback.label)
+        else:
+            route, handlers = callback.event_type, self._event_handlers.get(callback.event_type)
+        return route, handlers if handlers else self._default_handlers
+
+
+class CallbackDispatcher(_BaseCallbackDispatcher):
+    """
+    Dispatches the callbacks sent by the platform to the registered handlers using a pool of threads.
+
+    Callbacks are routed by message label or event type. Callbacks for the same receiver are always processed
+    by the same worker, so they are handled in the order they were submitted.
+    Redelivered callbacks are discarded as long as they are within the deduplication window.
+    """
+
+    def __init__(self, workers: int = 4, max_queue_size: int = 1000, deduplication_window: int = 10000,
+                 deduplication_ttl: float = 600, deduplication_key: Optional[Callable[[dict], str]] = None) -> None:
+        """
+        Create a new callback dispatcher
+
+        Args:
+            workers: the number of worker threads
+            max_queue_size: the maximum number of callbacks waiting to be handled
+            deduplication_window: the number of latest callbacks remembered for discarding redeliveries, 0 disables deduplication
+            deduplication_ttl: the number of seconds a callback is remembered for discarding redeliveries
+            deduplication_key: a function computing the key identifying a raw callback, by default the digest of its content
+        """
+        super().__init__(workers, max_queue_size, deduplication_window, deduplication_ttl, deduplication_key)
+        self._queues = [queue.Queue(maxsize=self._shard_size) for _ in range(workers)]
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        for index, shard_queue in enumerate(self._queues):
+            thread = threading.Thread(target=self._work, args=(shard_queue,), name=f"wenet-callback-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the workers once all the already submitted callbacks have been handled
+        """
+        if not self._threads:
+            return
+        for shard_queue in self._queues:
+            shard_queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, raw_callback: Union[dict, str, bytes], block: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Submit a callback received from the platform
+
+        Args:
+            raw_callback: the body of the callback, either as a dictionary or as JSON
+            block: whether to wait for space in the queue
+            timeout: the maximum number of seconds to wait for space in the queue
+
+        Returns:
+            True if the callback has been queued, False if it is a duplicate
+
+        Raises:
+            ValueError, KeyError: if the callback is not valid
+            queue.Full: if the queue is full
+        """
+        prepared = self._prepare(raw_callback)
+        if prepared is None:
+            return False
+
+        callback, deduplication_key, shard = prepared
+        try:
+            self._queues[shard].put(callback, block=block, timeout=timeout)
+        except queue.Full:
+            self._reject(deduplication_key)
+            raise
+        return True
+
+    def metrics_repr(self) -> dict:
+        metrics = self.metrics.to_repr()
+        metrics["queueDepth"] = self.queue_depth
+        return metrics
+
+    def _work(self, shard_queue: queue.Queue) -> None:
+        while True:
+            callback = shard_queue.get()
+            try:
+                if callback is None:
+                    return
+                self._handle(callback)
+            finally:
+                shard_queue.task_done()
+
+    def _handle(self, callback: Callback) -> None:
+        route, handlers = self._handlers_for(callback)
+        if not handlers:
+            logger.debug("No handler for callback [%s]", route)
+            self.metrics.increment("unhandled")
+            return
+
+        failed = False
+        start = time.perf_counter()
+        for handler in handlers:
+            try:
+                handler(callback)
+            except Exception as e:
+                failed = True
+                logger.exception("Handler failed for callback [%s]", route, exc_info=e)
+        self.metrics.observe_handler(route, time.perf_counter() - start, failed)
+
+
+class AsyncCallbackDispatcher(_BaseCallbackDispatcher):
+    """
+    Dispatches the callbacks sent by the platform to the registered handlers using asyncio tasks.
+
+    Handlers can be either coroutine functions or plain functions. Routing, ordering and deduplication
+    work as in the `CallbackDispatcher`.
+    """
+
+    def __init__(self, workers: int = 4, max_queue_size: int = 1000, deduplication_window: int = 10000,
+                 deduplication_ttl: float = 600, deduplication_key: Optional[Callable[[dict], str]] = None) -> None:
+        """
+        Create a new asyncio callback dispatcher
+
+        Args:
+            workers: the number of worker tasks
+            max_queue_size: the maximum number of callbacks waiting to be handled
+            deduplication_window: the number of latest callbacks remembered for discarding redeliveries, 0 disables deduplication
+            deduplication_ttl: the number of seconds a callback is remembered for discarding redeliveries
+            deduplication_key: a function computing the key identifying a raw callback, by default the digest of its content
+        """
+        super().__init__(workers, max_queue_size, deduplication_window, deduplication_ttl, deduplication_key)
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queues = [asyncio.Queue(maxsize=self._shard_size) for _ in range(self._workers)]
+        self._tasks = [asyncio.ensure_future(self._work(shard_queue)) for shard_queue in self._queues]
+
+    async def stop(self) -> None:
+        """
+        Stop the workers once all the already submitted callbacks have been handled
+        """
+        if not self._tasks:
+            return
+        for shard_queue in self._queues:
+            await shard_queue.put(None)
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+
+    async def submit(self, raw_callback: Union[dict, str, bytes], block: bool = True) -> bool:
+        """
+        Submit a callback received from the platform
+
+        Args:
+            raw_callback: the body of the callback, either as a dictionary or as JSON
+            block: whether to wait for space in the queue
+
+        Returns:
+            True if the callback has been queued, False if it is a duplicate
+
+        Raises:
+            ValueError, KeyError: if the callback is not valid
+            asyncio.QueueFull: if the queue is full and block is False
+        """
+        if not self._queues:
+            raise RuntimeError("The dispatcher has not been started")
+
+        prepared = self._prepare(raw_callback)
+        if prepared is None:
+            return False
+
+        callback, deduplication_key, shard = prepared
+        try:
+            if block:
+                await self._queues[shard].put(callback)
+            else:
+                self._queues[shard].put_nowait(callback)
+        except asyncio.QueueFull:
+            self._reject(deduplication_key)
+            raise
+        return True
+
+    def metrics_repr(self) -> dict:
+        metrics = self.metrics.to_repr()
+        metrics["queueDepth"] = self.queue_depth
+        return metrics
+
+    async def _work(self, shard_queue: asyncio.Queue) -> None:
+        while True:
+            callback = await shard_queue.get()
+            try:
+                if callback is None:
+                    return
+                await self._handle(callback)
+            finally:
+                shard_queue.task_done()
+
+    async def _handle(self, callback: Callback) -> None:
+        route, handlers = self._handlers_for(callback)
+        if not handlers:
+            logger.debug("No handler for callback [%s]", route)
+            self.metrics.increment("unhandled")
+            return
+
+        failed = False
+        start = time.perf_counter()
+        for handler in handlers:
+            try:
+                result = handler(callback)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                failed = True
+                logger.exception("Handler failed for callback [%s]", route, exc_info=e)
+        self.metrics.observe_handler(route, time.perf_counter() - start, failed)
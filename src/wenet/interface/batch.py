@@ -0,0 +1,192 @@
+from __future__ import absolute_import, annotations
+
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, Dict, Generic, Iterable, List, Optional, TypeVar
+
+
+logger = logging.getLogger("wenet.interface.batch")
+
+
+T = TypeVar("T")
+I = TypeVar("I")
+
+# The status codes of the failures that may not happen again when the request is repeated
+RETRIABLE_STATUS_CODES = frozenset([408, 425, 429, 500, 502, 503, 504])
+
+
+class BatchResult(Generic[T]):
+    """
+    The outcome of a request for many entities: the entities found, and the error raised for each of the other ones
+    (e.g. `NotFound`), so that a single failure does not fail the whole batch.
+    """
+
+    def __init__(self, results: Dict[str, T], errors: Dict[str, Exception]) -> None:
+        self.results = results
+        self.errors = errors
+
+    @property
+    def ok(self) -> bool:
+        """
+        :return: whether all the entities were got
+        """
+        return not self.errors
+
+    def __repr__(self) -> str:
+        return f"BatchResult(results={len(self.results)}, errors={len(self.errors)})"
+
+    def __eq__(self, o) -> bool:
+        if not isinstance(o, BatchResult):
+            return False
+        return self.results == o.results and self.errors.keys() == o.errors.keys()
+
+
+def unique_ids(ids: Iterable[str]) -> List[str]:
+    """
+    :return: the identifiers without duplicates, in their original order
+    """
+    return list(dict.fromkeys(ids))
+
+
+def run_batch(ids: Iterable[str], get: Callable[[str], T], max_workers: int) -> BatchResult[T]:
+    """
+    Get the entity of each identifier, with at most a number of concurrent requests
+
+    :param ids: the identifiers of the entities, duplicates are requested once
+    :param get: the function getting the entity of an identifier
+    :param max_workers: the maximum number of concurrent requests
+    :return: the entities got and the errors of the other identifiers
+    """
+    ids = unique_ids(ids)
+    results: Dict[str, T] = {}
+    errors: Dict[str, Exception] = {}
+
+    def run(entity_id: str) -> None:
+        try:
+            results[entity_id] = get(entity_id)
+        except Exception as e:
+            errors[entity_id] = e
+
+    workers = min(max_workers, len(ids))
+    if workers <= 1:
+        for entity_id in ids:
+            run(entity_id)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wenet-batch") as executor:
+            for _ in executor.map(run, ids):
+                pass
+
+    if errors:
+        logger.debug("Got [%s] entities out of [%s], errors for [%s]", len(results), len(ids), list(errors)[:10])
+    return BatchResult(results, errors)
+
+
+class ItemStatus(Enum):
+
+    OK = "ok"
+    RETRIABLE = "retriable"
+    PERMANENT = "permanent"
+
+
+class ItemResult(Generic[I, T]):
+    """
+    The outcome of the operation on an item of a bulk operation: its value, if succeeded, or its error, classified as
+    retriable (e.g. a timeout or a 503) or permanent (e.g. a 400)
+    """
+
+    def __init__(self, item: I, status: ItemStatus, value: Optional[T] = None, error: Optional[Exception] = None) -> None:
+        self.item = item
+        self.status = status
+        self.value = value
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"ItemResult(status={self.status.value}, error={self.error!r})"
+
+
+class BulkResult(Generic[I, T]):
+    """
+    The outcome of a bulk operation, with a result for each item in the order of the items
+    """
+
+    def __init__(self, items: List[ItemResult[I, T]]) -> None:
+        self.items = items
+
+    @property
+    def ok(self) -> bool:
+        """
+        :return: whether the operation succeeded on all the items
+        """
+        return all(result.status == ItemStatus.OK for result in self.items)
+
+    @property
+    def values(self) -> List[Optional[T]]:
+        """
+        :return: the values of the items on which the operation succeeded
+        """
+        return [result.value for result in self.items if result.status == ItemStatus.OK]
+
+    @property
+    def failed(self) -> List[ItemResult[I, T]]:
+        """
+        :return: the results of the items on which the operation failed
+        """
+        return [result for result in self.items if result.status != ItemStatus.OK]
+
+    def items_to_retry(self, include_permanent: bool = False) -> List[I]:
+        """
+        :param include_permanent: whether to include the items whose failure is permanent
+        :return: the items to send again in a new run of the operation
+        """
+        statuses = (ItemStatus.RETRIABLE, ItemStatus.PERMANENT) if include_permanent else (ItemStatus.RETRIABLE,)
+        return [result.item for result in self.items if result.status in statuses]
+
+    def __repr__(self) -> str:
+        return f"BulkResult(items={len(self.items)}, failed={len(self.failed)})"
+
+
+def is_retriable(error: Exception) -> bool:
+    """
+    :return: whether the failure of a request may not happen again when repeated: connection errors, timeouts, throttling and server errors
+    """
+    status_code = getattr(error, "http_status_code", None)
+    if status_code is not None:
+        return status_code in RETRIABLE_STATUS_CODES
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # Without requests loaded the error can not be one of its exceptions, and there is no need to import it
+    exceptions = sys.modules.get("requests.exceptions")
+    return exceptions is not None and isinstance(error, (exceptions.ConnectionError, exceptions.Timeout))
+
+
+def run_bulk(items: Iterable[I], operation: Callable[[I], T], max_workers: int) -> BulkResult[I, T]:
+    """
+    Run an operation on each item, with at most a number of concurrent requests.
+    The failure of an item does not stop the other ones: it is recorded in its result as retriable or permanent.
+
+    :param items: the items
+    :param operation: the operation, performing the request of an item
+    :param max_workers: the maximum number of concurrent requests
+    :return: the result of each item
+    """
+    items = list(items)
+
+    def run(item: I) -> ItemResult[I, T]:
+        try:
+            return ItemResult(item, ItemStatus.OK, value=operation(item))
+        except Exception as e:
+            return ItemResult(item, ItemStatus.RETRIABLE if is_retriable(e) else ItemStatus.PERMANENT, error=e)
+
+    workers = min(max_workers, len(items))
+    if workers <= 1:
+        results = [run(item) for item in items]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wenet-bulk") as executor:
+            results = list(executor.map(run, items))
+
+    result = BulkResult(results)
+    if not result.ok:
+        logger.debug("Bulk operation failed on [%s] items out of [%s]", len(result.failed), len(items))
+    return result
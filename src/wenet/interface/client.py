@@ -1,24 +1,45 @@
 from __future__ import absolute_import, annotations
 
+import gzip
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, Union
-
-import requests
-from requests import Response
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 from wenet.interface.exceptions import RefreshTokenExpiredError
+from wenet.interface.metrics import ClientMetrics
 from wenet.storage.cache import BaseCache, InMemoryCache
+from wenet.utils import codec
+from wenet.utils.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from requests import Response, Session
+
+# requests (and urllib3) are imported on the first request, keeping them out of the start up of the applications
+requests = lazy_import("requests")
 
 logger = logging.getLogger("wenet.interface.client")
 
 
 class RestClient(ABC):
 
+    # Request bodies of at least this number of bytes are sent gzip compressed, None to never compress them
+    request_compression_threshold: Optional[int] = None
+    # The metrics of the requests of the client, None to not collect them
+    metrics: Optional[ClientMetrics] = None
+    # The session keeping a pool of connections for the requests of the client, None to open a connection for each request
+    session: Optional[Session] = None
+
     @abstractmethod
     def get_authentication(self, *args) -> dict:
         pass
 
+    def identity(self) -> Optional[str]:
+        """
+        :return: the identity the requests of the client are authenticated as, None if not authenticated
+        """
+        return None
+
     @abstractmethod
     def post(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
         pass
@@ -31,78 +52,252 @@ class RestClient(ABC):
     def put(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
         pass
 
+    def patch(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
+        raise NotImplementedError(f"[{type(self).__name__}] does not support patch requests")
+
     @abstractmethod
     def delete(self, url: str, query_params: Optional[dict] = None, headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
         pass
 
+    def enable_connection_pool(self, max_connections: int = 10) -> None:
+        """
+        Send the requests of the client through a session keeping alive up to a number of connections for each host,
+        to be reused by the following requests, also from concurrent threads
+
+        :param max_connections: the maximum number of connections kept alive for each host
+        """
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        self.session = session
+
+    @staticmethod
+    def encode_body(body: Union[dict, list], headers: dict) -> bytes:
+        """
+        Encode the body of a request with the JSON codec, setting its content type if not already specified
+        """
+        if not any(header.lower() == "content-type" for header in headers):
+            headers["Content-Type"] = "application/json"
+        return codec.dumps(body)
+
+    @staticmethod
+    def decode_body(response: Response) -> Any:
+        """
+        Decode the JSON body of a response directly from its raw content
+
+        :raises ValueError: if the body is not valid JSON
+        """
+        return codec.loads(response.content)
+
+    @staticmethod
+    def _prepare_headers(headers: Optional[dict]) -> dict:
+        """
+        Copy the headers of a request, so that the ones of the caller are never modified, asking for a compressed
+        response in all the encodings that can be decoded (gzip and deflate, plus brotli when installed)
+        """
+        prepared = dict(headers) if headers else {}
+        if not any(header.lower() == "accept-encoding" for header in prepared):
+            prepared["Accept-Encoding"] = _accept_encoding()
+        return prepared
+
+    def _prepare_body(self, body: Union[dict, list], headers: dict) -> bytes:
+        data = self.encode_body(body, headers)
+        threshold = self.request_compression_threshold
+        if threshold is not None and len(data) >= threshold:
+            data = gzip.compress(data, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        return data
+
+    def _send(self, method: str, url: str, request_records: Optional[list], request_bytes: int, **kwargs) -> Response:
+        """
+        Perform a request, recording it in the request records and in the metrics of the client
+        """
+        metrics = self.metrics
+        if metrics is None:
+            response = getattr(self.session or requests, method)(url, **kwargs)
+        elif metrics.tracer is None:
+            response = self._measure(metrics, method, url, request_bytes, kwargs)
+        else:
+            with metrics.request_span(method, url) as span:
+                response = self._measure(metrics, method, url, request_bytes, kwargs)
+                span.set_attribute("http.response.status_code", response.status_code)
+
+        self._record_request(request_records, method, url, response, request_bytes)
+        return response
+
+    def _measure(self, metrics: ClientMetrics, method: str, url: str, request_bytes: int, kwargs: dict) -> Response:
+        start = time.perf_counter()
+        try:
+            response = getattr(self.session or requests, method)(url, **kwargs)
+        except Exception:
+            metrics.observe_request(method, url, time.perf_counter() - start, None, request_bytes)
+            raise
+        metrics.observe_request(method, url, time.perf_counter() - start, response.status_code, request_bytes, response_wire_size(response))
+        return response
+
+    @staticmethod
+    def _record_request(request_records: Optional[list], method: str, url: str, response: Response, request_bytes: int) -> None:
+        if request_records is None and not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        response_bytes = response_wire_size(response)
+        logger.debug("Request [%s %s] sent [%s] bytes and received [%s] bytes", method, url, request_bytes, response_bytes)
+        if request_records is not None:
+            request_records.append({
+                "url": url,
+                "method": method,
+                "respond": response.status_code,
+                "requestBytes": request_bytes,
+                "responseBytes": response_bytes
+            })
+
+
+_ACCEPT_ENCODING: Optional[str] = None
+
+
+def _accept_encoding() -> str:
+    global _ACCEPT_ENCODING
+    if _ACCEPT_ENCODING is None:
+        from urllib3.util.request import ACCEPT_ENCODING
+        _ACCEPT_ENCODING = ACCEPT_ENCODING
+    return _ACCEPT_ENCODING
+
+
+def response_wire_size(response: Response) -> Optional[int]:
+    """
+    The number of bytes of the body of a response as transferred on the wire, before its decompression
+
+    :return: the number of bytes, None if it can not be measured
+    """
+    raw = getattr(response, "raw", None)
+    tell = getattr(raw, "tell", None)
+    if tell is not None:
+        try:
+            size = tell()
+        except (OSError, ValueError):
+            size = None
+        if isinstance(size, int):
+            return size
+
+    headers = getattr(response, "headers", None)
+    content_length = headers.get("Content-Length") if headers is not None else None
+    if isinstance(content_length, str) and content_length.isdigit():
+        return int(content_length)
+    content = getattr(response, "_content", None)
+    if isinstance(content, bytes):
+        return len(content)
+    return None
+
 
 class NoAuthenticationClient(RestClient):
 
+    def __init__(self, request_compression_threshold: Optional[int] = None, metrics: Optional[ClientMetrics] = None) -> None:
+        """
+        Create a new client without authentication
+
+        Args:
+            request_compression_threshold: the size in bytes from which request bodies are sent gzip compressed, by default they are never compressed
+            metrics: the metrics where to record the requests of the client, by default they are not collected
+        """
+        self.request_compression_threshold = request_compression_threshold
+        self.metrics = metrics
+
     def get_authentication(self) -> dict:
         pass
 
     def post(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        return requests.post(url, json=body, headers=headers)
+        headers = self._prepare_headers(headers)
+        data = self._prepare_body(body, headers)
+        response = self._send("post", url, request_records, len(data), data=data, headers=headers)
+        return response
 
     def get(self, url: str, query_params: Optional[dict] = None, headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        return requests.get(url, params=query_params, headers=headers)
+        response = self._send("get", url, request_records, 0, params=query_params, headers=self._prepare_headers(headers))
+        return response
 
     def put(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        return requests.put(url, json=body, headers=headers)
+        headers = self._prepare_headers(headers)
+        data = self._prepare_body(body, headers)
+        response = self._send("put", url, request_records, len(data), data=data, headers=headers)
+        return response
+
+    def patch(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
+        headers = self._prepare_headers(headers)
+        data = self._prepare_body(body, headers)
+        response = self._send("patch", url, request_records, len(data), data=data, headers=headers)
+        return response
 
     def delete(self, url: str, query_params: Optional[dict] = None, headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        return requests.delete(url, params=query_params, headers=headers)
+        response = self._send("delete", url, request_records, 0, params=query_params, headers=self._prepare_headers(headers))
+        return response
 
 
 class ApikeyClient(RestClient):
 
-    def __init__(self, apikey: str, component_authorization_apikey_header: str = "x-wenet-component-apikey") -> None:
+    def __init__(self, apikey: str, component_authorization_apikey_header: str = "x-wenet-component-apikey", request_compression_threshold: Optional[int] = None,
+                 metrics: Optional[ClientMetrics] = None) -> None:
         """
         Create a new apikey client
 
         Args:
             apikey: the apikey to authenticate the requests
             component_authorization_apikey_header: the component authorization header for the apikey
+            request_compression_threshold: the size in bytes from which request bodies are sent gzip compressed, by default they are never compressed
+            metrics: the metrics where to record the requests of the client, by default they are not collected
         """
         self._apikey = apikey
         self._component_authorization_apikey_header = component_authorization_apikey_header
+        self.request_compression_threshold = request_compression_threshold
+        self.metrics = metrics
 
     def get_authentication(self) -> dict:
         return {
             self._component_authorization_apikey_header: self._apikey
         }
 
-    def post(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        if headers is None:
-            headers = {}
+    def identity(self) -> Optional[str]:
+        return f"apikey:{self._apikey}"
 
+    def post(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
+        headers = self._prepare_headers(headers)
         headers.update(self.get_authentication())
+        data = self._prepare_body(body, headers)
 
-        return requests.post(url, json=body, headers=headers)
+        response = self._send("post", url, request_records, len(data), data=data, headers=headers)
+        return response
 
     def get(self, url: str, query_params: Optional[dict] = None, headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        if headers is None:
-            headers = {}
-
+        headers = self._prepare_headers(headers)
         headers.update(self.get_authentication())
 
-        return requests.get(url, params=query_params, headers=headers)
+        response = self._send("get", url, request_records, 0, params=query_params, headers=headers)
+        return response
 
     def put(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        if headers is None:
-            headers = {}
+        headers = self._prepare_headers(headers)
+        headers.update(self.get_authentication())
+        data = self._prepare_body(body, headers)
 
+        response = self._send("put", url, request_records, len(data), data=data, headers=headers)
+        return response
+
+    def patch(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
+        headers = self._prepare_headers(headers)
         headers.update(self.get_authentication())
+        data = self._prepare_body(body, headers)
 
-        return requests.put(url, json=body, headers=headers)
+        response = self._send("patch", url, request_records, len(data), data=data, headers=headers)
+        return response
 
     def delete(self, url: str, query_params: Optional[dict] = None, headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        if headers is None:
-            headers = {}
-
+        headers = self._prepare_headers(headers)
         headers.update(self.get_authentication())
 
-        return requests.delete(url, params=query_params, headers=headers)
+        response = self._send("delete", url, request_records, 0, params=query_params, headers=headers)
+        return response
 
 
 class Oauth2Client(RestClient):
@@ -124,7 +319,8 @@ class Oauth2Client(RestClient):
             return Oauth2Client.ClientCredentials(raw_data["accessToken"], raw_data["refreshToken"])
 
     def __init__(self, client_id: str, client_secret: str, resource_id: str, cache: Optional[BaseCache] = None,
-                 token_endpoint_url: str = "https://internetofus.u-hopper.com/prod/api/oauth2/token"):
+                 token_endpoint_url: str = "https://internetofus.u-hopper.com/prod/api/oauth2/token", request_compression_threshold: Optional[int] = None,
+                 metrics: Optional[ClientMetrics] = None):
         """
         Create a new oauth2 client
 
@@ -134,13 +330,20 @@ class Oauth2Client(RestClient):
             resource_id: the identifier of the resource
             cache: a cache to be used for storing client credentials, if not specified dedicated in memory cache is going to be used
             token_endpoint_url: the oauth2 token endpoint URL of the platform
+            request_compression_threshold: the size in bytes from which request bodies are sent gzip compressed, by default they are never compressed
+            metrics: the metrics where to record the requests of the client and its token refreshes, by default they are not collected
         """
+        self.request_compression_threshold = request_compression_threshold
+        self.metrics = metrics
         self.token_endpoint_url = token_endpoint_url
         self._cache = cache if cache and isinstance(cache, BaseCache) else InMemoryCache()
         self._resource_id = resource_id
         self._client_id = client_id
         self._client_secret = client_secret
 
+    def identity(self) -> Optional[str]:
+        return f"oauth2:{self._client_id}:{self._resource_id}"
+
     @property
     def _client_credential(self) -> Oauth2Client.ClientCredentials:
         raw_credentials = self._cache.get(self._resource_id)
@@ -179,7 +382,9 @@ class Oauth2Client(RestClient):
         return client
 
     def refresh_access_token(self) -> None:
-        logger.info(f"Refresh token for client [{self._client_id}]")
+        logger.info("Refresh token for client [%s]", self._client_id)
+        if self.metrics is not None:
+            self.metrics.increment("refreshes")
         body = {
             "client_id": self._client_id,
             "client_secret": self._client_secret,
@@ -187,19 +392,22 @@ class Oauth2Client(RestClient):
             "refresh_token": self.refresh_token
         }
 
-        response = requests.post(self.token_endpoint_url, json=body)
-        logger.debug(f"Refresh token endpoint returned a code [{response.status_code}]")
-        logger.debug(f"Refresh token endpoint returned: {response.text}")
+        response = requests.post(self.token_endpoint_url, data=codec.dumps(body), headers={"Content-Type": "application/json"})
+        logger.debug("Refresh token endpoint returned a code [%s]", response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Refresh token endpoint returned: %s", response.text)
         if response.status_code == 200:
-            body = response.json()
+            body = self.decode_body(response)
             refresh_token = body["refresh_token"]
             token = body["access_token"]
 
             credentials = Oauth2Client.ClientCredentials(token, refresh_token)
             self._cache.cache(data=credentials.to_repr(), key=self._resource_id)
-            logger.info(f"Refreshed oauth2 token for resource [{self._resource_id}]")
+            logger.info("Refreshed oauth2 token for resource [%s]", self._resource_id)
         else:
-            logger.error(f"Unable to refresh the token for client ID [{self._client_id}]")
+            logger.error("Unable to refresh the token for client ID [%s]", self._client_id)
+            if self.metrics is not None:
+                self.metrics.increment("refresh_failures")
             raise RefreshTokenExpiredError("Unable to refresh the token")
 
     def _initialize(self, code: str, redirect_url: str):
@@ -211,9 +419,9 @@ class Oauth2Client(RestClient):
             "code": code
         }
 
-        response = requests.post(self.token_endpoint_url, json=body)
+        response = requests.post(self.token_endpoint_url, data=codec.dumps(body), headers={"Content-Type": "application/json"})
         if response.status_code == 200:
-            body = response.json()
+            body = self.decode_body(response)
             refresh_token = body["refresh_token"]
             token = body["access_token"]
 
@@ -230,23 +438,19 @@ class Oauth2Client(RestClient):
         }
 
     def post(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        if headers is None:
-            headers = {}
+        headers = self._prepare_headers(headers)
+        data = self._prepare_body(body, headers)
 
         def post_request(client: Optional, retry: bool):
-            logger.debug(f"Performing post request with token {client.token} {client.refresh_token}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Performing post request with token %s %s", client.token, client.refresh_token)
             headers.update(client.get_authentication(client.token))
-            response = requests.post(url, json=body, headers=headers)
-            record = {
-                "url": url,
-                "method" : "post",
-                "respond" : response.status_code
-            }
-            if request_records is not None:
-                request_records.append(record)
+            response = client._send("post", url, request_records, len(data), data=data, headers=headers)
             if response.status_code in [400, 401, 403]:
                 if retry:
                     client.refresh_access_token()
+                    if client.metrics is not None:
+                        client.metrics.increment("retries")
                     return post_request(client, False)
                 else:
                     return response
@@ -256,23 +460,18 @@ class Oauth2Client(RestClient):
         return post_request(self, True)
 
     def get(self, url: str, query_params: Optional[dict] = None, headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        if headers is None:
-            headers = {}
+        headers = self._prepare_headers(headers)
 
         def get_request(client: Optional, retry: bool):
-            logger.debug(f"Performing get request with token {client.token} {client.refresh_token}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Performing get request with token %s %s", client.token, client.refresh_token)
             headers.update(client.get_authentication(client.token))
-            response = requests.get(url, params=query_params, headers=headers)
-            record = {
-                "url": url,
-                "method" : "get",
-                "respond" : response.status_code
-            }
-            if request_records is not None:
-                request_records.append(record)
+            response = client._send("get", url, request_records, 0, params=query_params, headers=headers)
             if response.status_code in [400, 401, 403]:
                 if retry:
                     client.refresh_access_token()
+                    if client.metrics is not None:
+                        client.metrics.increment("retries")
                     return get_request(client, False)
                 else:
                     return response
@@ -282,23 +481,19 @@ class Oauth2Client(RestClient):
         return get_request(self, True)
 
     def put(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        if headers is None:
-            headers = {}
+        headers = self._prepare_headers(headers)
+        data = self._prepare_body(body, headers)
 
         def put_request(client: Optional, retry: bool):
-            logger.debug(f"Performing put request with token {client.token} {client.refresh_token}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Performing put request with token %s %s", client.token, client.refresh_token)
             headers.update(client.get_authentication(client.token))
-            response = requests.put(url, json=body, headers=headers)
-            record = {
-                "url": url,
-                "method" : "put",
-                "respond" : response.status_code
-            }
-            if request_records is not None:
-                request_records.append(record)
+            response = client._send("put", url, request_records, len(data), data=data, headers=headers)
             if response.status_code in [400, 401, 403]:
                 if retry:
                     client.refresh_access_token()
+                    if client.metrics is not None:
+                        client.metrics.increment("retries")
                     return put_request(client, False)
                 else:
                     return response
@@ -307,24 +502,41 @@ class Oauth2Client(RestClient):
 
         return put_request(self, True)
 
+    def patch(self, url: str, body: Union[dict, list], headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
+        headers = self._prepare_headers(headers)
+        data = self._prepare_body(body, headers)
+
+        def patch_request(client: Optional, retry: bool):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Performing patch request with token %s %s", client.token, client.refresh_token)
+            headers.update(client.get_authentication(client.token))
+            response = client._send("patch", url, request_records, len(data), data=data, headers=headers)
+            if response.status_code in [400, 401, 403]:
+                if retry:
+                    client.refresh_access_token()
+                    if client.metrics is not None:
+                        client.metrics.increment("retries")
+                    return patch_request(client, False)
+                else:
+                    return response
+            else:
+                return response
+
+        return patch_request(self, True)
+
     def delete(self, url: str, query_params: Optional[dict] = None, headers: Optional[dict] = None, request_records: Optional[list] = None) -> Response:
-        if headers is None:
-            headers = {}
+        headers = self._prepare_headers(headers)
 
         def delete_request(client: Optional, retry: bool):
-            logger.debug(f"Performing delete request with token {client.token} {client.refresh_token}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Performing delete request with token %s %s", client.token, client.refresh_token)
             headers.update(client.get_authentication(client.token))
-            response = requests.delete(url, params=query_params, headers=headers)
-            record = {
-                "url": url,
-                "method" : "delete",
-                "respond" : response.status_code
-            }
-            if request_records is not None:
-                request_records.append(record)
+            response = client._send("delete", url, request_records, 0, params=query_params, headers=headers)
             if response.status_code in [400, 401, 403]:
                 if retry:
                     client.refresh_access_token()
+                    if client.metrics is not None:
+                        client.metrics.increment("retries")
                     return delete_request(client, False)
                 else:
                     return response
@@ -1,20 +1,127 @@
 from __future__ import absolute_import, annotations
 
+import contextvars
+import copy
+import functools
+import hashlib
+import inspect
 import logging
+import threading
+import time
 from abc import ABC
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
 
+from wenet.interface.batch import BatchResult, BulkResult, run_batch, run_bulk
 from wenet.interface.client import RestClient
+from wenet.interface.exceptions import NotFound
+from wenet.interface.metrics import ClientMetrics
+from wenet.interface.pagination import AdaptivePageSize, paginate
+
+if TYPE_CHECKING:
+    from requests import Response
+
+    from wenet.storage.loader import CacheLoader
+    from wenet.utils.singleflight import SingleFlight
 
 
 logger = logging.getLogger("wenet.interface.component")
 
 
+def not_found_key(object_type: str, object_id: str, scope: Optional[str] = None) -> str:
+    """
+    :param object_type: the type of the resource
+    :param object_id: the identifier of the resource
+    :param scope: the digest of the identity and of the headers of the requests, so that a resource missing for a client is not missing for the other ones
+    :return: the cache key of the `NotFound` of a resource, shared by all the interfaces requesting it with the same scope
+    """
+    key = f"notFound:{object_type}:{object_id}"
+    return f"{key}#{scope}" if scope else key
+
+
+def _measure(metrics: ClientMetrics, operation: str, method: Callable, interface: ComponentInterface, args: tuple, kwargs: dict) -> Any:
+    start = time.perf_counter()
+    try:
+        result = method(interface, *args, **kwargs)
+    except Exception:
+        metrics.observe_operation(operation, time.perf_counter() - start, True)
+        raise
+    metrics.observe_operation(operation, time.perf_counter() - start, False)
+    return result
+
+
+# The operation measured in the current context: the public methods it calls are part of it, not other operations
+_current_operation: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("wenet_current_operation", default=None)
+
+# The return types of the methods returning lazy iterators, whose work happens after they return
+_LAZY_RETURN_TYPES = frozenset(["Iterator", "Iterable", "Generator", "KeysetPaginator"])
+
+
+def _returns_lazily(method: Callable) -> bool:
+    """
+    Whether a method returns a lazy iterator: its duration would only be the one of building the iterator
+    """
+    if inspect.isgeneratorfunction(method):
+        return True
+    annotation = method.__annotations__.get("return")
+    if annotation is None:
+        return False
+    name = annotation if isinstance(annotation, str) else getattr(annotation, "__name__", str(annotation))
+    return name.split("[", 1)[0].rsplit(".", 1)[-1] in _LAZY_RETURN_TYPES
+
+
+def _in_caller_context(function: Callable) -> Callable:
+    """
+    Make a function run by the workers of an executor see the context variables of the caller, e.g. the operation being measured
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(function, *args, **kwargs)
+
+
+def _instrumented(operation: str, method: Callable) -> Callable:
+    """
+    Wrap a public method of an interface so that its executions are recorded in the metrics of the client, if any.
+    Executions within another operation (e.g. the pages requested by `get_all_tasks`) are part of it and are not recorded.
+    """
+    @functools.wraps(method)
+    def instrumented(self: ComponentInterface, *args, **kwargs):
+        metrics = self._client.metrics
+        if metrics is None or _current_operation.get() is not None:
+            return method(self, *args, **kwargs)
+
+        token = _current_operation.set(operation)
+        try:
+            if metrics.tracer is None:
+                return _measure(metrics, operation, method, self, args, kwargs)
+            with metrics.operation_span(operation):
+                return _measure(metrics, operation, method, self, args, kwargs)
+        finally:
+            _current_operation.reset(token)
+
+    return instrumented
+
+
 class ComponentInterface(ABC):
 
-    def __init__(self, client: RestClient, base_url: str, extra_headers: Optional[dict] = None) -> None:
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        for name, attribute in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.isfunction(attribute) and not _returns_lazily(attribute):
+                setattr(cls, name, _instrumented(f"{cls.__name__}.{name}", attribute))
+
+    def __init__(self,
+                 client: RestClient,
+                 base_url: str,
+                 extra_headers: Optional[dict] = None,
+                 cache_loader: Optional[CacheLoader] = None,
+                 single_flight: Optional[SingleFlight] = None
+                 ) -> None:
         self._client = client
         self._base_url = base_url
+        self._cache_loader = cache_loader
+        self._single_flight = single_flight
+        self._page_sizes: Dict[str, AdaptivePageSize] = {}
+        self._page_sizes_lock = threading.Lock()
         self._base_headers = {
             "Accept": "application/json",
             "Content-Type": "application/json"
@@ -22,3 +129,169 @@ class ComponentInterface(ABC):
 
         if extra_headers:
             self._base_headers.update(extra_headers)
+
+    @staticmethod
+    def _decode(response: Response) -> Any:
+        return RestClient.decode_body(response)
+
+    def page_size(self, endpoint: str) -> AdaptivePageSize:
+        """
+        The size of the pages of an endpoint, tuned by all the requests getting all its items and configurable by
+        replacing its attributes (e.g. `maximum` or `target_latency`)
+
+        :param endpoint: the endpoint, e.g. `tasks`
+        :return: the size of the pages of the endpoint
+        """
+        with self._page_sizes_lock:
+            page_size = self._page_sizes.get(endpoint)
+            if page_size is None:
+                page_size = AdaptivePageSize()
+                self._page_sizes[endpoint] = page_size
+            return page_size
+
+    def _paginate(self, endpoint: str, get_page: Callable[[int, int, list], Tuple[List[Any], Optional[int]]], offset: int = 0) -> List[Any]:
+        """
+        Get all the items of a paginated endpoint, with pages of the adaptive size of the endpoint
+
+        :param endpoint: the endpoint
+        :param get_page: the function requesting the page at an offset with a limit, recording the request in a list of request records, and returning its items and the total number of items
+        :param offset: the index of the first item
+        :return: the items
+        """
+        return paginate(get_page, self.page_size(endpoint), offset)
+
+    def _enable_connection_pool(self, max_workers: int) -> None:
+        """
+        Let the concurrent requests of many workers reuse their connections, unless the client already has a session
+        """
+        if max_workers > 1 and self._client.session is None:
+            self._client.enable_connection_pool(max_workers)
+
+    def _get_many(self, ids: Iterable[str], get: Callable[..., Any], max_workers: int, headers: Optional[dict]) -> BatchResult:
+        """
+        Get many entities with at most a number of concurrent requests, over a pool of connections of the client
+
+        :param ids: the identifiers of the entities, duplicates are requested once
+        :param get: the method getting an entity from its identifier and the headers of the request
+        :param max_workers: the maximum number of concurrent requests
+        :param headers: additional headers
+        :return: the entities got and the errors of the other identifiers
+        """
+        self._enable_connection_pool(max_workers)
+        return run_batch(ids, _in_caller_context(lambda entity_id: get(entity_id, headers=dict(headers) if headers else None)), max_workers)
+
+    def _bulk(self, items: Iterable[Any], operation: Callable[..., Any], max_workers: int, headers: Optional[dict]) -> BulkResult:
+        """
+        Run a write operation on many items with at most a number of concurrent requests, over a pool of connections of the client
+
+        :param items: the items
+        :param operation: the method performing the request of an item, given the item and the headers of the request
+        :param max_workers: the maximum number of concurrent requests
+        :param headers: additional headers
+        :return: the result of each item, in the order of the items
+        """
+        self._enable_connection_pool(max_workers)
+        return run_bulk(items, _in_caller_context(lambda item: operation(item, headers=dict(headers) if headers else None)), max_workers)
+
+    def _coalesced(self, url: str, load: Callable[[], Any], query_params: Optional[dict], headers: Optional[dict]) -> Callable[[], Any]:
+        """
+        Wrap the function performing a GET request so that concurrent identical requests, with the same URL, query,
+        headers and authentication, share a single request, if the interface has a single flight. Each caller gets
+        its own copy of the decoded result, so that the changes of a caller are not seen by the other ones.
+
+        :return: the wrapped function
+        """
+        if self._single_flight is None:
+            return load
+        key = (
+            "GET",
+            url,
+            tuple(sorted((name, str(value)) for name, value in query_params.items())) if query_params else (),
+            tuple(sorted(headers.items())) if headers else (),
+            self._client.identity()
+        )
+        single_flight = self._single_flight
+
+        def coalesced() -> Any:
+            return copy.deepcopy(single_flight.do(key, load))
+
+        return coalesced
+
+    def _cached(self, url: str, load: Callable[[], Any], query_params: Optional[dict] = None, headers: Optional[dict] = None) -> Any:
+        """
+        Get the representation of a resource through the cache loader, if any, using as key its URL and a digest of
+        the identity of the client and of the headers, so that clients with different credentials never share entries
+
+        :param url: the URL of the resource
+        :param load: the function requesting the representation of the resource
+        :param query_params: the query parameters of the request
+        :param headers: the headers of the request
+        :return: the representation of the resource
+        """
+        load = self._coalesced(url, load, query_params, headers)
+        if self._cache_loader is None:
+            return load()
+        key = f"{url}?{urlencode(sorted(query_params.items()))}" if query_params else url
+        return self._cache_loader.get_or_load(f"{key}#{self._request_scope(headers)}", load)
+
+    def _request_scope(self, headers: Optional[dict]) -> str:
+        """
+        :return: the digest of the identity of the client and of the headers of a request, which may hold credentials
+        """
+        scope = repr((self._client.identity(), tuple(sorted((name, str(value)) for name, value in headers.items())) if headers else ()))
+        return hashlib.sha256(scope.encode("utf-8")).hexdigest()[:32]
+
+    def _unless_not_found(self, object_type: str, object_id: str, url: str, load: Callable[[], Any], headers: Optional[dict] = None, coalesce: bool = True) -> Any:
+        """
+        Request a resource, unless the cache loader, if any, recently cached that it does not exist
+
+        :param object_type: the type of the resource, as in the `NotFound` raised by the request
+        :param object_id: the identifier of the resource
+        :param url: the URL of the resource
+        :param load: the function requesting the resource
+        :param headers: the headers of the request
+        :param coalesce: whether the request can be shared with concurrent identical ones
+        :return: the resource
+        """
+        if coalesce:
+            load = self._coalesced(url, load, None, headers)
+        if self._cache_loader is None:
+            return load()
+        return self._cache_loader.load_unless_missing(not_found_key(object_type, object_id, self._request_scope(headers)), load, cache_errors=(NotFound,))
+
+    def _invalidate_not_found(self, object_type: str, object_id: Optional[str], headers: Optional[dict] = None) -> None:
+        """
+        Forget that a resource does not exist, once it has been created, for the requests with the identity of the
+        client and the headers of the creation. The other clients forget it once it expires.
+
+        :param object_type: the type of the resource
+        :param object_id: the identifier of the resource
+        :param headers: the headers of the creation request, by default the base headers of the interface
+        """
+        if self._cache_loader is not None and object_id:
+            scope = self._request_scope(headers if headers is not None else self._base_headers)
+            self._cache_loader.invalidate(not_found_key(object_type, object_id, scope))
+
+    def _created(self, object_type: str, response: Response, from_repr: Callable[[dict], Any], headers: Optional[dict] = None) -> Any:
+        """
+        Build the resource created with an identifier assigned by the platform from the body of the response, and
+        forget that it does not exist
+
+        :param object_type: the type of the resource
+        :param response: the response of the creation request
+        :param from_repr: the function building the resource from its representation
+        :param headers: the headers of the creation request
+        :return: the created resource, None if the platform did not return it
+        """
+        try:
+            created = self._decode(response)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(created, dict):
+            return None
+        self._invalidate_not_found(object_type, created.get("id"), headers)
+        try:
+            return from_repr(created)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug("The response of the creation of a [%s] is not a valid representation", object_type, exc_info=e)
+            return None
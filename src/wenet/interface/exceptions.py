@@ -14,10 +14,24 @@ class NotFound(ValueError):
 
     def __init__(self, object_type: str, object_id: str, http_status_code: int, server_response: str) -> None:
         super().__init__(f"{object_type} with [{object_id}] does not exist. Request has return a code [{http_status_code}] with content [{server_response}]")
+        self.object_type = object_type
+        self.object_id = object_id
         self.http_status_code = http_status_code
         self.server_response = server_response
         self.message = f"{object_type} with [{object_id}] does not exist. Request has return a code [{http_status_code}] with content [{server_response}]"
 
+    def to_repr(self) -> dict:
+        return {
+            "objectType": self.object_type,
+            "objectId": self.object_id,
+            "httpStatusCode": self.http_status_code,
+            "serverResponse": self.server_response
+        }
+
+    @staticmethod
+    def from_repr(raw_data: dict) -> NotFound:
+        return NotFound(raw_data["objectType"], raw_data["objectId"], raw_data["httpStatusCode"], raw_data["serverResponse"])
+
 
 class CreationError(ValueError):
 
@@ -28,6 +42,15 @@ class CreationError(ValueError):
         self.message = f"Request has return a code [{http_status_code}] with content [{server_response}]"
 
 
+class UnexpectedResponse(Exception):
+
+    def __init__(self, http_status_code: int, server_response: str) -> None:
+        super().__init__(f"Request has return a code [{http_status_code}] with content [{server_response}]")
+        self.http_status_code = http_status_code
+        self.server_response = server_response
+        self.message = f"Request has return a code [{http_status_code}] with content [{server_response}]"
+
+
 class RefreshTokenExpiredError(Exception):
 
     def __init__(self, *args) -> None:
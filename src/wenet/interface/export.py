@@ -0,0 +1,150 @@
+from __future__ import absolute_import, annotations
+
+import itertools
+import logging
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, TypeVar
+
+
+logger = logging.getLogger("wenet.interface.export")
+
+
+T = TypeVar("T")
+
+
+class TimeWindow:
+    """
+    A range of timestamps in seconds, both bounds included as in the `*_from` and `*_to` filters of the platform
+    """
+
+    def __init__(self, start: int, end: int) -> None:
+        if end < start:
+            raise ValueError(f"The end [{end}] of a time window can not precede its start [{start}]")
+        self.start = start
+        self.end = end
+
+    @property
+    def seconds(self) -> int:
+        return self.end - self.start + 1
+
+    def split(self, parts: int) -> List[TimeWindow]:
+        """
+        :return: the window split in consecutive windows of about the same duration, at most one for each second
+        """
+        parts = max(1, min(parts, self.seconds))
+        bounds = [self.start + self.seconds * index // parts for index in range(parts)] + [self.end + 1]
+        return [TimeWindow(bounds[index], bounds[index + 1] - 1) for index in range(parts)]
+
+    def to_repr(self) -> dict:
+        return {
+            "start": self.start,
+            "end": self.end
+        }
+
+    @staticmethod
+    def from_repr(raw_data: dict) -> TimeWindow:
+        return TimeWindow(raw_data["start"], raw_data["end"])
+
+    def __eq__(self, o) -> bool:
+        if not isinstance(o, TimeWindow):
+            return False
+        return self.start == o.start and self.end == o.end
+
+    def __repr__(self) -> str:
+        return f"TimeWindow(start={self.start!r}, end={self.end!r})"
+
+
+def plan_windows(count: Callable[[TimeWindow], int], window: TimeWindow, shard_size: int, executor: ThreadPoolExecutor) -> List[TimeWindow]:
+    """
+    Split a time window in shards of at most about `shard_size` items, from the numbers of items of the windows.
+
+    Each window with too many items is split in as many windows of the same duration as needed if the items were
+    evenly spread over time, and the numbers of items of the new windows are counted again, concurrently, until
+    all the windows are small enough or last a single second. Windows without items are discarded.
+
+    :param count: the function counting the items of a window
+    :param window: the window to split
+    :param shard_size: the target number of items of a shard
+    :param executor: the executor counting the items of the windows
+    :return: the shards, in chronological order
+    """
+    shards = []
+    level = [window]
+    requests = 0
+    while level:
+        totals = list(executor.map(count, level))
+        requests += len(level)
+        next_level = []
+        for candidate, total in zip(level, totals):
+            if total == 0:
+                continue
+            if total <= shard_size or candidate.seconds == 1:
+                shards.append(candidate)
+            else:
+                next_level.extend(candidate.split(math.ceil(total / shard_size)))
+        level = next_level
+
+    shards.sort(key=lambda shard: shard.start)
+    logger.debug("Planned [%s] shards of [%s] with [%s] count requests", len(shards), window, requests)
+    return shards
+
+
+def export_windows(windows: List[TimeWindow], fetch: Callable[[TimeWindow], List[T]], id_of: Callable[[T], str], executor: ThreadPoolExecutor,
+                   prefetch: int) -> Iterator[T]:
+    """
+    Fetch the items of the windows concurrently, and merge them in a single stream in the order of the windows,
+    without the items already returned by the previous window (e.g. items moved across the boundary of two windows
+    during the export). The windows being disjoint, only the identifiers of the previous window are kept.
+
+    :param windows: the windows, in chronological order
+    :param fetch: the function getting the ordered items of a window
+    :param id_of: the function returning the identifier of an item
+    :param executor: the executor fetching the windows
+    :param prefetch: the maximum number of windows fetched ahead of the one being returned, bounding the memory of the export
+    :return: the items of the windows
+    """
+    windows = iter(windows)
+    pending = deque(executor.submit(fetch, window) for window in itertools.islice(windows, prefetch + 1))
+    previous = set()
+    try:
+        while pending:
+            items = pending.popleft().result()
+            window = next(windows, None)
+            if window is not None:
+                pending.append(executor.submit(fetch, window))
+            returned = set()
+            for item in items:
+                item_id = id_of(item)
+                if item_id not in returned and item_id not in previous:
+                    returned.add(item_id)
+                    yield item
+            previous = returned
+    finally:
+        # The export failed or was abandoned: do not fetch the windows not started yet
+        for future in pending:
+            future.cancel()
+
+
+def export_sharded(count: Callable[[TimeWindow], int],
+                   fetch: Callable[[TimeWindow], List[T]],
+                   id_of: Callable[[T], str],
+                   window: TimeWindow,
+                   shard_size: int,
+                   max_workers: int
+                   ) -> Iterator[T]:
+    """
+    Export the items of a time window, split in shards fetched concurrently and merged in a single ordered stream
+
+    :param count: the function counting the items of a window
+    :param fetch: the function getting the ordered items of a window
+    :param id_of: the function returning the identifier of an item
+    :param window: the window to export
+    :param shard_size: the target number of items of a shard
+    :param max_workers: the maximum number of concurrent requests
+    :return: the items of the window, without duplicates
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wenet-export") as executor:
+        shards = plan_windows(count, window, shard_size, executor)
+        yield from export_windows(shards, fetch, id_of, executor, prefetch=2 * max_workers)
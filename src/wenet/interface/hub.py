@@ -2,22 +2,28 @@ from __future__ import absolute_import, annotations
 
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional
 
+from wenet.interface.batch import BatchResult
 from wenet.interface.component import ComponentInterface
 from wenet.interface.client import RestClient
 from wenet.interface.exceptions import AuthenticationException, NotFound
 from wenet.model.app import App
 
+if TYPE_CHECKING:
+    from wenet.storage.loader import CacheLoader
+    from wenet.utils.singleflight import SingleFlight
+
 
 logger = logging.getLogger("wenet.interface.hub")
 
 
 class HubInterface(ComponentInterface):
 
-    def __init__(self, client: RestClient, platform_url: str, component_path: str = "/hub/frontend", extra_headers: Optional[dict] = None) -> None:
+    def __init__(self, client: RestClient, platform_url: str, component_path: str = "/hub/frontend", extra_headers: Optional[dict] = None,
+                 cache_loader: Optional[CacheLoader] = None, single_flight: Optional[SingleFlight] = None) -> None:
         base_url = platform_url + component_path
-        super().__init__(client, base_url, extra_headers)
+        super().__init__(client, base_url, extra_headers, cache_loader, single_flight)
 
     def get_user_ids_for_app(self, app_id: str, from_datetime: Optional[datetime] = None, to_datetime: Optional[datetime] = None, headers: Optional[dict] = None) -> List[str]:
         if headers is not None:
@@ -31,16 +37,21 @@ class HubInterface(ComponentInterface):
         if to_datetime is not None:
             query_params["toTs"] = int(to_datetime.timestamp())
 
-        response = self._client.get(f"{self._base_url}/data/app/{app_id}/user", query_params=query_params, headers=headers)
+        url = f"{self._base_url}/data/app/{app_id}/user"
 
-        if response.status_code == 200:
-            return response.json()
-        elif response.status_code in [401, 403]:
-            raise AuthenticationException("hub", response.status_code, response.text)
-        elif response.status_code == 404:
-            raise NotFound("App", app_id, response.status_code, response.text)
-        else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+        def load() -> List[str]:
+            response = self._client.get(url, query_params=query_params, headers=headers)
+
+            if response.status_code == 200:
+                return self._decode(response)
+            elif response.status_code in [401, 403]:
+                raise AuthenticationException("hub", response.status_code, response.text)
+            elif response.status_code == 404:
+                raise NotFound("App", app_id, response.status_code, response.text)
+            else:
+                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+
+        return self._cached(url, load, query_params, headers)
 
     def get_app_details(self, app_id: str, headers: Optional[dict] = None) -> App:
         if headers is not None:
@@ -48,16 +59,33 @@ class HubInterface(ComponentInterface):
         else:
             headers = self._base_headers
 
-        response = self._client.get(f"{self._base_url}/data/app/{app_id}", headers=headers)
+        url = f"{self._base_url}/data/app/{app_id}"
 
-        if response.status_code == 200:
-            return App.from_repr(response.json())
-        elif response.status_code in [401, 403]:
-            raise AuthenticationException("hub", response.status_code, response.text)
-        elif response.status_code == 404:
-            raise NotFound("App", app_id, response.status_code, response.text)
-        else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+        def load() -> dict:
+            response = self._client.get(url, headers=headers)
+
+            if response.status_code == 200:
+                return self._decode(response)
+            elif response.status_code in [401, 403]:
+                raise AuthenticationException("hub", response.status_code, response.text)
+            elif response.status_code == 404:
+                raise NotFound("App", app_id, response.status_code, response.text)
+            else:
+                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+
+        # The `NotFound` of an app is cached as the ones of profiles and tasks, while its details are cached as the other reference data
+        return App.from_repr(self._cached(url, lambda: self._unless_not_found("App", app_id, url, load, headers, coalesce=False), headers=headers))
+
+    def get_apps(self, app_ids: Iterable[str], max_workers: int = 8, headers: Optional[dict] = None) -> BatchResult[App]:
+        """
+        Get the details of many apps, from the cache loader if any, requesting each of the others once and at most `max_workers` at the same time
+
+        :param app_ids: the identifiers of the apps
+        :param max_workers: the maximum number of concurrent requests
+        :param headers: additional headers
+        :return: the apps found by identifier, and the errors (e.g. `NotFound`) of the other apps
+        """
+        return self._get_many(app_ids, self.get_app_details, max_workers, headers)
 
     def get_app_developers(self, app_id: str, headers: Optional[dict] = None) -> List[str]:
         if headers is not None:
@@ -68,7 +96,7 @@ class HubInterface(ComponentInterface):
         response = self._client.get(f"{self._base_url}/data/app/{app_id}/developer", headers=headers)
 
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         elif response.status_code in [401, 403]:
             raise AuthenticationException("hub", response.status_code, response.text)
         elif response.status_code == 404:
@@ -85,7 +113,7 @@ class HubInterface(ComponentInterface):
         response = self._client.get(f"{self._base_url}/data/user", headers=headers)
 
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         elif response.status_code in [401, 403]:
             raise AuthenticationException("hub", response.status_code, response.text)
         else:
@@ -1,20 +1,26 @@
 from __future__ import absolute_import, annotations
 
 import logging
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
 
 from wenet.interface.component import ComponentInterface
 from wenet.interface.client import RestClient
 from wenet.interface.exceptions import AuthenticationException
 
+if TYPE_CHECKING:
+    from wenet.storage.loader import CacheLoader
+    from wenet.utils.singleflight import SingleFlight
+
+
 logger = logging.getLogger("wenet.interface.incentive_server")
 
 
 class IncentiveServerInterface(ComponentInterface):
 
-    def __init__(self, client: RestClient, platform_url: str, component_path: str = "/incentive_server", extra_headers: Optional[dict] = None) -> None:
+    def __init__(self, client: RestClient, platform_url: str, component_path: str = "/incentive_server", extra_headers: Optional[dict] = None,
+                 cache_loader: Optional[CacheLoader] = None, single_flight: Optional[SingleFlight] = None) -> None:
         base_url = platform_url + component_path
-        super().__init__(client, base_url, extra_headers)
+        super().__init__(client, base_url, extra_headers, cache_loader, single_flight)
 
     def get_cohorts(self, headers: Optional[dict] = None) -> List[dict]:
         if headers is not None:
@@ -22,11 +28,16 @@ class IncentiveServerInterface(ComponentInterface):
         else:
             headers = self._base_headers
 
-        response = self._client.get(f"{self._base_url}/api/UsersCohorts/", headers=headers)
+        url = f"{self._base_url}/api/UsersCohorts/"
 
-        if response.status_code == 200:
-            return response.json()
-        elif response.status_code in [401, 403]:
-            raise AuthenticationException("incentive server", response.status_code, response.text)
-        else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+        def load() -> List[dict]:
+            response = self._client.get(url, headers=headers)
+
+            if response.status_code == 200:
+                return self._decode(response)
+            elif response.status_code in [401, 403]:
+                raise AuthenticationException("incentive server", response.status_code, response.text)
+            else:
+                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+
+        return self._cached(url, load, headers=headers)
@@ -0,0 +1,262 @@
+from __future__ import absolute_import, annotations
+
+import re
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Pattern, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+
+# Upper bounds of the latency buckets, in seconds
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_UUID = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+_HEX = re.compile(r"^[0-9a-fA-F]{16,}$")
+
+# The collections of the platform whose next path segment is the identifier of an item (e.g. `/tasks/{id}`,
+# `/user/profile/{id}` or `/data/app/{id}/user`), and the segments following them that are routes, not identifiers
+_ROUTE_COLLECTIONS = frozenset(["tasks", "task", "profiles", "profile", "app", "user"])
+_ROUTE_SEGMENTS = frozenset(["transaction", "transactions", "profile"])
+
+_MAX_CACHED_TEMPLATES = 4096
+
+
+def _is_identifier(segment: str, previous: str) -> bool:
+    """
+    Whether a path segment is an identifier: a number, a UUID, a long hexadecimal string (e.g. an object id), or any
+    segment following a collection of the platform in its routes. Other segments are kept, even when they contain
+    digits (e.g. `oauth2` or `v1beta2`), so that distinct endpoints are never merged.
+    """
+    if segment.isdigit() or _UUID.match(segment) or _HEX.match(segment):
+        return True
+    return previous in _ROUTE_COLLECTIONS and segment not in _ROUTE_SEGMENTS
+
+
+def endpoint_template(url: str) -> str:
+    """
+    The template of the endpoint of a URL: its path, with the identifiers replaced by `{id}`
+
+    :param url: the URL of a request
+    :return: the template of the endpoint (e.g. `/task_manager/tasks/{id}`)
+    """
+    segments = urlsplit(url).path.split("/")
+    return "/".join("{id}" if segment and _is_identifier(segment, segments[index - 1] if index else "") else segment
+                    for index, segment in enumerate(segments))
+
+
+class LatencyHistogram:
+    """
+    A histogram of latencies with fixed buckets; not thread-safe on its own.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, latency: float) -> None:
+        self.counts[bisect_left(self.buckets, latency)] += 1
+        self.count += 1
+        self.sum += latency
+        if latency > self.max:
+            self.max = latency
+
+    def to_repr(self) -> dict:
+        """
+        The buckets are cumulative, as in Prometheus: each one counts the observations lower or equal to its bound
+        """
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "average": self.sum / self.count if self.count else 0.0,
+            "buckets": buckets
+        }
+
+
+class EndpointMetrics:
+    """
+    The metrics of the requests to an endpoint: latency histogram, status codes, errors and bytes on the wire
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.latency = LatencyHistogram(buckets)
+        self.statuses: Dict[int, int] = {}
+        self.errors = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def to_repr(self) -> dict:
+        return {
+            "requests": self.latency.count,
+            "latency": self.latency.to_repr(),
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "errors": self.errors,
+            "requestBytes": self.request_bytes,
+            "responseBytes": self.response_bytes
+        }
+
+
+class ClientMetrics:
+    """
+    Thread-safe metrics of the requests performed by the rest clients and of the operations of the interfaces.
+
+    Requests are grouped by method and endpoint template, computed from their URL with `endpoint_template` unless
+    one of the `endpoint_templates` overrides matches the path of the URL. Operations are the public methods of the
+    interfaces (e.g. `TaskManagerInterface.get_task`), measured including the decoding of the responses. The methods
+    returning lazy iterators (e.g. `iter_tasks`) are not operations, and the methods called by an operation (e.g. the
+    pages of `get_all_tasks`) are part of it rather than other operations.
+
+    When a tracer is given, each request and operation runs in a span created with
+    `tracer.start_as_current_span(name, attributes=...)`, so any OpenTelemetry tracer can be used as is.
+
+    Attributes:
+        - retries: the number of requests repeated after an authentication failure
+        - refreshes: the number of attempts to refresh the access token of an oauth2 client
+        - refresh_failures: the number of failed attempts to refresh the access token
+    """
+
+    def __init__(self,
+                 endpoint_templates: Optional[Sequence[Tuple[Union[str, Pattern], str]]] = None,
+                 tracer: Optional[object] = None,
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+                 ) -> None:
+        """
+        :param endpoint_templates: the (regular expression, template) pairs overriding the template of the URL paths matching the expression
+        :param tracer: an OpenTelemetry compatible tracer
+        :param buckets: the upper bounds of the latency buckets, in seconds
+        """
+        self._lock = threading.Lock()
+        self._overrides: List[Tuple[Pattern, str]] = [(re.compile(pattern), template) for pattern, template in endpoint_templates or []]
+        self._templates: Dict[str, str] = {}
+        self._buckets = tuple(buckets)
+        self.tracer = tracer
+        self.retries = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self._endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+        self._operations: Dict[str, EndpointMetrics] = {}
+
+    def template(self, url: str) -> str:
+        """
+        :param url: the URL of a request
+        :return: the endpoint template of the URL
+        """
+        template = self._templates.get(url)
+        if template is None:
+            path = urlsplit(url).path
+            for pattern, override in self._overrides:
+                if pattern.search(path):
+                    template = override
+                    break
+            else:
+                template = endpoint_template(path)
+            if len(self._templates) >= _MAX_CACHED_TEMPLATES:
+                self._templates.clear()
+            self._templates[url] = template
+        return template
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def observe_request(self, method: str, url: str, latency: float, status: Optional[int], request_bytes: int = 0, response_bytes: Optional[int] = None) -> None:
+        """
+        Record a request
+
+        :param method: the HTTP method of the request
+        :param url: the URL of the request
+        :param latency: the duration of the request, in seconds
+        :param status: the status code of the response, None if the request failed without a response
+        :param request_bytes: the number of bytes of the body of the request
+        :param response_bytes: the number of bytes of the body of the response, None if unknown
+        """
+        key = (method.upper(), self.template(url))
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = EndpointMetrics(self._buckets)
+                self._endpoints[key] = endpoint
+            self._observe(endpoint, latency, status)
+            endpoint.request_bytes += request_bytes
+            if response_bytes:
+                endpoint.response_bytes += response_bytes
+
+    def observe_operation(self, operation: str, latency: float, failed: bool) -> None:
+        """
+        Record the execution of an operation of an interface
+
+        :param operation: the name of the operation, e.g. `TaskManagerInterface.get_task`
+        :param latency: the duration of the operation, in seconds
+        :param failed: whether the operation raised an exception
+        """
+        with self._lock:
+            metrics = self._operations.get(operation)
+            if metrics is None:
+                metrics = EndpointMetrics(self._buckets)
+                self._operations[operation] = metrics
+            self._observe(metrics, latency, None if failed else 200)
+
+    @staticmethod
+    def _observe(metrics: EndpointMetrics, latency: float, status: Optional[int]) -> None:
+        metrics.latency.observe(latency)
+        if status is None:
+            metrics.errors += 1
+        else:
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    @contextmanager
+    def request_span(self, method: str, url: str) -> Iterator[Optional[object]]:
+        """
+        The span of a request, following the OpenTelemetry semantic conventions for HTTP clients
+
+        :return: the span, None when there is no tracer
+        """
+        if self.tracer is None:
+            yield None
+            return
+
+        method = method.upper()
+        template = self.template(url)
+        attributes = {"http.request.method": method, "url.full": url, "url.template": template}
+        with self.tracer.start_as_current_span(f"{method} {template}", attributes=attributes) as span:
+            yield span
+
+    @contextmanager
+    def operation_span(self, operation: str) -> Iterator[Optional[object]]:
+        """
+        :return: the span of an operation of an interface, None when there is no tracer
+        """
+        if self.tracer is None:
+            yield None
+            return
+
+        with self.tracer.start_as_current_span(operation, attributes={"wenet.operation": operation}) as span:
+            yield span
+
+    def reset(self) -> None:
+        with self._lock:
+            self.retries = 0
+            self.refreshes = 0
+            self.refresh_failures = 0
+            self._endpoints.clear()
+            self._operations.clear()
+
+    def to_repr(self) -> dict:
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "refreshes": self.refreshes,
+                "refreshFailures": self.refresh_failures,
+                "endpoints": {f"{method} {template}": metrics.to_repr() for (method, template), metrics in self._endpoints.items()},
+                "operations": {operation: metrics.to_repr() for operation, metrics in self._operations.items()}
+            }
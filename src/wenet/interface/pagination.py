@@ -0,0 +1,353 @@
+from __future__ import absolute_import, annotations
+
+import functools
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+
+logger = logging.getLogger("wenet.interface.pagination")
+
+
+T = TypeVar("T")
+
+# The status codes of the requests that timed out on the side of the platform
+TIMEOUT_STATUS_CODES = frozenset([408, 504])
+
+
+class AdaptivePageSize:
+    """
+    The number of items to request for each page of an endpoint, tuned from the latency and the size of the previous pages.
+
+    The cost of an item is estimated from each page, as a moving average of the seconds and of the bytes of the page
+    divided by its items, and the next page requests the items fitting both the target latency and the target size.
+    The size grows at most by `max_growth` times from a page to the next one, is halved when a page times out, and
+    never exceeds the maximum of the server, learnt from the pages returning fewer items than requested while more remain.
+    """
+
+    def __init__(self,
+                 initial: int = 100,
+                 minimum: int = 10,
+                 maximum: int = 1000,
+                 target_latency: float = 1.0,
+                 target_bytes: int = 1_000_000,
+                 smoothing: float = 0.5,
+                 max_growth: float = 2.0
+                 ) -> None:
+        """
+        :param initial: the number of items of the first page
+        :param minimum: the minimum number of items of a page
+        :param maximum: the maximum number of items of a page
+        :param target_latency: the seconds a page should take
+        :param target_bytes: the bytes a page should weigh on the wire
+        :param smoothing: the weight of the latest page in the estimated cost of an item, between 0 (excluded) and 1
+        :param max_growth: the maximum ratio between the sizes of two consecutive pages
+        """
+        if not 0 < minimum <= maximum:
+            raise ValueError(f"The minimum page size [{minimum}] must be positive and not greater than the maximum [{maximum}]")
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"The smoothing [{smoothing}] must be in (0, 1]")
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.target_bytes = target_bytes
+        self.smoothing = smoothing
+        self.max_growth = max_growth
+        self.server_maximum: Optional[int] = None
+        self._size = self._clamp(initial)
+        self._seconds_per_item: Optional[float] = None
+        self._bytes_per_item: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """
+        :return: the number of items to request for the next page, within the current bounds
+        """
+        return self._clamp(self._size)
+
+    def observe(self, requested: int, returned: int, latency: float, response_bytes: Optional[int], has_more: bool) -> None:
+        """
+        Tune the size of the next page from a page
+
+        :param requested: the number of items requested
+        :param returned: the number of items returned
+        :param latency: the seconds the request of the page took
+        :param response_bytes: the bytes of the response on the wire, None if unknown
+        :param has_more: whether there are items after the page
+        """
+        with self._lock:
+            if has_more and 0 < returned < requested:
+                # The platform capped the limit
+                self.server_maximum = returned if self.server_maximum is None else min(self.server_maximum, returned)
+                logger.debug("Learnt a maximum page size of [%s] items", self.server_maximum)
+            if returned <= 0:
+                return
+
+            self._seconds_per_item = self._average(self._seconds_per_item, latency / returned)
+            if response_bytes:
+                self._bytes_per_item = self._average(self._bytes_per_item, response_bytes / returned)
+
+            ideal = self.target_latency / self._seconds_per_item if self._seconds_per_item > 0 else float(self.maximum)
+            if self._bytes_per_item:
+                ideal = min(ideal, self.target_bytes / self._bytes_per_item)
+            size = self._clamp(int(min(ideal, self._size * self.max_growth)))
+            if size != self._size:
+                logger.debug("Page size tuned from [%s] to [%s] items", self._size, size)
+            self._size = size
+
+    def back_off(self) -> None:
+        """
+        Halve the size of the next page, after a page timed out
+        """
+        with self._lock:
+            self._size = self._clamp(self._size // 2)
+            # The cost of the items was underestimated
+            self._seconds_per_item = None
+        logger.debug("Page size reduced to [%s] items after a timeout", self._size)
+
+    def _average(self, average: Optional[float], value: float) -> float:
+        return value if average is None else self.smoothing * value + (1 - self.smoothing) * average
+
+    def _clamp(self, size: int) -> int:
+        maximum = self.maximum if self.server_maximum is None else min(self.maximum, self.server_maximum)
+        return max(self.minimum, min(maximum, size))
+
+
+def is_timeout(error: Exception) -> bool:
+    """
+    :return: whether a request failed because it took too long, on the side of the client or of the platform
+    """
+    status_code = getattr(error, "http_status_code", None)
+    if status_code is not None:
+        return status_code in TIMEOUT_STATUS_CODES
+    if isinstance(error, TimeoutError):
+        return True
+    # Without requests loaded the error can not be one of its exceptions, and there is no need to import it
+    exceptions = sys.modules.get("requests.exceptions")
+    return exceptions is not None and isinstance(error, exceptions.Timeout)
+
+
+def _request_page(request: Callable[[int, list], Tuple[List[T], Optional[int]]],
+                  page_size: AdaptivePageSize,
+                  offset: int,
+                  max_timeouts: int,
+                  position: str
+                  ) -> Tuple[List[T], bool]:
+    """
+    Request a page with the adaptive size, halving it and retrying when the page times out, and tune the size from the page
+
+    :param request: the function requesting the page with a limit, recording the request in a list of request records, and returning its items and the total number of items from the offset of the page, if known
+    :param page_size: the size of the pages
+    :param offset: the offset of the page, among the items counted by the total
+    :param max_timeouts: the maximum number of consecutive timeouts of the page before failing
+    :param position: the description of the position of the page, for the logs
+    :return: the items of the page and whether there are items after them
+    """
+    timeouts = 0
+    while True:
+        limit = page_size.size
+        request_records: list = []
+        start = time.perf_counter()
+        try:
+            page, total = request(limit, request_records)
+        except Exception as e:
+            if not is_timeout(e) or timeouts >= max_timeouts:
+                raise
+            timeouts += 1
+            logger.info("Page of [%s] items at %s timed out, retrying with a smaller page", limit, position)
+            page_size.back_off()
+            continue
+        latency = time.perf_counter() - start
+
+        if total is not None:
+            has_more = len(page) > 0 and offset + len(page) < total
+        else:
+            has_more = len(page) >= limit
+        response_bytes = request_records[-1]["responseBytes"] if request_records else None
+        page_size.observe(limit, len(page), latency, response_bytes, has_more)
+        return page, has_more
+
+
+def paginate(get_page: Callable[[int, int, list], Tuple[List[T], Optional[int]]],
+             page_size: AdaptivePageSize,
+             offset: int = 0,
+             max_timeouts: int = 3
+             ) -> List[T]:
+    """
+    Get all the items of a paginated endpoint, with pages of adaptive size
+
+    :param get_page: the function requesting the page at an offset with a limit, recording the request in a list of request records, and returning its items and the total number of items, if known
+    :param page_size: the size of the pages, tuned from each page
+    :param offset: the index of the first item
+    :param max_timeouts: the maximum number of consecutive timeouts of a page before failing
+    :return: the items
+    """
+    items: List[T] = []
+    for page, _ in iter_pages(get_page, page_size, offset, max_timeouts=max_timeouts):
+        items.extend(page)
+    return items
+
+
+def iter_pages(get_page: Callable[[int, int, list], Tuple[List[T], Optional[int]]],
+               page_size: AdaptivePageSize,
+               offset: int = 0,
+               end: Optional[int] = None,
+               max_timeouts: int = 3
+               ) -> Iterator[Tuple[List[T], int]]:
+    """
+    Iterate the pages of a paginated endpoint, with pages of adaptive size, up to an optional end offset
+
+    :param get_page: the function requesting the page at an offset with a limit, recording the request in a list of request records, and returning its items and the total number of items, if known
+    :param page_size: the size of the pages, tuned from each page
+    :param offset: the index of the first item
+    :param end: the index following the last item, by default the pages go on until the last item
+    :param max_timeouts: the maximum number of consecutive timeouts of a page before failing
+    :return: the pages, each with the offset of the next one
+    """
+    def request(page_offset: int, limit: int, request_records: list) -> Tuple[List[T], Optional[int]]:
+        page, total = get_page(page_offset, min(limit, end - page_offset), request_records)
+        # The items after the end are not part of the pages: a page stopping at the end is the last one, not a page capped by the server
+        return page[:end - page_offset], min(total, end) if total is not None else None
+
+    has_more = end is None or offset < end
+    while has_more:
+        page, has_more = _request_page(functools.partial(get_page if end is None else request, offset), page_size, offset, max_timeouts,
+                                       f"offset [{offset}]")
+        offset += len(page)
+        has_more = has_more and (end is None or offset < end)
+        yield page, offset
+
+
+class KeysetCursor:
+    """
+    The position of a keyset pagination: the second of the timestamp of the last item returned, and the identifiers
+    of the items already returned with a timestamp in that second, so that the pagination can be resumed from it
+    without returning them again
+    """
+
+    def __init__(self, timestamp: Optional[int] = None, ids: Optional[List[str]] = None) -> None:
+        self.timestamp = timestamp
+        self.ids = ids if ids is not None else []
+
+    def to_repr(self) -> dict:
+        return {
+            "timestamp": self.timestamp,
+            "ids": list(self.ids)
+        }
+
+    @staticmethod
+    def from_repr(raw_data: dict) -> KeysetCursor:
+        return KeysetCursor(raw_data.get("timestamp"), raw_data.get("ids"))
+
+    def __eq__(self, o) -> bool:
+        if not isinstance(o, KeysetCursor):
+            return False
+        return self.timestamp == o.timestamp and self.ids == o.ids
+
+    def __repr__(self) -> str:
+        return f"KeysetCursor(timestamp={self.timestamp!r}, ids={len(self.ids)})"
+
+
+class KeysetPaginator(Generic[T]):
+    """
+    Iterate the items of an endpoint ordered by a timestamp and by identifier, advancing a timestamp cursor instead of
+    an offset, so that deep pages cost as much as the first one and are not shifted by the items created meanwhile.
+
+    Each page is requested from the second of the cursor, at the offset of the last item returned within that second,
+    and only the items following it, by timestamp and then by identifier, are kept. When the page does not start
+    from that item, because items of that second were deleted or updated to another timestamp meanwhile, the offset
+    is moved back until it does, so that no item is skipped; when it holds only items preceding it, because items
+    were created meanwhile in that second, the offset is moved forward. Offsets are thus bounded by the number of
+    items sharing a second, and pages never exceed the maximum of the server.
+
+    The cursor is updated each time a page is returned, and can be stored to resume the iteration later on.
+    """
+
+    def __init__(self,
+                 get_page: Callable[[Optional[int], int, int, list], Tuple[List[T], Optional[int]]],
+                 timestamp_of: Callable[[T], float],
+                 id_of: Callable[[T], str],
+                 page_size: AdaptivePageSize,
+                 cursor: Optional[KeysetCursor] = None,
+                 max_timeouts: int = 3
+                 ) -> None:
+        """
+        :param get_page: the function requesting the page of the items from a timestamp, at an offset, with a limit, recording the request in a list of request records, and returning its items, ordered by timestamp and identifier, and the total number of items from the timestamp
+        :param timestamp_of: the function returning the timestamp of an item, in seconds
+        :param id_of: the function returning the identifier of an item
+        :param page_size: the size of the pages, tuned from each page
+        :param cursor: the cursor to resume the iteration from, by default it starts from the first item
+        :param max_timeouts: the maximum number of consecutive timeouts of a page before failing
+        """
+        self._get_page = get_page
+        self._timestamp_of = timestamp_of
+        self._id_of = id_of
+        self._page_size = page_size
+        self._max_timeouts = max_timeouts
+        self.cursor = KeysetCursor(cursor.timestamp, list(cursor.ids)) if cursor is not None else KeysetCursor()
+        self.done = False
+
+    def pages(self) -> Iterator[List[T]]:
+        """
+        :return: the pages of the items following the cursor, each without the items already returned
+        """
+        while not self.done:
+            timestamp = self.cursor.timestamp
+            offset = max(0, len(self.cursor.ids) - 1)
+            # Whether the items before the offset are known to precede the cursor
+            anchored = offset == 0
+            while True:
+                page, has_more = _request_page(functools.partial(self._get_page, timestamp, offset), self._page_size, offset, self._max_timeouts,
+                                               f"timestamp [{timestamp}] and offset [{offset}]")
+                if not anchored and (not page or self._follows(page[0], timestamp, self.cursor.ids[-1])):
+                    # Items of the second of the cursor left it: the ones following the cursor may precede the offset
+                    offset = max(0, offset - max(len(page), self._page_size.size))
+                    anchored = offset == 0
+                    continue
+                items = self._advance(page)
+                if items or not has_more:
+                    break
+                # Items created meanwhile in the second of the cursor shifted the ones following it after the page
+                offset += len(page)
+                anchored = True
+            self.done = not has_more
+            if items:
+                yield items
+
+    def _follows(self, item: T, timestamp: Optional[int], last_id: Optional[str]) -> bool:
+        """
+        :return: whether an item follows the item of a timestamp and an identifier, by timestamp and then by identifier
+        """
+        second = int(self._timestamp_of(item))
+        if timestamp is None or second != timestamp:
+            return timestamp is None or second > timestamp
+        return last_id is None or self._id_of(item) > last_id
+
+    def __iter__(self) -> Iterator[T]:
+        for page in self.pages():
+            yield from page
+
+    def _advance(self, page: List[T]) -> List[T]:
+        """
+        Move the cursor after the items of a page
+
+        :return: the items of the page not returned yet
+        """
+        timestamp = self.cursor.timestamp
+        ids = list(self.cursor.ids)
+        items = []
+        for item in page:
+            if not self._follows(item, timestamp, ids[-1] if ids else None):
+                continue
+            second = int(self._timestamp_of(item))
+            if timestamp is None or second > timestamp:
+                timestamp = second
+                ids = []
+            ids.append(self._id_of(item))
+            items.append(item)
+        self.cursor = KeysetCursor(timestamp, ids)
+        return items
@@ -1,22 +1,29 @@
 from __future__ import absolute_import, annotations
 
 import logging
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 
+from wenet.interface.batch import BatchResult, BulkResult, unique_ids
 from wenet.interface.component import ComponentInterface
 from wenet.interface.client import RestClient
-from wenet.interface.exceptions import AuthenticationException, NotFound, CreationError
+from wenet.interface.exceptions import AuthenticationException, NotFound, CreationError, UnexpectedResponse
+from wenet.model.user.diff import ProfileDiff
 from wenet.model.user.profile import WeNetUserProfile, WeNetUserProfilesPage, UserIdentifiersPage
 
+if TYPE_CHECKING:
+    from wenet.storage.loader import CacheLoader
+    from wenet.utils.singleflight import SingleFlight
+
 
 logger = logging.getLogger("wenet.interface.profile_manager")
 
 
 class ProfileManagerInterface(ComponentInterface):
 
-    def __init__(self, client: RestClient, platform_url: str, component_path: str = "/profile_manager", extra_headers: Optional[dict] = None) -> None:
+    def __init__(self, client: RestClient, platform_url: str, component_path: str = "/profile_manager", extra_headers: Optional[dict] = None,
+                 cache_loader: Optional[CacheLoader] = None, single_flight: Optional[SingleFlight] = None) -> None:
         base_url = platform_url + component_path
-        super().__init__(client, base_url, extra_headers)
+        super().__init__(client, base_url, extra_headers, cache_loader, single_flight)
 
     def get_user_profile(self, user_id: str, headers: Optional[dict] = None) -> WeNetUserProfile:
         if headers is not None:
@@ -24,16 +31,33 @@ class ProfileManagerInterface(ComponentInterface):
         else:
             headers = self._base_headers
 
-        response = self._client.get(f"{self._base_url}/profiles/{user_id}", headers=headers)
+        url = f"{self._base_url}/profiles/{user_id}"
 
-        if response.status_code in [200, 202]:
-            return WeNetUserProfile.from_repr(response.json())
-        elif response.status_code in [401, 403]:
-            raise AuthenticationException("profile manager", response.status_code, response.text)
-        elif response.status_code == 404:
-            raise NotFound("User", user_id, response.status_code, response.text)
-        else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+        def load() -> dict:
+            response = self._client.get(url, headers=headers)
+
+            if response.status_code in [200, 202]:
+                return self._decode(response)
+            elif response.status_code in [401, 403]:
+                raise AuthenticationException("profile manager", response.status_code, response.text)
+            elif response.status_code == 404:
+                raise NotFound("User", user_id, response.status_code, response.text)
+            else:
+                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+
+        return WeNetUserProfile.from_repr(self._unless_not_found("User", user_id, url, load, headers))
+
+    def get_user_profiles(self, user_ids: Iterable[str], max_workers: int = 8, headers: Optional[dict] = None) -> BatchResult[WeNetUserProfile]:
+        """
+        Get many user profiles, requesting each of them once and at most `max_workers` at the same time.
+        The profiles recently found missing by the cache loader, if any, are not requested again.
+
+        :param user_ids: the identifiers of the users
+        :param max_workers: the maximum number of concurrent requests
+        :param headers: additional headers
+        :return: the profiles found by user identifier, and the errors (e.g. `NotFound`) of the other users
+        """
+        return self._get_many(user_ids, self.get_user_profile, max_workers, headers)
 
     def update_user_profile(self, profile: WeNetUserProfile, headers: Optional[dict] = None) -> None:
         if headers is not None:
@@ -53,6 +77,39 @@ class ProfileManagerInterface(ComponentInterface):
             else:
                 raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
 
+    def update_user_profile_changes(self, previous_profile: WeNetUserProfile, profile: WeNetUserProfile, headers: Optional[dict] = None) -> ProfileDiff:
+        """
+        Update only the fields of a profile that changed since its previous version, sending a minimal payload.
+        No request is performed if nothing changed.
+
+        The changes are merged into the stored profile with `PATCH /profiles/{id}`: the profile manager replaces the
+        whole profile on `PUT /profiles/{id}` (see `update_user_profile`), which would reset the fields not changed.
+
+        :param previous_profile: the version of the profile known to the profile manager
+        :param profile: the updated version of the profile
+        :param headers: the headers of the request
+        :return: the changes sent to the profile manager
+        """
+        diff = ProfileDiff.compute(previous_profile, profile)
+        if diff.is_empty():
+            logger.debug("No changes to update for profile [%s]", profile.profile_id)
+            return diff
+
+        if headers is not None:
+            headers.update(self._base_headers)
+        else:
+            headers = self._base_headers
+
+        response = self._client.patch(f"{self._base_url}/profiles/{profile.profile_id}", body=diff.to_repr(), headers=headers)
+
+        if response.status_code not in [200, 202]:
+            if response.status_code in [401, 403]:
+                raise AuthenticationException("profile manager", response.status_code, response.text)
+            else:
+                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+
+        return diff
+
     def create_empty_user_profile(self, user_id: str, headers: Optional[dict] = None) -> WeNetUserProfile:
         if headers is not None:
             headers.update(self._base_headers)
@@ -65,12 +122,25 @@ class ProfileManagerInterface(ComponentInterface):
 
         response = self._client.put(f"{self._base_url}/profiles", body=profile_repr, headers=headers)
         if response.status_code in [200, 201, 202]:
+            self._invalidate_not_found("User", user_id, headers)
             return WeNetUserProfile.empty(user_id)
         elif response.status_code in [401, 403]:
             raise AuthenticationException("profile manager", response.status_code, response.text)
         else:
             raise CreationError(response.status_code, response.text)
 
+    def create_empty_user_profiles(self, user_ids: Iterable[str], max_workers: int = 8, headers: Optional[dict] = None) -> BulkResult[str, WeNetUserProfile]:
+        """
+        Create the empty profiles of many users, at most `max_workers` at the same time.
+        A failed creation does not stop the other ones, and is classified as retriable (e.g. a timeout or a 503) or permanent (e.g. a 400).
+
+        :param user_ids: the identifiers of the users, duplicates are created once
+        :param max_workers: the maximum number of concurrent requests
+        :param headers: additional headers
+        :return: the result of each user, with the created profile if it succeeded, in the order of the users
+        """
+        return self._bulk(unique_ids(user_ids), self.create_empty_user_profile, max_workers, headers)
+
     def delete_user_profile(self, user_id: str, headers: Optional[dict] = None) -> None:
         if headers is not None:
             headers.update(self._base_headers)
@@ -93,25 +163,18 @@ class ProfileManagerInterface(ComponentInterface):
         else:
             headers = self._base_headers
 
-        profiles = []
-        has_got_all_profiles = False
-        offset = 0
-        while not has_got_all_profiles:
-            response = self._client.get(f"{self._base_url}/profiles", query_params={"offset": offset}, headers=headers)
+        def get_page(offset: int, limit: int, request_records: list) -> Tuple[List[WeNetUserProfile], int]:
+            response = self._client.get(f"{self._base_url}/profiles", query_params={"offset": offset, "limit": limit}, headers=headers, request_records=request_records)
 
             if response.status_code in [200, 202]:
-                profiles_page = WeNetUserProfilesPage.from_repr(response.json())
+                page = WeNetUserProfilesPage.from_repr(self._decode(response))
+                return page.profiles, page.total
             elif response.status_code in [401, 403]:
                 raise AuthenticationException("profile manager", response.status_code, response.text)
             else:
-                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
-
-            profiles.extend(profiles_page.profiles)
-            offset = len(profiles)
-            if len(profiles) >= profiles_page.total:
-                has_got_all_profiles = True
+                raise UnexpectedResponse(response.status_code, response.text)
 
-        return profiles
+        return self._paginate("profiles", get_page)
 
     def get_profile_user_ids(self, headers: Optional[dict] = None) -> List[str]:
         if headers is not None:
@@ -119,22 +182,15 @@ class ProfileManagerInterface(ComponentInterface):
         else:
             headers = self._base_headers
 
-        user_ids = []
-        has_got_all_user_ids = False
-        offset = 0
-        while not has_got_all_user_ids:
-            response = self._client.get(f"{self._base_url}/userIdentifiers", query_params={"offset": offset}, headers=headers)
+        def get_page(offset: int, limit: int, request_records: list) -> Tuple[List[str], int]:
+            response = self._client.get(f"{self._base_url}/userIdentifiers", query_params={"offset": offset, "limit": limit}, headers=headers, request_records=request_records)
 
             if response.status_code in [200, 202]:
-                user_ids_page = UserIdentifiersPage.from_repr(response.json())
+                page = UserIdentifiersPage.from_repr(self._decode(response))
+                return page.user_ids, page.total
             elif response.status_code in [401, 403]:
                 raise AuthenticationException("profile manager", response.status_code, response.text)
             else:
-                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
-
-            user_ids.extend(user_ids_page.user_ids)
-            offset = len(user_ids)
-            if len(user_ids) >= user_ids_page.total:
-                has_got_all_user_ids = True
+                raise UnexpectedResponse(response.status_code, response.text)
 
-        return user_ids
+        return self._paginate("userIdentifiers", get_page)
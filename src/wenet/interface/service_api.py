@@ -2,19 +2,25 @@ from __future__ import absolute_import, annotations
 
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 
+from wenet.interface.batch import BatchResult
 from wenet.interface.client import RestClient, Oauth2Client
 from wenet.interface.component import ComponentInterface
-from wenet.interface.exceptions import NotFound, CreationError, AuthenticationException
+from wenet.interface.exceptions import NotFound, CreationError, AuthenticationException, UnexpectedResponse
 from wenet.model.app import AppDTO
 from wenet.model.logging_message.message import BaseMessage
 from wenet.model.task.task import Task, TaskPage
 from wenet.model.task.transaction import TaskTransaction
+from wenet.model.user.diff import ProfileDiff
 from wenet.model.user.token import TokenDetails
 from wenet.model.user.profile import WeNetUserProfile, CoreWeNetUserProfile
 
-import json
+if TYPE_CHECKING:
+    from wenet.storage.loader import CacheLoader
+    from wenet.utils.singleflight import SingleFlight
+
+
 logger = logging.getLogger("wenet.interface.service_api")
 
 
@@ -26,12 +32,13 @@ class ServiceApiInterface(ComponentInterface):
     TOKEN_ENDPOINT = "/token"
     LOG_ENDPOINT = "/log/messages"
 
-    def __init__(self, client: RestClient, platform_url: str, component_path: str = "/service", component_path_oauth: str = "/api/service", extra_headers: Optional[dict] = None) -> None:
+    def __init__(self, client: RestClient, platform_url: str, component_path: str = "/service", component_path_oauth: str = "/api/service", extra_headers: Optional[dict] = None,
+                 cache_loader: Optional[CacheLoader] = None, single_flight: Optional[SingleFlight] = None) -> None:
         if isinstance(client, Oauth2Client):
             base_url = platform_url + component_path_oauth
         else:
             base_url = platform_url + component_path
-        super().__init__(client, base_url, extra_headers)
+        super().__init__(client, base_url, extra_headers, cache_loader, single_flight)
 
     def get_token_details(self, headers: Optional[dict] = None, request_records: Optional[list] = None) -> TokenDetails:
         if headers is not None:
@@ -42,7 +49,7 @@ class ServiceApiInterface(ComponentInterface):
         response = self._client.get(f"{self._base_url}{self.TOKEN_ENDPOINT}", headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return TokenDetails.from_repr(response.json())
+            return TokenDetails.from_repr(self._decode(response))
         elif response.status_code in [401, 403]:
             raise AuthenticationException("service api", response.status_code, response.text)
         else:
@@ -57,7 +64,7 @@ class ServiceApiInterface(ComponentInterface):
         response = self._client.get(f"{self._base_url}{self.APP_ENDPOINT}/{app_id}", headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return AppDTO.from_repr(response.json())
+            return AppDTO.from_repr(self._decode(response))
         elif response.status_code in [401, 403]:
             raise AuthenticationException("service api", response.status_code, response.text)
         elif response.status_code == 404:
@@ -74,7 +81,7 @@ class ServiceApiInterface(ComponentInterface):
         response = self._client.get(f"{self._base_url}{self.APP_ENDPOINT}/{app_id}/users", headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         elif response.status_code in [401, 403]:
             raise AuthenticationException("service api", response.status_code, response.text)
         elif response.status_code == 404:
@@ -82,7 +89,7 @@ class ServiceApiInterface(ComponentInterface):
         else:
             raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
 
-    def create_task(self, task: Task, headers: Optional[dict] = None, request_records: Optional[list] = None) -> None:
+    def create_task(self, task: Task, headers: Optional[dict] = None, request_records: Optional[list] = None) -> Optional[Task]:
         if headers is not None:
             headers.update(self._base_headers)
         else:
@@ -98,22 +105,40 @@ class ServiceApiInterface(ComponentInterface):
             else:
                 raise CreationError(response.status_code, response.text)
 
+        return self._created("Task", response, Task.from_repr, headers)
+
     def get_task(self, task_id: str, headers: Optional[dict] = None, request_records: Optional[list] = None) -> Task:
         if headers is not None:
             headers.update(self._base_headers)
         else:
             headers = self._base_headers
 
-        response = self._client.get(f"{self._base_url}{self.TASK_ENDPOINT}/{task_id}", headers=headers, request_records=request_records)
+        url = f"{self._base_url}{self.TASK_ENDPOINT}/{task_id}"
 
-        if response.status_code == 200:
-            return Task.from_repr(response.json(), task_id)
-        elif response.status_code in [401, 403]:
-            raise AuthenticationException("service api", response.status_code, response.text)
-        elif response.status_code == 404:
-            raise NotFound("Task", task_id, response.status_code, response.text)
-        else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+        def load() -> dict:
+            response = self._client.get(url, headers=headers, request_records=request_records)
+
+            if response.status_code == 200:
+                return self._decode(response)
+            elif response.status_code in [401, 403]:
+                raise AuthenticationException("service api", response.status_code, response.text)
+            elif response.status_code == 404:
+                raise NotFound("Task", task_id, response.status_code, response.text)
+            else:
+                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+
+        return Task.from_repr(self._unless_not_found("Task", task_id, url, load, headers, coalesce=request_records is None), task_id)
+
+    def get_tasks(self, task_ids: Iterable[str], max_workers: int = 8, headers: Optional[dict] = None) -> BatchResult[Task]:
+        """
+        Get many tasks, requesting each of them once and at most `max_workers` at the same time
+
+        :param task_ids: the identifiers of the tasks
+        :param max_workers: the maximum number of concurrent requests
+        :param headers: additional headers
+        :return: the tasks found by identifier, and the errors (e.g. `NotFound`) of the other tasks
+        """
+        return self._get_many(task_ids, self.get_task, max_workers, headers)
 
     def create_task_transaction(self, transaction: TaskTransaction, headers: Optional[dict] = None, request_records: Optional[list] = None) -> None:
         if headers is not None:
@@ -135,16 +160,32 @@ class ServiceApiInterface(ComponentInterface):
         else:
             headers = self._base_headers
 
-        response = self._client.get(f"{self._base_url}{self.USER_ENDPOINT}/profile/{wenet_user_id}", headers=headers, request_records=request_records)
+        url = f"{self._base_url}{self.USER_ENDPOINT}/profile/{wenet_user_id}"
 
-        if response.status_code == 200:
-            return CoreWeNetUserProfile.from_repr(response.json())
-        elif response.status_code in [401, 403]:
-            raise AuthenticationException("service api", response.status_code, response.text)
-        elif response.status_code == 404:
-            raise NotFound("User", wenet_user_id, response.status_code, response.text)
-        else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+        def load() -> dict:
+            response = self._client.get(url, headers=headers, request_records=request_records)
+
+            if response.status_code == 200:
+                return self._decode(response)
+            elif response.status_code in [401, 403]:
+                raise AuthenticationException("service api", response.status_code, response.text)
+            elif response.status_code == 404:
+                raise NotFound("User", wenet_user_id, response.status_code, response.text)
+            else:
+                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+
+        return CoreWeNetUserProfile.from_repr(self._unless_not_found("User", wenet_user_id, url, load, headers, coalesce=request_records is None))
+
+    def get_user_profiles(self, wenet_user_ids: Iterable[str], max_workers: int = 8, headers: Optional[dict] = None) -> BatchResult[CoreWeNetUserProfile]:
+        """
+        Get many user profiles, requesting each of them once and at most `max_workers` at the same time
+
+        :param wenet_user_ids: the identifiers of the users
+        :param max_workers: the maximum number of concurrent requests
+        :param headers: additional headers
+        :return: the profiles found by user identifier, and the errors (e.g. `NotFound`) of the other users
+        """
+        return self._get_many(wenet_user_ids, self.get_user_profile, max_workers, headers)
 
     def create_user_profile(self, wenet_user_id: str, headers: Optional[dict] = None, request_records: Optional[list] = None) -> None:
         if headers is not None:
@@ -160,6 +201,8 @@ class ServiceApiInterface(ComponentInterface):
             else:
                 raise CreationError(response.status_code, response.text)
 
+        self._invalidate_not_found("User", wenet_user_id, headers)
+
     def update_user_profile(self, wenet_user_id: str, profile: CoreWeNetUserProfile, headers: Optional[dict] = None, request_records: Optional[list] = None) -> WeNetUserProfile:
         if headers is not None:
             headers.update(self._base_headers)
@@ -169,7 +212,7 @@ class ServiceApiInterface(ComponentInterface):
         response = self._client.put(f"{self._base_url}{self.USER_ENDPOINT}/profile/{wenet_user_id}", profile.to_repr(), headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return WeNetUserProfile.from_repr(response.json())
+            return WeNetUserProfile.from_repr(self._decode(response))
         elif response.status_code in [401, 403]:
             raise AuthenticationException("service api", response.status_code, response.text)
         elif response.status_code == 404:
@@ -177,34 +220,75 @@ class ServiceApiInterface(ComponentInterface):
         else:
             raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
 
+    def update_user_profile_changes(self, wenet_user_id: str, previous_profile: CoreWeNetUserProfile, profile: CoreWeNetUserProfile, headers: Optional[dict] = None, request_records: Optional[list] = None) -> ProfileDiff:
+        """
+        Update only the fields of a profile that changed since its previous version.
+        Changed competences, materials and meanings are sent to their dedicated endpoints, the other changed fields are
+        merged into the stored profile with a minimal payload through `PATCH /user/profile/{id}`, since `PUT` replaces
+        the whole profile (see `update_user_profile`). No request is performed if nothing changed.
+
+        :param wenet_user_id: the identifier of the user
+        :param previous_profile: the version of the profile known to the platform
+        :param profile: the updated version of the profile
+        :param headers: the headers of the requests
+        :param request_records: the list where to record the performed requests
+        :return: the changes sent to the platform
+        """
+        diff = ProfileDiff.compute(previous_profile, profile)
+        if diff.is_empty():
+            logger.debug("No changes to update for profile [%s]", wenet_user_id)
+            return diff
+
+        changes = dict(diff.changes)
+        if "competences" in changes:
+            self.update_user_competences(wenet_user_id, changes.pop("competences"), headers=headers, request_records=request_records)
+        if "materials" in changes:
+            self.update_user_materials(wenet_user_id, changes.pop("materials"), headers=headers, request_records=request_records)
+        if "meanings" in changes:
+            self.update_user_meanings(wenet_user_id, changes.pop("meanings"), headers=headers, request_records=request_records)
+
+        if changes:
+            if headers is not None:
+                headers.update(self._base_headers)
+            else:
+                headers = self._base_headers
+
+            profile_repr = ProfileDiff(diff.profile_id, changes).to_repr()
+            response = self._client.patch(f"{self._base_url}{self.USER_ENDPOINT}/profile/{wenet_user_id}", profile_repr, headers=headers, request_records=request_records)
+
+            if response.status_code in [401, 403]:
+                raise AuthenticationException("service api", response.status_code, response.text)
+            elif response.status_code == 404:
+                raise NotFound("User", wenet_user_id, response.status_code, response.text)
+            elif response.status_code != 200:
+                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+
+        return diff
+
     def get_opened_tasks_of_user(self, wenet_user_id: str, app_id: str, headers: Optional[dict] = None, request_records: Optional[list] = None) -> List[Task]:
         if headers is not None:
             headers.update(self._base_headers)
         else:
             headers = self._base_headers
 
-        tasks = []
-        response = self._client.get(f"{self._base_url}{self.TASK_ENDPOINT}s",
-                                    query_params={"appId": app_id, "requesterId": wenet_user_id, "hasCloseTs": False},
-                                    headers=headers, request_records=request_records)
+        def get_page(offset: int, limit: int, page_request_records: list) -> Tuple[List[Task], int]:
+            response = self._client.get(f"{self._base_url}{self.TASK_ENDPOINT}s",
+                                        query_params={"appId": app_id, "requesterId": wenet_user_id, "hasCloseTs": False, "offset": offset, "limit": limit},
+                                        headers=headers, request_records=page_request_records)
+            if request_records is not None:
+                request_records.extend(page_request_records)
+
+            if response.status_code == 200:
+                task_page = TaskPage.from_repr(self._decode(response))
+                return task_page.tasks, task_page.total
+            elif response.status_code in [401, 403]:
+                raise AuthenticationException("service api", response.status_code, response.text)
+            elif response.status_code == 404:
+                raise NotFound("User", wenet_user_id, response.status_code, response.text)
+            else:
+                raise UnexpectedResponse(response.status_code, response.text)
 
-        if response.status_code == 200:
-            task_page = TaskPage.from_repr(response.json())
-            tasks.extend(task_page.tasks)
-            while len(tasks) < task_page.total:
-                offset = len(tasks)
-                response = self._client.get(f"{self._base_url}{self.TASK_ENDPOINT}s",
-                                            query_params={"appId": app_id, "requesterId": wenet_user_id, "offset": offset},
-                                            headers=headers, request_records=request_records)
-                task_page = TaskPage.from_repr(response.json())
-                tasks.extend(task_page.tasks)
-            return tasks
-        elif response.status_code in [401, 403]:
-            raise AuthenticationException("service api", response.status_code, response.text)
-        elif response.status_code == 404:
-            raise NotFound("User", wenet_user_id, response.status_code, response.text)
-        else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+        return self._paginate("tasks", get_page)
 
     def get_all_tasks(self,
                       app_id: Optional[str] = None,
@@ -224,7 +308,7 @@ class ServiceApiInterface(ComponentInterface):
                       request_records: Optional[list] = None
                       ) -> List[Task]:
         """
-        Get the tasks specifying parameters
+        Get the tasks specifying parameters, with pages of the adaptive size of `page_size("tasks")`
 
         Args:
             app_id: an application identifier to be equals on the tasks to return
@@ -249,10 +333,7 @@ class ServiceApiInterface(ComponentInterface):
             AuthenticationException: if unauthorized for the request
             Exception: if response from the component returns an unexpected code
         """
-        tasks = []
-        limit = 100
-        has_got_all_tasks = False
-        while not has_got_all_tasks:
+        def get_page(page_offset: int, limit: int, page_request_records: list) -> Tuple[List[Task], int]:
             task_page = self.get_task_page(
                 app_id=app_id,
                 requester_id=requester_id,
@@ -266,16 +347,16 @@ class ServiceApiInterface(ComponentInterface):
                 has_close_ts=has_close_ts,
                 deadline_from=deadline_from,
                 deadline_to=deadline_to,
-                offset=offset,
+                offset=page_offset,
                 limit=limit,
-                headers=headers
+                headers=dict(headers) if headers else None,
+                request_records=page_request_records
             )
-            tasks.extend(task_page.tasks)
-            offset += len(task_page.tasks)
-            if len(task_page.tasks) < limit:
-                has_got_all_tasks = True
+            if request_records is not None:
+                request_records.extend(page_request_records)
+            return task_page.tasks, task_page.total
 
-        return tasks
+        return self._paginate("tasks", get_page, offset)
 
     def get_task_page(self,
                       app_id: Optional[str] = None,
@@ -320,7 +401,7 @@ class ServiceApiInterface(ComponentInterface):
 
         Raises:
             AuthenticationException: if unauthorized for the request
-            Exception: if response from the component returns an unexpected code
+            UnexpectedResponse: if response from the component returns an unexpected code
         """
         if headers is not None:
             headers.update(self._base_headers)
@@ -353,11 +434,11 @@ class ServiceApiInterface(ComponentInterface):
         response = self._client.get(f"{self._base_url}{self.TASK_ENDPOINT}s", query_params=query_params, headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return TaskPage.from_repr(response.json())
+            return TaskPage.from_repr(self._decode(response))
         elif response.status_code in [401, 403]:
             raise AuthenticationException("service api", response.status_code, response.text)
         else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+            raise UnexpectedResponse(response.status_code, response.text)
 
     def get_all_tasks_of_application(self, app_id: str, headers: Optional[dict] = None, request_records: Optional[list] = None) -> List[Task]:
         if headers is not None:
@@ -365,28 +446,24 @@ class ServiceApiInterface(ComponentInterface):
         else:
             headers = self._base_headers
 
-        tasks = []
-        response = self._client.get(f"{self._base_url}{self.TASK_ENDPOINT}s",
-                                    query_params={"appId": app_id, "hasCloseTs": False},
-                                    headers=headers, request_records=request_records)
+        def get_page(offset: int, limit: int, page_request_records: list) -> Tuple[List[Task], int]:
+            response = self._client.get(f"{self._base_url}{self.TASK_ENDPOINT}s",
+                                        query_params={"appId": app_id, "hasCloseTs": False, "offset": offset, "limit": limit},
+                                        headers=headers, request_records=page_request_records)
+            if request_records is not None:
+                request_records.extend(page_request_records)
+
+            if response.status_code == 200:
+                task_page = TaskPage.from_repr(self._decode(response))
+                return task_page.tasks, task_page.total
+            elif response.status_code in [401, 403]:
+                raise AuthenticationException("service api", response.status_code, response.text)
+            elif response.status_code == 404:
+                raise NotFound("App", app_id, response.status_code, response.text)
+            else:
+                raise UnexpectedResponse(response.status_code, response.text)
 
-        if response.status_code == 200:
-            task_page = TaskPage.from_repr(response.json())
-            tasks.extend(task_page.tasks)
-            while len(tasks) < task_page.total:
-                offset = len(tasks)
-                response = self._client.get(f"{self._base_url}{self.TASK_ENDPOINT}s",
-                                            query_params={"appId": app_id, "offset": offset},
-                                            headers=headers, request_records=request_records)
-                task_page = TaskPage.from_repr(response.json())
-                tasks.extend(task_page.tasks)
-            return tasks
-        elif response.status_code in [401, 403]:
-            raise AuthenticationException("service api", response.status_code, response.text)
-        elif response.status_code == 404:
-            raise NotFound("App", app_id, response.status_code, response.text)
-        else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+        return self._paginate("tasks", get_page)
 
     def log_message(self, message: BaseMessage, headers: Optional[dict] = None, request_records: Optional[list] = None) -> None:
         if headers is not None:
@@ -411,7 +488,7 @@ class ServiceApiInterface(ComponentInterface):
         response = self._client.put(f"{self._base_url}{self.USER_ENDPOINT}/profile/{wenet_user_id}/competences", body=competences, headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         elif response.status_code in [401, 403]:
             raise AuthenticationException("service api", response.status_code, response.text)
         elif response.status_code == 404:
@@ -428,7 +505,7 @@ class ServiceApiInterface(ComponentInterface):
         response = self._client.put(f"{self._base_url}{self.USER_ENDPOINT}/profile/{wenet_user_id}/materials", body=materials, headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         elif response.status_code in [401, 403]:
             raise AuthenticationException("service api", response.status_code, response.text)
         elif response.status_code == 404:
@@ -445,7 +522,7 @@ class ServiceApiInterface(ComponentInterface):
         response = self._client.put(f"{self._base_url}{self.USER_ENDPOINT}/profile/{wenet_user_id}/meanings", body=meanings, headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         elif response.status_code in [401, 403]:
             raise AuthenticationException("service api", response.status_code, response.text)
         elif response.status_code == 404:
@@ -462,7 +539,7 @@ class ServiceApiInterface(ComponentInterface):
         response = self._client.get(f"{self._base_url}{self.USER_ENDPOINT}/profile/{wenet_user_id}/competences", headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         elif response.status_code in [401, 403]:
             raise AuthenticationException("service api", response.status_code, response.text)
         elif response.status_code == 404:
@@ -479,7 +556,7 @@ class ServiceApiInterface(ComponentInterface):
         response = self._client.get(f"{self._base_url}{self.USER_ENDPOINT}/profile/{wenet_user_id}/materials", headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         elif response.status_code in [401, 403]:
             raise AuthenticationException("service api", response.status_code, response.text)
         elif response.status_code == 404:
@@ -496,7 +573,7 @@ class ServiceApiInterface(ComponentInterface):
         response = self._client.get(f"{self._base_url}{self.USER_ENDPOINT}/profile/{wenet_user_id}/meanings", headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         elif response.status_code in [401, 403]:
             raise AuthenticationException("service api", response.status_code, response.text)
         elif response.status_code == 404:
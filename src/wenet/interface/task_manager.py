@@ -1,24 +1,45 @@
 from __future__ import absolute_import, annotations
 
 import logging
-from datetime import datetime
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
-from wenet.interface.component import ComponentInterface
+from wenet.interface.batch import BatchResult, BulkResult
+from wenet.interface.component import ComponentInterface, _in_caller_context
 from wenet.interface.client import RestClient
-from wenet.interface.exceptions import AuthenticationException, NotFound, CreationError
+from wenet.interface.exceptions import AuthenticationException, NotFound, CreationError, UnexpectedResponse
+from wenet.interface.export import TimeWindow, export_sharded, plan_windows
+from wenet.interface.pagination import KeysetCursor, KeysetPaginator, iter_pages
 from wenet.model.task.task import TaskPage, Task
 from wenet.model.task.transaction import TaskTransaction, TaskTransactionPage
 
+if TYPE_CHECKING:
+    from wenet.storage.loader import CacheLoader
+    from wenet.utils.singleflight import SingleFlight
+
 
 logger = logging.getLogger("wenet.interface.task_manager")
 
 
+T = TypeVar("T")
+
+
+def _utc(timestamp: int) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def _time_window(date_from: datetime, date_to: Optional[datetime]) -> TimeWindow:
+    date_to = date_to if date_to is not None else datetime.now(timezone.utc)
+    return TimeWindow(int(date_from.timestamp()), int(date_to.timestamp()))
+
+
 class TaskManagerInterface(ComponentInterface):
 
-    def __init__(self, client: RestClient, platform_url: str, component_path: str = "/task_manager", extra_headers: Optional[dict] = None) -> None:
+    def __init__(self, client: RestClient, platform_url: str, component_path: str = "/task_manager", extra_headers: Optional[dict] = None,
+                 cache_loader: Optional[CacheLoader] = None, single_flight: Optional[SingleFlight] = None) -> None:
         base_url = platform_url + component_path
-        super().__init__(client, base_url, extra_headers)
+        super().__init__(client, base_url, extra_headers, cache_loader, single_flight)
 
     def get_all_tasks(self,
                       app_id: Optional[str] = None,
@@ -38,7 +59,7 @@ class TaskManagerInterface(ComponentInterface):
                       headers: Optional[dict] = None
                       ) -> List[Task]:
         """
-        Get the tasks specifying query parameters
+        Get the tasks specifying query parameters, with pages of the adaptive size of `page_size("tasks")`
 
         Args:
             app_id: an application identifier to be equals on the tasks to return
@@ -64,10 +85,7 @@ class TaskManagerInterface(ComponentInterface):
             AuthenticationException: if unauthorized for the request
             Exception: if response from the component returns an unexpected code
         """
-        tasks = []
-        limit = 100
-        has_got_all_tasks = False
-        while not has_got_all_tasks:
+        def get_page(page_offset: int, limit: int, request_records: list) -> Tuple[List[Task], int]:
             task_page = self.get_task_page(
                 app_id=app_id,
                 requester_id=requester_id,
@@ -82,16 +100,14 @@ class TaskManagerInterface(ComponentInterface):
                 closed_from=closed_from,
                 closed_to=closed_to,
                 order=order,
-                offset=offset,
+                offset=page_offset,
                 limit=limit,
-                headers=headers
+                headers=dict(headers) if headers else None,
+                request_records=request_records
             )
-            tasks.extend(task_page.tasks)
-            offset += len(task_page.tasks)
-            if len(task_page.tasks) < limit:
-                has_got_all_tasks = True
+            return task_page.tasks, task_page.total
 
-        return tasks
+        return self._paginate("tasks", get_page, offset)
 
     def get_all_transactions(self,
                              app_id: Optional[str] = None,
@@ -120,7 +136,7 @@ class TaskManagerInterface(ComponentInterface):
                              headers: Optional[dict] = None
                              ) -> List[TaskTransaction]:
         """
-        Get the transactions specifying query parameters
+        Get the transactions specifying query parameters, with pages of the adaptive size of `page_size("transactions")`
 
         Args:
             app_id: an application identifier to be equals on the tasks to return
@@ -155,10 +171,7 @@ class TaskManagerInterface(ComponentInterface):
             AuthenticationException: if unauthorized for the request
             Exception: if response from the component returns an unexpected code
         """
-        transactions = []
-        has_got_all_transactions = False
-        limit = 100
-        while not has_got_all_transactions:
+        def get_page(page_offset: int, limit: int, request_records: list) -> Tuple[List[TaskTransaction], int]:
             transaction_page = self.get_transaction_page(
                 app_id=app_id,
                 requester_id=requester_id,
@@ -182,16 +195,313 @@ class TaskManagerInterface(ComponentInterface):
                 update_from=update_from,
                 update_to=update_to,
                 order=order,
-                offset=offset,
+                offset=page_offset,
                 limit=limit,
-                headers=headers
+                headers=dict(headers) if headers else None,
+                request_records=request_records
             )
-            transactions.extend(transaction_page.transactions)
-            offset += len(transaction_page.transactions)
-            if len(transaction_page.transactions) < limit:
-                has_got_all_transactions = True
+            return transaction_page.transactions, transaction_page.total
+
+        return self._paginate("transactions", get_page, offset)
+
+    # The timestamps a keyset pagination can be ordered by: the field of the order, and the filter from a timestamp
+    KEYSET_TIMESTAMPS = {
+        "creation": ("_creationTs", "creation_from"),
+        "update": ("_lastUpdateTs", "update_from")
+    }
+
+    def iter_tasks(self, order_by: str = "creation", cursor: Optional[KeysetCursor] = None, headers: Optional[dict] = None, **filters) -> KeysetPaginator[Task]:
+        """
+        Iterate the tasks ordered by creation, or update, timestamp and by identifier, advancing a timestamp cursor
+        instead of an offset, so that deep exports are as fast and consistent as the first page
+
+        Args:
+            order_by: the timestamp ordering the tasks, `creation` or `update`
+            cursor: the cursor of a previous iteration to resume from, by default it starts from the first task
+            headers: additional headers
+            filters: the query parameters of `get_task_page`, e.g. `app_id` or `creation_to`, except `order`, `offset` and `limit`
+
+        Returns:
+            The iterator of the tasks, and of their pages with `pages()`, whose `cursor` can be stored after each page to resume the iteration
+
+        Raises:
+            AuthenticationException: if unauthorized for the request
+            UnexpectedResponse: if response from the component returns an unexpected code
+        """
+        order_field, from_filter = self._keyset_timestamp(order_by)
+
+        def get_page(timestamp: Optional[int], offset: int, limit: int, request_records: list) -> Tuple[List[Task], int]:
+            if timestamp is not None:
+                filters[from_filter] = _utc(timestamp)
+            task_page = self.get_task_page(order=f"{order_field},id", offset=offset, limit=limit, headers=dict(headers) if headers else None,
+                                           request_records=request_records, **filters)
+            return task_page.tasks, task_page.total
+
+        timestamp_of = (lambda task: task.creation_ts) if order_by == "creation" else (lambda task: task.last_update_ts)
+        return KeysetPaginator(get_page, timestamp_of, lambda task: task.task_id, self.page_size("tasks"), cursor)
+
+    def iter_transactions(self, order_by: str = "creation", cursor: Optional[KeysetCursor] = None, headers: Optional[dict] = None,
+                          **filters) -> KeysetPaginator[TaskTransaction]:
+        """
+        Iterate the transactions ordered by creation, or update, timestamp and by identifier, advancing a timestamp
+        cursor instead of an offset, so that deep exports are as fast and consistent as the first page
+
+        Args:
+            order_by: the timestamp ordering the transactions, `creation` or `update`
+            cursor: the cursor of a previous iteration to resume from, by default it starts from the first transaction
+            headers: additional headers
+            filters: the query parameters of `get_transaction_page`, e.g. `app_id` or `task_id`, except `order`, `offset` and `limit`
+
+        Returns:
+            The iterator of the transactions, and of their pages with `pages()`, whose `cursor` can be stored after each page to resume the iteration
+
+        Raises:
+            AuthenticationException: if unauthorized for the request
+            UnexpectedResponse: if response from the component returns an unexpected code
+        """
+        order_field, from_filter = self._keyset_timestamp(order_by)
+
+        def get_page(timestamp: Optional[int], offset: int, limit: int, request_records: list) -> Tuple[List[TaskTransaction], int]:
+            if timestamp is not None:
+                filters[from_filter] = _utc(timestamp)
+            transaction_page = self.get_transaction_page(order=f"{order_field},id", offset=offset, limit=limit, headers=dict(headers) if headers else None,
+                                                         request_records=request_records, **filters)
+            return transaction_page.transactions, transaction_page.total
+
+        timestamp_of = (lambda transaction: transaction.creation_ts) if order_by == "creation" else (lambda transaction: transaction.last_update_ts)
+        return KeysetPaginator(get_page, timestamp_of, lambda transaction: transaction.id, self.page_size("transactions"), cursor)
+
+    def export_tasks(self,
+                     creation_from: datetime,
+                     creation_to: Optional[datetime] = None,
+                     max_workers: int = 8,
+                     shard_size: int = 5000,
+                     headers: Optional[dict] = None,
+                     **filters
+                     ) -> Iterator[Task]:
+        """
+        Export the tasks created in a date range, split in time windows fetched concurrently and merged in a single
+        stream ordered by creation timestamp and identifier, so that exports scale with the workers rather than with the latency.
+        The windows are sized from the `total` of the pages, to hold at most about `shard_size` tasks.
+
+        Args:
+            creation_from: the minimum creation date time of the tasks
+            creation_to: the maximum creation date time of the tasks, by default now
+            max_workers: the maximum number of concurrent requests
+            shard_size: the target number of tasks of a window
+            headers: additional headers
+            filters: the query parameters of `get_task_page`, e.g. `app_id`, except the creation range, `order`, `offset` and `limit`
+
+        Returns:
+            The iterator of the tasks, without duplicates
+
+        Raises:
+            AuthenticationException: if unauthorized for the request
+            UnexpectedResponse: if response from the component returns an unexpected code
+        """
+        def count(window: TimeWindow) -> int:
+            return self.get_task_page(creation_from=_utc(window.start), creation_to=_utc(window.end), limit=1, headers=dict(headers) if headers else None,
+                                      **filters).total
+
+        def fetch(window: TimeWindow) -> List[Task]:
+            return list(self.iter_tasks(headers=headers, creation_from=_utc(window.start), creation_to=_utc(window.end), **filters))
+
+        self._enable_connection_pool(max_workers)
+        return export_sharded(count, fetch, lambda task: task.task_id, _time_window(creation_from, creation_to), shard_size, max_workers)
+
+    def export_transactions(self,
+                            creation_from: datetime,
+                            creation_to: Optional[datetime] = None,
+                            max_workers: int = 8,
+                            shard_size: int = 5000,
+                            headers: Optional[dict] = None,
+                            **filters
+                            ) -> Iterator[TaskTransaction]:
+        """
+        Export the transactions created in a date range, split in time windows fetched concurrently and merged in a
+        single stream ordered by creation timestamp and identifier, so that exports scale with the workers rather than with the latency.
+        The windows are sized from the `total` of the pages, to hold at most about `shard_size` transactions.
+
+        Args:
+            creation_from: the minimum creation date time of the transactions
+            creation_to: the maximum creation date time of the transactions, by default now
+            max_workers: the maximum number of concurrent requests
+            shard_size: the target number of transactions of a window
+            headers: additional headers
+            filters: the query parameters of `get_transaction_page`, e.g. `app_id`, except the creation range, `order`, `offset` and `limit`
+
+        Returns:
+            The iterator of the transactions, without duplicates
+
+        Raises:
+            AuthenticationException: if unauthorized for the request
+            UnexpectedResponse: if response from the component returns an unexpected code
+        """
+        def count(window: TimeWindow) -> int:
+            return self.get_transaction_page(creation_from=_utc(window.start), creation_to=_utc(window.end), limit=1,
+                                             headers=dict(headers) if headers else None, **filters).total
+
+        def fetch(window: TimeWindow) -> List[TaskTransaction]:
+            return list(self.iter_transactions(headers=headers, creation_from=_utc(window.start), creation_to=_utc(window.end), **filters))
+
+        self._enable_connection_pool(max_workers)
+        return export_sharded(count, fetch, lambda transaction: transaction.id, _time_window(creation_from, creation_to), shard_size, max_workers)
+
+    def plan_task_shards(self,
+                         creation_from: Optional[datetime] = None,
+                         creation_to: Optional[datetime] = None,
+                         shard_size: int = 5000,
+                         max_workers: int = 8,
+                         headers: Optional[dict] = None,
+                         **filters
+                         ) -> List[dict]:
+        """
+        Split the export of the tasks in shards of at most about `shard_size` tasks, to be exported independently, e.g.
+        by workers on different nodes coordinated by an `ExportCoordinator`. With a creation date range the shards are
+        time windows sized as in `export_tasks`, otherwise they are ranges of offsets of the tasks ordered by creation.
+
+        Args:
+            creation_from: the minimum creation date time of the tasks, to split them in time windows
+            creation_to: the maximum creation date time of the tasks, by default now
+            shard_size: the target number of tasks of a shard
+            max_workers: the maximum number of concurrent requests planning the time windows
+            headers: additional headers
+            filters: the query parameters of `get_task_page`, e.g. `app_id`, except the creation range, `order`, `offset` and `limit`
+
+        Returns:
+            The shards, that can be encoded as JSON, to export with `iter_task_shard` and the same filters
+
+        Raises:
+            AuthenticationException: if unauthorized for the request
+            UnexpectedResponse: if response from the component returns an unexpected code
+        """
+        def count(window: Optional[TimeWindow]) -> int:
+            window_filters = dict(filters, creation_from=_utc(window.start), creation_to=_utc(window.end)) if window is not None else filters
+            return self.get_task_page(limit=1, headers=dict(headers) if headers else None, **window_filters).total
+
+        return self._plan_shards(count, creation_from, creation_to, shard_size, max_workers)
+
+    def iter_task_shard(self, shard: dict, progress: Optional[dict] = None, headers: Optional[dict] = None, **filters) -> Iterator[Tuple[List[Task], dict]]:
+        """
+        Iterate the pages of the tasks of a shard planned by `plan_task_shards`, from the progress of a previous iteration
+
+        Args:
+            shard: the shard
+            progress: the progress returned with the last page exported, to resume the shard from, by default it starts from its first task
+            headers: additional headers
+            filters: the filters the shard was planned with
+
+        Returns:
+            The iterator of the pages of the tasks, each with the progress to checkpoint once it is exported
+
+        Raises:
+            AuthenticationException: if unauthorized for the request
+            UnexpectedResponse: if response from the component returns an unexpected code
+        """
+        def get_page(offset: int, limit: int, request_records: list) -> Tuple[List[Task], int]:
+            task_page = self.get_task_page(order="_creationTs,id", offset=offset, limit=limit, headers=dict(headers) if headers else None,
+                                           request_records=request_records, **filters)
+            return task_page.tasks, task_page.total
+
+        def iterate(window: TimeWindow, cursor: Optional[KeysetCursor]) -> KeysetPaginator[Task]:
+            return self.iter_tasks(cursor=cursor, headers=headers, creation_from=_utc(window.start), creation_to=_utc(window.end), **filters)
+
+        return self._iter_shard(shard, progress, "tasks", get_page, iterate)
+
+    def plan_transaction_shards(self,
+                                creation_from: Optional[datetime] = None,
+                                creation_to: Optional[datetime] = None,
+                                shard_size: int = 5000,
+                                max_workers: int = 8,
+                                headers: Optional[dict] = None,
+                                **filters
+                                ) -> List[dict]:
+        """
+        Split the export of the transactions in shards of at most about `shard_size` transactions, to be exported
+        independently, e.g. by workers on different nodes coordinated by an `ExportCoordinator`. With a creation date
+        range the shards are time windows sized as in `export_transactions`, otherwise they are ranges of offsets of
+        the transactions ordered by creation.
 
-        return transactions
+        Args:
+            creation_from: the minimum creation date time of the transactions, to split them in time windows
+            creation_to: the maximum creation date time of the transactions, by default now
+            shard_size: the target number of transactions of a shard
+            max_workers: the maximum number of concurrent requests planning the time windows
+            headers: additional headers
+            filters: the query parameters of `get_transaction_page`, e.g. `app_id`, except the creation range, `order`, `offset` and `limit`
+
+        Returns:
+            The shards, that can be encoded as JSON, to export with `iter_transaction_shard` and the same filters
+
+        Raises:
+            AuthenticationException: if unauthorized for the request
+            UnexpectedResponse: if response from the component returns an unexpected code
+        """
+        def count(window: Optional[TimeWindow]) -> int:
+            window_filters = dict(filters, creation_from=_utc(window.start), creation_to=_utc(window.end)) if window is not None else filters
+            return self.get_transaction_page(limit=1, headers=dict(headers) if headers else None, **window_filters).total
+
+        return self._plan_shards(count, creation_from, creation_to, shard_size, max_workers)
+
+    def iter_transaction_shard(self, shard: dict, progress: Optional[dict] = None, headers: Optional[dict] = None,
+                               **filters) -> Iterator[Tuple[List[TaskTransaction], dict]]:
+        """
+        Iterate the pages of the transactions of a shard planned by `plan_transaction_shards`, from the progress of a previous iteration
+
+        Args:
+            shard: the shard
+            progress: the progress returned with the last page exported, to resume the shard from, by default it starts from its first transaction
+            headers: additional headers
+            filters: the filters the shard was planned with
+
+        Returns:
+            The iterator of the pages of the transactions, each with the progress to checkpoint once it is exported
+
+        Raises:
+            AuthenticationException: if unauthorized for the request
+            UnexpectedResponse: if response from the component returns an unexpected code
+        """
+        def get_page(offset: int, limit: int, request_records: list) -> Tuple[List[TaskTransaction], int]:
+            transaction_page = self.get_transaction_page(order="_creationTs,id", offset=offset, limit=limit, headers=dict(headers) if headers else None,
+                                                         request_records=request_records, **filters)
+            return transaction_page.transactions, transaction_page.total
+
+        def iterate(window: TimeWindow, cursor: Optional[KeysetCursor]) -> KeysetPaginator[TaskTransaction]:
+            return self.iter_transactions(cursor=cursor, headers=headers, creation_from=_utc(window.start), creation_to=_utc(window.end), **filters)
+
+        return self._iter_shard(shard, progress, "transactions", get_page, iterate)
+
+    def _plan_shards(self, count: Callable[[Optional[TimeWindow]], int], creation_from: Optional[datetime], creation_to: Optional[datetime],
+                     shard_size: int, max_workers: int) -> List[dict]:
+        if creation_from is None:
+            total = count(None)
+            return [{"offset": offset, "limit": shard_size} for offset in range(0, total, shard_size)]
+
+        self._enable_connection_pool(max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wenet-export") as executor:
+            windows = plan_windows(_in_caller_context(count), _time_window(creation_from, creation_to), shard_size, executor)
+        return [window.to_repr() for window in windows]
+
+    def _iter_shard(self,
+                    shard: dict,
+                    progress: Optional[dict],
+                    endpoint: str,
+                    get_page: Callable[[int, int, list], Tuple[List[T], int]],
+                    iterate: Callable[[TimeWindow, Optional[KeysetCursor]], KeysetPaginator[T]]
+                    ) -> Iterator[Tuple[List[T], dict]]:
+        if "offset" in shard:
+            offset = progress["offset"] if progress else shard["offset"]
+            for page, offset in iter_pages(get_page, self.page_size(endpoint), offset, end=shard["offset"] + shard["limit"]):
+                yield page, {"offset": offset}
+        else:
+            paginator = iterate(TimeWindow.from_repr(shard), KeysetCursor.from_repr(progress) if progress else None)
+            for page in paginator.pages():
+                yield page, paginator.cursor.to_repr()
+
+    def _keyset_timestamp(self, order_by: str) -> Tuple[str, str]:
+        if order_by not in self.KEYSET_TIMESTAMPS:
+            raise ValueError(f"Can not order by [{order_by}], expected one of {list(self.KEYSET_TIMESTAMPS)}")
+        return self.KEYSET_TIMESTAMPS[order_by]
 
     def get_task(self, task_id: str, headers: Optional[dict] = None) -> Task:
         """
@@ -213,16 +523,35 @@ class TaskManagerInterface(ComponentInterface):
         else:
             headers = self._base_headers
 
-        response = self._client.get(f"{self._base_url}/tasks/{task_id}", headers=headers)
+        url = f"{self._base_url}/tasks/{task_id}"
 
-        if response.status_code == 200:
-            return Task.from_repr(response.json())
-        elif response.status_code in [401, 403]:
-            raise AuthenticationException("task manager", response.status_code, response.text)
-        elif response.status_code == 404:
-            raise NotFound("Task", task_id, response.status_code, response.text)
-        else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+        def load() -> dict:
+            response = self._client.get(url, headers=headers)
+
+            if response.status_code == 200:
+                return self._decode(response)
+            elif response.status_code in [401, 403]:
+                raise AuthenticationException("task manager", response.status_code, response.text)
+            elif response.status_code == 404:
+                raise NotFound("Task", task_id, response.status_code, response.text)
+            else:
+                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+
+        return Task.from_repr(self._unless_not_found("Task", task_id, url, load, headers))
+
+    def get_tasks(self, task_ids: Iterable[str], max_workers: int = 8, headers: Optional[dict] = None) -> BatchResult[Task]:
+        """
+        Get many tasks, requesting each of them once and at most `max_workers` at the same time
+
+        Args:
+            task_ids: the identifiers of the tasks
+            max_workers: the maximum number of concurrent requests
+            headers: additional headers
+
+        Returns:
+            The tasks found by identifier, and the errors (e.g. `NotFound`) of the other tasks
+        """
+        return self._get_many(task_ids, self.get_task, max_workers, headers)
 
     def get_task_page(self,
                       app_id: Optional[str] = None,
@@ -240,7 +569,8 @@ class TaskManagerInterface(ComponentInterface):
                       order: Optional[str] = None,
                       offset: int = 0,
                       limit: int = 100,
-                      headers: Optional[dict] = None
+                      headers: Optional[dict] = None,
+                      request_records: Optional[list] = None
                       ) -> TaskPage:
         """
         Get a page of tasks specifying query parameters
@@ -262,13 +592,14 @@ class TaskManagerInterface(ComponentInterface):
             offset: The index of the first task to return. Default value is set to 0
             limit: the number maximum of tasks to return. Default value is set to 100
             headers: additional headers
+            request_records: the list where to record the performed requests
 
         Returns:
             A page of tasks
 
         Raises:
             AuthenticationException: if unauthorized for the request
-            Exception: if response from the component returns an unexpected code
+            UnexpectedResponse: if response from the component returns an unexpected code
         """
         if headers is not None:
             headers.update(self._base_headers)
@@ -299,14 +630,14 @@ class TaskManagerInterface(ComponentInterface):
             if query_params_temp[key] is not None:
                 query_params[key] = query_params_temp[key]
 
-        response = self._client.get(f"{self._base_url}/tasks", query_params=query_params, headers=headers)
+        response = self._client.get(f"{self._base_url}/tasks", query_params=query_params, headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return TaskPage.from_repr(response.json())
+            return TaskPage.from_repr(self._decode(response))
         elif response.status_code in [401, 403]:
             raise AuthenticationException("task manager", response.status_code, response.text)
         else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+            raise UnexpectedResponse(response.status_code, response.text)
 
     def get_transaction_page(self,
                              app_id: Optional[str] = None,
@@ -333,7 +664,8 @@ class TaskManagerInterface(ComponentInterface):
                              order: Optional[str] = None,
                              offset: int = 0,
                              limit: int = 100,
-                             headers: Optional[dict] = None
+                             headers: Optional[dict] = None,
+                             request_records: Optional[list] = None
                              ) -> TaskTransactionPage:
         """
         Get a page of transactions specifying query parameters
@@ -364,13 +696,14 @@ class TaskManagerInterface(ComponentInterface):
             offset: The index of the first task to return. Default value is set to 0
             limit: the number maximum of tasks to return. Default value is set to 100
             headers: additional headers
+            request_records: the list where to record the performed requests
 
         Returns:
             A page of transactions
 
         Raises:
             AuthenticationException: if unauthorized for the request
-            Exception: if response from the component returns an unexpected code
+            UnexpectedResponse: if response from the component returns an unexpected code
         """
         if headers is not None:
             headers.update(self._base_headers)
@@ -410,16 +743,16 @@ class TaskManagerInterface(ComponentInterface):
             if query_params_temp[key] is not None:
                 query_params[key] = query_params_temp[key]
 
-        response = self._client.get(f"{self._base_url}/taskTransactions", query_params=query_params, headers=headers)
+        response = self._client.get(f"{self._base_url}/taskTransactions", query_params=query_params, headers=headers, request_records=request_records)
 
         if response.status_code == 200:
-            return TaskTransactionPage.from_repr(response.json())
+            return TaskTransactionPage.from_repr(self._decode(response))
         elif response.status_code in [401, 403]:
             raise AuthenticationException("task manager", response.status_code, response.text)
         else:
-            raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+            raise UnexpectedResponse(response.status_code, response.text)
 
-    def create_task(self, task: Task, headers: Optional[dict] = None) -> None:
+    def create_task(self, task: Task, headers: Optional[dict] = None) -> Optional[Task]:
         """
         Create a new task
 
@@ -427,6 +760,9 @@ class TaskManagerInterface(ComponentInterface):
             task: the new task to create
             headers: additional headers
 
+        Returns:
+            The created task, with the identifier assigned by the platform, None if the platform did not return it
+
         Raises:
             AuthenticationException: if unauthorized for the request
             Exception: if response from the component returns an unexpected code
@@ -446,6 +782,24 @@ class TaskManagerInterface(ComponentInterface):
             else:
                 raise CreationError(response.status_code, response.text)
 
+        return self._created("Task", response, Task.from_repr, headers)
+
+    def create_tasks(self, tasks: Iterable[Task], max_workers: int = 8, headers: Optional[dict] = None) -> BulkResult[Task, Optional[Task]]:
+        """
+        Create many tasks, at most `max_workers` at the same time.
+        A failed creation does not stop the other ones, and is classified as retriable (e.g. a timeout or a 503) or permanent (e.g. a 400).
+        A creation that timed out may have succeeded anyway, so retrying it may create the task twice.
+
+        Args:
+            tasks: the new tasks to create
+            max_workers: the maximum number of concurrent requests
+            headers: additional headers
+
+        Returns:
+            The result of each task, with the created task if it succeeded, in the order of the tasks
+        """
+        return self._bulk(tasks, self.create_task, max_workers, headers)
+
     def update_task(self, task: Task, headers: Optional[dict] = None) -> None:
         """
         Update a task
@@ -456,7 +810,8 @@ class TaskManagerInterface(ComponentInterface):
 
         Raises:
             AuthenticationException: if unauthorized for the request
-            Exception: if response from the component returns an unexpected code
+            NotFound: if the task does not exist
+            UnexpectedResponse: if response from the component returns an unexpected code
         """
         if headers is not None:
             headers.update(self._base_headers)
@@ -471,9 +826,24 @@ class TaskManagerInterface(ComponentInterface):
             elif response.status_code == 404:
                 raise NotFound("Task", task.task_id, response.status_code, response.text)
             else:
-                raise Exception(f"Request has return a code [{response.status_code}] with content [{response.text}]")
+                raise UnexpectedResponse(response.status_code, response.text)
 
-    def create_task_transaction(self, task_transaction: TaskTransaction, headers: Optional[dict] = None) -> None:
+    def update_tasks(self, tasks: Iterable[Task], max_workers: int = 8, headers: Optional[dict] = None) -> BulkResult[Task, None]:
+        """
+        Update many tasks, at most `max_workers` at the same time.
+        A failed update does not stop the other ones, and is classified as retriable (e.g. a timeout or a 503) or permanent (e.g. a 404).
+
+        Args:
+            tasks: the updated tasks
+            max_workers: the maximum number of concurrent requests
+            headers: additional headers
+
+        Returns:
+            The result of each task, in the order of the tasks
+        """
+        return self._bulk(tasks, self.update_task, max_workers, headers)
+
+    def create_task_transaction(self, task_transaction: TaskTransaction, headers: Optional[dict] = None) -> Optional[TaskTransaction]:
         """
         Create a task transaction
 
@@ -481,6 +851,9 @@ class TaskManagerInterface(ComponentInterface):
             task_transaction: the new task transaction to create
             headers: additional headers
 
+        Returns:
+            The created task transaction, None if the platform did not return it
+
         Raises:
             AuthenticationException: if unauthorized for the request
             Exception: if response from the component returns an unexpected code
@@ -497,3 +870,22 @@ class TaskManagerInterface(ComponentInterface):
                 raise AuthenticationException("task manager", response.status_code, response.text)
             else:
                 raise CreationError(response.status_code, response.text)
+
+        return self._created("TaskTransaction", response, TaskTransaction.from_repr, headers)
+
+    def create_task_transactions(self, task_transactions: Iterable[TaskTransaction], max_workers: int = 8, headers: Optional[dict] = None
+                                 ) -> BulkResult[TaskTransaction, Optional[TaskTransaction]]:
+        """
+        Create many task transactions, at most `max_workers` at the same time.
+        A failed creation does not stop the other ones, and is classified as retriable (e.g. a timeout or a 503) or permanent (e.g. a 400).
+        A creation that timed out may have succeeded anyway, so retrying it may create the transaction twice.
+
+        Args:
+            task_transactions: the new task transactions to create
+            max_workers: the maximum number of concurrent requests
+            headers: additional headers
+
+        Returns:
+            The result of each task transaction, with the created transaction if it succeeded, in the order of the transactions
+        """
+        return self._bulk(task_transactions, self.create_task_transaction, max_workers, headers)
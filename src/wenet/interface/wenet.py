@@ -1,18 +1,41 @@
 from __future__ import absolute_import, annotations
 
-from typing import Optional
+import importlib
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
-from wenet.interface.client import RestClient
-from wenet.interface.hub import HubInterface
-from wenet.interface.incentive_server import IncentiveServerInterface
-from wenet.interface.logger import LoggerInterface
-from wenet.interface.profile_manager import ProfileManagerInterface
-from wenet.interface.service_api import ServiceApiInterface
-from wenet.interface.task_manager import TaskManagerInterface
+if TYPE_CHECKING:
+    from wenet.interface.client import RestClient
+    from wenet.interface.hub import HubInterface
+    from wenet.interface.incentive_server import IncentiveServerInterface
+    from wenet.interface.logger import LoggerInterface
+    from wenet.interface.profile_manager import ProfileManagerInterface
+    from wenet.interface.service_api import ServiceApiInterface
+    from wenet.interface.task_manager import TaskManagerInterface
+    from wenet.storage.loader import CacheLoader
+    from wenet.utils.singleflight import SingleFlight
+
+
+# The module and the class of each interface of the collector
+_INTERFACES: Dict[str, Tuple[str, str]] = {
+    "service_api": ("wenet.interface.service_api", "ServiceApiInterface"),
+    "profile_manager": ("wenet.interface.profile_manager", "ProfileManagerInterface"),
+    "incentive_server": ("wenet.interface.incentive_server", "IncentiveServerInterface"),
+    "task_manager": ("wenet.interface.task_manager", "TaskManagerInterface"),
+    "logger": ("wenet.interface.logger", "LoggerInterface"),
+    "hub": ("wenet.interface.hub", "HubInterface"),
+}
 
 
 class WeNet:
 
+    service_api: ServiceApiInterface
+    profile_manager: ProfileManagerInterface
+    incentive_server: IncentiveServerInterface
+    task_manager: TaskManagerInterface
+    logger: LoggerInterface
+    hub: HubInterface
+
     def __init__(self,
                  service_api: ServiceApiInterface,
                  profile_manager: ProfileManagerInterface,
@@ -29,23 +52,45 @@ class WeNet:
         self.hub = hub
 
     @staticmethod
-    def build(client: RestClient, platform_url: str = "https://internetofus.u-hopper.com/prod", extra_headers: Optional[dict] = None) -> WeNet:
+    def build(client: RestClient,
+              platform_url: str = "https://internetofus.u-hopper.com/prod",
+              extra_headers: Optional[dict] = None,
+              cache_loader: Optional[CacheLoader] = None,
+              single_flight: Optional[SingleFlight] = None
+              ) -> WeNet:
         """
-        Build a WeNet collector with all the platform interfaces
+        Build a WeNet collector with all the platform interfaces.
+        Each interface, and its module, is only created on first access.
 
         Args:
             client: the client for authenticate requests: ApikeyClient for an internal usage, Oauth2Client for an external usage.
             platform_url: the URL of the platform
             extra_headers: extra heather to add to all the requests
+            cache_loader: the loader caching the reference data of the platform (e.g. app details and cohorts), if any
+            single_flight: the single flight coalescing concurrent identical requests of apps, profiles and tasks, if any
 
         Returns:
             a WeNet collector with all the platform interfaces
         """
-        return WeNet(
-            service_api=ServiceApiInterface(client, platform_url=platform_url, extra_headers=extra_headers),
-            profile_manager=ProfileManagerInterface(client, platform_url=platform_url, extra_headers=extra_headers),
-            incentive_server=IncentiveServerInterface(client, platform_url=platform_url, extra_headers=extra_headers),
-            task_manager=TaskManagerInterface(client, platform_url=platform_url, extra_headers=extra_headers),
-            logger=LoggerInterface(client, platform_url=platform_url, extra_headers=extra_headers),
-            hub=HubInterface(client, platform_url=platform_url, extra_headers=extra_headers)
-        )
+        wenet = WeNet.__new__(WeNet)
+        wenet._client = client
+        wenet._platform_url = platform_url
+        wenet._extra_headers = extra_headers
+        wenet._cache_loader = cache_loader
+        wenet._single_flight = single_flight
+        wenet._lock = threading.Lock()
+        return wenet
+
+    def __getattr__(self, name: str):
+        # Only called for the interfaces not created yet by a collector built with `build`
+        interface = _INTERFACES.get(name)
+        if interface is None or "_client" not in self.__dict__:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        with self._lock:
+            if name not in self.__dict__:
+                module_name, class_name = interface
+                interface_class = getattr(importlib.import_module(module_name), class_name)
+                self.__dict__[name] = interface_class(self._client, platform_url=self._platform_url, extra_headers=self._extra_headers,
+                                                   cache_loader=self._cache_loader, single_flight=self._single_flight)
+            return self.__dict__[name]
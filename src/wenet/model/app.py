@@ -86,7 +86,7 @@ class App:
             and self.message_callback_url == o.message_callback_url and self.metadata == o.metadata
 
     def __repr__(self) -> str:
-        return str(self.to_repr())
+        return f"App(app_id={self.app_id!r})"
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -155,7 +155,7 @@ class AppDTO:
             and self.message_callback_url == o.message_callback_url and self.metadata == o.metadata
 
     def __repr__(self) -> str:
-        return str(self.to_repr())
+        return f"AppDTO(app_id={self.app_id!r})"
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -186,7 +186,7 @@ class AppDeveloper:
         return self.app_id == o.app_id and self.user_id == o.user_id
 
     def __repr__(self) -> str:
-        return str(self.to_repr())
+        return f"AppDeveloper(app_id={self.app_id!r}, user_id={self.user_id!r})"
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -1,13 +1,23 @@
 from __future__ import absolute_import, annotations
 
+from typing import Callable, Dict, List
+
 from wenet.model.callback_message.event import Event, WeNetAuthenticationEvent
-from wenet.model.callback_message.message import TextualMessage, Message, TaskConcludedNotification, \
-    TaskVolunteerNotification, TaskProposalNotification, TaskSelectionNotification, IncentiveMessage, IncentiveBadge, \
-    QuestionToAnswerMessage, AnsweredQuestionMessage
+from wenet.model.callback_message.message import Message
 
 
 class MessageBuilder:
 
+    @staticmethod
+    def register(label: str, decoder: Callable[[dict], Message]) -> None:
+        """
+        Register a custom message type, so that the messages with the given label are built with the specified decoder
+
+        :param label: the label of the message
+        :param decoder: the function building the message from its raw representation
+        """
+        Message.register(label, decoder)
+
     @staticmethod
     def build(raw_message: dict) -> Message:
         """
@@ -17,32 +27,37 @@ class MessageBuilder:
         :return Message: the message model
         :raises ValueError KeyError:
         """
-        message_label = raw_message["label"]
-        if message_label == TextualMessage.LABEL:
-            message = TextualMessage.from_repr(raw_message)
-        elif message_label == TaskConcludedNotification.LABEL:
-            message = TaskConcludedNotification.from_repr(raw_message)
-        elif message_label == TaskVolunteerNotification.LABEL:
-            message = TaskVolunteerNotification.from_repr(raw_message)
-        elif message_label == TaskProposalNotification.LABEL:
-            message = TaskProposalNotification.from_repr(raw_message)
-        elif message_label == TaskSelectionNotification.LABEL:
-            message = TaskSelectionNotification.from_repr(raw_message)
-        elif message_label == IncentiveMessage.LABEL:
-            message = IncentiveMessage.from_repr(raw_message)
-        elif message_label == IncentiveBadge.LABEL:
-            message = IncentiveBadge.from_repr(raw_message)
-        elif message_label == QuestionToAnswerMessage.LABEL:
-            message = QuestionToAnswerMessage.from_repr(raw_message)
-        elif message_label == AnsweredQuestionMessage.LABEL:
-            message = AnsweredQuestionMessage.from_repr(raw_message)
-        else:
-            message = Message.from_repr(raw_message)
-        return message
+        return Message.from_repr(raw_message)
+
+    @staticmethod
+    def build_many(raw_messages: List[dict]) -> List[Message]:
+        """
+        Build a list of messages from their raw representations, keeping their order.
+        It may raise ValueError or KeyError, to be caught where this method is used
+
+        :param raw_messages: the raw message representations
+        :return List[Message]: the message models
+        :raises ValueError KeyError:
+        """
+        return [Message.from_repr(raw_message) for raw_message in raw_messages]
 
 
 class EventBuilder:
 
+    _decoders: Dict[str, Callable[[dict], Event]] = {
+        WeNetAuthenticationEvent.TYPE: WeNetAuthenticationEvent.from_repr
+    }
+
+    @staticmethod
+    def register(event_type: str, decoder: Callable[[dict], Event]) -> None:
+        """
+        Register a custom event type, so that the events with the given type are built with the specified decoder
+
+        :param event_type: the type of the event
+        :param decoder: the function building the event from its raw representation
+        """
+        EventBuilder._decoders[event_type] = decoder
+
     @staticmethod
     def build(raw_event: dict) -> Event:
         """
@@ -51,9 +66,15 @@ class EventBuilder:
         :return Event: the event model
         :raises KeyError:
         """
-        event_type = raw_event["type"]
-        if event_type == WeNetAuthenticationEvent.TYPE:
-            event = WeNetAuthenticationEvent.from_repr(raw_event)
-        else:
-            event = Event.from_repr(raw_event)
-        return event
+        decoder = EventBuilder._decoders.get(raw_event["type"], Event.from_repr)
+        return decoder(raw_event)
+
+    @staticmethod
+    def build_many(raw_events: List[dict]) -> List[Event]:
+        """
+        Build a list of events from their raw representations, keeping their order
+        :param raw_events: the raw event representations
+        :return List[Event]: the event models
+        :raises KeyError:
+        """
+        return [EventBuilder.build(raw_event) for raw_event in raw_events]
@@ -1,9 +1,11 @@
 from __future__ import absolute_import, annotations
 
-from typing import Optional
+from typing import Callable, Dict, Optional
 
+from wenet.model.repr_cache import CachedRepr
 
-class Message:
+
+class Message(CachedRepr):
     """
     Base message from WeNet to the user.
 
@@ -16,6 +18,8 @@ class Message:
             - task_id: The identifier of the target task
     """
 
+    _decoders: Dict[str, Callable[[dict], Message]] = {}
+
     def __init__(self, app_id: str, receiver_id: str, label: str, attributes: dict) -> None:
         self.app_id = app_id
         self.receiver_id = receiver_id
@@ -30,36 +34,28 @@ class Message:
             "attributes": self.attributes
         }
 
+    @staticmethod
+    def register(label: str, decoder: Callable[[dict], Message]) -> None:
+        """
+        Register the decoder used for building the messages with the given label.
+        An existing decoder for the same label is replaced.
+
+        :param label: the label of the message
+        :param decoder: the function building the message from its raw representation
+        """
+        Message._decoders[label] = decoder
+
     @staticmethod
     def from_repr(raw: dict) -> Message:
-        message_type = raw["label"]
-        if message_type == TextualMessage.LABEL:
-            return TextualMessage.from_repr(raw)
-        elif message_type == TaskProposalNotification.LABEL:
-            return TaskProposalNotification.from_repr(raw)
-        elif message_type == TaskConcludedNotification.LABEL:
-            return TaskConcludedNotification.from_repr(raw)
-        elif message_type == TaskSelectionNotification.LABEL:
-            return TaskSelectionNotification.from_repr(raw)
-        elif message_type == TaskVolunteerNotification.LABEL:
-            return TaskVolunteerNotification.from_repr(raw)
-        elif message_type == IncentiveMessage.LABEL:
-            return IncentiveMessage.from_repr(raw)
-        elif message_type == IncentiveBadge.LABEL:
-            return IncentiveBadge.from_repr(raw)
-        elif message_type == QuestionToAnswerMessage.LABEL:
-            return QuestionToAnswerMessage.from_repr(raw)
-        elif message_type == AnsweredQuestionMessage.LABEL:
-            return AnsweredQuestionMessage.from_repr(raw)
-        elif message_type == AnsweredPickedMessage.LABEL:
-            return AnsweredPickedMessage.from_repr(raw)
-        else:
-            return Message(
-                raw["appId"],
-                raw["receiverId"],
-                raw["label"],
-                raw["attributes"]
-            )
+        decoder = Message._decoders.get(raw["label"])
+        if decoder is not None:
+            return decoder(raw)
+        return Message(
+            raw["appId"],
+            raw["receiverId"],
+            raw["label"],
+            raw["attributes"]
+        )
 
     def __eq__(self, o: object) -> bool:
         if not isinstance(o, Message):
@@ -488,3 +484,9 @@ class AnsweredPickedMessage(Message):
     @property
     def task_id(self) -> str:
         return self.attributes["taskId"]
+
+
+for _message_class in [TextualMessage, TaskProposalNotification, TaskConcludedNotification, TaskSelectionNotification,
+                       TaskVolunteerNotification, IncentiveMessage, IncentiveBadge, QuestionToAnswerMessage,
+                       AnsweredQuestionMessage, AnsweredPickedMessage]:
+    Message.register(_message_class.LABEL, _message_class.from_repr)
@@ -1,7 +1,7 @@
 from __future__ import absolute_import, annotations
 
 import abc
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 
 
 class BaseContent(abc.ABC):
@@ -10,6 +10,8 @@ class BaseContent(abc.ABC):
     applications and the Wenet platform
     """
 
+    _decoders: Dict[str, Callable[[dict], BaseContent]] = {}
+
     def __init__(self) -> None:
         self.type = self.get_type()
 
@@ -31,25 +33,24 @@ class BaseContent(abc.ABC):
             return False
         return self.type == o.type
 
+    @staticmethod
+    def register(content_type: str, decoder: Callable[[dict], BaseContent]) -> None:
+        """
+        Register the decoder used for building the contents of the given type.
+        An existing decoder for the same type is replaced.
+
+        :param content_type: the type of the content
+        :param decoder: the function building the content from its raw representation
+        """
+        BaseContent._decoders[content_type] = decoder
+
     @staticmethod
     def from_repr(raw: dict) -> BaseContent:
         content_type = raw["type"]
-        if content_type == TextualContent.get_type():
-            return TextualContent.from_repr(raw)
-        elif content_type == ActionContent.get_type():
-            # ActionContent and ActionRequest have the same type
-            try:
-                action = ActionContent.from_repr(raw)
-            except KeyError:
-                action = ActionRequest.from_repr(raw)
-            return action
-        elif content_type == AttachmentContent.get_type():
-            return AttachmentContent.from_repr(raw)
-        elif content_type == LocationContent.get_type():
-            return LocationContent.from_repr(raw)
-        elif content_type == CarouselContent.get_type():
-            return CarouselContent.from_repr(raw)
-        raise TypeError(f"Unexpected type [{content_type}] of content")
+        decoder = BaseContent._decoders.get(content_type)
+        if decoder is None:
+            raise TypeError(f"Unexpected type [{content_type}] of content")
+        return decoder(raw)
 
 
 class ContentWithButtons(BaseContent, abc.ABC):
@@ -342,3 +343,17 @@ class CarouselContent(BaseContent):
         return CarouselContent(
             [Card.from_repr(c) for c in raw["cards"]]
         )
+
+
+def _action_from_repr(raw: dict) -> BaseContent:
+    # ActionContent and ActionRequest have the same type, they are told apart by their fields
+    if "buttonText" in raw and "buttonId" in raw:
+        return ActionContent.from_repr(raw)
+    return ActionRequest.from_repr(raw)
+
+
+BaseContent.register(TextualContent.TYPE, TextualContent.from_repr)
+BaseContent.register(ActionContent.TYPE, _action_from_repr)
+BaseContent.register(AttachmentContent.TYPE, AttachmentContent.from_repr)
+BaseContent.register(LocationContent.TYPE, LocationContent.from_repr)
+BaseContent.register(CarouselContent.TYPE, CarouselContent.from_repr)
@@ -2,7 +2,7 @@ from __future__ import absolute_import, annotations
 
 import abc
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 from wenet.model.logging_message.content import BaseContent
 
@@ -19,6 +19,9 @@ class BaseMessage(abc.ABC):
         - timestamp: the timestamp of the message. If None is given, the current timestamp is used
         - metadata: an optional dictionary containing key-value pairs
     """
+
+    _decoders: Dict[str, Callable[[dict], BaseMessage]] = {}
+
     @staticmethod
     @abc.abstractmethod
     def get_type() -> str:
@@ -54,16 +57,24 @@ class BaseMessage(abc.ABC):
             "metadata": self.metadata,
         }
 
+    @staticmethod
+    def register(message_type: str, decoder: Callable[[dict], BaseMessage]) -> None:
+        """
+        Register the decoder used for building the messages of the given type.
+        An existing decoder for the same type is replaced.
+
+        :param message_type: the type of the message
+        :param decoder: the function building the message from its raw representation
+        """
+        BaseMessage._decoders[message_type] = decoder
+
     @staticmethod
     def from_repr(raw: dict) -> BaseMessage:
         message_type = raw["type"]
-        if message_type == RequestMessage.get_type():
-            return RequestMessage.from_repr(raw)
-        elif message_type == ResponseMessage.get_type():
-            return ResponseMessage.from_repr(raw)
-        elif message_type == NotificationMessage.get_type():
-            return NotificationMessage.from_repr(raw)
-        raise TypeError(f"Unexpected type [{message_type}] of message")
+        decoder = BaseMessage._decoders.get(message_type)
+        if decoder is None:
+            raise TypeError(f"Unexpected type [{message_type}] of message")
+        return decoder(raw)
 
     def __eq__(self, o: object) -> bool:
         if not isinstance(o, BaseMessage):
@@ -151,3 +162,8 @@ class NotificationMessage(BaseMessage):
             datetime.fromisoformat(raw["timestamp"]),
             raw.get("metadata", None)
         )
+
+
+BaseMessage.register(RequestMessage.TYPE, RequestMessage.from_repr)
+BaseMessage.register(ResponseMessage.TYPE, ResponseMessage.from_repr)
+BaseMessage.register(NotificationMessage.TYPE, NotificationMessage.from_repr)
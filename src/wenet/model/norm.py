@@ -2,6 +2,8 @@ from __future__ import absolute_import, annotations
 
 from enum import Enum
 
+from wenet.model.repr_cache import CachedRepr, cached_repr
+
 
 class NormOperator(Enum):
 
@@ -12,7 +14,7 @@ class NormOperator(Enum):
     GREATER_EQ_THAN = "GREATER_EQ_THAN"
 
 
-class Norm:
+class Norm(CachedRepr):
 
     def __init__(self, norm_id: str, attribute: str, operator: NormOperator, comparison: bool, negation: bool):
         self.norm_id = norm_id
@@ -21,6 +23,7 @@ class Norm:
         self.comparison = comparison
         self.negation = negation
 
+    @cached_repr
     def to_repr(self) -> dict:
         return {
             "id": self.norm_id,
@@ -41,7 +44,7 @@ class Norm:
         )
 
     def __repr__(self):
-        return str(self.to_repr())
+        return f"Norm(norm_id={self.norm_id!r}, attribute={self.attribute!r})"
 
     def __str__(self):
         return self.__repr__()
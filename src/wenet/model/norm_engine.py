@@ -0,0 +1,260 @@
+from __future__ import absolute_import, annotations
+
+import operator
+import re
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from wenet.model.norm import Norm, NormOperator
+from wenet.model.task.task import Task
+
+
+_OPERATORS: Dict[NormOperator, Callable[[object, object], bool]] = {
+    NormOperator.EQUALS: operator.eq,
+    NormOperator.LESS_THAN: operator.lt,
+    NormOperator.GREATER_THAN: operator.gt,
+    NormOperator.LESS_EQ_THAN: operator.le,
+    NormOperator.GREATER_EQ_THAN: operator.ge,
+}
+
+# Fields of the representation of the models not matching the name of their attribute
+_ATTRIBUTE_ALIASES = {
+    "id": "profile_id",
+    "personalBehaviors": "personal_behaviours",
+    "_creationTs": "creation_ts",
+    "_lastUpdateTs": "last_update_ts",
+}
+
+_CAMEL_CASE_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+def _attribute_name(field: str) -> str:
+    alias = _ATTRIBUTE_ALIASES.get(field)
+    if alias is not None:
+        return alias
+    return _CAMEL_CASE_BOUNDARY.sub("_", field).lower()
+
+
+def _compile_accessor(attribute: str) -> Callable[[object], object]:
+    """
+    Build the function reading the value of a norm attribute from a model.
+
+    The attribute is the dotted path of the field in the representation of the model (e.g. `dateOfBirth.year`),
+    each segment is read as the matching snake case attribute of a model or as the key of a dictionary.
+    Enum values are compared through their value.
+    """
+    segments = [(field, _attribute_name(field)) for field in attribute.split(".")]
+
+    if len(segments) == 1:
+        field, attribute_name = segments[0]
+
+        def access_field(item: object) -> object:
+            value = item.get(field) if type(item) is dict else getattr(item, attribute_name, None)
+            return value.value if isinstance(value, Enum) else value
+
+        return access_field
+
+    def access(item: object) -> object:
+        value = item
+        for field, attribute_name in segments:
+            if value is None:
+                return None
+            if isinstance(value, dict):
+                value = value.get(field)
+            else:
+                value = getattr(value, attribute_name, None)
+        if isinstance(value, Enum):
+            value = value.value
+        return value
+
+    return access
+
+
+def _compile_condition(norm: Norm) -> Callable[[object], bool]:
+    """
+    Build the function checking whether a value satisfies a norm.
+    A missing value, or one that can not be compared with the norm comparison, does not satisfy the norm;
+    the negation is applied on top of that.
+    """
+    compare = _OPERATORS[norm.operator]
+    comparison = norm.comparison.value if isinstance(norm.comparison, Enum) else norm.comparison
+    negation = bool(norm.negation)
+
+    def condition(value: object) -> bool:
+        if value is None:
+            return negation
+        try:
+            return bool(compare(value, comparison)) != negation
+        except TypeError:
+            return negation
+
+    return condition
+
+
+def norms_key(norms: Iterable[Norm]) -> Tuple[Hashable, ...]:
+    """
+    The key identifying the semantic of a set of norms, regardless of their identifiers
+    """
+    return tuple((norm.attribute, norm.operator.value, repr(norm.comparison), bool(norm.negation)) for norm in norms)
+
+
+class CompiledNorms:
+    """
+    A list of norms compiled into a single predicate, satisfied when all the norms are satisfied.
+
+    The predicate can be evaluated over models (e.g. `WeNetUserProfile`) or over columnar data, where each column
+    is the sequence of the values of a norm attribute for all the candidates.
+    """
+
+    def __init__(self, norms: Iterable[Norm]) -> None:
+        self.norms = list(norms)
+        self._checks = [(norm.attribute, _compile_accessor(norm.attribute), _compile_condition(norm)) for norm in self.norms]
+
+    def __call__(self, item: object) -> bool:
+        for _, access, condition in self._checks:
+            if not condition(access(item)):
+                return False
+        return True
+
+    def evaluate(self, items: Iterable[object]) -> List[bool]:
+        """
+        Check which models satisfy the norms
+
+        :param items: the models to check
+        :return: for each model, whether it satisfies the norms
+        """
+        return [self(item) for item in items]
+
+    def filter(self, items: Iterable[object]) -> list:
+        """
+        :param items: the models to check
+        :return: the models satisfying the norms, in their original order
+        """
+        return [item for item in items if self(item)]
+
+    def evaluate_columns(self, columns: Dict[str, Sequence], size: Optional[int] = None) -> List[bool]:
+        """
+        Check which candidates satisfy the norms, given the values of their attributes in columns.
+        A column missing from the data is considered as a column of missing values.
+
+        :param columns: the values of the candidates for each norm attribute, in the same order for all the columns
+        :param size: the number of candidates, by default the length of the columns
+        :return: for each candidate, whether it satisfies the norms
+        :raises ValueError: if the number of candidates can not be inferred or the columns have different lengths
+        """
+        if size is None:
+            if not columns:
+                raise ValueError("The number of candidates is required when no column is provided")
+            size = len(next(iter(columns.values())))
+
+        remaining = range(size)
+        for attribute, _, condition in self._checks:
+            column = columns.get(attribute)
+            if column is None:
+                if not condition(None):
+                    return [False] * size
+                continue
+            if len(column) != size:
+                raise ValueError(f"Column [{attribute}] has [{len(column)}] values instead of [{size}]")
+            remaining = [index for index in remaining if condition(column[index])]
+
+        mask = [False] * size
+        for index in remaining:
+            mask[index] = True
+        return mask
+
+
+class NormEngine:
+    """
+    Compile norms into predicates and evaluate them over candidates, caching both the compiled norms
+    and the results of the evaluation of the norms of a task.
+
+    Results are cached per task and set of norms, for each profile identifier and last update timestamp:
+    profiles without an update timestamp are always evaluated.
+    """
+
+    def __init__(self, max_compiled_norms: int = 256, max_cached_tasks: int = 1024) -> None:
+        self._max_compiled_norms = max_compiled_norms
+        self._max_cached_tasks = max_cached_tasks
+        self._compiled: OrderedDict[Tuple, CompiledNorms] = OrderedDict()
+        self._results: OrderedDict[Tuple, Dict[Tuple, bool]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compile(self, norms: Iterable[Norm]) -> CompiledNorms:
+        """
+        :param norms: the norms to compile
+        :return: the predicate satisfied when all the norms are satisfied
+        """
+        norms = list(norms)
+        key = norms_key(norms)
+        with self._lock:
+            compiled = self._compiled.get(key)
+            if compiled is not None:
+                self._compiled.move_to_end(key)
+                return compiled
+
+        compiled = CompiledNorms(norms)
+        with self._lock:
+            self._compiled[key] = compiled
+            if len(self._compiled) > self._max_compiled_norms:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def evaluate_task(self, task: Task, profiles: Sequence[object]) -> List[bool]:
+        """
+        Check which profiles satisfy the norms of a task
+
+        :param task: the task
+        :param profiles: the candidate profiles
+        :return: for each profile, whether it satisfies the norms of the task
+        """
+        compiled = self.compile(task.norms)
+        key = (task.task_id, norms_key(compiled.norms))
+        with self._lock:
+            results = self._results.get(key)
+            if results is None:
+                results = {}
+                self._results[key] = results
+                if len(self._results) > self._max_cached_tasks:
+                    self._results.popitem(last=False)
+            else:
+                self._results.move_to_end(key)
+
+        evaluation = []
+        for profile in profiles:
+            profile_key = self._profile_key(profile)
+            satisfied = results.get(profile_key) if profile_key is not None else None
+            if satisfied is None:
+                satisfied = compiled(profile)
+                if profile_key is not None:
+                    results[profile_key] = satisfied
+            evaluation.append(satisfied)
+        return evaluation
+
+    def matching_profiles(self, task: Task, profiles: Sequence[object]) -> list:
+        """
+        :param task: the task
+        :param profiles: the candidate profiles
+        :return: the profiles satisfying the norms of the task, in their original order
+        """
+        return [profile for profile, satisfied in zip(profiles, self.evaluate_task(task, profiles)) if satisfied]
+
+    def invalidate(self, task_id: Optional[str] = None) -> None:
+        """
+        Discard the cached results of a task, or of all the tasks if no task is specified
+        """
+        with self._lock:
+            if task_id is None:
+                self._results.clear()
+            else:
+                for key in [key for key in self._results if key[0] == task_id]:
+                    del self._results[key]
+
+    @staticmethod
+    def _profile_key(profile: object) -> Optional[Tuple]:
+        last_update_ts = getattr(profile, "last_update_ts", None)
+        if last_update_ts is None:
+            return None
+        return getattr(profile, "profile_id", None), last_update_ts
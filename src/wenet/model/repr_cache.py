@@ -0,0 +1,200 @@
+from __future__ import absolute_import, annotations
+
+import copy
+import functools
+import weakref
+from typing import Callable, List, Optional
+
+
+class CachedRepr:
+    """
+    Mixin adding an opt-in memoisation of the `to_repr` methods decorated with `cached_repr`.
+
+    Once `enable_repr_cache` is called on an object, its representation is built only the first time it is requested
+    and re-used until the object changes. Assigning an attribute of the object, or of any model nested in it at any
+    depth (e.g. the goal of a task, the transactions of a task or their messages), invalidates the cached
+    representation, and so do in-place changes of their lists and dictionaries (e.g. appending a norm to `task.norms`
+    or a keyword to `task.goal.keywords`): once the representation is cached, they are replaced by tracked copies.
+    Changes through references to them taken before can not be detected: call `invalidate_repr` after them.
+
+    The returned representation is a deep copy of the cached one, that can be modified by the caller.
+    """
+
+    _repr_cache: Optional[dict] = None
+    _repr_parents: Optional[List[weakref.ref]] = None
+    # Whether assigning an attribute invalidates the cached representations, only set on the objects that need it
+    _repr_tracked = False
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if self._repr_tracked:
+            self.invalidate_repr()
+
+    def __getstate__(self) -> dict:
+        # Copies and unpickled objects start without cache
+        return {name: value for name, value in self.__dict__.items() if name not in _REPR_STATE}
+
+    def enable_repr_cache(self) -> CachedRepr:
+        """
+        Enable the memoisation of the representation of the object
+
+        :return: the object itself
+        """
+        if self._repr_cache is None:
+            self._track_assignments()
+            object.__setattr__(self, "_repr_cache", {})
+        return self
+
+    def disable_repr_cache(self) -> None:
+        object.__setattr__(self, "_repr_cache", None)
+
+    def invalidate_repr(self) -> None:
+        """
+        Discard the cached representation of the object and of the objects including it
+        """
+        cache = self._repr_cache
+        if cache:
+            cache.clear()
+        if self._repr_parents:
+            for parent_ref in self._repr_parents:
+                parent = parent_ref()
+                if parent is not None:
+                    parent.invalidate_repr()
+
+    def _track_assignments(self) -> None:
+        if not self._repr_tracked:
+            object.__setattr__(self, "_repr_tracked", True)
+
+    def _watch_children(self) -> None:
+        for name, value in list(self.__dict__.items()):
+            if name in _REPR_STATE:
+                continue
+            if isinstance(value, CachedRepr):
+                value._add_repr_parent(self)
+            elif isinstance(value, (list, dict)):
+                tracked = _track_container(value, self)
+                if tracked is not value:
+                    object.__setattr__(self, name, tracked)
+
+    def _add_repr_parent(self, parent: CachedRepr) -> None:
+        parents = self._repr_parents
+        if parents is None:
+            self._track_assignments()
+            parents = []
+            object.__setattr__(self, "_repr_parents", parents)
+        if not any(parent_ref() is parent for parent_ref in parents):
+            parents.append(weakref.ref(parent))
+        # The changes of the models and containers nested in the child invalidate it, and so its parents
+        self._watch_children()
+
+
+# The attributes holding the state of the memoisation, that are not part of the model
+_REPR_STATE = frozenset(["_repr_cache", "_repr_parents", "_repr_tracked"])
+
+
+def cached_repr(to_repr: Callable[..., dict]) -> Callable[..., dict]:
+    """
+    Decorate the `to_repr` method of a `CachedRepr` model, so that its result is memoised when the cache is enabled.
+    Calls with arguments are never cached.
+    """
+    @functools.wraps(to_repr)
+    def wrapper(self: CachedRepr, *args, **kwargs) -> dict:
+        cache = self._repr_cache
+        if cache is None or args or kwargs:
+            return to_repr(self, *args, **kwargs)
+
+        cached = cache.get(to_repr)
+        if cached is None:
+            cached = to_repr(self)
+            cache[to_repr] = cached
+            self._watch_children()
+        return _copy_repr(cached)
+
+    return wrapper
+
+
+def _copy_repr(value):
+    """
+    Copy a representation, made of dictionaries, lists and immutable values, faster than `copy.deepcopy`
+    """
+    if isinstance(value, dict):
+        return {key: _copy_repr(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_repr(item) for item in value]
+    return value
+
+
+class _TrackedList(list):
+    """
+    A list invalidating the cached representation of its owner when changed in place
+    """
+
+    __slots__ = ("_owner",)
+
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        return list, (list(self),)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return copy.deepcopy(list(self), memo)
+
+
+class _TrackedDict(dict):
+    """
+    A dictionary invalidating the cached representation of its owner when changed in place
+    """
+
+    __slots__ = ("_owner",)
+
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        return dict, (dict(self),)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return copy.deepcopy(dict(self), memo)
+
+
+def _invalidating(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        owner = self._owner()
+        if owner is not None:
+            owner.invalidate_repr()
+        return result
+    return wrapper
+
+
+for _name in ("__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse"):
+    setattr(_TrackedList, _name, _invalidating(getattr(list, _name)))
+for _name in ("__setitem__", "__delitem__", "__ior__", "pop", "popitem", "clear", "update", "setdefault"):
+    setattr(_TrackedDict, _name, _invalidating(getattr(dict, _name)))
+
+
+def _track_container(value, owner: CachedRepr):
+    """
+    Get a tracked copy of a list or a dictionary and of the containers nested in it, and make the models it includes
+    invalidate the representation of the owner
+
+    :return: the tracked container, the value itself if it is already tracked for the owner
+    """
+    if isinstance(value, (_TrackedList, _TrackedDict)) and value._owner() is owner:
+        items = value if isinstance(value, list) else value.values()
+        for item in items:
+            if isinstance(item, CachedRepr):
+                item._add_repr_parent(owner)
+        return value
+
+    if isinstance(value, list):
+        tracked = _TrackedList(_track_item(item, owner) for item in value)
+    else:
+        tracked = _TrackedDict((key, _track_item(item, owner)) for key, item in value.items())
+    tracked._owner = weakref.ref(owner)
+    return tracked
+
+
+def _track_item(item, owner: CachedRepr):
+    if isinstance(item, CachedRepr):
+        item._add_repr_parent(owner)
+        return item
+    if isinstance(item, (list, dict)):
+        return _track_container(item, owner)
+    return item
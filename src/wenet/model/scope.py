@@ -2,7 +2,7 @@ from __future__ import absolute_import, annotations
 
 import abc
 from enum import Enum
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 
 class Scope(Enum):
@@ -23,6 +23,22 @@ class Scope(Enum):
     CONVERSATIONS = "conversations"
 
 
+class ScopeProjection:
+    """
+    The fields of a model allowed by a set of scopes, compiled with the functions reading their representation
+    """
+
+    def __init__(self, getters: List[Tuple[str, Callable[[object], object]]]) -> None:
+        self._getters = getters
+
+    @property
+    def fields(self) -> List[str]:
+        return [field for field, _ in self._getters]
+
+    def __call__(self, model: object) -> dict:
+        return {field: getter(model) for field, getter in self._getters}
+
+
 class AbstractScopeMappings(abc.ABC):
 
     @staticmethod
@@ -30,6 +46,42 @@ class AbstractScopeMappings(abc.ABC):
     def _get_mappings() -> Dict[Scope, str]:
         pass
 
+    @staticmethod
+    def _get_field_getters() -> Dict[str, Callable[[object], object]]:
+        """
+        The functions reading the representation of each mapped field from the model, needed to build projections
+        """
+        return {}
+
+    @classmethod
+    def get_mappings(cls) -> Dict[Scope, str]:
+        mappings = cls.__dict__.get("_cached_mappings")
+        if mappings is None:
+            mappings = cls._get_mappings()
+            cls._cached_mappings = mappings
+        return mappings
+
     @classmethod
     def get_field(cls, scope: Scope) -> Optional[str]:
-        return cls._get_mappings().get(scope, None)
+        return cls.get_mappings().get(scope, None)
+
+    @classmethod
+    def get_projection(cls, scopes: Iterable[Scope]) -> ScopeProjection:
+        """
+        Get the projection of the fields allowed by the scopes, compiled once for each set of scopes
+
+        :param scopes: the scopes
+        :return: the projection serialising only the allowed fields of a model
+        """
+        scopes = scopes if isinstance(scopes, frozenset) else frozenset(scopes)
+        projections = cls.__dict__.get("_cached_projections")
+        if projections is None:
+            projections = {}
+            cls._cached_projections = projections
+
+        projection = projections.get(scopes)
+        if projection is None:
+            getters = cls._get_field_getters()
+            projection = ScopeProjection([(field, getters[field]) for scope, field in cls.get_mappings().items() if scope in scopes])
+            projections[scopes] = projection
+        return projection
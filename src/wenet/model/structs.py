@@ -0,0 +1,356 @@
+from __future__ import absolute_import, annotations
+
+from typing import Any, Dict, List, Optional, Type, TypeVar, Union
+
+try:
+    import msgspec
+except ImportError as e:
+    # typed structs are an optional layer, requiring the `structs` extra
+    raise ImportError("Typed structs require msgspec, install it with `pip install wenet-common[structs]`") from e
+
+from wenet.model.app import App, AppStatus
+from wenet.model.callback_message.message import Message
+from wenet.model.norm import Norm, NormOperator
+from wenet.model.task.task import Task, TaskGoal, TaskPage
+from wenet.model.task.transaction import TaskTransaction
+from wenet.model.user.common import Date, Gender
+from wenet.model.user.profile import UserName, WeNetUserProfile, WeNetUserProfilesPage
+
+
+Number = Union[int, float]
+
+# Structs decode platform responses in a single pass from the raw JSON bytes, validating them against their schema.
+# They can be converted to and from the models with `to_model` and `from_model`, or decoded directly into models with
+# `decode_model`.
+
+
+class NormStruct(msgspec.Struct, kw_only=True):
+    id: Optional[str] = None
+    attribute: str
+    operator: NormOperator
+    comparison: Any = None
+    negation: bool = False
+
+    def to_model(self) -> Norm:
+        return Norm(self.id, self.attribute, self.operator, self.comparison, self.negation)
+
+    @staticmethod
+    def from_model(norm: Norm) -> NormStruct:
+        return NormStruct(id=norm.norm_id, attribute=norm.attribute, operator=norm.operator, comparison=norm.comparison, negation=norm.negation)
+
+
+class TaskGoalStruct(msgspec.Struct, kw_only=True):
+    name: str
+    description: str = ""
+    keywords: Optional[List[str]] = None
+
+    def to_model(self) -> TaskGoal:
+        return TaskGoal(self.name, self.description, self.keywords)
+
+    @staticmethod
+    def from_model(goal: TaskGoal) -> TaskGoalStruct:
+        return TaskGoalStruct(name=goal.name, description=goal.description, keywords=goal.keywords)
+
+
+class TaskTransactionStruct(msgspec.Struct, kw_only=True):
+    id: Optional[str] = None
+    task_id: str = msgspec.field(name="taskId")
+    label: str
+    attributes: Optional[Dict[str, Any]] = None
+    creation_ts: Optional[Number] = msgspec.field(name="_creationTs")
+    last_update_ts: Optional[Number] = msgspec.field(name="_lastUpdateTs")
+    actioneer_id: Optional[str] = msgspec.field(name="actioneerId")
+    messages: Optional[List[Dict[str, Any]]] = None
+
+    def to_model(self) -> TaskTransaction:
+        return TaskTransaction(
+            self.id,
+            self.task_id,
+            self.label,
+            self.creation_ts,
+            self.last_update_ts,
+            self.actioneer_id,
+            self.attributes,
+            [Message.from_repr(message) for message in self.messages] if self.messages else None
+        )
+
+    @staticmethod
+    def from_model(transaction: TaskTransaction) -> TaskTransactionStruct:
+        return TaskTransactionStruct(
+            id=transaction.id,
+            task_id=transaction.task_id,
+            label=transaction.label,
+            attributes=transaction.attributes,
+            creation_ts=transaction.creation_ts,
+            last_update_ts=transaction.last_update_ts,
+            actioneer_id=transaction.actioneer_id,
+            messages=[message.to_repr() for message in transaction.messages]
+        )
+
+
+class TaskStruct(msgspec.Struct, kw_only=True):
+    id: Optional[str] = None
+    creation_ts: Optional[Number] = msgspec.field(default=None, name="_creationTs")
+    last_update_ts: Optional[Number] = msgspec.field(default=None, name="_lastUpdateTs")
+    task_type_id: str = msgspec.field(name="taskTypeId")
+    requester_id: str = msgspec.field(name="requesterId")
+    app_id: str = msgspec.field(name="appId")
+    community_id: Optional[str] = msgspec.field(default=None, name="communityId")
+    goal: TaskGoalStruct
+    norms: Optional[List[NormStruct]] = None
+    attributes: Optional[Dict[str, Any]] = None
+    close_ts: Optional[Number] = msgspec.field(default=None, name="closeTs")
+    transactions: Optional[List[TaskTransactionStruct]] = None
+
+    def to_model(self) -> Task:
+        return Task(
+            self.id,
+            self.creation_ts,
+            self.last_update_ts,
+            self.task_type_id,
+            self.requester_id,
+            self.app_id,
+            self.community_id,
+            self.goal.to_model(),
+            [norm.to_model() for norm in self.norms] if self.norms else None,
+            self.attributes,
+            self.close_ts,
+            [transaction.to_model() for transaction in self.transactions] if self.transactions else None
+        )
+
+    @staticmethod
+    def from_model(task: Task) -> TaskStruct:
+        return TaskStruct(
+            id=task.task_id,
+            creation_ts=task.creation_ts,
+            last_update_ts=task.last_update_ts,
+            task_type_id=task.task_type_id,
+            requester_id=task.requester_id,
+            app_id=task.app_id,
+            community_id=task.community_id,
+            goal=TaskGoalStruct.from_model(task.goal),
+            norms=[NormStruct.from_model(norm) for norm in task.norms],
+            attributes=task.attributes,
+            close_ts=task.close_ts,
+            transactions=[TaskTransactionStruct.from_model(transaction) for transaction in task.transactions]
+        )
+
+
+class TaskPageStruct(msgspec.Struct, kw_only=True):
+    offset: int
+    total: int
+    tasks: Optional[List[TaskStruct]] = None
+
+    def to_model(self) -> TaskPage:
+        return TaskPage(self.offset, self.total, [task.to_model() for task in self.tasks] if self.tasks else None)
+
+    @staticmethod
+    def from_model(page: TaskPage) -> TaskPageStruct:
+        return TaskPageStruct(offset=page.offset, total=page.total, tasks=[TaskStruct.from_model(task) for task in page.tasks])
+
+
+class UserNameStruct(msgspec.Struct, kw_only=True):
+    first: Optional[str] = None
+    middle: Optional[str] = None
+    last: Optional[str] = None
+    prefix: Optional[str] = None
+    suffix: Optional[str] = None
+
+    def to_model(self) -> UserName:
+        return UserName(self.first, self.middle, self.last, self.prefix, self.suffix)
+
+    @staticmethod
+    def from_model(name: UserName) -> UserNameStruct:
+        return UserNameStruct(first=name.first, middle=name.middle, last=name.last, prefix=name.prefix, suffix=name.suffix)
+
+
+class DateStruct(msgspec.Struct, kw_only=True):
+    year: Optional[int] = None
+    month: Optional[int] = None
+    day: Optional[int] = None
+
+    def to_model(self) -> Date:
+        return Date(self.year, self.month, self.day)
+
+    @staticmethod
+    def from_model(date: Date) -> DateStruct:
+        return DateStruct(year=date.year, month=date.month, day=date.day)
+
+
+class WeNetUserProfileStruct(msgspec.Struct, kw_only=True):
+    id: Optional[str] = None
+    name: Optional[UserNameStruct] = None
+    date_of_birth: Optional[DateStruct] = msgspec.field(default=None, name="dateOfBirth")
+    gender: Optional[str] = None
+    email: Optional[str] = None
+    phone_number: Optional[str] = msgspec.field(default=None, name="phoneNumber")
+    locale: Optional[str] = None
+    avatar: Optional[str] = None
+    nationality: Optional[str] = None
+    occupation: Optional[str] = None
+    creation_ts: Optional[Number] = msgspec.field(default=None, name="_creationTs")
+    last_update_ts: Optional[Number] = msgspec.field(default=None, name="_lastUpdateTs")
+    norms: Optional[List[NormStruct]] = None
+    planned_activities: Optional[List[Any]] = msgspec.field(default=None, name="plannedActivities")
+    relevant_locations: Optional[List[Any]] = msgspec.field(default=None, name="relevantLocations")
+    relationships: Optional[List[Any]] = None
+    personal_behaviours: Optional[List[Any]] = msgspec.field(default=None, name="personalBehaviors")
+    materials: Optional[List[Any]] = None
+    competences: Optional[List[Any]] = None
+    meanings: Optional[List[Any]] = None
+
+    def to_model(self) -> WeNetUserProfile:
+        return WeNetUserProfile(
+            name=self.name.to_model() if self.name is not None else None,
+            date_of_birth=self.date_of_birth.to_model() if self.date_of_birth is not None else None,
+            gender=Gender(self.gender) if self.gender else None,
+            email=self.email,
+            phone_number=self.phone_number,
+            locale=self.locale,
+            avatar=self.avatar,
+            nationality=self.nationality,
+            occupation=self.occupation,
+            creation_ts=self.creation_ts,
+            last_update_ts=self.last_update_ts,
+            profile_id=self.id,
+            norms=[norm.to_model() for norm in self.norms] if self.norms else None,
+            planned_activities=self.planned_activities,
+            relevant_locations=self.relevant_locations,
+            relationships=self.relationships,
+            personal_behaviours=self.personal_behaviours,
+            materials=self.materials,
+            competences=self.competences,
+            meanings=self.meanings
+        )
+
+    @staticmethod
+    def from_model(profile: WeNetUserProfile) -> WeNetUserProfileStruct:
+        return WeNetUserProfileStruct(
+            id=str(profile.profile_id),
+            name=UserNameStruct.from_model(profile.name) if profile.name is not None else None,
+            date_of_birth=DateStruct.from_model(profile.date_of_birth) if profile.date_of_birth is not None else None,
+            gender=profile.gender.value if profile.gender else None,
+            email=profile.email,
+            phone_number=profile.phone_number,
+            locale=profile.locale,
+            avatar=profile.avatar,
+            nationality=profile.nationality,
+            occupation=profile.occupation,
+            creation_ts=profile.creation_ts,
+            last_update_ts=profile.last_update_ts,
+            norms=[NormStruct.from_model(norm) for norm in profile.norms],
+            planned_activities=profile.planned_activities,
+            relevant_locations=profile.relevant_locations,
+            relationships=profile.relationships,
+            personal_behaviours=profile.personal_behaviours,
+            materials=profile.materials,
+            competences=profile.competences,
+            meanings=profile.meanings
+        )
+
+
+class WeNetUserProfilesPageStruct(msgspec.Struct, kw_only=True):
+    offset: int
+    total: int
+    profiles: Optional[List[WeNetUserProfileStruct]] = None
+
+    def to_model(self) -> WeNetUserProfilesPage:
+        return WeNetUserProfilesPage(self.offset, self.total, [profile.to_model() for profile in self.profiles] if self.profiles else None)
+
+    @staticmethod
+    def from_model(page: WeNetUserProfilesPage) -> WeNetUserProfilesPageStruct:
+        return WeNetUserProfilesPageStruct(offset=page.offset, total=page.total, profiles=[WeNetUserProfileStruct.from_model(profile) for profile in page.profiles])
+
+
+class AppStruct(msgspec.Struct, kw_only=True):
+    id: str
+    name: str
+    status: AppStatus
+    owner_id: int = msgspec.field(name="ownerId")
+    image_url: Optional[str] = None
+    creation_ts: Optional[Number] = msgspec.field(default=None, name="createdAt")
+    last_update_ts: Optional[Number] = msgspec.field(default=None, name="updatedAt")
+    metadata: Optional[Dict[str, Any]] = None
+    message_callback_url: Optional[str] = msgspec.field(default=None, name="messageCallbackUrl")
+
+    def to_model(self) -> App:
+        return App(self.creation_ts, self.last_update_ts, self.id, self.status, self.name, self.owner_id, self.image_url, self.message_callback_url, self.metadata)
+
+    @staticmethod
+    def from_model(app: App) -> AppStruct:
+        return AppStruct(
+            id=app.app_id,
+            name=app.name,
+            status=app.status,
+            owner_id=app.owner_id,
+            image_url=app.image_url,
+            creation_ts=app.creation_ts,
+            last_update_ts=app.last_update_ts,
+            metadata=app.metadata,
+            message_callback_url=app.message_callback_url
+        )
+
+
+# The struct of each model supporting typed decoding
+STRUCTS: Dict[type, Type[msgspec.Struct]] = {
+    Task: TaskStruct,
+    TaskTransaction: TaskTransactionStruct,
+    TaskPage: TaskPageStruct,
+    WeNetUserProfile: WeNetUserProfileStruct,
+    WeNetUserProfilesPage: WeNetUserProfilesPageStruct,
+    App: AppStruct,
+}
+
+S = TypeVar("S", bound=msgspec.Struct)
+M = TypeVar("M")
+
+_decoders: Dict[type, msgspec.json.Decoder] = {}
+_encoder = msgspec.json.Encoder()
+
+
+def decode(data: Union[bytes, str], struct_type: Type[S]) -> S:
+    """
+    Decode and validate a JSON document into a struct
+
+    :param data: the raw JSON document
+    :param struct_type: the type of struct to decode
+    :return: the struct
+    :raises ValueError: if the document is not valid JSON or does not match the schema of the struct
+    """
+    decoder = _decoders.get(struct_type)
+    if decoder is None:
+        decoder = msgspec.json.Decoder(struct_type)
+        _decoders[struct_type] = decoder
+    try:
+        return decoder.decode(data)
+    except msgspec.DecodeError as e:
+        raise ValueError(f"Invalid [{struct_type.__name__}] document: {e}") from e
+
+
+def decode_model(data: Union[bytes, str], model_type: Type[M]) -> M:
+    """
+    Decode and validate a JSON document directly into a model (e.g. `TaskPage`), without building intermediate dictionaries
+
+    :param data: the raw JSON document
+    :param model_type: the type of model, one of the keys of `STRUCTS`
+    :return: the model
+    :raises ValueError: if the document is not valid JSON or does not match the schema of the model
+    """
+    return decode(data, _struct_of(model_type)).to_model()
+
+
+def encode(item: Union[msgspec.Struct, Any]) -> bytes:
+    """
+    Encode a struct, or a model supporting typed decoding, into a JSON document
+    """
+    if not isinstance(item, msgspec.Struct):
+        item = _struct_of(type(item)).from_model(item)
+    return _encoder.encode(item)
+
+
+def _struct_of(model_type: type) -> Type[msgspec.Struct]:
+    for base in model_type.__mro__:
+        struct_type = STRUCTS.get(base)
+        if struct_type is not None:
+            return struct_type
+    raise TypeError(f"No struct available for [{model_type.__name__}]")
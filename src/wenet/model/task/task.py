@@ -5,6 +5,7 @@ from numbers import Number
 from typing import Optional, List
 
 from wenet.model.norm import Norm
+from wenet.model.repr_cache import CachedRepr, cached_repr
 from wenet.model.task.transaction import TaskTransaction
 
 
@@ -18,13 +19,14 @@ class TaskState(Enum):
     CANCELLED = "Cancelled"
 
 
-class TaskGoal:
+class TaskGoal(CachedRepr):
 
     def __init__(self, name: str, description: str, keywords: Optional[List[str]] = None):
         self.name = name
         self.description = description
         self.keywords = keywords if keywords else []
 
+    @cached_repr
     def to_repr(self) -> dict:
         return {
             "name": self.name,
@@ -47,13 +49,13 @@ class TaskGoal:
         return self.name == o.name and self.description == o.description and self.keywords == o.keywords
 
     def __repr__(self) -> str:
-        return str(self.to_repr())
+        return f"TaskGoal(name={self.name!r})"
 
     def __str__(self):
-        return self.to_repr()
+        return self.__repr__()
 
 
-class Task:
+class Task(CachedRepr):
 
     def __init__(self,
                  task_id: Optional[str],
@@ -132,6 +134,7 @@ class Task:
         if not self.transactions:
             self.transactions = []
 
+    @cached_repr
     def to_repr(self) -> dict:
         return {
             "id": self.task_id,
@@ -177,7 +180,7 @@ class Task:
         return task_repr
 
     def __repr__(self):
-        return str(self.to_repr())
+        return f"Task(task_id={self.task_id!r}, app_id={self.app_id!r}, requester_id={self.requester_id!r})"
 
     def __str__(self):
         return self.__repr__()
@@ -243,7 +246,7 @@ class TaskPage:
         return self.offset == o.offset and self.total == o.total and self.tasks == o.tasks
 
     def __repr__(self) -> str:
-        return str(self.to_repr())
+        return f"TaskPage(offset={self.offset!r}, total={self.total!r}, tasks={len(self.tasks)})"
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -3,9 +3,10 @@ from __future__ import absolute_import, annotations
 from typing import Optional, List
 
 from wenet.model.callback_message.message import Message
+from wenet.model.repr_cache import CachedRepr, cached_repr
 
 
-class TaskTransaction:
+class TaskTransaction(CachedRepr):
 
     def __init__(self, transaction_id: Optional[str], task_id: str, label: str, creation_ts: int, last_update_ts: int,
                  actioneer_id: str, attributes: Optional[dict], messages: Optional[List[Message]] = None):
@@ -32,6 +33,7 @@ class TaskTransaction:
         if not self.messages:
             self.messages = []
 
+    @cached_repr
     def to_repr(self) -> dict:
         repr_dict = {
             "taskId": self.task_id,
@@ -67,7 +69,7 @@ class TaskTransaction:
             self.id == o.id and self.actioneer_id == o.actioneer_id
 
     def __repr__(self) -> str:
-        return str(self.to_repr())
+        return f"TaskTransaction(id={self.id!r}, task_id={self.task_id!r}, label={self.label!r})"
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -124,7 +126,7 @@ class TaskTransactionPage:
         return self.offset == o.offset and self.total == o.total and self.transactions == o.transactions
 
     def __repr__(self) -> str:
-        return str(self.to_repr())
+        return f"TaskTransactionPage(offset={self.offset!r}, total={self.total!r}, transactions={len(self.transactions)})"
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from iso639 import is_valid639_1
+from wenet.model.repr_cache import CachedRepr, cached_repr
 
 
 class PlatformType(Enum):
@@ -21,7 +21,7 @@ class Gender(Enum):
     NOT_SAY = "not-say"
 
 
-class Date:
+class Date(CachedRepr):
 
     def __init__(self, year: Optional[int], month: Optional[int], day: Optional[int]):
         """
@@ -57,6 +57,7 @@ class Date:
         else:
             return False
 
+    @cached_repr
     def to_repr(self) -> dict:
         return {
             "year": self.year,
@@ -80,7 +81,7 @@ class Date:
             return datetime(year=self.year, month=self.month, day=self.day)
 
     def __repr__(self):
-        return str(self.to_repr())
+        return f"Date(year={self.year!r}, month={self.month!r}, day={self.day!r})"
 
     def __str__(self):
         return self.__repr__()
@@ -113,6 +114,8 @@ class UserLanguage:
         if not isinstance(code, str):
             raise TypeError("Code should be a string")
 
+        from iso639 import is_valid639_1
+
         if not is_valid639_1(self.code):
             raise ValueError("[%s] is not a valid iso639-1 language" % self.code)
 
@@ -132,7 +135,7 @@ class UserLanguage:
         )
 
     def __repr__(self):
-        return str(self.to_repr())
+        return f"UserLanguage(code={self.code!r}, level={self.level!r})"
 
     def __str__(self):
         return self.__repr__()
@@ -0,0 +1,115 @@
+from __future__ import absolute_import, annotations
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from wenet.model.user.profile import CoreWeNetUserProfile, WeNetUserProfile
+
+
+def _to_repr(value):
+    return value.to_repr() if value is not None else None
+
+
+def _enum_value(value):
+    return value.value if value else None
+
+
+def _identity(value):
+    return value
+
+
+def _norms_repr(value):
+    return [norm.to_repr() for norm in value] if value is not None else None
+
+
+# (field of the representation, attribute of the profile, serialiser of the attribute)
+_CORE_FIELDS: List[Tuple[str, str, Callable]] = [
+    ("name", "name", _to_repr),
+    ("dateOfBirth", "date_of_birth", _to_repr),
+    ("gender", "gender", _enum_value),
+    ("email", "email", _identity),
+    ("phoneNumber", "phone_number", _identity),
+    ("locale", "locale", _identity),
+    ("avatar", "avatar", _identity),
+    ("nationality", "nationality", _identity),
+    ("occupation", "occupation", _identity),
+]
+
+_EXTENDED_FIELDS: List[Tuple[str, str, Callable]] = [
+    ("norms", "norms", _norms_repr),
+    ("plannedActivities", "planned_activities", _identity),
+    ("relevantLocations", "relevant_locations", _identity),
+    ("relationships", "relationships", _identity),
+    ("personalBehaviors", "personal_behaviours", _identity),
+    ("materials", "materials", _identity),
+    ("competences", "competences", _identity),
+    ("meanings", "meanings", _identity),
+]
+
+
+class ProfileDiff:
+    """
+    The top-level fields of a profile that changed between two of its versions, with their new representation.
+
+    Fields are compared on the attributes of the profiles, so only the changed ones are ever serialised.
+    The fields only available in a `WeNetUserProfile` (norms, competences, materials, ...) are compared only when
+    both versions are `WeNetUserProfile`; creation and update timestamps are never compared since they are handled
+    by the platform.
+    """
+
+    def __init__(self, profile_id: Optional[str], changes: Dict[str, object]) -> None:
+        self.profile_id = profile_id
+        self.changes = changes
+
+    @staticmethod
+    def compute(previous: CoreWeNetUserProfile, current: CoreWeNetUserProfile) -> ProfileDiff:
+        """
+        Compare two versions of the same profile
+
+        :param previous: the version of the profile known to the platform
+        :param current: the updated version of the profile
+        :return: the fields changed in the updated version
+        :raises ValueError: if the two profiles do not have the same identifier
+        """
+        if previous.profile_id != current.profile_id:
+            raise ValueError(f"Can not compare profile [{previous.profile_id}] with profile [{current.profile_id}]")
+
+        fields = _CORE_FIELDS
+        if isinstance(previous, WeNetUserProfile) and isinstance(current, WeNetUserProfile):
+            fields = _CORE_FIELDS + _EXTENDED_FIELDS
+
+        changes = {}
+        for field, attribute, serialise in fields:
+            value = getattr(current, attribute)
+            if getattr(previous, attribute) != value:
+                changes[field] = serialise(value)
+
+        return ProfileDiff(current.profile_id, changes)
+
+    @property
+    def changed_fields(self) -> List[str]:
+        return list(self.changes.keys())
+
+    def is_empty(self) -> bool:
+        return not self.changes
+
+    def to_repr(self) -> dict:
+        """
+        The minimal representation of the profile needed to apply the changes
+        """
+        changes_repr = {"id": self.profile_id}
+        changes_repr.update(self.changes)
+        return changes_repr
+
+    def __contains__(self, field: str) -> bool:
+        return field in self.changes
+
+    def __repr__(self) -> str:
+        return f"ProfileDiff(profile_id={self.profile_id!r}, changed_fields={self.changed_fields!r})"
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    def __eq__(self, o):
+        if not isinstance(o, ProfileDiff):
+            return False
+        return self.profile_id == o.profile_id and self.changes == o.changes
@@ -2,15 +2,19 @@ from __future__ import absolute_import, annotations
 
 import re
 from numbers import Number
-from typing import List, Optional, Dict
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, List, Optional
 
 from wenet.model.scope import AbstractScopeMappings, Scope
 from wenet.model.user.common import Gender, Date
 from wenet.model.norm import Norm
-from babel.core import Locale
+from wenet.model.repr_cache import CachedRepr, cached_repr
 
 
-class CoreWeNetUserProfile:
+PUBLIC_SCOPES = frozenset([Scope.ID, Scope.FIRST_NAME, Scope.LAST_NAME])
+
+
+class CoreWeNetUserProfile(CachedRepr):
 
     class ScopeMappings(AbstractScopeMappings):
         @staticmethod
@@ -25,6 +29,18 @@ class CoreWeNetUserProfile:
                 Scope.EMAIL: "email",
             }
 
+        @staticmethod
+        def _get_field_getters() -> Dict[str, Callable[[object], object]]:
+            return {
+                "id": lambda profile: str(profile.profile_id),
+                "dateOfBirth": lambda profile: profile.date_of_birth.to_repr() if profile.date_of_birth is not None else None,
+                "gender": lambda profile: profile.gender.value if profile.gender else None,
+                "nationality": attrgetter("nationality"),
+                "locale": attrgetter("locale"),
+                "phoneNumber": attrgetter("phone_number"),
+                "email": attrgetter("email"),
+            }
+
     def __init__(self,
                  name: Optional[UserName],
                  date_of_birth: Optional[Date],
@@ -115,6 +131,7 @@ class CoreWeNetUserProfile:
             if not isinstance(profile_id, str):
                 raise TypeError("Profile id should be a string")
 
+    @cached_repr
     def to_repr(self) -> dict:
         return {
             "name": self.name.to_repr() if self.name is not None else None,
@@ -131,28 +148,40 @@ class CoreWeNetUserProfile:
             "id": str(self.profile_id),
         }
 
-    def to_filtered_repr(self, scope_list: List[Scope]) -> dict:
-        profile_repr = self.to_repr()
-
+    def to_filtered_repr(self, scope_list: Iterable[Scope]) -> dict:
+        scopes = scope_list if isinstance(scope_list, frozenset) else frozenset(scope_list)
         result = {
-            "name": self.name.to_filtered_repr(scope_list) if self.name is not None else None
+            "name": self.name.to_filtered_repr(scopes) if self.name is not None else None
         }
-
-        for scope in scope_list:
-            field = self.ScopeMappings.get_field(scope)
-            if field is not None:
-                result[field] = profile_repr[field]
-
+        result.update(self.ScopeMappings.get_projection(scopes)(self))
         return result
 
     def to_public_repr(self) -> dict:
-        scopes = [
-            Scope.ID,
-            Scope.FIRST_NAME,
-            Scope.LAST_NAME
-        ]
+        return self.to_filtered_repr(PUBLIC_SCOPES)
+
+    @staticmethod
+    def to_filtered_reprs(profiles: Iterable[CoreWeNetUserProfile], scope_list: Iterable[Scope]) -> List[dict]:
+        """
+        Build the filtered representation of many profiles, compiling the projection of the scopes only once
+
+        :param profiles: the profiles
+        :param scope_list: the scopes allowed
+        :return: the filtered representations, in the order of the profiles
+        """
+        scopes = frozenset(scope_list)
+        profile_projection = CoreWeNetUserProfile.ScopeMappings.get_projection(scopes)
+        name_projection = UserName.ScopeMappings.get_projection(scopes)
+
+        result = []
+        for profile in profiles:
+            profile_repr = {"name": name_projection(profile.name) if profile.name is not None else None}
+            profile_repr.update(profile_projection(profile))
+            result.append(profile_repr)
+        return result
 
-        return self.to_filtered_repr(scopes)
+    @staticmethod
+    def to_public_reprs(profiles: Iterable[CoreWeNetUserProfile]) -> List[dict]:
+        return CoreWeNetUserProfile.to_filtered_reprs(profiles, PUBLIC_SCOPES)
 
     @staticmethod
     def from_repr(raw_data: dict, profile_id: Optional[str] = None) -> CoreWeNetUserProfile:
@@ -197,6 +226,9 @@ class CoreWeNetUserProfile:
 
     @staticmethod
     def is_valid_locale(locale: str) -> bool:
+        # Babel takes a while to import, it is only loaded when the first locale is validated
+        from babel.core import Locale
+
         try:
             Locale.parse(locale)
             return True
@@ -204,7 +236,7 @@ class CoreWeNetUserProfile:
             return False
 
     def __repr__(self):
-        return str(self.to_repr())
+        return f"CoreWeNetUserProfile(profile_id={self.profile_id!r})"
 
     def __str__(self):
         return self.__repr__()
@@ -335,6 +367,7 @@ class WeNetUserProfile(CoreWeNetUserProfile):
         else:
             self.personal_behaviours = []
 
+    @cached_repr
     def to_repr(self) -> dict:
         base_repr = super().to_repr()
         base_repr.update({
@@ -396,7 +429,7 @@ class WeNetUserProfile(CoreWeNetUserProfile):
         return self
 
     def __repr__(self):
-        return str(self.to_repr())
+        return f"WeNetUserProfile(profile_id={self.profile_id!r})"
 
     def __str__(self):
         return self.__repr__()
@@ -459,7 +492,7 @@ class WeNetUserProfile(CoreWeNetUserProfile):
         )
 
 
-class UserName:
+class UserName(CachedRepr):
 
     class ScopeMappings(AbstractScopeMappings):
         @staticmethod
@@ -472,6 +505,10 @@ class UserName:
                 Scope.SUFFIX_NAME: "suffix",
             }
 
+        @staticmethod
+        def _get_field_getters() -> Dict[str, Callable[[object], object]]:
+            return {field: attrgetter(field) for field in ["first", "middle", "last", "prefix", "suffix"]}
+
     def __init__(self, first: Optional[str], middle: Optional[str], last: Optional[str], prefix: Optional[str], suffix: Optional[str]):
         self.first = first
         self.middle = middle
@@ -495,6 +532,7 @@ class UserName:
             if not isinstance(suffix, str):
                 raise TypeError("Suffix should be a string")
 
+    @cached_repr
     def to_repr(self, public_profile: bool = False) -> dict:
         if public_profile:
             return {
@@ -510,16 +548,8 @@ class UserName:
                 "suffix": self.suffix
             }
 
-    def to_filtered_repr(self, scope_list: List[Scope]) -> dict:
-        name_repr = self.to_repr()
-        result = {}
-
-        for scope in scope_list:
-            field = self.ScopeMappings.get_field(scope)
-            if field is not None:
-                result[field] = name_repr[field]
-
-        return result
+    def to_filtered_repr(self, scope_list: Iterable[Scope]) -> dict:
+        return self.ScopeMappings.get_projection(scope_list)(self)
 
     @staticmethod
     def from_repr(raw_data: dict) -> UserName:
@@ -542,7 +572,7 @@ class UserName:
         )
 
     def __repr__(self):
-        return str(self.to_repr())
+        return f"UserName(first={self.first!r}, last={self.last!r})"
 
     def __str__(self):
         return self.__repr__()
@@ -604,7 +634,7 @@ class WeNetUserProfilesPage:
         return self.offset == o.offset and self.total == o.total and self.profiles == o.profiles
 
     def __repr__(self) -> str:
-        return str(self.to_repr())
+        return f"WeNetUserProfilesPage(offset={self.offset!r}, total={self.total!r}, profiles={len(self.profiles)})"
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -658,7 +688,7 @@ class UserIdentifiersPage:
         return self.offset == o.offset and self.total == o.total and self.user_ids == o.user_ids
 
     def __repr__(self) -> str:
-        return str(self.to_repr())
+        return f"UserIdentifiersPage(offset={self.offset!r}, total={self.total!r}, user_ids={len(self.user_ids)})"
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -1,14 +1,20 @@
 from __future__ import absolute_import, annotations
 
-import json
+import importlib
 import logging
 import os
+import re
+import time
 import uuid
 from abc import ABC
 from json import JSONDecodeError
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
 
-import redis
+from wenet.utils import codec
+
+if TYPE_CHECKING:
+    import redis
+    import redis.asyncio
 
 logger = logging.getLogger("wenet.storage.cache")
 
@@ -34,6 +40,14 @@ class BaseCache(ABC):
         """
         pass
 
+    def delete(self, key: str) -> None:
+        """
+        Remove the data associated to the specified key, if any.
+
+        :param str key: the data key
+        """
+        pass
+
     @staticmethod
     def _generate_id():
         return str(uuid.uuid4())
@@ -56,15 +70,36 @@ class InMemoryCache(BaseCache):
     def get(self, key: str) -> Optional[dict]:
         return self._cache.get(key, None)
 
+    def delete(self, key: str) -> None:
+        self._cache.pop(key, None)
+
 
 class RedisCache(BaseCache):
     """
     Cache allows to store data in Redis.
     Cached data will only be available for a limited and specified amount of time.
+
+    The keys of a cache with a namespace are prefixed by `<namespace>:`, so that caches of different kinds of data can
+    share the same database and be invalidated separately. The keys of a versioned namespace are also prefixed by the
+    current generation of the namespace (`<namespace>:g<generation>:`), so that all of them are invalidated at once by
+    incrementing the generation; other processes see the new generation within `generation_refresh_interval` seconds.
     """
 
-    def __init__(self, r: redis.Redis) -> None:
+    def __init__(self, r: redis.Redis, namespace: Optional[str] = None, versioned: bool = False, generation_refresh_interval: float = 1.0) -> None:
+        """
+        :param r: the redis connection
+        :param namespace: the prefix of the keys of the cache, if any
+        :param versioned: whether the namespace is versioned, requires a namespace
+        :param generation_refresh_interval: the seconds the generation of a versioned namespace is kept before reading it again from Redis
+        """
+        if versioned and not namespace:
+            raise ValueError("A versioned cache requires a namespace")
         self._r = r
+        self.namespace = namespace
+        self.versioned = versioned
+        self.generation_refresh_interval = generation_refresh_interval
+        self._generation: Optional[int] = None
+        self._generation_read_at = 0.0
 
     def cache(self, data: dict, key: Optional[str] = None, **kwargs) -> str:
         """
@@ -81,62 +116,449 @@ class RedisCache(BaseCache):
         if key is None:
             key = self._generate_id()
 
-        self._set(key, json.dumps(data), kwargs.get("ttl", None))
+        self._set(self._key(key), codec.dumps(data), kwargs.get("ttl", None))
         return key
 
-    def _set(self, key: str, value: str, ttl: Optional[int]) -> None:
-        logger.debug(f"Caching data for key [{key}] and ttl [{ttl}]")
+    def _set(self, key: str, value: bytes, ttl: Optional[int]) -> None:
+        logger.debug("Caching data for key [%s] and ttl [%s]", key, ttl)
         if ttl:
             self._r.set(key, value, ex=ttl)
         else:
             self._r.set(key, value)
 
     def get(self, key: str) -> Optional[dict]:
-        logger.debug(f"Getting cached data for key [{key}]")
-        result = self._get(key)
-        if result is not None:
-            try:
-                result = json.loads(result)
-            except JSONDecodeError as e:
-                logger.exception(f"Could not parse cached data for key [{key}]", exc_info=e)
-                raise e
+        logger.debug("Getting cached data for key [%s]", key)
+        return _decode(key, self._get(self._key(key)))
+
+    def _get(self, key) -> Optional[bytes]:
+        return self._r.get(key)
+
+    def delete(self, key: str) -> None:
+        logger.debug("Deleting cached data for key [%s]", key)
+        self._r.delete(self._key(key))
+
+    def _key(self, key: str) -> str:
+        """
+        :return: the key in Redis of a key of the cache
+        """
+        if not self.namespace:
+            return key
+        if self.versioned:
+            return f"{self.namespace}:g{self.generation()}:{key}"
+        return f"{self.namespace}:{key}"
+
+    def _generation_key(self) -> str:
+        return f"{self.namespace}:generation"
+
+    def generation(self) -> int:
+        """
+        :return: the current generation of the versioned namespace of the cache
+        """
+        now = time.monotonic()
+        if self._generation is None or now - self._generation_read_at >= self.generation_refresh_interval:
+            value = self._r.get(self._generation_key())
+            self._generation = int(value) if value is not None else 0
+            self._generation_read_at = now
+        return self._generation
+
+    def invalidate_all(self, batch_size: int = 500, pause: float = 0.0) -> None:
+        """
+        Invalidate all the data of the namespace of the cache.
+
+        A versioned namespace is invalidated in constant time by incrementing its generation, the data of the previous
+        generations is then removed by its time to live or by `purge_stale_generations`. The data of a namespace that is
+        not versioned is removed with `invalidate_prefix`.
+
+        :param batch_size: the number of keys scanned and removed at once, for namespaces that are not versioned
+        :param pause: the seconds to wait between batches, for namespaces that are not versioned
+        """
+        if not self.namespace:
+            raise ValueError("Only the data of a cache with a namespace can be invalidated")
+        if self.versioned:
+            self._generation = self._r.incr(self._generation_key())
+            self._generation_read_at = time.monotonic()
+            logger.info("Invalidated namespace [%s], now at generation [%s]", self.namespace, self._generation)
         else:
-            logger.debug(f"No data for key [{key}]")
+            self.invalidate_prefix("", batch_size=batch_size, pause=pause)
 
-        return result
+    def invalidate_prefix(self, prefix: str, batch_size: int = 500, pause: float = 0.0) -> int:
+        """
+        Remove the data whose keys start with a prefix, in the current generation of the namespace if versioned.
 
-    def _get(self, key) -> str:
-        return self._r.get(key)
+        Keys are found incrementally with SCAN and removed with UNLINK, which frees their memory in background, in
+        batches, so that Redis is never blocked for long and keeps serving the other clients.
+
+        :param prefix: the prefix of the keys of the cache to remove
+        :param batch_size: the number of keys scanned and removed at once
+        :param pause: the seconds to wait between batches, to further limit the load on Redis
+        :return: the number of removed keys
+        """
+        if not self.namespace and not prefix:
+            raise ValueError("Removing all the keys of the database requires a prefix or a namespace")
+        return self._unlink_matching(_escape_pattern(self._key(prefix)) + "*", batch_size, pause)
+
+    def purge_stale_generations(self, batch_size: int = 500, pause: float = 0.0) -> int:
+        """
+        Remove the data of the previous generations of the versioned namespace of the cache, with SCAN and UNLINK.
+
+        :param batch_size: the number of keys scanned and removed at once
+        :param pause: the seconds to wait between batches
+        :return: the number of removed keys
+        """
+        if not self.versioned:
+            raise ValueError("Only a versioned cache has stale generations")
+        current = f"{self.namespace}:g{self.generation()}:"
+        return self._unlink_matching(_escape_pattern(f"{self.namespace}:g") + "*", batch_size, pause,
+                                     lambda key: not key.startswith(current))
+
+    def _unlink_matching(self, pattern: str, batch_size: int, pause: float, accept: Optional[Callable[[str], bool]] = None) -> int:
+        removed = 0
+        batch = []
+        for key in self._r.scan_iter(match=pattern, count=batch_size):
+            if accept is not None and not accept(key.decode("utf-8") if isinstance(key, bytes) else key):
+                continue
+            batch.append(key)
+            if len(batch) >= batch_size:
+                removed += self._r.unlink(*batch)
+                batch = []
+                if pause:
+                    time.sleep(pause)
+        if batch:
+            removed += self._r.unlink(*batch)
+        logger.debug("Removed [%s] keys matching [%s]", removed, pattern)
+        return removed
+
+    def lock(self, name: str, timeout: float) -> redis.lock.Lock:
+        """
+        Get a lock shared by all the clients of the Redis database.
+
+        :param name: the name of the lock
+        :param timeout: the seconds after which the lock is released if its owner did not release it
+        :return: the lock, not acquired yet
+        """
+        return self._r.lock(self.shared_key(name), timeout=timeout)
+
+    def shared_key(self, name: str) -> str:
+        """
+        :return: the key in Redis of data shared by all the clients of the namespace, and kept when a versioned namespace is invalidated (e.g. locks)
+        """
+        return f"{self.namespace}:{name}" if self.namespace else name
+
+    @property
+    def client(self) -> redis.Redis:
+        """
+        :return: the Redis client of the cache, for the data structures other than cached entries
+        """
+        return self._r
+
+    def close(self) -> None:
+        """
+        Close the connections of the pool of the cache
+        """
+        self._r.close()
 
     @staticmethod
     def _build_redis_from_env() -> redis.Redis:
         """
-        Build the Redis connection using environment variables.
-
-        Required environment variables are:
-          - REDIS_HOST - default to 'localhost'
-          - REDIS_PORT - default to '6379'
-          - REDIS_DB - default to '0'
+        Build the Redis connection using environment variables, see `build_from_env`.
 
         :return: the redis connection
         """
-        return redis.Redis(
-            host=os.getenv("REDIS_HOST", "localhost"),
-            port=int(os.getenv("REDIS_PORT", 6379)),
-            db=int(os.getenv("REDIS_DB", 0))
-        )
+        return _build_client_from_env("redis")
 
     @staticmethod
-    def build_from_env() -> RedisCache:
+    def build_from_env(namespace: Optional[str] = None, versioned: bool = False) -> RedisCache:
         """
         Build the Redis cache using environment variables.
 
-        Required environment variables are:
+        Supported environment variables are:
+          - REDIS_MODE - one of 'standalone', 'sentinel' or 'cluster', default to 'standalone'
           - REDIS_HOST - default to 'localhost'
           - REDIS_PORT - default to '6379'
           - REDIS_DB - default to '0'
-
+          - REDIS_USERNAME, REDIS_PASSWORD - the credentials, if any
+          - REDIS_SSL - whether to connect with TLS, default to 'false'
+          - REDIS_SSL_CA_CERTS - the path of the CA certificates used to verify the server, if any
+          - REDIS_SSL_CERT_REQS - whether the server certificate is 'required', 'optional' or 'none', default to 'required'
+          - REDIS_MAX_CONNECTIONS - the size of the connection pool, default to '50'
+          - REDIS_POOL_TIMEOUT - the seconds to wait for a free connection of a full pool (standalone mode), default to '20'
+          - REDIS_SOCKET_TIMEOUT - the timeout of the commands in seconds, default to '5'
+          - REDIS_SOCKET_CONNECT_TIMEOUT - the timeout of new connections in seconds, default to '5'
+          - REDIS_HEALTH_CHECK_INTERVAL - the seconds after which an idle connection is checked before use, default to '30'
+          - REDIS_SENTINELS - the comma separated `host:port` of the sentinels (sentinel mode)
+          - REDIS_SENTINEL_SERVICE - the name of the monitored master (sentinel mode), default to 'mymaster'
+          - REDIS_SENTINEL_PASSWORD - the password of the sentinels (sentinel mode), if any
+          - REDIS_CLUSTER_NODES - the comma separated `host:port` of the startup nodes (cluster mode), default to 'REDIS_HOST:REDIS_PORT'
+
+        :param namespace: the prefix of the keys of the cache, if any
+        :param versioned: whether the namespace is versioned
         :return: the redis cache
         """
         r = RedisCache._build_redis_from_env()
-        return RedisCache(r)
+        return RedisCache(r, namespace=namespace, versioned=versioned)
+
+    @staticmethod
+    def build_sentinel_from_env(namespace: Optional[str] = None, versioned: bool = False) -> RedisCache:
+        """
+        Build the Redis cache on the master monitored by Redis Sentinel, using the environment variables of `build_from_env`.
+
+        :param namespace: the prefix of the keys of the cache, if any
+        :param versioned: whether the namespace is versioned
+        :return: the redis cache
+        """
+        return RedisCache(_build_client_from_env("redis", mode="sentinel"), namespace=namespace, versioned=versioned)
+
+    @staticmethod
+    def build_cluster_from_env(namespace: Optional[str] = None, versioned: bool = False) -> RedisCache:
+        """
+        Build the Redis cache on a Redis Cluster, using the environment variables of `build_from_env`.
+
+        :param namespace: the prefix of the keys of the cache, if any
+        :param versioned: whether the namespace is versioned
+        :return: the redis cache
+        """
+        return RedisCache(_build_client_from_env("redis", mode="cluster"), namespace=namespace, versioned=versioned)
+
+
+class AsyncRedisCache:
+    """
+    Cache allows to store data in Redis from asyncio applications, through `redis.asyncio`.
+    Cached data will only be available for a limited and specified amount of time.
+
+    The keys of a cache with a namespace are prefixed by `<namespace>:`, as in `RedisCache`.
+    """
+
+    def __init__(self, r: redis.asyncio.Redis, namespace: Optional[str] = None) -> None:
+        """
+        :param r: the redis connection
+        :param namespace: the prefix of the keys of the cache, if any
+        """
+        self._r = r
+        self.namespace = namespace
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}" if self.namespace else key
+
+    async def cache(self, data: dict, key: Optional[str] = None, **kwargs) -> str:
+        """
+        Cache data in dictionary format.
+
+        Among the kwargs:
+
+        * ttl: the time to live of the data entry (expressed in seconds)
+
+        :param dict data: the data to cache
+        :param key: the key to save the data
+        :return: the identifier associated to the data entry
+        """
+        if key is None:
+            key = BaseCache._generate_id()
+
+        ttl = kwargs.get("ttl", None)
+        logger.debug("Caching data for key [%s] and ttl [%s]", key, ttl)
+        if ttl:
+            await self._r.set(self._key(key), codec.dumps(data), ex=ttl)
+        else:
+            await self._r.set(self._key(key), codec.dumps(data))
+        return key
+
+    async def get(self, key: str) -> Optional[dict]:
+        """
+        Get cached data associated to the specified key.
+
+        :param str key: the data key
+        :return: the requested data, if it exists
+        """
+        logger.debug("Getting cached data for key [%s]", key)
+        return _decode(key, await self._r.get(self._key(key)))
+
+    async def delete(self, key: str) -> None:
+        """
+        Remove the data associated to the specified key, if any.
+
+        :param str key: the data key
+        """
+        logger.debug("Deleting cached data for key [%s]", key)
+        await self._r.delete(self._key(key))
+
+    async def invalidate_prefix(self, prefix: str, batch_size: int = 500, pause: float = 0.0) -> int:
+        """
+        Remove the data whose keys start with a prefix, with SCAN and UNLINK in batches as in `RedisCache.invalidate_prefix`.
+
+        :param prefix: the prefix of the keys of the cache to remove
+        :param batch_size: the number of keys scanned and removed at once
+        :param pause: the seconds to wait between batches, to further limit the load on Redis
+        :return: the number of removed keys
+        """
+        # Already imported by the running event loop, not at module level to keep the import of the synchronous cache light
+        import asyncio
+
+        if not self.namespace and not prefix:
+            raise ValueError("Removing all the keys of the database requires a prefix or a namespace")
+        pattern = _escape_pattern(self._key(prefix)) + "*"
+        removed = 0
+        batch = []
+        async for key in self._r.scan_iter(match=pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                removed += await self._r.unlink(*batch)
+                batch = []
+                if pause:
+                    await asyncio.sleep(pause)
+        if batch:
+            removed += await self._r.unlink(*batch)
+        logger.debug("Removed [%s] keys matching [%s]", removed, pattern)
+        return removed
+
+    async def close(self) -> None:
+        """
+        Close the connections of the pool of the cache
+        """
+        # `aclose` replaced `close` in redis 5
+        close = getattr(self._r, "aclose", None) or self._r.close
+        await close()
+
+    @staticmethod
+    def build_from_env(namespace: Optional[str] = None) -> AsyncRedisCache:
+        """
+        Build the asyncio Redis cache using the environment variables of `RedisCache.build_from_env`.
+
+        :param namespace: the prefix of the keys of the cache, if any
+        :return: the redis cache
+        """
+        return AsyncRedisCache(_build_client_from_env("redis.asyncio"), namespace=namespace)
+
+    @staticmethod
+    def build_sentinel_from_env(namespace: Optional[str] = None) -> AsyncRedisCache:
+        """
+        Build the asyncio Redis cache on the master monitored by Redis Sentinel, using the environment variables of `RedisCache.build_from_env`.
+
+        :param namespace: the prefix of the keys of the cache, if any
+        :return: the redis cache
+        """
+        return AsyncRedisCache(_build_client_from_env("redis.asyncio", mode="sentinel"), namespace=namespace)
+
+    @staticmethod
+    def build_cluster_from_env(namespace: Optional[str] = None) -> AsyncRedisCache:
+        """
+        Build the asyncio Redis cache on a Redis Cluster, using the environment variables of `RedisCache.build_from_env`.
+
+        :param namespace: the prefix of the keys of the cache, if any
+        :return: the redis cache
+        """
+        return AsyncRedisCache(_build_client_from_env("redis.asyncio", mode="cluster"), namespace=namespace)
+
+
+def _decode(key: str, result: Optional[bytes]) -> Optional[dict]:
+    if result is None:
+        logger.debug("No data for key [%s]", key)
+        return None
+    try:
+        return codec.loads(result)
+    except JSONDecodeError as e:
+        logger.exception("Could not parse cached data for key [%s]", key, exc_info=e)
+        raise e
+
+
+def _escape_pattern(value: str) -> str:
+    """
+    :return: the value escaped for a glob-style pattern of Redis
+    """
+    return re.sub(r"([*?\[\]\\])", r"\\\1", value)
+
+
+def _flag_from_env(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _seconds_from_env(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+def _addresses_from_env(name: str, default: str) -> List[Tuple[str, int]]:
+    addresses = []
+    for address in os.getenv(name, default).split(","):
+        address = address.strip()
+        if address:
+            host, _, port = address.rpartition(":")
+            addresses.append((host, int(port)) if host else (port, 6379))
+    return addresses
+
+
+def _connection_kwargs_from_env() -> dict:
+    """
+    :return: the options of the connections shared by standalone, sentinel and cluster clients
+    """
+    kwargs = {
+        "username": os.getenv("REDIS_USERNAME") or None,
+        "password": os.getenv("REDIS_PASSWORD") or None,
+        "socket_timeout": _seconds_from_env("REDIS_SOCKET_TIMEOUT", 5),
+        "socket_connect_timeout": _seconds_from_env("REDIS_SOCKET_CONNECT_TIMEOUT", 5),
+        "health_check_interval": _seconds_from_env("REDIS_HEALTH_CHECK_INTERVAL", 30),
+    }
+    if _flag_from_env("REDIS_SSL"):
+        kwargs["ssl_ca_certs"] = os.getenv("REDIS_SSL_CA_CERTS") or None
+        kwargs["ssl_cert_reqs"] = os.getenv("REDIS_SSL_CERT_REQS", "required")
+    return kwargs
+
+
+def _build_client_from_env(module_name: str, mode: Optional[str] = None):
+    """
+    Build a Redis client configured by the environment variables described in `RedisCache.build_from_env`
+
+    :param module_name: the module of the client, `redis` or `redis.asyncio`
+    :param mode: the deployment of Redis, by default the one in REDIS_MODE
+    :return: the client
+    """
+    module = importlib.import_module(module_name)
+    mode = (mode or os.getenv("REDIS_MODE", "standalone")).lower()
+    host = os.getenv("REDIS_HOST", "localhost")
+    port = int(os.getenv("REDIS_PORT", 6379))
+    max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+    ssl = _flag_from_env("REDIS_SSL")
+    kwargs = _connection_kwargs_from_env()
+    logger.debug("Building a %s redis client in [%s] mode with at most [%s] connections", module_name, mode, max_connections)
+
+    if mode == "standalone":
+        pool = module.BlockingConnectionPool(
+            host=host,
+            port=port,
+            db=int(os.getenv("REDIS_DB", 0)),
+            max_connections=max_connections,
+            timeout=_seconds_from_env("REDIS_POOL_TIMEOUT", 20),
+            connection_class=module.SSLConnection if ssl else module.Connection,
+            **kwargs
+        )
+        return module.Redis(connection_pool=pool)
+
+    if mode == "sentinel":
+        sentinel_module = importlib.import_module(f"{module_name}.sentinel")
+        sentinel_password = os.getenv("REDIS_SENTINEL_PASSWORD") or None
+        sentinel = sentinel_module.Sentinel(
+            _addresses_from_env("REDIS_SENTINELS", f"{host}:26379"),
+            sentinel_kwargs={
+                "password": sentinel_password,
+                "socket_timeout": kwargs["socket_timeout"],
+                "socket_connect_timeout": kwargs["socket_connect_timeout"]
+            }
+        )
+        return sentinel.master_for(
+            os.getenv("REDIS_SENTINEL_SERVICE", "mymaster"),
+            db=int(os.getenv("REDIS_DB", 0)),
+            max_connections=max_connections,
+            ssl=ssl,
+            **kwargs
+        )
+
+    if mode == "cluster":
+        cluster_module = importlib.import_module(f"{module_name}.cluster")
+        startup_nodes = [cluster_module.ClusterNode(node_host, node_port) for node_host, node_port in _addresses_from_env("REDIS_CLUSTER_NODES", f"{host}:{port}")]
+        return cluster_module.RedisCluster(startup_nodes=startup_nodes, max_connections=max_connections, ssl=ssl, **kwargs)
+
+    raise ValueError(f"Unsupported REDIS_MODE [{mode}], expected one of 'standalone', 'sentinel' or 'cluster'")
@@ -0,0 +1,318 @@
+from __future__ import absolute_import, annotations
+
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from wenet.storage.cache import RedisCache
+from wenet.utils import codec
+
+
+logger = logging.getLogger("wenet.storage.coordinator")
+
+
+# Each script reads the time of Redis, so that the leases of all the nodes expire on the same clock
+
+_CREATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  return 0
+end
+for index = 1, #ARGV do
+  redis.call('HSET', KEYS[1], tostring(index - 1), ARGV[index])
+  redis.call('RPUSH', KEYS[2], tostring(index - 1))
+end
+return 1
+"""
+
+# Lease an expired shard, or else a pending one, unless it was already leased `max_attempts` times
+_LEASE_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local max_attempts = tonumber(ARGV[3])
+while true do
+  local shard
+  local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now, 'LIMIT', 0, 1)
+  if #expired > 0 then
+    shard = expired[1]
+  else
+    shard = redis.call('LPOP', KEYS[1])
+    if not shard then
+      return false
+    end
+  end
+  local attempts = redis.call('HINCRBY', KEYS[4], shard, 1)
+  if max_attempts > 0 and attempts > max_attempts then
+    redis.call('ZREM', KEYS[2], shard)
+    redis.call('HDEL', KEYS[3], shard)
+    redis.call('SADD', KEYS[6], shard)
+  else
+    redis.call('ZADD', KEYS[2], now + tonumber(ARGV[1]), shard)
+    redis.call('HSET', KEYS[3], shard, ARGV[2])
+    return {shard, redis.call('HGET', KEYS[5], shard), redis.call('HGET', KEYS[7], shard) or false, attempts}
+  end
+end
+"""
+
+_HEARTBEAT_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then
+  return 0
+end
+local time = redis.call('TIME')
+redis.call('ZADD', KEYS[1], tonumber(time[1]) + tonumber(time[2]) / 1000000 + tonumber(ARGV[3]), ARGV[1])
+if ARGV[4] then
+  redis.call('HSET', KEYS[3], ARGV[1], ARGV[4])
+end
+return 1
+"""
+
+_COMPLETE_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then
+  return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('SADD', KEYS[3], ARGV[1])
+return 1
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then
+  return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('RPUSH', KEYS[3], ARGV[1])
+return 1
+"""
+
+
+class ShardLease:
+    """
+    The lease of a shard of an export job by a worker, valid until it is not renewed for the lease time to live.
+    A lease that expired may be given to another worker: from then on its operations fail and it is `lost`.
+    """
+
+    def __init__(self, coordinator: ExportCoordinator, shard_id: str, shard: dict, progress: Optional[dict], token: str, attempt: int) -> None:
+        """
+        :param coordinator: the coordinator of the job
+        :param shard_id: the identifier of the shard in the job
+        :param shard: the shard, as planned
+        :param progress: the progress checkpointed by the previous workers of the shard, if any
+        :param token: the token identifying the lease
+        :param attempt: the number of times the shard was leased, including this one
+        """
+        self._coordinator = coordinator
+        self.shard_id = shard_id
+        self.shard = shard
+        self.progress = progress
+        self.token = token
+        self.attempt = attempt
+        self.lost = False
+
+    def heartbeat(self) -> bool:
+        """
+        Renew the lease
+
+        :return: whether the lease is still owned
+        """
+        return self._owned(self._coordinator._heartbeat(self, None))
+
+    def checkpoint(self, progress: dict) -> bool:
+        """
+        Store the progress of the shard, from which the next worker resumes it if this one crashes, and renew the lease
+
+        :param progress: the progress, that can be encoded as JSON
+        :return: whether the lease is still owned, otherwise the worker should stop
+        """
+        if self._owned(self._coordinator._heartbeat(self, progress)):
+            self.progress = progress
+        return not self.lost
+
+    def complete(self) -> bool:
+        """
+        Mark the shard as exported
+
+        :return: whether the lease was still owned
+        """
+        return self._owned(self._coordinator._complete(self))
+
+    def release(self) -> bool:
+        """
+        Give the shard back to the pending ones, with its progress, e.g. after a failure
+
+        :return: whether the lease was still owned
+        """
+        return self._owned(self._coordinator._release(self))
+
+    def _owned(self, owned: bool) -> bool:
+        if not owned and not self.lost:
+            logger.warning("Lost the lease of shard [%s] of export [%s]", self.shard_id, self._coordinator.job_id)
+            self.lost = True
+        return owned
+
+    def __repr__(self) -> str:
+        return f"ShardLease(shard_id={self.shard_id!r}, attempt={self.attempt!r}, lost={self.lost!r})"
+
+
+class ExportCoordinator:
+    """
+    Coordinate an export job split in shards (e.g. time windows or offset ranges) among workers on different nodes,
+    through Redis.
+
+    Workers lease the pending shards, renew their leases with heartbeats while exporting them, and checkpoint their
+    progress. The shards whose lease was not renewed in time, because their worker crashed or hung, are leased again
+    by the other workers, which resume them from their last checkpoint. A shard leased more than `max_attempts` times
+    is marked as failed instead.
+
+    All the keys of a job share the hash tag of its identifier, so that a job is kept in a single slot of a Redis Cluster.
+    """
+
+    def __init__(self, cache: RedisCache, job_id: str, lease_ttl: float = 60, max_attempts: int = 5) -> None:
+        """
+        :param cache: the Redis cache whose connection and namespace store the job
+        :param job_id: the identifier of the job, shared by its workers
+        :param lease_ttl: the seconds after which a lease that is not renewed expires
+        :param max_attempts: the maximum number of leases of a shard, 0 for no maximum
+        """
+        self.job_id = job_id
+        self.lease_ttl = lease_ttl
+        self.max_attempts = max_attempts
+        self._r = cache.client
+        prefix = cache.shared_key(f"export:{{{job_id}}}")
+        self._keys: Dict[str, str] = {name: f"{prefix}:{name}" for name in ("shards", "pending", "leases", "owners", "attempts", "progress", "done", "failed")}
+        self._create_script = self._r.register_script(_CREATE_SCRIPT)
+        self._lease_script = self._r.register_script(_LEASE_SCRIPT)
+        self._heartbeat_script = self._r.register_script(_HEARTBEAT_SCRIPT)
+        self._complete_script = self._r.register_script(_COMPLETE_SCRIPT)
+        self._release_script = self._r.register_script(_RELEASE_SCRIPT)
+
+    @staticmethod
+    def build_from_env(job_id: str, lease_ttl: float = 60, max_attempts: int = 5, namespace: Optional[str] = None) -> ExportCoordinator:
+        """
+        Build the coordinator of a job on the Redis configured by the environment variables of `RedisCache.build_from_env`
+
+        :param job_id: the identifier of the job, shared by its workers
+        :param lease_ttl: the seconds after which a lease that is not renewed expires
+        :param max_attempts: the maximum number of leases of a shard, 0 for no maximum
+        :param namespace: the prefix of the keys of the job, if any
+        :return: the coordinator
+        """
+        return ExportCoordinator(RedisCache.build_from_env(namespace=namespace), job_id, lease_ttl, max_attempts)
+
+    def create(self, shards: List[dict]) -> bool:
+        """
+        Create the job with its shards, unless it already exists, so that all the workers can call it with the same plan
+
+        :param shards: the shards, that can be encoded as JSON
+        :return: whether the job was created
+        """
+        created = bool(self._create_script(keys=[self._keys["shards"], self._keys["pending"]], args=[codec.dumps(shard) for shard in shards]))
+        if created:
+            logger.info("Created export [%s] with [%s] shards", self.job_id, len(shards))
+        return created
+
+    def lease(self) -> Optional[ShardLease]:
+        """
+        Lease a shard whose lease expired, or else a pending shard
+
+        :return: the lease, None if no shard is available
+        """
+        token = uuid.uuid4().hex
+        keys = [self._keys[name] for name in ("pending", "leases", "owners", "attempts", "shards", "failed", "progress")]
+        leased = self._lease_script(keys=keys, args=[self.lease_ttl, token, self.max_attempts])
+        if not leased:
+            return None
+
+        shard_id, shard, progress, attempt = leased
+        shard_id = shard_id.decode() if isinstance(shard_id, bytes) else shard_id
+        logger.debug("Leased shard [%s] of export [%s], attempt [%s]", shard_id, self.job_id, attempt)
+        return ShardLease(self, shard_id, codec.loads(shard), codec.loads(progress) if progress else None, token, int(attempt))
+
+    def status(self) -> Dict[str, int]:
+        """
+        :return: the number of shards of the job, and of the pending, leased, done and failed ones
+        """
+        pipeline = self._r.pipeline(transaction=False)
+        pipeline.hlen(self._keys["shards"])
+        pipeline.llen(self._keys["pending"])
+        pipeline.zcard(self._keys["leases"])
+        pipeline.scard(self._keys["done"])
+        pipeline.scard(self._keys["failed"])
+        shards, pending, leased, done, failed = pipeline.execute()
+        return {"shards": shards, "pending": pending, "leased": leased, "done": done, "failed": failed}
+
+    def delete(self) -> None:
+        """
+        Delete the job and the state of its shards
+        """
+        self._r.unlink(*self._keys.values())
+
+    def work(self, process: Callable[[ShardLease], None], poll_interval: float = 1.0, heartbeat_interval: Optional[float] = None) -> int:
+        """
+        Process the shards of the job until all of them are done or failed, renewing the lease of each shard in
+        background while it is processed. While the other shards are leased by other workers, wait for them to
+        complete, or to expire and be leased again.
+
+        A shard whose processing raises an exception is released, to be leased again, and the worker goes on with the
+        next shard. A shard is completed once processed, unless its lease was lost meanwhile.
+
+        :param process: the function exporting a shard from its progress, checkpointing it with `ShardLease.checkpoint` and stopping when it returns False
+        :param poll_interval: the seconds to wait when all the remaining shards are leased
+        :param heartbeat_interval: the seconds between two renewals of a lease, by default a third of the lease time to live
+        :return: the number of shards completed by the worker
+        """
+        completed = 0
+        while True:
+            lease = self.lease()
+            if lease is None:
+                status = self.status()
+                if status["pending"] == 0 and status["leased"] == 0:
+                    return completed
+                time.sleep(poll_interval)
+                continue
+
+            with self._heartbeating(lease, heartbeat_interval or self.lease_ttl / 3):
+                try:
+                    process(lease)
+                except Exception as e:
+                    logger.warning("Could not export shard [%s] of export [%s], releasing it", lease.shard_id, self.job_id, exc_info=e)
+                    lease.release()
+                    continue
+            if not lease.lost and lease.complete():
+                completed += 1
+
+    @contextmanager
+    def _heartbeating(self, lease: ShardLease, interval: float) -> Iterator[None]:
+        stopped = threading.Event()
+
+        def heartbeat() -> None:
+            while not stopped.wait(interval):
+                try:
+                    if not lease.heartbeat():
+                        return
+                except Exception as e:
+                    # The lease expires if Redis is not reachable for its whole time to live
+                    logger.warning("Could not renew the lease of shard [%s] of export [%s]", lease.shard_id, self.job_id, exc_info=e)
+
+        thread = threading.Thread(target=heartbeat, name=f"wenet-export-heartbeat-{lease.shard_id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+    def _heartbeat(self, lease: ShardLease, progress: Optional[dict]) -> bool:
+        args = [lease.shard_id, lease.token, self.lease_ttl]
+        if progress is not None:
+            args.append(codec.dumps(progress))
+        return bool(self._heartbeat_script(keys=[self._keys["leases"], self._keys["owners"], self._keys["progress"]], args=args))
+
+    def _complete(self, lease: ShardLease) -> bool:
+        return bool(self._complete_script(keys=[self._keys["leases"], self._keys["owners"], self._keys["done"]], args=[lease.shard_id, lease.token]))
+
+    def _release(self, lease: ShardLease) -> bool:
+        return bool(self._release_script(keys=[self._keys["leases"], self._keys["owners"], self._keys["pending"]], args=[lease.shard_id, lease.token]))
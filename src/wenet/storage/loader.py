@@ -0,0 +1,263 @@
+from __future__ import absolute_import, annotations
+
+import copy
+import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Set, Tuple, Type
+
+from wenet.storage.cache import BaseCache, RedisCache
+from wenet.utils.singleflight import SingleFlight
+
+
+logger = logging.getLogger("wenet.storage.loader")
+
+
+class CacheLoader:
+    """
+    Fill a cache with the values computed by loaders, avoiding that many workers compute the same expired value at once.
+
+    Each entry has a soft and a hard time to live:
+
+    * before its soft expiration the cached value is returned;
+    * between its soft and hard expiration the stale value is returned while a single background refresh computes the new one;
+    * after its hard expiration, or when missing, the value is computed by a single loader, while the other workers wait for it.
+
+    Refreshes are also started a little before the soft expiration, with a probability growing as the expiration gets
+    closer and as the loader gets slower (probabilistic early expiration, also known as XFetch), so that the refreshes
+    of hot keys are spread over time.
+
+    Loaders are coordinated within the process by a single flight for each key, so that the loads of different keys
+    never wait for each other, and, optionally, by a Redis lock shared by all the processes using the same Redis cache.
+
+    Errors meaning that a value does not exist (e.g. `NotFound`) can be cached too, for a short time to live, so that
+    repeated requests of missing values do not reach the platform. Cached errors must have `to_repr` and `from_repr`
+    methods, and are raised again on the following requests until they expire or are invalidated.
+    """
+
+    def __init__(self,
+                 cache: BaseCache,
+                 soft_ttl: float = 60,
+                 hard_ttl: float = 600,
+                 beta: float = 1.0,
+                 distributed_lock: bool = False,
+                 lock_timeout: float = 10,
+                 refresh_workers: int = 2,
+                 negative_ttl: float = 30
+                 ) -> None:
+        """
+        :param cache: the cache storing the values
+        :param soft_ttl: the seconds after which a value is refreshed in background
+        :param hard_ttl: the seconds after which a value is no longer returned
+        :param beta: the weight of the probabilistic early expiration, 0 disables it
+        :param distributed_lock: whether to coordinate the loaders of different processes with a Redis lock, requires a RedisCache
+        :param lock_timeout: the seconds after which the lock of a loader expires, and the maximum time waited for the value computed by another process
+        :param refresh_workers: the number of threads refreshing stale values
+        :param negative_ttl: the seconds a cached error is raised again without calling the loader
+        """
+        if hard_ttl < soft_ttl:
+            raise ValueError(f"The hard ttl [{hard_ttl}] can not be shorter than the soft ttl [{soft_ttl}]")
+        if distributed_lock and not isinstance(cache, RedisCache):
+            raise ValueError("A distributed lock requires a RedisCache")
+
+        self._cache = cache
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.beta = beta
+        self.distributed_lock = distributed_lock
+        self.lock_timeout = lock_timeout
+        self._refresh_workers = refresh_workers
+        self.negative_ttl = negative_ttl
+        self._loads = SingleFlight()
+        self._refreshing: Set[str] = set()
+        self._refreshing_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get_or_load(self,
+                    key: str,
+                    loader: Callable[[], Any],
+                    soft_ttl: Optional[float] = None,
+                    hard_ttl: Optional[float] = None,
+                    cache_errors: Tuple[Type[Exception], ...] = ()
+                    ) -> Any:
+        """
+        Get the value cached for a key, computing it with the loader if it is missing or expired
+
+        :param key: the key of the value
+        :param loader: the function computing the value, returning data that can be encoded as JSON
+        :param soft_ttl: the soft time to live of the value, by default the one of the loader
+        :param hard_ttl: the hard time to live of the value, by default the one of the loader
+        :param cache_errors: the errors of the loader to cache for the negative time to live
+        :return: a copy of the value, that can be modified by the caller
+        """
+        soft_ttl = self.soft_ttl if soft_ttl is None else soft_ttl
+        hard_ttl = self.hard_ttl if hard_ttl is None else hard_ttl
+
+        entry = self._get_entry(key, cache_errors)
+        if entry is not None:
+            if self._should_refresh(entry):
+                self._refresh_in_background(key, loader, soft_ttl, hard_ttl, cache_errors)
+            return copy.deepcopy(entry["value"])
+
+        def load() -> Any:
+            # Another thread may have loaded the value since it was found missing
+            loaded_entry = self._get_entry(key, cache_errors)
+            if loaded_entry is not None:
+                return loaded_entry["value"]
+            return self._load(key, loader, soft_ttl, hard_ttl, cache_errors, wait=True)
+
+        # The concurrent callers of the same key wait for a single load, and get its value or its error; each of them
+        # gets its own copy of the value, so that it never aliases the cached one nor the ones of the other callers
+        return copy.deepcopy(self._loads.do(key, load))
+
+    def load_unless_missing(self, key: str, loader: Callable[[], Any], cache_errors: Tuple[Type[Exception], ...]) -> Any:
+        """
+        Compute a value with the loader, without caching it, unless an error of the loader is cached for the key
+
+        :param key: the key of the cached error
+        :param loader: the function computing the value
+        :param cache_errors: the errors of the loader to cache for the negative time to live
+        :return: the value
+        """
+        self._get_entry(key, cache_errors)
+        try:
+            return loader()
+        except cache_errors as e:
+            self._cache_error(key, e, 0.0)
+            raise
+
+    def invalidate(self, key: str) -> None:
+        """
+        Remove the value cached for a key, so that it is computed again on the next request
+        """
+        logger.debug("Invalidating cached value for key [%s]", key)
+        self._cache.delete(key)
+
+    def close(self) -> None:
+        """
+        Wait for the background refreshes to complete and stop their threads
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_entry(self, key: str, cache_errors: Tuple[Type[Exception], ...] = ()) -> Optional[dict]:
+        """
+        :return: the entry cached for the key, if not expired
+        :raise: the error cached for the key, if not expired
+        """
+        entry = self._cache.get(key)
+        if entry is None or time.time() >= entry["hardExpiresAt"]:
+            return None
+        if "error" in entry:
+            for error_type in cache_errors:
+                if error_type.__name__ == entry["error"]["type"]:
+                    logger.debug("Raising cached [%s] for key [%s]", error_type.__name__, key)
+                    raise error_type.from_repr(entry["error"]["repr"])
+            return None
+        return entry
+
+    def _cache_error(self, key: str, error: Exception, delta: float) -> None:
+        now = time.time()
+        entry = {
+            "error": {"type": type(error).__name__, "repr": error.to_repr()},
+            "delta": delta,
+            "softExpiresAt": now + self.negative_ttl,
+            "hardExpiresAt": now + self.negative_ttl
+        }
+        self._cache.cache(entry, key=key, ttl=int(math.ceil(self.negative_ttl)))
+        logger.debug("Cached [%s] for key [%s]", type(error).__name__, key)
+
+    def _should_refresh(self, entry: dict) -> bool:
+        now = time.time()
+        if now >= entry["softExpiresAt"]:
+            return True
+        if self.beta <= 0:
+            return False
+        # XFetch: expire early with a probability that grows with the duration of the loader and the closeness of the expiration
+        return now - entry["delta"] * self.beta * math.log(1.0 - random.random()) >= entry["softExpiresAt"]
+
+    def _load(self, key: str, loader: Callable[[], Any], soft_ttl: float, hard_ttl: float, cache_errors: Tuple[Type[Exception], ...], wait: bool) -> Any:
+        lock = self._acquire_distributed_lock(key)
+        if lock is False:
+            if not wait:
+                return None
+            # Another process is loading the value
+            entry = self._wait_for_entry(key, cache_errors)
+            if entry is not None:
+                return entry["value"]
+            lock = None
+
+        try:
+            start = time.time()
+            try:
+                value = loader()
+            except cache_errors as e:
+                self._cache_error(key, e, time.time() - start)
+                raise
+            now = time.time()
+            entry = {
+                "value": value,
+                "delta": now - start,
+                "softExpiresAt": now + soft_ttl,
+                "hardExpiresAt": now + hard_ttl
+            }
+            self._cache.cache(entry, key=key, ttl=int(math.ceil(hard_ttl)))
+            logger.debug("Loaded value for key [%s] in [%.3f] seconds", key, entry["delta"])
+            return value
+        finally:
+            if lock:
+                self._release_distributed_lock(key, lock)
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Any], soft_ttl: float, hard_ttl: float, cache_errors: Tuple[Type[Exception], ...]) -> None:
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._refresh_workers, thread_name_prefix="wenet-cache-loader")
+            executor = self._executor
+
+        def refresh() -> None:
+            try:
+                self._load(key, loader, soft_ttl, hard_ttl, cache_errors, wait=False)
+            except Exception as e:
+                logger.warning("Could not refresh cached value for key [%s], the stale value is kept", key, exc_info=e)
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(key)
+
+        logger.debug("Refreshing cached value for key [%s] in background", key)
+        executor.submit(refresh)
+
+    def _acquire_distributed_lock(self, key: str):
+        """
+        :return: the acquired lock, False if it is held by another process, None if no distributed lock is used
+        """
+        if not self.distributed_lock:
+            return None
+        lock = self._cache.lock(f"{key}:lock", timeout=self.lock_timeout)
+        return lock if lock.acquire(blocking=False) else False
+
+    @staticmethod
+    def _release_distributed_lock(key: str, lock) -> None:
+        try:
+            lock.release()
+        except Exception as e:
+            # The lock expired, and may have been acquired by another process
+            logger.warning("Could not release the lock of key [%s]", key, exc_info=e)
+
+    def _wait_for_entry(self, key: str, cache_errors: Tuple[Type[Exception], ...]) -> Optional[dict]:
+        deadline = time.time() + self.lock_timeout
+        delay = 0.01
+        while time.time() < deadline:
+            time.sleep(delay)
+            entry = self._get_entry(key, cache_errors)
+            if entry is not None:
+                return entry
+            delay = min(delay * 2, 0.2)
+        logger.warning("Timed out waiting for the value of key [%s] loaded by another process", key)
+        return None
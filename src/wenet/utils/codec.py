@@ -0,0 +1,174 @@
+from __future__ import absolute_import, annotations
+
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Union
+
+
+logger = logging.getLogger("wenet.utils.codec")
+
+
+class JsonCodec(ABC):
+    """
+    Encode and decode JSON documents.
+
+    Implementations always encode to UTF-8 bytes and decode from either bytes or strings,
+    raising `json.JSONDecodeError` (a ValueError) when the document is not valid JSON, whatever the library used.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        pass
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+def _decode_error(error: Exception, data: Union[bytes, bytearray, memoryview, str]) -> json.JSONDecodeError:
+    if not isinstance(data, str):
+        data = bytes(data).decode("utf-8", errors="replace")
+    return json.JSONDecodeError(str(error), data, 0)
+
+
+class StdlibJsonCodec(JsonCodec):
+
+    name = "json"
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, data: Any) -> bytes:
+        return self._orjson.dumps(data, option=self._options)
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+        self._decode_error = msgspec.DecodeError
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, data: Any) -> bytes:
+        return self._encoder.encode(data)
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as e:
+            raise _decode_error(e, data) from e
+
+
+class UjsonCodec(JsonCodec):
+
+    name = "ujson"
+
+    def __init__(self) -> None:
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, data: Any) -> bytes:
+        return self._ujson.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        try:
+            return self._ujson.loads(data)
+        except json.JSONDecodeError:
+            raise
+        except ValueError as e:
+            raise _decode_error(e, data) from e
+
+
+# The available codecs, from the preferred one
+CODECS: Dict[str, Callable[[], JsonCodec]] = {
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec,
+    UjsonCodec.name: UjsonCodec,
+    StdlibJsonCodec.name: StdlibJsonCodec,
+}
+
+
+def build_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Build a JSON codec.
+
+    :param name: the name of the codec (`orjson`, `msgspec`, `ujson` or `json`), by default the value of the
+        `WENET_JSON_CODEC` environment variable or, if not set, the fastest installed one
+    :return: the codec
+    :raises ValueError: if the codec does not exist
+    :raises ImportError: if the library of the requested codec is not installed
+    """
+    if name is None:
+        name = os.getenv("WENET_JSON_CODEC")
+
+    if name:
+        if name not in CODECS:
+            raise ValueError(f"Unknown JSON codec [{name}], available codecs are {list(CODECS)}")
+        return CODECS[name]()
+
+    for codec_name, codec_builder in CODECS.items():
+        try:
+            return codec_builder()
+        except ImportError:
+            logger.debug("JSON codec [%s] is not available", codec_name)
+    return StdlibJsonCodec()
+
+
+_codec: Optional[JsonCodec] = None
+
+
+def get_codec() -> JsonCodec:
+    global _codec
+    if _codec is None:
+        _codec = build_codec()
+    return _codec
+
+
+def set_codec(codec: Union[JsonCodec, str, None]) -> JsonCodec:
+    """
+    Change the JSON codec used by the interfaces and the caches
+
+    :param codec: the codec, the name of the codec or None to use the default one
+    :return: the codec in use
+    """
+    global _codec
+    _codec = codec if isinstance(codec, JsonCodec) else build_codec(codec)
+    return _codec
+
+
+def dumps(data: Any) -> bytes:
+    return get_codec().dumps(data)
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    return get_codec().loads(data)
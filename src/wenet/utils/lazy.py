@@ -0,0 +1,49 @@
+from __future__ import absolute_import, annotations
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    A placeholder of a module imported on the first access to one of its attributes.
+
+    Attributes are always read from the imported module, so the placeholder can be used in place of the module
+    (e.g. `requests = LazyModule("requests")` and then `requests.get(...)`), and attributes set on the placeholder,
+    as done by `unittest.mock.patch`, take precedence over the ones of the module until they are deleted.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+
+    def _load(self) -> types.ModuleType:
+        module = sys.modules.get(self.__name__)
+        if module is None or module is self:
+            module = importlib.import_module(self.__name__)
+        return module
+
+    def __getattr__(self, attribute: str):
+        if attribute.startswith("__") and attribute.endswith("__"):
+            raise AttributeError(attribute)
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        loaded = self.__name__ in sys.modules
+        return f"<lazy module {self.__name__!r}{'' if loaded else ' (not imported)'}>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Get a module, importing it only on first use if it was not already imported
+
+    :param name: the full name of the module
+    :return: the module, or a placeholder importing it on the first access to one of its attributes
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
@@ -0,0 +1,125 @@
+from __future__ import absolute_import, annotations
+
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key from different threads: the first caller runs the function while
+    the others wait for it, and all of them get its result, or its exception.
+    Calls made once the function completed run it again, nothing is cached.
+
+    The result is the same object for all the concurrent callers: it must be treated as read-only, or copied by
+    each caller before being modified.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Run a function, unless another thread is already running it for the same key
+
+        :param key: the key identifying identical calls
+        :param function: the function to run
+        :return: the result of the function, the same object for all the concurrent callers
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        """
+        :return: the number of keys with a running call
+        """
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Coalesce concurrent calls with the same key in an asyncio event loop: the first caller awaits the coroutine while
+    the others await its result, or its exception.
+    Calls made once the coroutine completed run it again, nothing is cached.
+
+    As with `SingleFlight`, the result is the same object for all the concurrent callers, and must be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, Any] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await a coroutine, unless another task is already awaiting it for the same key
+
+        :param key: the key identifying identical calls
+        :param function: the function returning the coroutine to await
+        :return: the result of the coroutine, shared by all the concurrent callers
+        """
+        import asyncio
+
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Shielded, so that a cancelled waiter does not cancel the call of the other ones
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved, so that no warning is logged when no other caller was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def in_flight(self) -> int:
+        """
+        :return: the number of keys with a running call
+        """
+        return len(self._calls)
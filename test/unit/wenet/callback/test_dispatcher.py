@@ -0,0 +1,210 @@
+from __future__ import absolute_import, annotations
+
+import asyncio
+import copy
+import json
+import queue
+import threading
+from unittest import TestCase
+
+from wenet.callback.dispatcher import CallbackDispatcher, AsyncCallbackDispatcher
+from wenet.model.callback_message.event import WeNetAuthenticationEvent
+from wenet.model.callback_message.message import TextualMessage, TaskProposalNotification
+
+
+class TestCallbackDispatcher(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.dispatcher = CallbackDispatcher(workers=2, max_queue_size=10)
+
+    def tearDown(self):
+        self.dispatcher.stop(timeout=5)
+        super().tearDown()
+
+    def test_route_by_label(self):
+        textual_messages = []
+        proposals = []
+        self.dispatcher.on_message(TextualMessage.LABEL, textual_messages.append)
+        self.dispatcher.on_message(TaskProposalNotification.LABEL, proposals.append)
+        self.dispatcher.start()
+
+        self.assertTrue(self.dispatcher.submit(TextualMessage("app_id", "receiver_id", "title", "text", {}).to_repr()))
+        self.assertTrue(self.dispatcher.submit(json.dumps(TaskProposalNotification("app_id", "receiver_id", {}).to_repr())))
+        self.dispatcher.stop(timeout=5)
+
+        self.assertEqual(1, len(textual_messages))
+        self.assertIsInstance(textual_messages[0], TextualMessage)
+        self.assertEqual(1, len(proposals))
+        self.assertIsInstance(proposals[0], TaskProposalNotification)
+
+    def test_route_by_event_type(self):
+        events = []
+        self.dispatcher.on_event(WeNetAuthenticationEvent.TYPE, events.append)
+        self.dispatcher.start()
+
+        self.dispatcher.submit(json.dumps(WeNetAuthenticationEvent("external_id", "code").to_repr()).encode("utf-8"))
+        self.dispatcher.stop(timeout=5)
+
+        self.assertEqual([WeNetAuthenticationEvent("external_id", "code")], events)
+
+    def test_default_handler(self):
+        handled = []
+        self.dispatcher.on_default(handled.append)
+        self.dispatcher.start()
+
+        self.dispatcher.submit(TextualMessage("app_id", "receiver_id", "title", "text", {}).to_repr())
+        self.dispatcher.stop(timeout=5)
+
+        self.assertEqual(1, len(handled))
+
+    def test_unhandled(self):
+        self.dispatcher.start()
+        self.dispatcher.submit(TextualMessage("app_id", "receiver_id", "title", "text", {}).to_repr())
+        self.dispatcher.stop(timeout=5)
+
+        self.assertEqual(1, self.dispatcher.metrics_repr()["unhandled"])
+
+    def test_receiver_ordering(self):
+        handled = []
+        self.dispatcher.on_message(TextualMessage.LABEL, lambda message: handled.append((message.receiver_id, message.text)))
+        self.dispatcher.start()
+
+        for index in range(5):
+            for receiver_id in ["first", "second"]:
+                self.dispatcher.submit(TextualMessage("app_id", receiver_id, "title", str(index), {}).to_repr())
+        self.dispatcher.stop(timeout=5)
+
+        for receiver_id in ["first", "second"]:
+            self.assertEqual([str(index) for index in range(5)], [text for receiver, text in handled if receiver == receiver_id])
+
+    def test_deduplication(self):
+        handled = []
+        self.dispatcher.on_message(TextualMessage.LABEL, handled.append)
+        self.dispatcher.start()
+
+        raw_message = TextualMessage("app_id", "receiver_id", "title", "text", {}).to_repr()
+        self.assertTrue(self.dispatcher.submit(raw_message))
+        self.assertFalse(self.dispatcher.submit(json.dumps(raw_message)))
+        self.dispatcher.stop(timeout=5)
+
+        self.assertEqual(1, len(handled))
+        self.assertEqual(1, self.dispatcher.metrics_repr()["duplicated"])
+
+    def test_default_deduplication_key(self):
+        raw_message = TextualMessage("app_id", "receiver_id", "title", "text", {"ranks": {1: "first", 2: "second"}}).to_repr()
+        reordered = dict(reversed(list(copy.deepcopy(raw_message).items())))
+
+        self.assertEqual(CallbackDispatcher.default_deduplication_key(raw_message), CallbackDispatcher.default_deduplication_key(reordered))
+        raw_message["attributes"]["text"] = "other text"
+        self.assertNotEqual(CallbackDispatcher.default_deduplication_key(raw_message), CallbackDispatcher.default_deduplication_key(reordered))
+
+    def test_deduplication_disabled(self):
+        dispatcher = CallbackDispatcher(workers=1, max_queue_size=10, deduplication_window=0)
+        raw_message = TextualMessage("app_id", "receiver_id", "title", "text", {}).to_repr()
+        self.assertTrue(dispatcher.submit(raw_message))
+        self.assertTrue(dispatcher.submit(raw_message))
+
+    def test_invalid_callback(self):
+        with self.assertRaises(ValueError):
+            self.dispatcher.submit({"appId": "app_id"})
+        with self.assertRaises(ValueError):
+            self.dispatcher.submit("[]")
+
+    def test_queue_full(self):
+        dispatcher = CallbackDispatcher(workers=1, max_queue_size=1)
+        raw_message = TextualMessage("app_id", "receiver_id", "title", "text", {}).to_repr()
+        dispatcher.submit(raw_message)
+        with self.assertRaises(queue.Full):
+            dispatcher.submit(TextualMessage("app_id", "receiver_id", "title", "other", {}).to_repr(), block=False)
+
+        metrics = dispatcher.metrics_repr()
+        self.assertEqual(1, metrics["rejected"])
+        self.assertEqual(1, metrics["queueDepth"])
+
+    def test_failing_handler(self):
+        def failing_handler(message):
+            raise RuntimeError()
+
+        handled = []
+        self.dispatcher.on_message(TextualMessage.LABEL, failing_handler)
+        self.dispatcher.on_message(TextualMessage.LABEL, handled.append)
+        self.dispatcher.start()
+
+        self.dispatcher.submit(TextualMessage("app_id", "receiver_id", "title", "text", {}).to_repr())
+        self.dispatcher.stop(timeout=5)
+
+        metrics = self.dispatcher.metrics_repr()
+        self.assertEqual(1, len(handled))
+        self.assertEqual(1, metrics["failed"])
+        self.assertEqual(1, metrics["handlers"][TextualMessage.LABEL]["failed"])
+
+    def test_metrics(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_handler(message):
+            started.set()
+            release.wait(5)
+
+        self.dispatcher.on_message(TextualMessage.LABEL, blocking_handler)
+        self.dispatcher.start()
+        for index in range(3):
+            self.dispatcher.submit(TextualMessage("app_id", "receiver_id", "title", str(index), {}).to_repr())
+
+        started.wait(5)
+        self.assertEqual(2, self.dispatcher.metrics_repr()["queueDepth"])
+        release.set()
+        self.dispatcher.stop(timeout=5)
+
+        metrics = self.dispatcher.metrics_repr()
+        self.assertEqual(0, metrics["queueDepth"])
+        self.assertEqual(3, metrics["received"])
+        self.assertEqual(3, metrics["processed"])
+        self.assertEqual(3, metrics["handlers"][TextualMessage.LABEL]["count"])
+        self.assertGreaterEqual(metrics["handlers"][TextualMessage.LABEL]["maxLatency"], metrics["handlers"][TextualMessage.LABEL]["averageLatency"])
+
+
+class TestAsyncCallbackDispatcher(TestCase):
+
+    def test_dispatch(self):
+        handled = []
+
+        async def handle_message(message):
+            await asyncio.sleep(0)
+            handled.append(message.text)
+
+        async def run():
+            dispatcher = AsyncCallbackDispatcher(workers=2, max_queue_size=10)
+            dispatcher.on_message(TextualMessage.LABEL, handle_message)
+            dispatcher.on_event(WeNetAuthenticationEvent.TYPE, lambda event: handled.append(event.code))
+            await dispatcher.start()
+            for index in range(3):
+                await dispatcher.submit(TextualMessage("app_id", "receiver_id", "title", str(index), {}).to_repr())
+            await dispatcher.submit(WeNetAuthenticationEvent("external_id", "code").to_repr())
+            duplicated = await dispatcher.submit(WeNetAuthenticationEvent("external_id", "code").to_repr())
+            await dispatcher.stop()
+            return dispatcher, duplicated
+
+        dispatcher, duplicated = asyncio.new_event_loop().run_until_complete(run())
+
+        self.assertFalse(duplicated)
+        self.assertEqual(["0", "1", "2"], [text for text in handled if text != "code"])
+        self.assertIn("code", handled)
+        metrics = dispatcher.metrics_repr()
+        self.assertEqual(4, metrics["processed"])
+        self.assertEqual(1, metrics["duplicated"])
+        self.assertEqual(0, metrics["queueDepth"])
+
+    def test_queue_full(self):
+        async def run():
+            dispatcher = AsyncCallbackDispatcher(workers=1, max_queue_size=1)
+            await dispatcher.start()
+            await dispatcher.submit(TextualMessage("app_id", "receiver_id", "title", "text", {}).to_repr(), block=False)
+            with self.assertRaises(asyncio.QueueFull):
+                await dispatcher.submit(TextualMessage("app_id", "receiver_id", "title", "other", {}).to_repr(), block=False)
+            await dispatcher.stop()
+            return dispatcher
+
+        dispatcher = asyncio.new_event_loop().run_until_complete(run())
+        self.assertEqual(1, dispatcher.metrics_repr()["rejected"])
@@ -4,12 +4,15 @@ from typing import Union, Optional
 
 from requests import Response
 
+from wenet.utils import codec
+
 
 class MockResponse(Response):
 
     def __init__(self, response_content: Optional[Union[dict, list]]):
         super().__init__()
         self.response_content = response_content
+        self._content = codec.dumps(response_content)
 
     @property
     def text(self):
@@ -0,0 +1,141 @@
+from __future__ import absolute_import, annotations
+
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+from test.unit.wenet.interface.mock.client import MockApikeyClient
+from test.unit.wenet.interface.mock.response import MockResponse
+from wenet.interface.batch import BatchResult, ItemStatus, is_retriable, run_batch, run_bulk, unique_ids
+from wenet.interface.exceptions import CreationError, NotFound, UnexpectedResponse
+from wenet.interface.profile_manager import ProfileManagerInterface
+from wenet.interface.task_manager import TaskManagerInterface
+from wenet.model.task.task import Task, TaskGoal
+from wenet.model.user.profile import WeNetUserProfile
+
+
+class TestRunBatch(TestCase):
+
+    def test_unique_ids(self):
+        self.assertEqual(["b", "a", "c"], unique_ids(["b", "a", "b", "c", "a"]))
+
+    def test_results_and_errors(self):
+        def get(entity_id: str) -> str:
+            if entity_id == "missing":
+                raise NotFound("User", entity_id, 404, "")
+            return entity_id.upper()
+
+        result = run_batch(["a", "missing", "b", "a"], get, max_workers=4)
+
+        self.assertEqual({"a": "A", "b": "B"}, result.results)
+        self.assertEqual(["missing"], list(result.errors))
+        self.assertIsInstance(result.errors["missing"], NotFound)
+        self.assertFalse(result.ok)
+
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def get(entity_id: str) -> str:
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.005)
+            with lock:
+                running[0] -= 1
+            return entity_id
+
+        result = run_batch([str(index) for index in range(20)], get, max_workers=3)
+
+        self.assertTrue(result.ok)
+        self.assertEqual(20, len(result.results))
+        self.assertLessEqual(running[1], 3)
+
+    def test_sequential(self):
+        get = Mock(side_effect=lambda entity_id: entity_id)
+
+        self.assertEqual(BatchResult({"a": "a"}, {}), run_batch(["a"], get, max_workers=8))
+        get.assert_called_once_with("a")
+
+
+class TestRunBulk(TestCase):
+
+    def test_is_retriable(self):
+        self.assertTrue(is_retriable(UnexpectedResponse(503, "")))
+        self.assertTrue(is_retriable(CreationError(429, "")))
+        self.assertTrue(is_retriable(TimeoutError()))
+        self.assertFalse(is_retriable(CreationError(400, "")))
+        self.assertFalse(is_retriable(NotFound("Task", "task_id", 404, "")))
+        self.assertFalse(is_retriable(ValueError()))
+
+    def test_classified_results(self):
+        def operation(item: str) -> str:
+            if item == "busy":
+                raise UnexpectedResponse(503, "")
+            if item == "invalid":
+                raise CreationError(400, "")
+            return item.upper()
+
+        result = run_bulk(["a", "busy", "invalid", "b"], operation, max_workers=4)
+
+        self.assertFalse(result.ok)
+        self.assertEqual(["a", "busy", "invalid", "b"], [item.item for item in result.items])
+        self.assertEqual([ItemStatus.OK, ItemStatus.RETRIABLE, ItemStatus.PERMANENT, ItemStatus.OK], [item.status for item in result.items])
+        self.assertEqual(["A", "B"], result.values)
+        self.assertEqual(["busy"], result.items_to_retry())
+        self.assertEqual(["busy", "invalid"], result.items_to_retry(include_permanent=True))
+
+    def test_ok(self):
+        result = run_bulk([], Mock(), max_workers=4)
+
+        self.assertTrue(result.ok)
+        self.assertEqual([], result.items_to_retry())
+
+
+class TestCreateTasks(TestCase):
+
+    def test_create_tasks(self):
+        task_manager = TaskManagerInterface(MockApikeyClient(), "")
+        task_manager._client.enable_connection_pool = Mock()
+
+        def post(url: str, body: dict, **kwargs) -> MockResponse:
+            if body["appId"] == "busy":
+                response = MockResponse(None)
+                response.status_code = 503
+            else:
+                response = MockResponse(dict(body, id=f"task_{body['appId']}"))
+                response.status_code = 201
+            return response
+
+        task_manager._client.post = Mock(side_effect=post)
+        tasks = [Task(None, None, None, "", "", app_id, None, TaskGoal("", "")) for app_id in ["app_1", "busy", "app_2"]]
+
+        result = task_manager.create_tasks(tasks, max_workers=2)
+
+        self.assertEqual(["task_app_1", "task_app_2"], [task.task_id for task in result.values])
+        self.assertEqual([tasks[1]], result.items_to_retry())
+        self.assertIsInstance(result.failed[0].error, CreationError)
+        task_manager._client.enable_connection_pool.assert_called_once_with(2)
+
+
+class TestGetUserProfiles(TestCase):
+
+    def test_get_user_profiles(self):
+        profile_manager = ProfileManagerInterface(MockApikeyClient(), "")
+        profile_manager._client.enable_connection_pool = Mock()
+
+        def get(url: str, **kwargs) -> MockResponse:
+            user_id = url.rsplit("/", 1)[1]
+            response = MockResponse(WeNetUserProfile.empty(user_id).to_repr() if user_id != "missing" else None)
+            response.status_code = 200 if user_id != "missing" else 404
+            return response
+
+        profile_manager._client.get = Mock(side_effect=get)
+
+        result = profile_manager.get_user_profiles(["user_1", "missing", "user_2", "user_1"], max_workers=2)
+
+        self.assertEqual({"user_1": WeNetUserProfile.empty("user_1"), "user_2": WeNetUserProfile.empty("user_2")}, result.results)
+        self.assertIsInstance(result.errors["missing"], NotFound)
+        self.assertEqual(3, profile_manager._client.get.call_count)
+        profile_manager._client.enable_connection_pool.assert_called_once_with(2)
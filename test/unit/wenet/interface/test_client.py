@@ -0,0 +1,157 @@
+from __future__ import absolute_import, annotations
+
+import gzip
+import io
+import logging
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from requests import Response
+
+from wenet.interface.client import ApikeyClient, NoAuthenticationClient, Oauth2Client, RestClient, response_wire_size
+from wenet.storage.cache import InMemoryCache
+from wenet.utils import codec
+
+
+class TestOauth2Client(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = InMemoryCache()
+        self.cache.cache(Oauth2Client.ClientCredentials("token", "refresh_token").to_repr(), key="resourceId")
+        self.cache.get = Mock(wraps=self.cache.get)
+        self.client = Oauth2Client("clientId", "clientSecret", "resourceId", self.cache, token_endpoint_url="tokenEndpointUrl")
+        self.logger = logging.getLogger("wenet.interface.client")
+        self.level = self.logger.level
+
+    def tearDown(self):
+        self.logger.setLevel(self.level)
+        super().tearDown()
+
+    def test_no_token_lookup_for_disabled_debug_log(self):
+        self.logger.setLevel(logging.INFO)
+        with patch("wenet.interface.client.requests.get", return_value=Mock(status_code=200)) as get:
+            self.client.get("url")
+
+        self.assertEqual("bearer token", get.call_args.kwargs["headers"]["authorization"])
+        self.assertEqual(1, self.cache.get.call_count)
+
+    def test_token_lookup_for_enabled_debug_log(self):
+        self.logger.setLevel(logging.DEBUG)
+        with patch("wenet.interface.client.requests.get", return_value=Mock(status_code=200)):
+            self.client.get("url")
+
+        self.assertEqual(3, self.cache.get.call_count)
+
+
+class TestApikeyClient(TestCase):
+
+    def test_encoded_body(self):
+        client = ApikeyClient("apikey")
+        with patch("wenet.interface.client.requests.post", return_value=Mock(status_code=200)) as post:
+            client.post("url", {"key": "value"})
+
+        self.assertEqual({"key": "value"}, codec.loads(post.call_args.kwargs["data"]))
+        self.assertEqual("application/json", post.call_args.kwargs["headers"]["Content-Type"])
+
+    def test_content_type_not_overridden(self):
+        headers = {"content-type": "application/json; charset=utf-8"}
+        RestClient.encode_body({}, headers)
+        self.assertEqual({"content-type": "application/json; charset=utf-8"}, headers)
+
+
+class TestConnectionPool(TestCase):
+
+    def test_connection_pool(self):
+        client = ApikeyClient("apikey")
+        client.enable_connection_pool(4)
+        adapter = client.session.get_adapter("https://internetofus.u-hopper.com")
+        self.assertEqual(4, adapter._pool_maxsize)
+
+        client.session.get = Mock(return_value=Mock(status_code=200))
+        with patch("wenet.interface.client.requests.get") as get:
+            client.get("url")
+
+        client.session.get.assert_called_once()
+        get.assert_not_called()
+
+
+class TestRequestCompression(TestCase):
+
+    def test_accept_encoding(self):
+        headers = {"x-custom": "value"}
+        client = ApikeyClient("apikey")
+        with patch("wenet.interface.client.requests.get", return_value=Mock(status_code=200)) as get:
+            client.get("url", headers=headers)
+
+        self.assertIn("gzip", get.call_args.kwargs["headers"]["Accept-Encoding"])
+        self.assertEqual({"x-custom": "value"}, headers)
+
+    def test_accept_encoding_not_overridden(self):
+        client = ApikeyClient("apikey")
+        with patch("wenet.interface.client.requests.get", return_value=Mock(status_code=200)) as get:
+            client.get("url", headers={"accept-encoding": "identity"})
+
+        self.assertEqual("identity", get.call_args.kwargs["headers"]["accept-encoding"])
+        self.assertNotIn("Accept-Encoding", get.call_args.kwargs["headers"])
+
+    def test_small_body_not_compressed(self):
+        client = ApikeyClient("apikey", request_compression_threshold=1024)
+        with patch("wenet.interface.client.requests.post", return_value=Mock(status_code=200)) as post:
+            client.post("url", {"key": "value"})
+
+        self.assertEqual({"key": "value"}, codec.loads(post.call_args.kwargs["data"]))
+        self.assertNotIn("Content-Encoding", post.call_args.kwargs["headers"])
+
+    def test_large_body_compressed(self):
+        body = [{"name": f"competence_{index}", "ontology": "esco", "level": 0.5} for index in range(100)]
+        client = ApikeyClient("apikey", request_compression_threshold=1024)
+        with patch("wenet.interface.client.requests.put", return_value=Mock(status_code=200)) as put:
+            client.put("url", body)
+
+        self.assertEqual("gzip", put.call_args.kwargs["headers"]["Content-Encoding"])
+        self.assertEqual("application/json", put.call_args.kwargs["headers"]["Content-Type"])
+        self.assertEqual(body, codec.loads(gzip.decompress(put.call_args.kwargs["data"])))
+
+    def test_patch(self):
+        client = ApikeyClient("apikey")
+        with patch("wenet.interface.client.requests.patch", return_value=Mock(status_code=200)) as patch_request:
+            client.patch("url", {"key": "value"})
+
+        self.assertEqual({"key": "value"}, codec.loads(patch_request.call_args.kwargs["data"]))
+        self.assertEqual("apikey", patch_request.call_args.kwargs["headers"]["x-wenet-component-apikey"])
+
+    def test_compression_disabled_by_default(self):
+        body = [{"name": f"competence_{index}", "ontology": "esco", "level": 0.5} for index in range(100)]
+        client = NoAuthenticationClient()
+        with patch("wenet.interface.client.requests.post", return_value=Mock(status_code=200)) as post:
+            client.post("url", body)
+
+        self.assertNotIn("Content-Encoding", post.call_args.kwargs["headers"])
+
+    def test_request_records(self):
+        response = Response()
+        response.status_code = 200
+        response.headers["Content-Length"] = "120"
+        request_records = []
+        client = ApikeyClient("apikey", request_compression_threshold=1024)
+        with patch("wenet.interface.client.requests.post", return_value=response) as post:
+            client.post("url", {"key": "value"}, request_records=request_records)
+        with patch("wenet.interface.client.requests.get", return_value=response):
+            client.get("url", request_records=request_records)
+
+        self.assertEqual([
+            {"url": "url", "method": "post", "respond": 200, "requestBytes": len(post.call_args.kwargs["data"]), "responseBytes": 120},
+            {"url": "url", "method": "get", "respond": 200, "requestBytes": 0, "responseBytes": 120},
+        ], request_records)
+
+    def test_response_wire_size(self):
+        raw = io.BytesIO(gzip.compress(b"{}" * 100))
+        response = Response()
+        response.raw = raw
+        response.raw.read()
+        self.assertEqual(raw.tell(), response_wire_size(response))
+
+        response = Response()
+        response._content = b"{}"
+        self.assertEqual(2, response_wire_size(response))
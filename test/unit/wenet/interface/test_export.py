@@ -0,0 +1,127 @@
+from __future__ import absolute_import, annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest import TestCase
+from unittest.mock import Mock
+
+from test.unit.wenet.interface.mock.client import MockApikeyClient
+from test.unit.wenet.interface.mock.response import MockResponse
+from wenet.interface.export import TimeWindow, export_sharded, export_windows, plan_windows
+from wenet.interface.task_manager import TaskManagerInterface
+from wenet.model.task.task import Task, TaskGoal
+
+
+class TestTimeWindow(TestCase):
+
+    def test_split(self):
+        self.assertEqual([TimeWindow(0, 4), TimeWindow(5, 9)], TimeWindow(0, 9).split(2))
+        self.assertEqual([TimeWindow(0, 2), TimeWindow(3, 5), TimeWindow(6, 9)], TimeWindow(0, 9).split(3))
+
+    def test_split_in_seconds(self):
+        self.assertEqual([TimeWindow(0, 0), TimeWindow(1, 1)], TimeWindow(0, 1).split(10))
+
+    def test_repr(self):
+        self.assertEqual(TimeWindow(10, 20), TimeWindow.from_repr(TimeWindow(10, 20).to_repr()))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            TimeWindow(10, 9)
+
+
+class TestShardedExport(TestCase):
+
+    @staticmethod
+    def _count(timestamps: list):
+        def count(window: TimeWindow) -> int:
+            return sum(1 for timestamp in timestamps if window.start <= timestamp <= window.end)
+        return count
+
+    def test_plan_windows(self):
+        # Skewed: most of the items are in the last seconds
+        timestamps = list(range(0, 1000, 10)) + [990 + index % 10 for index in range(400)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            shards = plan_windows(self._count(timestamps), TimeWindow(0, 999), 100, executor)
+
+        count = self._count(timestamps)
+        self.assertEqual(len(timestamps), sum(count(shard) for shard in shards))
+        self.assertTrue(all(count(shard) <= 100 or shard.seconds == 1 for shard in shards))
+        self.assertEqual(sorted(shards, key=lambda shard: shard.start), shards)
+
+    def test_plan_windows_without_items(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            self.assertEqual([], plan_windows(lambda window: 0, TimeWindow(0, 999), 100, executor))
+
+    def test_export_windows_in_order_without_duplicates(self):
+        windows = TimeWindow(0, 99).split(10)
+
+        def fetch(window: TimeWindow) -> list:
+            # The last item of each window is also returned by the next one
+            return [str(timestamp) for timestamp in range(window.start, window.end + 1)] + [str(window.end + 1)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            items = list(export_windows(windows, fetch, lambda item: item, executor, prefetch=2))
+
+        self.assertEqual([str(timestamp) for timestamp in range(101)], items)
+
+    def test_export_windows_keeps_only_the_identifiers_of_the_previous_window(self):
+        windows = TimeWindow(0, 29).split(3)
+
+        def fetch(window: TimeWindow) -> list:
+            return [f"window_{window.start}", "shared"]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            items = list(export_windows(windows, fetch, lambda item: item, executor, prefetch=1))
+
+        # The identifiers of the first window are forgotten once the second one is returned
+        self.assertEqual(["window_0", "shared", "window_10", "window_20", "shared"], items)
+
+    def test_export_windows_prefetch(self):
+        windows = TimeWindow(0, 99).split(10)
+        fetched = []
+        lock = threading.Lock()
+
+        def fetch(window: TimeWindow) -> list:
+            with lock:
+                fetched.append(window)
+            return [window.start]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            items = export_windows(windows, fetch, str, executor, prefetch=2)
+            next(items)
+            items.close()
+
+        self.assertLessEqual(len(fetched), 4)
+
+    def test_export_sharded(self):
+        timestamps = [index // 3 for index in range(300)]
+        items = [(timestamp, f"id_{index:03}") for index, timestamp in enumerate(timestamps)]
+
+        def fetch(window: TimeWindow) -> list:
+            return [item for item in items if window.start <= item[0] <= window.end]
+
+        exported = list(export_sharded(self._count(timestamps), fetch, lambda item: item[1], TimeWindow(0, 99), 25, 4))
+
+        self.assertEqual(items, exported)
+
+    def test_export_tasks(self):
+        task_manager = TaskManagerInterface(MockApikeyClient(), "")
+        task_manager._client.enable_connection_pool = Mock()
+        tasks = [Task(f"task_{index:02}", 1000 + index, 2000, "", "", "app_id", None, TaskGoal("", "")).to_repr() for index in range(40)]
+
+        def get(url: str, query_params: dict, **kwargs) -> MockResponse:
+            matching = [task for task in tasks if query_params["creationFrom"] <= task["_creationTs"] <= query_params["creationTo"]]
+            offset, limit = query_params.get("offset", 0), query_params["limit"]
+            response = MockResponse({"offset": offset, "total": len(matching), "tasks": matching[offset:offset + limit]})
+            response.status_code = 200
+            return response
+
+        task_manager._client.get = Mock(side_effect=get)
+
+        exported = list(task_manager.export_tasks(datetime.fromtimestamp(1000, tz=timezone.utc), datetime.fromtimestamp(1039, tz=timezone.utc),
+                                                  max_workers=4, shard_size=10))
+
+        self.assertEqual([task["id"] for task in tasks], [task.task_id for task in exported])
+        task_manager._client.enable_connection_pool.assert_called_once_with(4)
@@ -1,13 +1,19 @@
 from __future__ import absolute_import, annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
 from unittest.mock import Mock
 
 from test.unit.wenet.interface.mock.client import MockApikeyClient
 from test.unit.wenet.interface.mock.response import MockResponse
+from wenet.interface.client import ApikeyClient
 from wenet.interface.exceptions import AuthenticationException, NotFound
 from wenet.interface.hub import HubInterface
 from wenet.model.app import App
+from wenet.storage.cache import InMemoryCache
+from wenet.storage.loader import CacheLoader
+from wenet.utils.singleflight import SingleFlight
 
 
 class TestHubInterface(TestCase):
@@ -22,6 +28,36 @@ class TestHubInterface(TestCase):
         self.hub_interface._client.get = Mock(return_value=response)
         self.assertEqual(response.json(), self.hub_interface.get_user_ids_for_app("app_id"))
 
+    def test_get_user_ids_for_app_cached_copy(self):
+        hub_interface = HubInterface(MockApikeyClient(), "", cache_loader=CacheLoader(InMemoryCache()))
+        response = MockResponse(["user_id"])
+        response.status_code = 200
+        hub_interface._client.get = Mock(return_value=response)
+
+        hub_interface.get_user_ids_for_app("app_id").append("other_user_id")
+
+        self.assertEqual(["user_id"], hub_interface.get_user_ids_for_app("app_id"))
+        hub_interface._client.get.assert_called_once()
+
+    def test_get_user_ids_for_app_coalesced_copies(self):
+        single_flight = SingleFlight()
+        hub_interface = HubInterface(MockApikeyClient(), "", single_flight=single_flight)
+        response = MockResponse(["user_id"])
+        response.status_code = 200
+        release = threading.Event()
+        hub_interface._client.get = Mock(side_effect=lambda *args, **kwargs: release.wait() and response)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(hub_interface.get_user_ids_for_app, "app_id") for _ in range(2)]
+            while single_flight.coalesced < 1:
+                release.wait(0.001)
+            release.set()
+            user_ids = [future.result() for future in futures]
+
+        hub_interface._client.get.assert_called_once()
+        user_ids[0].append("other_user_id")
+        self.assertEqual(["user_id"], user_ids[1])
+
     def test_get_user_ids_for_app_exception(self):
         response = MockResponse(None)
         response.status_code = 400
@@ -126,3 +162,99 @@ class TestHubInterface(TestCase):
         self.hub_interface._client.get = Mock(return_value=response)
         with self.assertRaises(AuthenticationException):
             self.hub_interface.get_user_ids()
+
+    def test_get_app_details_cached(self):
+        hub_interface = HubInterface(MockApikeyClient(), "", cache_loader=CacheLoader(InMemoryCache()))
+        response = MockResponse({
+            "id": "id",
+            "name": "name",
+            "status": 1,
+            "ownerId": 1,
+            "image_url": "image_url",
+            "createdAt": 1612518873,
+            "updatedAt": 1612532618,
+            "metadata": {},
+            "messageCallbackUrl": "messageCallbackUrl"
+        })
+        response.status_code = 200
+        hub_interface._client.get = Mock(return_value=response)
+
+        self.assertEqual(App.from_repr(response.json()), hub_interface.get_app_details("app_id"))
+        self.assertEqual(App.from_repr(response.json()), hub_interface.get_app_details("app_id"))
+        hub_interface._client.get.assert_called_once()
+
+    def test_get_app_details_not_found_cached(self):
+        hub_interface = HubInterface(MockApikeyClient(), "", cache_loader=CacheLoader(InMemoryCache()))
+        response = MockResponse(None)
+        response.status_code = 404
+        hub_interface._client.get = Mock(return_value=response)
+
+        for _ in range(2):
+            with self.assertRaises(NotFound):
+                hub_interface.get_app_details("app_id")
+        hub_interface._client.get.assert_called_once()
+
+        hub_interface._invalidate_not_found("App", "app_id")
+        with self.assertRaises(NotFound):
+            hub_interface.get_app_details("app_id")
+        self.assertEqual(2, hub_interface._client.get.call_count)
+
+    def test_get_app_details_cached_by_identity(self):
+        cache_loader = CacheLoader(InMemoryCache())
+        hub_interfaces = [HubInterface(ApikeyClient(apikey), "", cache_loader=cache_loader) for apikey in ["apikey", "other_apikey", "apikey"]]
+        response = MockResponse({"id": "app_id", "name": "name", "status": 1, "ownerId": 1, "image_url": "image_url", "createdAt": 1612518873,
+                                 "updatedAt": 1612532618, "metadata": {}, "messageCallbackUrl": "messageCallbackUrl"})
+        response.status_code = 200
+        for hub_interface in hub_interfaces:
+            hub_interface._client.get = Mock(return_value=response)
+            hub_interface.get_app_details("app_id")
+
+        hub_interfaces[0]._client.get.assert_called_once()
+        # Another apikey does not get the entry of the first one
+        hub_interfaces[1]._client.get.assert_called_once()
+        hub_interfaces[2]._client.get.assert_not_called()
+        self.assertFalse(any("apikey" in key for key in cache_loader._cache._cache))
+
+    def test_get_app_details_not_found_cached_by_identity(self):
+        cache_loader = CacheLoader(InMemoryCache())
+        hub_interfaces = [HubInterface(ApikeyClient(apikey), "", cache_loader=cache_loader) for apikey in ["apikey", "other_apikey", "apikey"]]
+        response = MockResponse(None)
+        response.status_code = 404
+        for hub_interface in hub_interfaces:
+            hub_interface._client.get = Mock(return_value=response)
+            with self.assertRaises(NotFound):
+                hub_interface.get_app_details("app_id")
+
+        hub_interfaces[0]._client.get.assert_called_once()
+        # The app may exist for another apikey
+        hub_interfaces[1]._client.get.assert_called_once()
+        hub_interfaces[2]._client.get.assert_not_called()
+
+    def test_get_app_details_coalesced(self):
+        single_flight = SingleFlight()
+        hub_interface = HubInterface(MockApikeyClient(), "", single_flight=single_flight)
+        response = MockResponse({
+            "id": "id",
+            "name": "name",
+            "status": 1,
+            "ownerId": 1,
+            "image_url": "image_url",
+            "createdAt": 1612518873,
+            "updatedAt": 1612532618,
+            "metadata": {},
+            "messageCallbackUrl": "messageCallbackUrl"
+        })
+        response.status_code = 200
+        release = threading.Event()
+        hub_interface._client.get = Mock(side_effect=lambda *args, **kwargs: release.wait() and response)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(hub_interface.get_app_details, "app_id") for _ in range(3)]
+            while single_flight.coalesced < 2:
+                release.wait(0.001)
+            release.set()
+            apps = [future.result() for future in futures]
+
+        hub_interface._client.get.assert_called_once()
+        self.assertEqual([App.from_repr(response.json())] * 3, apps)
+        self.assertIsNot(apps[0], apps[1])
@@ -0,0 +1,185 @@
+from __future__ import absolute_import, annotations
+
+from contextlib import contextmanager
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from requests import Response
+
+from test.unit.wenet.interface.mock.client import MockApikeyClient
+from test.unit.wenet.interface.mock.response import MockResponse
+from wenet.interface.client import ApikeyClient, Oauth2Client
+from wenet.interface.metrics import ClientMetrics, LatencyHistogram, endpoint_template
+from wenet.interface.task_manager import TaskManagerInterface
+from wenet.model.task.task import Task, TaskGoal, TaskPage
+from wenet.storage.cache import InMemoryCache
+
+
+def build_response(status_code: int, content: bytes = b"{}") -> Response:
+    response = Response()
+    response.status_code = status_code
+    response._content = content
+    return response
+
+
+class MockTracer:
+
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        span = Mock()
+        span.name = name
+        span.attributes = dict(attributes)
+        self.spans.append(span)
+        yield span
+
+
+class TestEndpointTemplate(TestCase):
+
+    def test_identifiers(self):
+        self.assertEqual("/task_manager/tasks/{id}", endpoint_template("https://wenet.eu/task_manager/tasks/5fa3e2a1b2c3d4e5f6a7b8c9"))
+        self.assertEqual("/service/user/profile/{id}", endpoint_template("https://wenet.eu/service/user/profile/1234?scope=all"))
+        self.assertEqual("/profile_manager/profiles/{id}/competences", endpoint_template("/profile_manager/profiles/9b2f1e0c-7a3d-4c1b-8e2f-1a2b3c4d5e6f/competences"))
+
+    def test_route_identifiers(self):
+        self.assertEqual("/hub/frontend/data/app/{id}/user", endpoint_template("https://wenet.eu/hub/frontend/data/app/4DGyNe4vvs/user"))
+        self.assertEqual("/task_manager/tasks/{id}", endpoint_template("https://wenet.eu/task_manager/tasks/task_1"))
+        self.assertEqual("/task_manager/tasks/transactions", endpoint_template("https://wenet.eu/task_manager/tasks/transactions"))
+        self.assertEqual("/service/task/transaction", endpoint_template("https://wenet.eu/service/task/transaction"))
+
+    def test_static_segments(self):
+        self.assertEqual("/api/v1/hub/data/app", endpoint_template("https://wenet.eu/api/v1/hub/data/app"))
+        self.assertEqual("/prod/api/oauth2/token", endpoint_template("https://wenet.eu/prod/api/oauth2/token"))
+        self.assertEqual("/api/v1beta2/tasks", endpoint_template("https://wenet.eu/api/v1beta2/tasks"))
+        self.assertEqual("/incentive_server/api/UsersCohorts/", endpoint_template("https://wenet.eu/incentive_server/api/UsersCohorts/"))
+
+
+class TestLatencyHistogram(TestCase):
+
+    def test_buckets(self):
+        histogram = LatencyHistogram((0.1, 1.0))
+        for latency in [0.05, 0.1, 0.5, 2.0]:
+            histogram.observe(latency)
+
+        self.assertEqual({"0.1": 2, "1.0": 3, "+Inf": 4}, histogram.to_repr()["buckets"])
+        self.assertEqual(4, histogram.to_repr()["count"])
+        self.assertEqual(2.0, histogram.to_repr()["max"])
+
+
+class TestClientMetrics(TestCase):
+
+    def test_requests(self):
+        metrics = ClientMetrics()
+        client = ApikeyClient("apikey", metrics=metrics)
+        with patch("wenet.interface.client.requests.get", side_effect=[build_response(200, b"{}"), build_response(404, b"[]")]):
+            client.get("https://wenet.eu/task_manager/tasks/123")
+            client.get("https://wenet.eu/task_manager/tasks/456")
+        with patch("wenet.interface.client.requests.post", return_value=build_response(201)) as post:
+            client.post("https://wenet.eu/task_manager/tasks", {"key": "value"})
+
+        endpoints = metrics.to_repr()["endpoints"]
+        self.assertEqual({"GET /task_manager/tasks/{id}", "POST /task_manager/tasks"}, set(endpoints))
+        self.assertEqual(2, endpoints["GET /task_manager/tasks/{id}"]["requests"])
+        self.assertEqual({"200": 1, "404": 1}, endpoints["GET /task_manager/tasks/{id}"]["statuses"])
+        self.assertEqual(4, endpoints["GET /task_manager/tasks/{id}"]["responseBytes"])
+        self.assertEqual(len(post.call_args.kwargs["data"]), endpoints["POST /task_manager/tasks"]["requestBytes"])
+
+    def test_failed_request(self):
+        metrics = ClientMetrics()
+        client = ApikeyClient("apikey", metrics=metrics)
+        with patch("wenet.interface.client.requests.get", side_effect=ConnectionError()):
+            with self.assertRaises(ConnectionError):
+                client.get("https://wenet.eu/hub/data/app")
+
+        self.assertEqual(1, metrics.to_repr()["endpoints"]["GET /hub/data/app"]["errors"])
+
+    def test_endpoint_template_override(self):
+        metrics = ClientMetrics(endpoint_templates=[(r"^/hub/data/app/[^/]+/user$", "/hub/data/app/{appId}/user")])
+        self.assertEqual("/hub/data/app/{appId}/user", metrics.template("https://wenet.eu/hub/data/app/myApp/user"))
+        self.assertEqual("/hub/data/app/{id}", metrics.template("https://wenet.eu/hub/data/app/a1b2c3d4"))
+
+    def test_retries_and_refreshes(self):
+        metrics = ClientMetrics()
+        cache = InMemoryCache()
+        cache.cache(Oauth2Client.ClientCredentials("token", "refresh_token").to_repr(), key="resourceId")
+        client = Oauth2Client("clientId", "clientSecret", "resourceId", cache, token_endpoint_url="tokenEndpointUrl", metrics=metrics)
+        refresh_response = build_response(200, b'{"access_token": "new_token", "refresh_token": "new_refresh_token"}')
+        with patch("wenet.interface.client.requests.get", side_effect=[build_response(401), build_response(200)]), \
+                patch("wenet.interface.client.requests.post", return_value=refresh_response):
+            client.get("https://wenet.eu/hub/data/app")
+
+        metrics_repr = metrics.to_repr()
+        self.assertEqual(1, metrics_repr["retries"])
+        self.assertEqual(1, metrics_repr["refreshes"])
+        self.assertEqual(0, metrics_repr["refreshFailures"])
+        self.assertEqual({"200": 1, "401": 1}, metrics_repr["endpoints"]["GET /hub/data/app"]["statuses"])
+
+    def test_spans(self):
+        tracer = MockTracer()
+        client = ApikeyClient("apikey", metrics=ClientMetrics(tracer=tracer))
+        with patch("wenet.interface.client.requests.get", return_value=build_response(200)):
+            client.get("https://wenet.eu/task_manager/tasks/123")
+
+        self.assertEqual(1, len(tracer.spans))
+        self.assertEqual("GET /task_manager/tasks/{id}", tracer.spans[0].name)
+        self.assertEqual("GET", tracer.spans[0].attributes["http.request.method"])
+        tracer.spans[0].set_attribute.assert_called_once_with("http.response.status_code", 200)
+
+    def test_operations(self):
+        metrics = ClientMetrics()
+        client = MockApikeyClient()
+        client.metrics = metrics
+        task_manager = TaskManagerInterface(client, "")
+        response = MockResponse(None)
+        response.status_code = 404
+        task_manager._client.get = Mock(return_value=response)
+        with self.assertRaises(Exception):
+            task_manager.get_task("task_id")
+
+        operation = metrics.to_repr()["operations"]["TaskManagerInterface.get_task"]
+        self.assertEqual(1, operation["requests"])
+        self.assertEqual(1, operation["errors"])
+
+    def test_nested_operations(self):
+        metrics = ClientMetrics()
+        client = MockApikeyClient()
+        client.metrics = metrics
+        task_manager = TaskManagerInterface(client, "")
+        response = MockResponse(TaskPage(0, 1, [Task("task_id", None, None, "", "", "app_id", None, TaskGoal("", ""))]).to_repr())
+        response.status_code = 200
+        task_manager._client.get = Mock(return_value=response)
+
+        task_manager.get_all_tasks()
+        task_manager.get_tasks(["task_1", "task_2"], max_workers=2)
+
+        self.assertEqual({"TaskManagerInterface.get_all_tasks", "TaskManagerInterface.get_tasks"}, set(metrics.to_repr()["operations"]))
+
+    def test_lazy_operations(self):
+        metrics = ClientMetrics()
+        client = MockApikeyClient()
+        client.metrics = metrics
+        task_manager = TaskManagerInterface(client, "")
+        response = MockResponse(TaskPage(0, 0, []).to_repr())
+        response.status_code = 200
+        task_manager._client.get = Mock(return_value=response)
+
+        list(task_manager.iter_tasks())
+        list(task_manager.iter_task_shard({"offset": 0, "limit": 10}))
+
+        # The pages requested while iterating are operations of their own
+        self.assertEqual({"TaskManagerInterface.get_task_page"}, set(metrics.to_repr()["operations"]))
+
+    def test_no_metrics(self):
+        client = ApikeyClient("apikey")
+        with patch("wenet.interface.client.requests.get", return_value=build_response(200)):
+            client.get("https://wenet.eu/task_manager/tasks/123")
+        self.assertIsNone(client.metrics)
+
+    def test_reset(self):
+        metrics = ClientMetrics()
+        metrics.observe_request("get", "/task_manager/tasks", 0.01, 200)
+        metrics.increment("retries")
+        metrics.reset()
+        self.assertEqual({"retries": 0, "refreshes": 0, "refreshFailures": 0, "endpoints": {}, "operations": {}}, metrics.to_repr())
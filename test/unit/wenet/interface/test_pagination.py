@@ -0,0 +1,289 @@
+from __future__ import absolute_import, annotations
+
+from unittest import TestCase
+from unittest.mock import Mock
+
+from test.unit.wenet.interface.mock.client import MockApikeyClient
+from test.unit.wenet.interface.mock.response import MockResponse
+from wenet.interface.exceptions import UnexpectedResponse
+from wenet.interface.pagination import AdaptivePageSize, KeysetCursor, KeysetPaginator, is_timeout, paginate
+from wenet.interface.profile_manager import ProfileManagerInterface
+from wenet.interface.task_manager import TaskManagerInterface
+from wenet.model.task.task import Task, TaskGoal, TaskPage
+from wenet.model.user.profile import UserIdentifiersPage
+
+
+class TestAdaptivePageSize(TestCase):
+
+    def test_grows_with_fast_pages(self):
+        page_size = AdaptivePageSize(initial=100, maximum=1000, target_latency=1.0, max_growth=2.0)
+
+        page_size.observe(100, 100, 0.01, 1000, True)
+        self.assertEqual(200, page_size.size)
+        page_size.observe(200, 200, 0.02, 2000, True)
+        self.assertEqual(400, page_size.size)
+
+    def test_converges_to_target_latency(self):
+        page_size = AdaptivePageSize(initial=100, target_latency=1.0, target_bytes=10 ** 9, smoothing=1.0)
+
+        for _ in range(10):
+            # 0.1 seconds of round trip and 1 millisecond for each item
+            page_size.observe(page_size.size, page_size.size, 0.1 + 0.001 * page_size.size, None, True)
+
+        self.assertAlmostEqual(900, page_size.size, delta=10)
+
+    def test_shrinks_to_target_bytes(self):
+        page_size = AdaptivePageSize(initial=100, target_bytes=100_000)
+
+        page_size.observe(100, 100, 0.1, 1_000_000, True)
+
+        self.assertEqual(10, page_size.size)
+
+    def test_learns_server_maximum(self):
+        page_size = AdaptivePageSize(initial=100)
+
+        page_size.observe(100, 50, 0.01, None, True)
+
+        self.assertEqual(50, page_size.server_maximum)
+        self.assertEqual(50, page_size.size)
+
+    def test_last_page_is_not_a_server_maximum(self):
+        page_size = AdaptivePageSize(initial=100)
+
+        page_size.observe(100, 50, 0.01, None, False)
+
+        self.assertIsNone(page_size.server_maximum)
+
+    def test_back_off(self):
+        page_size = AdaptivePageSize(initial=100, minimum=30)
+
+        page_size.back_off()
+        self.assertEqual(50, page_size.size)
+        page_size.back_off()
+        self.assertEqual(30, page_size.size)
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            AdaptivePageSize(minimum=100, maximum=10)
+
+
+class TestPaginate(TestCase):
+
+    @staticmethod
+    def _pages(items: list, server_maximum: int):
+        requests = []
+
+        def get_page(offset: int, limit: int, request_records: list):
+            requests.append((offset, limit))
+            request_records.append({"responseBytes": 100 * min(limit, server_maximum)})
+            return items[offset:offset + min(limit, server_maximum)], len(items)
+
+        return get_page, requests
+
+    def test_all_items(self):
+        items = list(range(1000))
+        get_page, requests = self._pages(items, server_maximum=1000)
+
+        self.assertEqual(items, paginate(get_page, AdaptivePageSize(initial=100)))
+        self.assertEqual((0, 100), requests[0])
+        self.assertLess(len(requests), 10)
+
+    def test_server_maximum(self):
+        items = list(range(500))
+        get_page, requests = self._pages(items, server_maximum=40)
+        page_size = AdaptivePageSize(initial=100)
+
+        self.assertEqual(items, paginate(get_page, page_size))
+        self.assertEqual(40, page_size.server_maximum)
+        self.assertTrue(all(limit == 40 for _, limit in requests[1:]))
+
+    def test_offset(self):
+        items = list(range(250))
+        get_page, _ = self._pages(items, server_maximum=1000)
+
+        self.assertEqual(items[200:], paginate(get_page, AdaptivePageSize(initial=100), offset=200))
+
+    def test_without_total(self):
+        get_page = Mock(side_effect=[(list(range(100)), None), (list(range(20)), None)])
+
+        self.assertEqual(120, len(paginate(get_page, AdaptivePageSize(initial=100, max_growth=1.0))))
+        self.assertEqual(2, get_page.call_count)
+
+    def test_back_off_on_timeout(self):
+        items = list(range(150))
+        get_page, requests = self._pages(items, server_maximum=1000)
+        timeouts = [UnexpectedResponse(504, "")]
+
+        def get_page_timing_out(offset: int, limit: int, request_records: list):
+            if timeouts:
+                raise timeouts.pop()
+            return get_page(offset, limit, request_records)
+
+        self.assertEqual(items, paginate(get_page_timing_out, AdaptivePageSize(initial=100)))
+        self.assertEqual((0, 50), requests[0])
+
+    def test_too_many_timeouts(self):
+        get_page = Mock(side_effect=TimeoutError())
+
+        with self.assertRaises(TimeoutError):
+            paginate(get_page, AdaptivePageSize(), max_timeouts=2)
+        self.assertEqual(3, get_page.call_count)
+
+    def test_other_errors(self):
+        get_page = Mock(side_effect=UnexpectedResponse(500, ""))
+
+        with self.assertRaises(UnexpectedResponse):
+            paginate(get_page, AdaptivePageSize())
+        self.assertEqual(1, get_page.call_count)
+
+    def test_is_timeout(self):
+        self.assertTrue(is_timeout(TimeoutError()))
+        self.assertTrue(is_timeout(UnexpectedResponse(504, "")))
+        self.assertFalse(is_timeout(UnexpectedResponse(503, "")))
+        self.assertFalse(is_timeout(ValueError()))
+
+
+class TestKeysetPaginator(TestCase):
+
+    @staticmethod
+    def _source(items: list):
+        """
+        A keyset endpoint of (timestamp, id) items, ordered by timestamp and identifier
+        """
+        requests = []
+
+        def get_page(timestamp, offset: int, limit: int, request_records: list):
+            requests.append((timestamp, offset, limit))
+            matching = sorted(item for item in items if timestamp is None or item[0] >= timestamp)
+            return matching[offset:offset + limit], len(matching)
+
+        return get_page, requests
+
+    @staticmethod
+    def _paginator(get_page, cursor=None, size: int = 10) -> KeysetPaginator:
+        page_size = AdaptivePageSize(initial=size, minimum=size, maximum=size)
+        return KeysetPaginator(get_page, lambda item: item[0], lambda item: item[1], page_size, cursor)
+
+    def test_all_items(self):
+        items = [(100 + index // 4, f"id_{index:03}") for index in range(50)]
+        get_page, requests = self._source(items)
+
+        self.assertEqual(items, list(self._paginator(get_page)))
+        self.assertEqual((None, 0, 10), requests[0])
+        # The page starts from the last item returned, in the second of the cursor
+        self.assertEqual((102, 1, 10), requests[1])
+
+    def test_equal_timestamps_over_many_pages(self):
+        items = [(100, f"id_{index:03}") for index in range(25)] + [(101, "id_last")]
+        get_page, requests = self._source(items)
+
+        self.assertEqual(items, list(self._paginator(get_page)))
+        self.assertEqual([(None, 0, 10), (100, 9, 10), (100, 18, 10)], requests)
+
+    def test_items_created_at_the_boundary(self):
+        items = [(100 + index // 4, f"id_{index:03}") for index in range(12)]
+        get_page, _ = self._source(items)
+        paginator = self._paginator(get_page, size=6)
+        pages = paginator.pages()
+
+        first = next(pages)
+        # Created in the second of the cursor, before the items already returned: shifts them to the next page
+        items.append((101, "id_000a"))
+        rest = [item for page in pages for item in page]
+
+        self.assertEqual([item[1] for item in items[:12]], [item[1] for item in first + rest])
+
+    def test_items_leaving_the_second_of_the_cursor(self):
+        items = [(100, "a"), (100, "b"), (100, "c"), (100, "d"), (200, "e")]
+        get_page, _ = self._source(items)
+        pages = self._paginator(get_page, size=2).pages()
+
+        first = next(pages)
+        # Updated, with the pagination ordered by update
+        items[0] = (300, "a")
+        rest = [item for page in pages for item in page]
+
+        self.assertEqual(["a", "b", "c", "d", "e", "a"], [item[1] for item in first + rest])
+
+    def test_items_deleted_from_the_second_of_the_cursor(self):
+        items = [(100, f"id_{index:03}") for index in range(30)]
+        get_page, _ = self._source(items)
+        pages = self._paginator(get_page).pages()
+
+        first = next(pages) + next(pages)
+        del items[5:15]
+        rest = [item for page in pages for item in page]
+
+        self.assertEqual([f"id_{index:03}" for index in range(30)], [item[1] for item in first + rest])
+
+    def test_second_larger_than_the_server_maximum(self):
+        items = [(100, f"id_{index:03}") for index in range(250)] + [(101, "id_last")]
+        source, requests = self._source(items)
+
+        def get_page(timestamp, offset: int, limit: int, request_records: list):
+            # The platform returns at most 100 items
+            return source(timestamp, offset, min(limit, 100), request_records)
+
+        page_size = AdaptivePageSize(initial=200, minimum=10, maximum=1000)
+        paginator = KeysetPaginator(get_page, lambda item: item[0], lambda item: item[1], page_size)
+
+        self.assertEqual(items, list(paginator))
+        self.assertEqual(100, page_size.server_maximum)
+        self.assertTrue(all(limit <= 200 for _, _, limit in requests))
+        self.assertEqual([0, 99, 198], [offset for _, offset, _ in requests])
+
+    def test_resume(self):
+        items = [(100 + index // 3, f"id_{index:03}") for index in range(40)]
+        get_page, _ = self._source(items)
+        paginator = self._paginator(get_page)
+        pages = paginator.pages()
+        first = next(pages) + next(pages)
+
+        cursor = KeysetCursor.from_repr(paginator.cursor.to_repr())
+        self.assertEqual(KeysetCursor(106, ["id_018"]), cursor)
+
+        self.assertEqual(items, first + list(self._paginator(get_page, cursor)))
+
+    def test_empty(self):
+        get_page, requests = self._source([])
+
+        self.assertEqual([], list(self._paginator(get_page)))
+        self.assertEqual(1, len(requests))
+
+    def test_iter_tasks(self):
+        task_manager = TaskManagerInterface(MockApikeyClient(), "")
+        tasks = [Task(f"task_{index}", 100 + index, 200, "", "", "app_id", None, TaskGoal("", "")) for index in range(3)]
+        first = MockResponse(TaskPage(0, 3, tasks[:2]).to_repr())
+        first.status_code = 200
+        second = MockResponse(TaskPage(0, 2, tasks[1:]).to_repr())
+        second.status_code = 200
+        task_manager._client.get = Mock(side_effect=[first, second])
+        task_manager.page_size("tasks").minimum = 1
+        task_manager.page_size("tasks").maximum = 2
+
+        self.assertEqual(["task_0", "task_1", "task_2"], [task.task_id for task in task_manager.iter_tasks(app_id="app_id")])
+        query_params = task_manager._client.get.call_args_list[1][1]["query_params"]
+        self.assertEqual({"appId": "app_id", "creationFrom": 101, "order": "_creationTs,id", "offset": 0, "limit": 2}, query_params)
+
+    def test_iter_tasks_invalid_order(self):
+        with self.assertRaises(ValueError):
+            TaskManagerInterface(MockApikeyClient(), "").iter_tasks(order_by="closing")
+
+
+class TestPaginatedInterface(TestCase):
+
+    def test_get_profile_user_ids(self):
+        profile_manager = ProfileManagerInterface(MockApikeyClient(), "")
+        user_ids = [f"user_{index}" for index in range(120)]
+
+        def get(url: str, query_params: dict, **kwargs) -> MockResponse:
+            offset, limit = query_params["offset"], query_params["limit"]
+            response = MockResponse(UserIdentifiersPage(offset, len(user_ids), user_ids[offset:offset + limit]).to_repr())
+            response.status_code = 200
+            return response
+
+        profile_manager._client.get = Mock(side_effect=get)
+
+        self.assertEqual(user_ids, profile_manager.get_profile_user_ids())
+        self.assertEqual(100, profile_manager._client.get.call_args_list[0][1]["query_params"]["limit"])
+        self.assertIs(profile_manager.page_size("userIdentifiers"), profile_manager.page_size("userIdentifiers"))
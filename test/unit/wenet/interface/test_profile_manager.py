@@ -1,5 +1,6 @@
 from __future__ import absolute_import, annotations
 
+from typing import Optional
 from unittest import TestCase
 from unittest.mock import Mock
 
@@ -8,6 +9,8 @@ from test.unit.wenet.interface.mock.response import MockResponse
 from wenet.interface.exceptions import AuthenticationException, NotFound, CreationError
 from wenet.interface.profile_manager import ProfileManagerInterface
 from wenet.model.user.profile import WeNetUserProfile, UserIdentifiersPage, WeNetUserProfilesPage
+from wenet.storage.cache import InMemoryCache
+from wenet.storage.loader import CacheLoader
 
 
 class TestProfileManagerInterface(TestCase):
@@ -36,6 +39,25 @@ class TestProfileManagerInterface(TestCase):
         with self.assertRaises(NotFound):
             self.profile_manager.get_user_profile("user_id")
 
+    def test_get_user_profile_not_found_cached(self):
+        profile_manager = ProfileManagerInterface(MockApikeyClient(), "", cache_loader=CacheLoader(InMemoryCache()))
+        response = MockResponse(None)
+        response.status_code = 404
+        profile_manager._client.get = Mock(return_value=response)
+        for _ in range(2):
+            with self.assertRaises(NotFound):
+                profile_manager.get_user_profile("user_id")
+        profile_manager._client.get.assert_called_once()
+
+        created = MockResponse(None)
+        created.status_code = 201
+        profile_manager._client.put = Mock(return_value=created)
+        profile_manager.create_empty_user_profile("user_id")
+        found = MockResponse(WeNetUserProfile.empty("user_id").to_repr())
+        found.status_code = 200
+        profile_manager._client.get = Mock(return_value=found)
+        self.assertEqual(WeNetUserProfile.empty("user_id"), profile_manager.get_user_profile("user_id"))
+
     def test_get_user_profile_unauthorized(self):
         response = MockResponse(None)
         response.status_code = 401
@@ -66,6 +88,55 @@ class TestProfileManagerInterface(TestCase):
         with self.assertRaises(AuthenticationException):
             self.profile_manager.update_user_profile(user_profile)
 
+    def test_update_user_profile_changes(self):
+        previous_profile = WeNetUserProfile.empty("user_id")
+        user_profile = WeNetUserProfile.empty("user_id")
+        user_profile.competences = [{"name": "competence"}]
+        response = MockResponse(None)
+        response.status_code = 200
+        self.profile_manager._client.patch = Mock(return_value=response)
+        self.profile_manager._client.put = Mock()
+        self.assertEqual(["competences"], self.profile_manager.update_user_profile_changes(previous_profile, user_profile).changed_fields)
+        self.profile_manager._client.patch.assert_called_once()
+        self.profile_manager._client.put.assert_not_called()
+        self.assertEqual({"id": "user_id", "competences": [{"name": "competence"}]}, self.profile_manager._client.patch.call_args.kwargs["body"])
+
+    def test_update_user_profile_changes_keeps_other_fields(self):
+        previous_profile = WeNetUserProfile.empty("user_id")
+        previous_profile.email = "user@example.com"
+        previous_profile.occupation = "occupation"
+        stored_profile = previous_profile.to_repr()
+
+        def merge(url: str, body: dict, headers: Optional[dict] = None) -> MockResponse:
+            # The profile manager merges the body of a patch into the stored profile
+            stored_profile.update(body)
+            response = MockResponse(stored_profile)
+            response.status_code = 200
+            return response
+
+        self.profile_manager._client.patch = Mock(side_effect=merge)
+        user_profile = WeNetUserProfile.from_repr(previous_profile.to_repr())
+        user_profile.occupation = "other occupation"
+
+        self.profile_manager.update_user_profile_changes(previous_profile, user_profile)
+
+        self.assertEqual(user_profile, WeNetUserProfile.from_repr(stored_profile))
+        self.assertEqual("user@example.com", stored_profile["email"])
+
+    def test_update_user_profile_no_changes(self):
+        self.profile_manager._client.patch = Mock()
+        self.assertTrue(self.profile_manager.update_user_profile_changes(WeNetUserProfile.empty("user_id"), WeNetUserProfile.empty("user_id")).is_empty())
+        self.profile_manager._client.patch.assert_not_called()
+
+    def test_update_user_profile_changes_unauthorized(self):
+        user_profile = WeNetUserProfile.empty("user_id")
+        user_profile.email = "user@example.com"
+        response = MockResponse(None)
+        response.status_code = 401
+        self.profile_manager._client.patch = Mock(return_value=response)
+        with self.assertRaises(AuthenticationException):
+            self.profile_manager.update_user_profile_changes(WeNetUserProfile.empty("user_id"), user_profile)
+
     def test_create_empty_user_profile(self):
         response = MockResponse(None)
         response.status_code = 200
@@ -243,6 +243,57 @@ class TestServiceApiInterface(TestCase):
         with self.assertRaises(AuthenticationException):
             self.service_api.update_user_profile("user_id", CoreWeNetUserProfile.empty("user_id"))
 
+    def test_update_user_profile_changes(self):
+        previous_profile = WeNetUserProfile.empty("user_id")
+        user_profile = WeNetUserProfile.empty("user_id")
+        user_profile.occupation = "occupation"
+        user_profile.materials = [{"name": "material"}]
+        response = MockResponse(WeNetUserProfile.empty("user_id").to_repr())
+        response.status_code = 200
+        self.service_api._client.put = Mock(return_value=response)
+        self.service_api._client.patch = Mock(return_value=response)
+
+        diff = self.service_api.update_user_profile_changes("user_id", previous_profile, user_profile)
+        self.assertEqual(["occupation", "materials"], diff.changed_fields)
+        materials_call = self.service_api._client.put.call_args
+        self.service_api._client.put.assert_called_once()
+        self.assertTrue(materials_call.args[0].endswith("/profile/user_id/materials"))
+        self.assertEqual([{"name": "material"}], materials_call.kwargs["body"])
+        # The other fields are merged, a put would replace the whole profile
+        self.service_api._client.patch.assert_called_once()
+        profile_call = self.service_api._client.patch.call_args
+        self.assertTrue(profile_call.args[0].endswith("/user/profile/user_id"))
+        self.assertEqual({"id": "user_id", "occupation": "occupation"}, profile_call.args[1])
+
+    def test_update_user_profile_changes_dedicated_endpoint_only(self):
+        user_profile = WeNetUserProfile.empty("user_id")
+        user_profile.meanings = [{"name": "meaning"}]
+        response = MockResponse([{"name": "meaning"}])
+        response.status_code = 200
+        self.service_api._client.put = Mock(return_value=response)
+        self.service_api._client.patch = Mock()
+
+        self.service_api.update_user_profile_changes("user_id", WeNetUserProfile.empty("user_id"), user_profile)
+        self.service_api._client.put.assert_called_once()
+        self.service_api._client.patch.assert_not_called()
+        self.assertTrue(self.service_api._client.put.call_args.args[0].endswith("/profile/user_id/meanings"))
+
+    def test_update_user_profile_no_changes(self):
+        self.service_api._client.put = Mock()
+        self.service_api._client.patch = Mock()
+        self.assertTrue(self.service_api.update_user_profile_changes("user_id", CoreWeNetUserProfile.empty("user_id"), CoreWeNetUserProfile.empty("user_id")).is_empty())
+        self.service_api._client.put.assert_not_called()
+        self.service_api._client.patch.assert_not_called()
+
+    def test_update_user_profile_changes_not_found(self):
+        user_profile = CoreWeNetUserProfile.empty("user_id")
+        user_profile.locale = "en_US"
+        response = MockResponse(None)
+        response.status_code = 404
+        self.service_api._client.patch = Mock(return_value=response)
+        with self.assertRaises(NotFound):
+            self.service_api.update_user_profile_changes("user_id", CoreWeNetUserProfile.empty("user_id"), user_profile)
+
     def test_get_opened_tasks_of_user(self):
         response = MockResponse(TaskPage(0, 1, [Task("task_id", None, None, "", "user_id", "app_id", None, TaskGoal("", ""))]).to_repr())
         response.status_code = 200
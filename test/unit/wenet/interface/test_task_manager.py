@@ -9,6 +9,8 @@ from wenet.interface.exceptions import AuthenticationException, NotFound, Creati
 from wenet.interface.task_manager import TaskManagerInterface
 from wenet.model.task.task import TaskPage, Task, TaskGoal
 from wenet.model.task.transaction import TaskTransactionPage, TaskTransaction
+from wenet.storage.cache import InMemoryCache
+from wenet.storage.loader import CacheLoader
 
 
 class TestTaskManagerInterface(TestCase):
@@ -131,6 +133,25 @@ class TestTaskManagerInterface(TestCase):
         self.task_manager._client.post = Mock(return_value=response)
         self.assertIsNone(self.task_manager.create_task(task))
 
+    def test_create_task_invalidates_not_found(self):
+        task_manager = TaskManagerInterface(MockApikeyClient(), "", cache_loader=CacheLoader(InMemoryCache()))
+        response = MockResponse(None)
+        response.status_code = 404
+        task_manager._client.get = Mock(return_value=response)
+        with self.assertRaises(NotFound):
+            task_manager.get_task("task_id")
+
+        task = Task("task_id", None, None, "", "", "", None, TaskGoal("", ""))
+        created = MockResponse(task.to_repr())
+        created.status_code = 201
+        task_manager._client.post = Mock(return_value=created)
+        task_manager.create_task(task)
+
+        found = MockResponse(task.to_repr())
+        found.status_code = 200
+        task_manager._client.get = Mock(return_value=found)
+        self.assertEqual(task, task_manager.get_task("task_id"))
+
     def test_create_task_exception(self):
         task = Task("task_id", None, None, "", "", "", None, TaskGoal("", ""))
         response = MockResponse(None)
@@ -24,3 +24,21 @@ class TestServiceCollector(TestCase):
         self.assertIsInstance(wenet.task_manager, TaskManagerInterface)
         self.assertIsInstance(wenet.logger, LoggerInterface)
         self.assertIsInstance(wenet.hub, HubInterface)
+
+    def test_lazy_build(self):
+        client = MockApikeyClient()
+        wenet = WeNet.build(client, platform_url="https://wenet.eu")
+        self.assertNotIn("task_manager", vars(wenet))
+
+        task_manager = wenet.task_manager
+        self.assertIsInstance(task_manager, TaskManagerInterface)
+        self.assertIs(task_manager, wenet.task_manager)
+        self.assertIs(client, task_manager._client)
+        self.assertEqual("https://wenet.eu/task_manager", task_manager._base_url)
+        self.assertNotIn("hub", vars(wenet))
+        self.assertIsInstance(wenet.hub, HubInterface)
+
+    def test_unknown_attribute(self):
+        wenet = WeNet.build(MockApikeyClient())
+        with self.assertRaises(AttributeError):
+            wenet.unknown
@@ -2,13 +2,14 @@ from __future__ import absolute_import, annotations
 
 import random
 from unittest import TestCase
+from unittest.mock import patch
 from uuid import uuid4
 
 from wenet.model.callback_message.builder import MessageBuilder, EventBuilder
 from wenet.model.callback_message.event import Event, WeNetAuthenticationEvent
 from wenet.model.callback_message.message import TextualMessage, TaskProposalNotification, TaskVolunteerNotification, \
     TaskConcludedNotification, TaskSelectionNotification, IncentiveMessage, IncentiveBadge, QuestionToAnswerMessage, \
-    AnsweredQuestionMessage
+    AnsweredQuestionMessage, AnsweredPickedMessage, Message
 
 
 class TestMessageBuilder(TestCase):
@@ -134,6 +135,53 @@ class TestMessageBuilder(TestCase):
         self.assertEqual(user_id, message.user_id)
         self.assertEqual(transaction_id, message.transaction_id)
 
+    def test_answered_picked_message(self):
+        receiver_id = str(uuid4())
+        app_id = str(uuid4())
+        task_id = str(uuid4())
+        transaction_id = str(uuid4())
+        start_message = AnsweredPickedMessage(app_id, receiver_id, task_id, transaction_id, {})
+        message = MessageBuilder.build(start_message.to_repr())
+        self.assertIsInstance(message, AnsweredPickedMessage)
+        self.assertEqual(task_id, message.task_id)
+        self.assertEqual(transaction_id, message.transaction_id)
+
+    def test_unknown_label(self):
+        raw_message = Message(str(uuid4()), str(uuid4()), str(uuid4()), {}).to_repr()
+        message = MessageBuilder.build(raw_message)
+        self.assertEqual(Message, type(message))
+        self.assertEqual(raw_message, message.to_repr())
+
+    @patch.dict(Message._decoders)
+    def test_register(self):
+        label = str(uuid4())
+
+        class CustomMessage(Message):
+            @staticmethod
+            def from_repr(raw: dict) -> CustomMessage:
+                return CustomMessage(raw["appId"], raw["receiverId"], raw["label"], raw["attributes"])
+
+        MessageBuilder.register(label, CustomMessage.from_repr)
+        message = MessageBuilder.build(Message(str(uuid4()), str(uuid4()), label, {}).to_repr())
+        self.assertIsInstance(message, CustomMessage)
+        self.assertIsInstance(Message.from_repr(message.to_repr()), CustomMessage)
+
+    def test_build_many(self):
+        raw_messages = [
+            TextualMessage(str(uuid4()), str(uuid4()), "title", "text", {}).to_repr(),
+            TaskProposalNotification(str(uuid4()), str(uuid4()), {}).to_repr(),
+            Message(str(uuid4()), str(uuid4()), str(uuid4()), {}).to_repr()
+        ]
+        messages = MessageBuilder.build_many(raw_messages)
+        self.assertEqual(3, len(messages))
+        self.assertIsInstance(messages[0], TextualMessage)
+        self.assertIsInstance(messages[1], TaskProposalNotification)
+        self.assertEqual(Message, type(messages[2]))
+        self.assertEqual(raw_messages, [message.to_repr() for message in messages])
+
+    def test_build_many_empty(self):
+        self.assertEqual([], MessageBuilder.build_many([]))
+
 
 class TestEventBuilder(TestCase):
     def test_event(self):
@@ -152,3 +200,21 @@ class TestEventBuilder(TestCase):
         self.assertEqual(parsed_event.event_type, event.event_type)
         self.assertEqual(parsed_event.external_id, event.external_id)
         self.assertEqual(parsed_event.code, event.code)
+
+    @patch.dict(EventBuilder._decoders)
+    def test_register(self):
+        event_type = str(uuid4())
+
+        class CustomEvent(Event):
+            @staticmethod
+            def from_repr(raw: dict) -> CustomEvent:
+                return CustomEvent(raw["type"])
+
+        EventBuilder.register(event_type, CustomEvent.from_repr)
+        self.assertIsInstance(EventBuilder.build(Event(event_type).to_repr()), CustomEvent)
+
+    def test_build_many(self):
+        events = [WeNetAuthenticationEvent(str(uuid4()), str(uuid4())), Event(str(uuid4()))]
+        parsed_events = EventBuilder.build_many([event.to_repr() for event in events])
+        self.assertEqual(events, parsed_events)
+        self.assertIsInstance(parsed_events[0], WeNetAuthenticationEvent)
@@ -1,6 +1,7 @@
 from __future__ import absolute_import, annotations
 
 from unittest import TestCase
+from unittest.mock import patch
 
 from wenet.model.logging_message.content import TextualContent, BaseContent, ActionContent, AttachmentContent, \
     LocationContent, Card, CarouselContent, ActionRequest
@@ -64,3 +65,39 @@ class TestActionRequest(TestCase):
     def test_repr(self):
         content = ActionRequest("value")
         self.assertEqual(content, ActionRequest.from_repr(content.to_repr()))
+
+    def test_base_repr(self):
+        content = ActionRequest("value")
+        self.assertEqual(content, BaseContent.from_repr(content.to_repr()))
+
+
+class TestBaseContent(TestCase):
+    def test_unexpected_type(self):
+        with self.assertRaises(TypeError):
+            BaseContent.from_repr({"type": "unexpected"})
+
+    @patch.dict(BaseContent._decoders)
+    def test_register(self):
+
+        class VideoContent(BaseContent):
+            TYPE = "test_video"
+
+            def __init__(self, uri: str) -> None:
+                super().__init__()
+                self.uri = uri
+
+            @staticmethod
+            def get_type() -> str:
+                return VideoContent.TYPE
+
+            def to_repr(self) -> dict:
+                return {"type": self.type, "uri": self.uri}
+
+            @staticmethod
+            def from_repr(raw: dict) -> VideoContent:
+                return VideoContent(raw["uri"])
+
+        BaseContent.register(VideoContent.TYPE, VideoContent.from_repr)
+        content = BaseContent.from_repr(VideoContent("uri").to_repr())
+        self.assertIsInstance(content, VideoContent)
+        self.assertEqual("uri", content.uri)
@@ -1,8 +1,9 @@
 from __future__ import absolute_import, annotations
 
 from unittest import TestCase
+from unittest.mock import patch
 
-from wenet.model.logging_message.content import TextualContent
+from wenet.model.logging_message.content import TextualContent, BaseContent
 from wenet.model.logging_message.message import RequestMessage, ResponseMessage, BaseMessage, \
     NotificationMessage
 
@@ -29,3 +30,29 @@ class TestNotificationMessage(TestCase):
         content.with_button("button", "value")
         message = NotificationMessage("message_id", "channel", "user_id", "project", content)
         self.assertEqual(message, BaseMessage.from_repr(message.to_repr()))
+
+
+class TestBaseMessage(TestCase):
+    def test_unexpected_type(self):
+        message = RequestMessage("message_id", "channel", "user_id", "project", TextualContent("text")).to_repr()
+        message["type"] = "unexpected"
+        with self.assertRaises(TypeError):
+            BaseMessage.from_repr(message)
+
+    @patch.dict(BaseMessage._decoders)
+    def test_register(self):
+
+        class EventMessage(BaseMessage):
+            TYPE = "TEST_EVENT"
+
+            @staticmethod
+            def get_type() -> str:
+                return EventMessage.TYPE
+
+            @staticmethod
+            def from_repr(raw: dict) -> EventMessage:
+                return EventMessage(raw["messageId"], raw["channel"], raw["userId"], raw["project"], BaseContent.from_repr(raw["content"]))
+
+        BaseMessage.register(EventMessage.TYPE, EventMessage.from_repr)
+        message = EventMessage("message_id", "channel", "user_id", "project", TextualContent("text"))
+        self.assertIsInstance(BaseMessage.from_repr(message.to_repr()), EventMessage)
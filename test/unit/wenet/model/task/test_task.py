@@ -454,6 +454,23 @@ class TestTask(TestCase):
             self.fail("From repr should not fail")
 
 
+    def test_str(self):
+        task = Task(
+            "task_id",
+            12345,
+            67486,
+            "type",
+            "requester",
+            "app_id",
+            "community_id",
+            TaskGoal("name", "description"),
+            attributes={"attribute": "value" * 1000}
+        )
+        self.assertEqual("Task(task_id='task_id', app_id='app_id', requester_id='requester')", str(task))
+        self.assertEqual(str(task), repr(task))
+        self.assertEqual("TaskPage(offset=0, total=1, tasks=1)", str(TaskPage(0, 1, [task])))
+
+
 class TestTaskPage(TestCase):
 
     def test_repr(self):
@@ -570,3 +587,6 @@ class TestTaskGoal(TestCase):
         self.assertEqual(task_goal, task_goal1)
         self.assertNotEqual(task_goal, task_goal2)
         self.assertNotEqual(task_goal, task_goal3)
+
+    def test_str(self):
+        self.assertEqual("TaskGoal(name='name')", str(TaskGoal("name", "description")))
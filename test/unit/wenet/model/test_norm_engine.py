@@ -0,0 +1,122 @@
+from __future__ import absolute_import, annotations
+
+from unittest import TestCase
+
+from wenet.model.norm import Norm, NormOperator
+from wenet.model.norm_engine import CompiledNorms, NormEngine
+from wenet.model.task.task import Task, TaskGoal
+from wenet.model.user.common import Date, Gender
+from wenet.model.user.profile import WeNetUserProfile
+
+
+def build_profile(profile_id: str, gender: Gender = None, year: int = None, last_update_ts: int = None) -> WeNetUserProfile:
+    profile = WeNetUserProfile.empty(profile_id)
+    profile.gender = gender
+    profile.date_of_birth = Date(year, 1, 1) if year is not None else None
+    profile.last_update_ts = last_update_ts
+    return profile
+
+
+class TestCompiledNorms(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.profiles = [
+            build_profile("first", Gender.FEMALE, 1990),
+            build_profile("second", Gender.MALE, 1980),
+            build_profile("third", Gender.FEMALE, 2005),
+            build_profile("fourth", None, None),
+        ]
+
+    def test_evaluate(self):
+        norms = CompiledNorms([
+            Norm("gender", "gender", NormOperator.EQUALS, "F", False),
+            Norm("age", "dateOfBirth.year", NormOperator.LESS_EQ_THAN, 2000, False),
+        ])
+        self.assertEqual([True, False, False, False], norms.evaluate(self.profiles))
+        self.assertEqual([self.profiles[0]], norms.filter(self.profiles))
+
+    def test_negation(self):
+        norms = CompiledNorms([Norm("gender", "gender", NormOperator.EQUALS, "M", True)])
+        self.assertEqual([True, False, True, True], norms.evaluate(self.profiles))
+
+    def test_no_norms(self):
+        self.assertEqual([True] * 4, CompiledNorms([]).evaluate(self.profiles))
+
+    def test_not_comparable_value(self):
+        norms = CompiledNorms([Norm("year", "dateOfBirth.year", NormOperator.GREATER_THAN, "2000", False)])
+        self.assertEqual([False] * 4, norms.evaluate(self.profiles))
+
+    def test_dictionary_attribute(self):
+        self.profiles[0].competences = [{"name": "competence"}]
+        norms = CompiledNorms([Norm("competences", "competences", NormOperator.EQUALS, [{"name": "competence"}], False)])
+        self.assertEqual([True, False, False, False], norms.evaluate(self.profiles))
+        self.assertTrue(CompiledNorms([Norm("key", "key", NormOperator.GREATER_THAN, 1, False)])({"key": 2}))
+
+    def test_evaluate_columns(self):
+        norms = CompiledNorms([
+            Norm("gender", "gender", NormOperator.EQUALS, "F", False),
+            Norm("age", "dateOfBirth.year", NormOperator.LESS_EQ_THAN, 2000, False),
+        ])
+        columns = {
+            "gender": ["F", "M", "F", None],
+            "dateOfBirth.year": [1990, 1980, 2005, None],
+        }
+        self.assertEqual(norms.evaluate(self.profiles), norms.evaluate_columns(columns))
+
+    def test_evaluate_missing_columns(self):
+        self.assertEqual([False] * 3, CompiledNorms([Norm("gender", "gender", NormOperator.EQUALS, "F", False)]).evaluate_columns({}, size=3))
+        self.assertEqual([True] * 3, CompiledNorms([Norm("gender", "gender", NormOperator.EQUALS, "F", True)]).evaluate_columns({}, size=3))
+        with self.assertRaises(ValueError):
+            CompiledNorms([]).evaluate_columns({})
+
+    def test_evaluate_columns_different_lengths(self):
+        norms = CompiledNorms([
+            Norm("gender", "gender", NormOperator.EQUALS, "F", False),
+            Norm("age", "dateOfBirth.year", NormOperator.LESS_EQ_THAN, 2000, False),
+        ])
+        with self.assertRaises(ValueError):
+            norms.evaluate_columns({"gender": ["F", "M"], "dateOfBirth.year": [1990]})
+
+
+class TestNormEngine(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.engine = NormEngine()
+        self.task = Task("task_id", None, None, "task_type_id", "requester_id", "app_id", None, TaskGoal("name", "description"),
+                         norms=[Norm("gender", "gender", NormOperator.EQUALS, "F", False)])
+
+    def test_compile_cache(self):
+        compiled = self.engine.compile(self.task.norms)
+        self.assertIs(compiled, self.engine.compile([Norm("other_id", "gender", NormOperator.EQUALS, "F", False)]))
+        self.assertIsNot(compiled, self.engine.compile([Norm("gender", "gender", NormOperator.EQUALS, "M", False)]))
+
+    def test_matching_profiles(self):
+        profiles = [build_profile("first", Gender.FEMALE, last_update_ts=1), build_profile("second", Gender.MALE, last_update_ts=1)]
+        self.assertEqual([profiles[0]], self.engine.matching_profiles(self.task, profiles))
+
+    def test_cached_results(self):
+        profile = build_profile("first", Gender.FEMALE, last_update_ts=1)
+        self.assertEqual([True], self.engine.evaluate_task(self.task, [profile]))
+
+        profile.gender = Gender.MALE
+        self.assertEqual([True], self.engine.evaluate_task(self.task, [profile]))
+        profile.last_update_ts = 2
+        self.assertEqual([False], self.engine.evaluate_task(self.task, [profile]))
+
+        profile.gender = Gender.FEMALE
+        self.engine.invalidate("task_id")
+        self.assertEqual([True], self.engine.evaluate_task(self.task, [profile]))
+
+    def test_changed_norms(self):
+        profile = build_profile("first", Gender.FEMALE, last_update_ts=1)
+        self.assertEqual([True], self.engine.evaluate_task(self.task, [profile]))
+        self.task.norms = [Norm("gender", "gender", NormOperator.EQUALS, "M", False)]
+        self.assertEqual([False], self.engine.evaluate_task(self.task, [profile]))
+
+    def test_profiles_without_update_ts(self):
+        profile = build_profile("first", Gender.FEMALE)
+        self.assertEqual([True], self.engine.evaluate_task(self.task, [profile]))
+        profile.gender = Gender.MALE
+        self.assertEqual([False], self.engine.evaluate_task(self.task, [profile]))
@@ -0,0 +1,144 @@
+from __future__ import absolute_import, annotations
+
+import copy
+import pickle
+from unittest import TestCase
+
+from wenet.model.callback_message.message import TextualMessage
+from wenet.model.norm import Norm, NormOperator
+from wenet.model.task.task import Task, TaskGoal
+from wenet.model.task.transaction import TaskTransaction
+from wenet.model.user.common import Date
+from wenet.model.user.profile import WeNetUserProfile, UserName
+
+
+class TestCachedRepr(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = Task(
+            task_id="task_id",
+            creation_ts=1577833100,
+            last_update_ts=1577833100,
+            task_type_id="task_type_id",
+            requester_id="requester_id",
+            app_id="app_id",
+            community_id="community_id",
+            goal=TaskGoal("goal", "description"),
+            norms=[Norm("norm_id", "attribute", NormOperator.EQUALS, True, False)],
+            attributes={"key": "value"}
+        )
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(self.task._repr_cache)
+        self.assertIs(Task, type(self.task))
+
+    def test_cached(self):
+        self.task.enable_repr_cache()
+        first_repr = self.task.to_repr()
+        self.assertEqual(first_repr, self.task.to_repr())
+
+    def test_returns_copy(self):
+        self.task.enable_repr_cache()
+        self.task.prepare_task()
+        self.assertIn("_creationTs", self.task.to_repr())
+
+    def test_returns_deep_copy(self):
+        self.task.enable_repr_cache()
+        task_repr = self.task.to_repr()
+        task_repr["goal"]["name"] = "other goal"
+        task_repr["norms"].clear()
+        task_repr["attributes"]["key"] = "other value"
+
+        self.assertEqual("goal", self.task.to_repr()["goal"]["name"])
+        self.assertEqual(1, len(self.task.to_repr()["norms"]))
+        self.assertEqual({"key": "value"}, self.task.to_repr()["attributes"])
+
+    def test_invalidated_on_assignment(self):
+        self.task.enable_repr_cache()
+        self.task.to_repr()
+        self.task.requester_id = "other_requester_id"
+        self.assertEqual("other_requester_id", self.task.to_repr()["requesterId"])
+
+    def test_invalidated_on_nested_assignment(self):
+        self.task.enable_repr_cache()
+        self.task.to_repr()
+        self.task.goal.name = "other goal"
+        self.task.norms[0].negation = True
+        self.assertEqual("other goal", self.task.to_repr()["goal"]["name"])
+        self.assertTrue(self.task.to_repr()["norms"][0]["negation"])
+
+    def test_invalidated_on_in_place_change(self):
+        self.task.enable_repr_cache()
+        self.task.to_repr()
+        self.task.norms.append(Norm("other_norm_id", "attribute", NormOperator.LESS_THAN, 1, False))
+        self.assertEqual(2, len(self.task.to_repr()["norms"]))
+        self.task.norms[1].comparison = 2
+        self.assertEqual(2, self.task.to_repr()["norms"][1]["comparison"])
+        self.task.attributes["key"] = "other value"
+        self.assertEqual({"key": "other value"}, self.task.to_repr()["attributes"])
+
+    def test_invalidated_on_deeply_nested_in_place_change(self):
+        message = TextualMessage("app_id", "receiver_id", "title", "text", {})
+        self.task.transactions = [TaskTransaction("transaction_id", "task_id", "label", 1577833100, 1577833100, "actioneer_id", {"key": "value"}, [message])]
+        self.task.enable_repr_cache()
+        self.task.to_repr()
+
+        self.task.goal.keywords.append("keyword")
+        self.assertEqual(["keyword"], self.task.to_repr()["goal"]["keywords"])
+        self.task.transactions[0].attributes["key"] = "other value"
+        self.assertEqual({"key": "other value"}, self.task.to_repr()["transactions"][0]["attributes"])
+        self.task.transactions[0].messages[0].attributes["text"] = "other text"
+        self.assertEqual("other text", self.task.to_repr()["transactions"][0]["messages"][0]["attributes"]["text"])
+
+    def test_cached_again_after_invalidation(self):
+        self.task.enable_repr_cache()
+        self.task.to_repr()
+        self.task.requester_id = "other_requester_id"
+        self.task.to_repr()
+
+        self.assertEqual(1, len(self.task._repr_cache))
+
+    def test_explicit_invalidation(self):
+        norms = self.task.norms
+        self.task.enable_repr_cache()
+        self.task.to_repr()
+        # A reference taken before the representation was cached is not tracked
+        norms.append(Norm("other_norm_id", "attribute", NormOperator.LESS_THAN, 1, False))
+        self.task.invalidate_repr()
+        self.assertEqual(1, len(self.task.to_repr()["norms"]))
+
+    def test_disable(self):
+        self.task.enable_repr_cache()
+        self.task.to_repr()
+        self.task.disable_repr_cache()
+        self.assertIsNone(self.task._repr_cache)
+        self.assertEqual(Task.from_repr(self.task.to_repr()), self.task)
+
+    def test_profile(self):
+        profile = WeNetUserProfile.empty("user_id")
+        profile.name = UserName("first", None, "last", None, None)
+        profile.date_of_birth = Date(2000, 1, 1)
+        profile.enable_repr_cache()
+
+        self.assertEqual(WeNetUserProfile.from_repr(profile.to_repr()), profile)
+        profile.name.first = "other"
+        profile.date_of_birth.year = 2001
+        profile.competences = [{"name": "competence"}]
+        profile_repr = profile.to_repr()
+        self.assertEqual("other", profile_repr["name"]["first"])
+        self.assertEqual(2001, profile_repr["dateOfBirth"]["year"])
+        self.assertEqual([{"name": "competence"}], profile_repr["competences"])
+        self.assertEqual({"first": "other", "last": "last"}, profile.name.to_repr(True))
+
+    def test_copy_and_pickle(self):
+        self.task.enable_repr_cache()
+        self.task.to_repr()
+        self.assertIs(Task, type(self.task))
+
+        for other_task in [copy.deepcopy(self.task), pickle.loads(pickle.dumps(self.task))]:
+            self.assertIs(Task, type(other_task))
+            self.assertIs(list, type(other_task.norms))
+            self.assertIs(dict, type(other_task.attributes))
+            self.assertIsNone(other_task._repr_cache)
+            self.assertEqual(self.task, other_task)
@@ -0,0 +1,71 @@
+from __future__ import absolute_import, annotations
+
+import json
+from unittest import TestCase, skipIf
+
+from wenet.model.app import App, AppStatus
+from wenet.model.callback_message.message import TextualMessage
+from wenet.model.norm import Norm, NormOperator
+from wenet.model.task.task import Task, TaskGoal, TaskPage
+from wenet.model.task.transaction import TaskTransaction
+from wenet.model.user.common import Date, Gender
+from wenet.model.user.profile import UserName, WeNetUserProfile, WeNetUserProfilesPage
+
+try:
+    from wenet.model import structs
+except ImportError:
+    structs = None
+
+
+@skipIf(structs is None, "msgspec is not installed")
+class TestStructs(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        transaction = TaskTransaction("transaction_id", "task_id", "label", 1577833200, 1577833300, "actioneer_id", {"key": "value"},
+                                      [TextualMessage("app_id", "receiver_id", "title", "text", {})])
+        self.task = Task("task_id", 1577833100, 1577833200, "task_type_id", "requester_id", "app_id", "community_id",
+                         TaskGoal("name", "description", ["keyword"]),
+                         [Norm("norm_id", "attribute", NormOperator.EQUALS, "value", False)],
+                         {"key": "value"}, 1577833300, [transaction])
+        self.profile = WeNetUserProfile.empty("user_id")
+        self.profile.name = UserName("first", None, "last", None, None)
+        self.profile.date_of_birth = Date(2000, 1, 20)
+        self.profile.gender = Gender.FEMALE
+        self.profile.competences = [{"name": "competence", "level": 0.5}]
+        self.app = App(1577833100, 1577833200, "app_id", AppStatus.STATUS_ACTIVE, "name", 1, None, "https://example.com/callback", {"key": "value"})
+
+    def assert_round_trip(self, model, model_type):
+        raw = json.dumps(model.to_repr()).encode("utf-8")
+        decoded = structs.decode_model(raw, model_type)
+        self.assertEqual(model, decoded)
+        self.assertEqual(model_type.from_repr(json.loads(raw)).to_repr(), decoded.to_repr())
+        self.assertEqual(model, structs.decode_model(structs.encode(model), model_type))
+
+    def test_task(self):
+        self.assert_round_trip(self.task, Task)
+        self.assert_round_trip(TaskPage(0, 2, [self.task, self.task]), TaskPage)
+        self.assert_round_trip(self.task.transactions[0], TaskTransaction)
+
+    def test_profile(self):
+        self.assert_round_trip(self.profile, WeNetUserProfile)
+        self.assert_round_trip(WeNetUserProfilesPage(0, 1, [self.profile]), WeNetUserProfilesPage)
+
+    def test_app(self):
+        self.assert_round_trip(self.app, App)
+
+    def test_tracked_model(self):
+        self.task.enable_repr_cache()
+        self.assertEqual(self.task, structs.decode_model(structs.encode(self.task), Task))
+
+    def test_minimal_task(self):
+        task = structs.decode_model(b'{"taskTypeId": "type", "requesterId": "requester", "appId": "app", "goal": {"name": "name"}}', Task)
+        self.assertEqual(Task(None, None, None, "type", "requester", "app", None, TaskGoal("name", "")), task)
+
+    def test_invalid_document(self):
+        with self.assertRaises(ValueError):
+            structs.decode_model(b'{"taskTypeId": 1, "requesterId": "requester", "appId": "app", "goal": {"name": "name"}}', Task)
+        with self.assertRaises(ValueError):
+            structs.decode_model(b'{"offset": 0}', TaskPage)
+        with self.assertRaises(ValueError):
+            structs.decode_model(b"notAJson", App)
@@ -0,0 +1,46 @@
+from __future__ import absolute_import, annotations
+
+from unittest import TestCase
+
+from wenet.model.norm import Norm, NormOperator
+from wenet.model.user.common import Date, Gender
+from wenet.model.user.diff import ProfileDiff
+from wenet.model.user.profile import CoreWeNetUserProfile, UserName, WeNetUserProfile
+
+
+class TestProfileDiff(TestCase):
+
+    def test_no_changes(self):
+        diff = ProfileDiff.compute(WeNetUserProfile.empty("user_id"), WeNetUserProfile.empty("user_id"))
+        self.assertTrue(diff.is_empty())
+        self.assertEqual({"id": "user_id"}, diff.to_repr())
+
+    def test_changes(self):
+        previous_profile = WeNetUserProfile.empty("user_id")
+        profile = WeNetUserProfile.empty("user_id")
+        profile.name = UserName("first", None, "last", None, None)
+        profile.date_of_birth = Date(2000, 1, 1)
+        profile.gender = Gender.FEMALE
+        profile.norms = [Norm("norm_id", "attribute", NormOperator.EQUALS, True, False)]
+        profile.competences = [{"name": "competence"}]
+        profile.creation_ts = 1577833200
+
+        diff = ProfileDiff.compute(previous_profile, profile)
+        self.assertEqual(["name", "dateOfBirth", "gender", "norms", "competences"], diff.changed_fields)
+        self.assertIn("competences", diff)
+        self.assertNotIn("materials", diff)
+        self.assertEqual(profile.name.to_repr(), diff.changes["name"])
+        self.assertEqual(Gender.FEMALE.value, diff.changes["gender"])
+        self.assertEqual([profile.norms[0].to_repr()], diff.changes["norms"])
+
+    def test_core_profile(self):
+        previous_profile = WeNetUserProfile.empty("user_id")
+        profile = CoreWeNetUserProfile.empty("user_id")
+        profile.email = "user@example.com"
+
+        diff = ProfileDiff.compute(previous_profile, profile)
+        self.assertEqual({"id": "user_id", "email": "user@example.com"}, diff.to_repr())
+
+    def test_different_profiles(self):
+        with self.assertRaises(ValueError):
+            ProfileDiff.compute(WeNetUserProfile.empty("user_id"), WeNetUserProfile.empty("other_user_id"))
@@ -450,3 +450,44 @@ class TestUserIdentifiersPage(TestCase):
         }
         self.assertIsInstance(UserIdentifiersPage.from_repr(user_ids_page_repr), UserIdentifiersPage)
 
+
+
+class TestScopeProjection(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.profile = WeNetUserProfile.empty("user_id")
+        self.profile.name = UserName("first", "middle", "last", "prefix", "suffix")
+        self.profile.date_of_birth = Date(2000, 1, 20)
+        self.profile.gender = Gender.FEMALE
+        self.profile.email = "email@example.com"
+        self.profile.phone_number = "phone number"
+
+    def test_filtered_repr(self):
+        scopes = [Scope.ID, Scope.MIDDLE_NAME, Scope.BIRTHDATE, Scope.GENDER, Scope.EMAIL, Scope.WRITE_FEED]
+        profile_repr = self.profile.to_repr()
+        self.assertEqual({
+            "name": {"middle": "middle"},
+            "id": "user_id",
+            "dateOfBirth": profile_repr["dateOfBirth"],
+            "gender": "F",
+            "email": "email@example.com",
+        }, self.profile.to_filtered_repr(scopes))
+
+    def test_public_repr(self):
+        self.assertEqual({"name": {"first": "first", "last": "last"}, "id": "user_id"}, self.profile.to_public_repr())
+
+    def test_cached_projection(self):
+        projection = WeNetUserProfile.ScopeMappings.get_projection([Scope.ID, Scope.EMAIL])
+        self.assertIs(projection, WeNetUserProfile.ScopeMappings.get_projection(frozenset([Scope.EMAIL, Scope.ID])))
+        self.assertEqual(["id", "email"], projection.fields)
+        self.assertIs(WeNetUserProfile.ScopeMappings.get_mappings(), WeNetUserProfile.ScopeMappings.get_mappings())
+
+    def test_batch(self):
+        other_profile = WeNetUserProfile.empty("other_user_id")
+        other_profile.name = None
+        profiles = [self.profile, other_profile]
+        scopes = [Scope.ID, Scope.LAST_NAME, Scope.PHONE_NUMBER]
+
+        self.assertEqual([profile.to_filtered_repr(scopes) for profile in profiles], WeNetUserProfile.to_filtered_reprs(profiles, scopes))
+        self.assertEqual([profile.to_public_repr() for profile in profiles], WeNetUserProfile.to_public_reprs(profiles))
@@ -1,12 +1,16 @@
 from __future__ import absolute_import, annotations
 
+import asyncio
+import os
 from json import JSONDecodeError
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 import redis
+import redis.asyncio
+import redis.sentinel
 
-from wenet.storage.cache import RedisCache, InMemoryCache
+from wenet.storage.cache import AsyncRedisCache, RedisCache, InMemoryCache
 
 
 class MockRedisCache(RedisCache):
@@ -108,3 +112,212 @@ class TestRedisCache(TestCase):
 
         with self.assertRaises(JSONDecodeError):
             cache.get("key")
+
+
+class TestRedisCacheFromEnv(TestCase):
+
+    def test_build_from_env(self):
+        with patch.dict(os.environ, {"REDIS_HOST": "redis", "REDIS_PORT": "6380", "REDIS_DB": "2", "REDIS_MAX_CONNECTIONS": "10",
+                                     "REDIS_SOCKET_TIMEOUT": "1.5", "REDIS_HEALTH_CHECK_INTERVAL": "15", "REDIS_POOL_TIMEOUT": "3"}):
+            cache = RedisCache.build_from_env()
+
+        pool = cache._r.connection_pool
+        self.assertIsInstance(pool, redis.BlockingConnectionPool)
+        self.assertEqual(10, pool.max_connections)
+        self.assertEqual(3, pool.timeout)
+        self.assertEqual(redis.Connection, pool.connection_class)
+        self.assertEqual("redis", pool.connection_kwargs["host"])
+        self.assertEqual(6380, pool.connection_kwargs["port"])
+        self.assertEqual(2, pool.connection_kwargs["db"])
+        self.assertEqual(1.5, pool.connection_kwargs["socket_timeout"])
+        self.assertEqual(5, pool.connection_kwargs["socket_connect_timeout"])
+        self.assertEqual(15, pool.connection_kwargs["health_check_interval"])
+
+    def test_build_from_env_with_ssl(self):
+        with patch.dict(os.environ, {"REDIS_SSL": "true", "REDIS_SSL_CERT_REQS": "none", "REDIS_PASSWORD": "password"}):
+            cache = RedisCache.build_from_env()
+
+        pool = cache._r.connection_pool
+        self.assertEqual(redis.SSLConnection, pool.connection_class)
+        self.assertEqual("none", pool.connection_kwargs["ssl_cert_reqs"])
+        self.assertEqual("password", pool.connection_kwargs["password"])
+
+    def test_build_sentinel_from_env(self):
+        with patch.dict(os.environ, {"REDIS_SENTINELS": "sentinel1:26379, sentinel2:26380", "REDIS_SENTINEL_SERVICE": "cache", "REDIS_MAX_CONNECTIONS": "20"}):
+            cache = RedisCache.build_sentinel_from_env()
+
+        pool = cache._r.connection_pool
+        self.assertIsInstance(pool, redis.sentinel.SentinelConnectionPool)
+        self.assertEqual("cache", pool.service_name)
+        self.assertEqual(20, pool.max_connections)
+        sentinels = [sentinel.connection_pool.connection_kwargs for sentinel in pool.sentinel_manager.sentinels]
+        self.assertEqual([("sentinel1", 26379), ("sentinel2", 26380)], [(sentinel["host"], sentinel["port"]) for sentinel in sentinels])
+
+    def test_build_from_env_with_mode(self):
+        with patch.dict(os.environ, {"REDIS_MODE": "sentinel"}):
+            cache = RedisCache.build_from_env()
+
+        self.assertIsInstance(cache._r.connection_pool, redis.sentinel.SentinelConnectionPool)
+
+    def test_build_cluster_from_env(self):
+        with patch.dict(os.environ, {"REDIS_CLUSTER_NODES": "node1:7000,node2:7001", "REDIS_MAX_CONNECTIONS": "5"}), \
+                patch("redis.cluster.RedisCluster") as cluster:
+            cache = RedisCache.build_cluster_from_env()
+
+        self.assertEqual(cluster.return_value, cache._r)
+        kwargs = cluster.call_args.kwargs
+        self.assertEqual([("node1", 7000), ("node2", 7001)], [(node.host, node.port) for node in kwargs["startup_nodes"]])
+        self.assertEqual(5, kwargs["max_connections"])
+        self.assertFalse(kwargs["ssl"])
+
+    def test_build_from_env_with_unknown_mode(self):
+        with patch.dict(os.environ, {"REDIS_MODE": "unknown"}):
+            with self.assertRaises(ValueError):
+                RedisCache.build_from_env()
+
+
+class TestAsyncRedisCache(TestCase):
+
+    def test_cache(self):
+        r = AsyncMock()
+        cache = AsyncRedisCache(r)
+
+        key = asyncio.new_event_loop().run_until_complete(cache.cache({"key": "value"}, key="expectedKey", ttl=10))
+
+        self.assertEqual("expectedKey", key)
+        r.set.assert_awaited_once()
+        self.assertEqual(10, r.set.call_args.kwargs["ex"])
+
+    def test_get(self):
+        r = AsyncMock()
+        r.get.return_value = b'{"key": "value"}'
+        cache = AsyncRedisCache(r)
+
+        result = asyncio.new_event_loop().run_until_complete(cache.get("key"))
+
+        self.assertEqual({"key": "value"}, result)
+
+    def test_get_non_existing_key(self):
+        r = AsyncMock()
+        r.get.return_value = None
+        cache = AsyncRedisCache(r)
+
+        result = asyncio.new_event_loop().run_until_complete(cache.get("nonExistingKey"))
+
+        self.assertEqual(None, result)
+
+    def test_invalidate_prefix(self):
+        async def scan_iter(**kwargs):
+            for key in [b"apps:app_1", b"apps:app_2", b"apps:app_3"]:
+                yield key
+
+        r = Mock()
+        r.scan_iter = Mock(side_effect=scan_iter)
+        r.unlink = AsyncMock(side_effect=lambda *keys: len(keys))
+        cache = AsyncRedisCache(r, namespace="apps")
+
+        removed = asyncio.new_event_loop().run_until_complete(cache.invalidate_prefix("app_", batch_size=2))
+
+        self.assertEqual(3, removed)
+        r.scan_iter.assert_called_once_with(match="apps:app_*", count=2)
+        self.assertEqual(2, r.unlink.await_count)
+
+    def test_build_from_env(self):
+        with patch.dict(os.environ, {"REDIS_MAX_CONNECTIONS": "10"}):
+            cache = AsyncRedisCache.build_from_env()
+
+        self.assertIsInstance(cache._r, redis.asyncio.Redis)
+        self.assertIsInstance(cache._r.connection_pool, redis.asyncio.BlockingConnectionPool)
+        self.assertEqual(10, cache._r.connection_pool.max_connections)
+
+
+class TestRedisCacheNamespace(TestCase):
+
+    def test_namespaced_keys(self):
+        r = Mock()
+        r.get.return_value = b'{"key": "value"}'
+        cache = RedisCache(r, namespace="credentials")
+
+        self.assertEqual("resource_id", cache.cache({"key": "value"}, key="resource_id", ttl=10))
+        r.set.assert_called_once_with("credentials:resource_id", b'{"key":"value"}', ex=10)
+        self.assertEqual({"key": "value"}, cache.get("resource_id"))
+        r.get.assert_called_once_with("credentials:resource_id")
+        cache.delete("resource_id")
+        r.delete.assert_called_once_with("credentials:resource_id")
+
+    def test_versioned_keys(self):
+        r = Mock()
+        r.get.side_effect = lambda key: b"3" if key == "apps:generation" else None
+        r.incr.return_value = 4
+        cache = RedisCache(r, namespace="apps", versioned=True)
+
+        self.assertIsNone(cache.get("app_id"))
+        r.get.assert_called_with("apps:g3:app_id")
+
+        cache.invalidate_all()
+        r.incr.assert_called_once_with("apps:generation")
+        cache.get("app_id")
+        r.get.assert_called_with("apps:g4:app_id")
+
+    def test_versioned_requires_namespace(self):
+        with self.assertRaises(ValueError):
+            RedisCache(Mock(), versioned=True)
+
+    def test_generation_refresh(self):
+        r = Mock()
+        r.get.return_value = b"1"
+        cache = RedisCache(r, namespace="apps", versioned=True, generation_refresh_interval=60)
+
+        self.assertEqual(1, cache.generation())
+        r.get.return_value = b"2"
+        self.assertEqual(1, cache.generation())
+
+        cache.generation_refresh_interval = 0
+        self.assertEqual(2, cache.generation())
+
+    def test_invalidate_prefix(self):
+        r = Mock()
+        r.scan_iter.return_value = iter([f"apps:app_{index}".encode() for index in range(5)])
+        r.unlink.side_effect = lambda *keys: len(keys)
+        cache = RedisCache(r, namespace="apps")
+
+        self.assertEqual(5, cache.invalidate_prefix("app_", batch_size=2))
+
+        r.scan_iter.assert_called_once_with(match="apps:app_*", count=2)
+        self.assertEqual([2, 2, 1], [len(call.args) for call in r.unlink.call_args_list])
+
+    def test_invalidate_prefix_escapes_pattern(self):
+        r = Mock()
+        r.scan_iter.return_value = iter([])
+        cache = RedisCache(r, namespace="apps")
+
+        self.assertEqual(0, cache.invalidate_prefix("a*[b]"))
+        r.scan_iter.assert_called_once_with(match="apps:a\\*\\[b\\]*", count=500)
+        r.unlink.assert_not_called()
+
+    def test_invalidate_prefix_without_namespace(self):
+        with self.assertRaises(ValueError):
+            RedisCache(Mock()).invalidate_prefix("")
+
+    def test_invalidate_all_not_versioned(self):
+        r = Mock()
+        r.scan_iter.return_value = iter([b"apps:app_id"])
+        r.unlink.return_value = 1
+        cache = RedisCache(r, namespace="apps")
+
+        cache.invalidate_all()
+
+        r.scan_iter.assert_called_once_with(match="apps:*", count=500)
+        r.unlink.assert_called_once_with(b"apps:app_id")
+
+    def test_purge_stale_generations(self):
+        r = Mock()
+        r.get.return_value = b"2"
+        r.scan_iter.return_value = iter([b"apps:g1:app_id", b"apps:g2:app_id", b"apps:g1:other_id"])
+        r.unlink.side_effect = lambda *keys: len(keys)
+        cache = RedisCache(r, namespace="apps", versioned=True)
+
+        self.assertEqual(2, cache.purge_stale_generations())
+
+        r.scan_iter.assert_called_once_with(match="apps:g*", count=500)
+        r.unlink.assert_called_once_with(b"apps:g1:app_id", b"apps:g1:other_id")
@@ -0,0 +1,271 @@
+from __future__ import absolute_import, annotations
+
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from unittest import TestCase, skipUnless
+from unittest.mock import Mock
+
+from test.unit.wenet.interface.mock.client import MockApikeyClient
+from test.unit.wenet.interface.mock.response import MockResponse
+from wenet.interface.task_manager import TaskManagerInterface
+from wenet.model.task.task import Task, TaskGoal
+from wenet.storage.cache import RedisCache
+from wenet.storage.coordinator import ExportCoordinator
+from wenet.utils import codec
+
+try:
+    import fakeredis
+    # Required by fakeredis to run Lua scripts
+    import lupa
+except ImportError:
+    fakeredis = None
+
+
+class TestExportCoordinator(TestCase):
+
+    def _coordinator(self, **kwargs) -> ExportCoordinator:
+        r = Mock()
+        self.scripts = {name: Mock(return_value=1) for name in ("create", "lease", "heartbeat", "complete", "release")}
+        r.register_script = Mock(side_effect=list(self.scripts.values()))
+        return ExportCoordinator(RedisCache(r, namespace="wenet"), "job", **kwargs)
+
+    def _status(self, coordinator: ExportCoordinator, *statuses: list) -> None:
+        coordinator._r.pipeline.return_value.execute = Mock(side_effect=list(statuses))
+
+    def test_keys_share_the_hash_tag_of_the_job(self):
+        coordinator = self._coordinator()
+
+        self.assertEqual("wenet:export:{job}:pending", coordinator._keys["pending"])
+        self.assertTrue(all(key.startswith("wenet:export:{job}:") for key in coordinator._keys.values()))
+
+    def test_create(self):
+        coordinator = self._coordinator()
+
+        self.assertTrue(coordinator.create([{"offset": 0, "limit": 10}, {"offset": 10, "limit": 10}]))
+
+        kwargs = self.scripts["create"].call_args[1]
+        self.assertEqual(["wenet:export:{job}:shards", "wenet:export:{job}:pending"], kwargs["keys"])
+        self.assertEqual([{"offset": 0, "limit": 10}, {"offset": 10, "limit": 10}], [codec.loads(arg) for arg in kwargs["args"]])
+
+    def test_lease(self):
+        coordinator = self._coordinator(lease_ttl=30, max_attempts=3)
+        self.scripts["lease"].return_value = [b"1", codec.dumps({"offset": 10, "limit": 10}), codec.dumps({"offset": 15}), 2]
+
+        lease = coordinator.lease()
+
+        self.assertEqual("1", lease.shard_id)
+        self.assertEqual({"offset": 10, "limit": 10}, lease.shard)
+        self.assertEqual({"offset": 15}, lease.progress)
+        self.assertEqual(2, lease.attempt)
+        self.assertEqual([30, lease.token, 3], self.scripts["lease"].call_args[1]["args"])
+
+    def test_nothing_to_lease(self):
+        coordinator = self._coordinator()
+        self.scripts["lease"].return_value = None
+
+        self.assertIsNone(coordinator.lease())
+
+    def test_checkpoint(self):
+        coordinator = self._coordinator()
+        self.scripts["lease"].return_value = [b"0", codec.dumps({"offset": 0, "limit": 10}), None, 1]
+        lease = coordinator.lease()
+
+        self.assertTrue(lease.checkpoint({"offset": 5}))
+
+        self.assertEqual({"offset": 5}, lease.progress)
+        self.assertEqual(["0", lease.token, 60, codec.dumps({"offset": 5})], self.scripts["heartbeat"].call_args[1]["args"])
+
+    def test_lost_lease(self):
+        coordinator = self._coordinator()
+        self.scripts["lease"].return_value = [b"0", codec.dumps({"offset": 0, "limit": 10}), None, 1]
+        self.scripts["heartbeat"].return_value = 0
+        lease = coordinator.lease()
+
+        self.assertFalse(lease.checkpoint({"offset": 5}))
+
+        self.assertTrue(lease.lost)
+        self.assertIsNone(lease.progress)
+
+    def test_work(self):
+        coordinator = self._coordinator()
+        self.scripts["lease"].side_effect = [[b"0", codec.dumps({"offset": 0, "limit": 10}), None, 1], None]
+        self._status(coordinator, [1, 0, 0, 1, 0])
+        process = Mock()
+
+        self.assertEqual(1, coordinator.work(process))
+
+        process.assert_called_once()
+        self.scripts["complete"].assert_called_once()
+
+    def test_work_waits_for_the_leased_shards(self):
+        coordinator = self._coordinator()
+        self.scripts["lease"].side_effect = [None, [b"0", codec.dumps({"offset": 0, "limit": 10}), None, 2], None]
+        # The shard leased by another worker expires, and is leased again
+        self._status(coordinator, [1, 0, 1, 0, 0], [1, 0, 0, 1, 0])
+
+        self.assertEqual(1, coordinator.work(Mock(), poll_interval=0))
+
+    def test_work_releases_the_failed_shards(self):
+        coordinator = self._coordinator()
+        self.scripts["lease"].side_effect = [[b"0", codec.dumps({"offset": 0, "limit": 10}), None, 1], None]
+        # Released, the shard was leased again by another worker until it failed too many times
+        self._status(coordinator, [1, 0, 0, 0, 1])
+
+        self.assertEqual(0, coordinator.work(Mock(side_effect=ValueError()), poll_interval=0))
+
+        self.scripts["release"].assert_called_once()
+        self.scripts["complete"].assert_not_called()
+
+    def test_work_does_not_complete_lost_shards(self):
+        coordinator = self._coordinator()
+        self.scripts["lease"].side_effect = [[b"0", codec.dumps({"offset": 0, "limit": 10}), None, 1], None]
+        self.scripts["heartbeat"].return_value = 0
+        self._status(coordinator, [1, 0, 0, 1, 0])
+
+        self.assertEqual(0, coordinator.work(lambda lease: lease.checkpoint({"offset": 10})))
+
+        self.scripts["complete"].assert_not_called()
+
+
+@skipUnless(fakeredis is not None or "TEST_REDIS_URL" in os.environ, "requires fakeredis with Lua support (pip install wenet-common[test]) or TEST_REDIS_URL")
+class TestExportCoordinatorScripts(TestCase):
+    """
+    Run the Lua scripts of the coordinator, on fakeredis or on the Redis server of TEST_REDIS_URL
+    """
+
+    def setUp(self):
+        if "TEST_REDIS_URL" in os.environ:
+            import redis
+            client = redis.Redis.from_url(os.environ["TEST_REDIS_URL"])
+        else:
+            client = fakeredis.FakeRedis()
+        self.cache = RedisCache(client, namespace="wenet-test")
+        self.job_id = uuid.uuid4().hex
+
+    def tearDown(self):
+        ExportCoordinator(self.cache, self.job_id).delete()
+
+    def _coordinator(self, **kwargs) -> ExportCoordinator:
+        return ExportCoordinator(self.cache, self.job_id, **kwargs)
+
+    def test_create_once(self):
+        coordinator = self._coordinator()
+
+        self.assertTrue(coordinator.create([{"offset": 0, "limit": 10}, {"offset": 10, "limit": 10}]))
+        self.assertFalse(coordinator.create([{"offset": 0, "limit": 20}]))
+
+        self.assertEqual({"shards": 2, "pending": 2, "leased": 0, "done": 0, "failed": 0}, coordinator.status())
+
+    def test_lease_and_complete(self):
+        coordinator = self._coordinator()
+        coordinator.create([{"offset": 0, "limit": 10}])
+
+        lease = coordinator.lease()
+
+        self.assertEqual(("0", {"offset": 0, "limit": 10}, None, 1), (lease.shard_id, lease.shard, lease.progress, lease.attempt))
+        self.assertIsNone(coordinator.lease())
+        self.assertTrue(lease.checkpoint({"offset": 5}))
+        self.assertTrue(lease.complete())
+        self.assertEqual({"shards": 1, "pending": 0, "leased": 0, "done": 1, "failed": 0}, coordinator.status())
+
+    def test_expired_lease_taken_over(self):
+        first = self._coordinator(lease_ttl=0.1)
+        first.create([{"offset": 0, "limit": 10}])
+        lost = first.lease()
+        lost.checkpoint({"offset": 5})
+        time.sleep(0.2)
+
+        lease = self._coordinator().lease()
+
+        self.assertEqual(("0", {"offset": 5}, 2), (lease.shard_id, lease.progress, lease.attempt))
+        # The lease expired and was given to another worker: its operations fail
+        self.assertFalse(lost.checkpoint({"offset": 8}))
+        self.assertFalse(lost.complete())
+        self.assertTrue(lost.lost)
+        self.assertIsNone(self._coordinator().lease())
+        self.assertTrue(lease.complete())
+        self.assertEqual({"shards": 1, "pending": 0, "leased": 0, "done": 1, "failed": 0}, first.status())
+
+    def test_released_shard_leased_again(self):
+        coordinator = self._coordinator()
+        coordinator.create([{"offset": 0, "limit": 10}])
+        lease = coordinator.lease()
+        lease.checkpoint({"offset": 3})
+
+        self.assertTrue(lease.release())
+
+        leased_again = coordinator.lease()
+        self.assertEqual(({"offset": 3}, 2), (leased_again.progress, leased_again.attempt))
+        self.assertFalse(lease.complete())
+
+    def test_max_attempts(self):
+        coordinator = self._coordinator(lease_ttl=0.1, max_attempts=2)
+        coordinator.create([{"offset": 0, "limit": 10}])
+        self.assertEqual(1, coordinator.lease().attempt)
+        time.sleep(0.2)
+        self.assertEqual(2, coordinator.lease().attempt)
+        time.sleep(0.2)
+
+        self.assertIsNone(coordinator.lease())
+        self.assertEqual({"shards": 1, "pending": 0, "leased": 0, "done": 0, "failed": 1}, coordinator.status())
+
+
+class TestTaskShards(TestCase):
+
+    def setUp(self):
+        self.task_manager = TaskManagerInterface(MockApikeyClient(), "")
+        self.tasks = [Task(f"task_{index:02}", 1000 + index, 2000, "", "", "app_id", None, TaskGoal("", "")).to_repr() for index in range(25)]
+
+        def get(url: str, query_params: dict, **kwargs) -> MockResponse:
+            matching = [task for task in self.tasks
+                        if query_params.get("creationFrom", 0) <= task["_creationTs"] <= query_params.get("creationTo", float("inf"))]
+            offset, limit = query_params.get("offset", 0), query_params["limit"]
+            response = MockResponse({"offset": offset, "total": len(matching), "tasks": matching[offset:offset + limit]})
+            response.status_code = 200
+            return response
+
+        self.task_manager._client.get = Mock(side_effect=get)
+
+    def _export(self, shards: list) -> list:
+        return [task.task_id for shard in shards for page, _ in self.task_manager.iter_task_shard(shard) for task in page]
+
+    def test_offset_shards(self):
+        shards = self.task_manager.plan_task_shards(shard_size=10)
+
+        self.assertEqual([{"offset": 0, "limit": 10}, {"offset": 10, "limit": 10}, {"offset": 20, "limit": 10}], shards)
+        self.assertEqual([task["id"] for task in self.tasks], self._export(shards))
+        self.assertIsNone(self.task_manager.page_size("tasks").server_maximum)
+
+    def test_window_shards(self):
+        self.task_manager._client.enable_connection_pool = Mock()
+        shards = self.task_manager.plan_task_shards(self._utc(1000), self._utc(1024), shard_size=10, max_workers=2)
+
+        self.assertEqual(3, len(shards))
+        self.assertEqual([task["id"] for task in self.tasks], self._export(shards))
+
+    def test_resume_offset_shard(self):
+        self.task_manager.page_size("tasks").minimum = 1
+        self.task_manager.page_size("tasks").maximum = 4
+        pages = self.task_manager.iter_task_shard({"offset": 10, "limit": 10})
+        _, progress = next(pages)
+        self.assertEqual({"offset": 14}, progress)
+
+        resumed = [task.task_id for page, _ in self.task_manager.iter_task_shard({"offset": 10, "limit": 10}, progress) for task in page]
+
+        self.assertEqual([task["id"] for task in self.tasks[14:20]], resumed)
+
+    def test_resume_window_shard(self):
+        self.task_manager.page_size("tasks").minimum = 1
+        self.task_manager.page_size("tasks").maximum = 4
+        pages = self.task_manager.iter_task_shard({"start": 1000, "end": 1009})
+        _, progress = next(pages)
+
+        resumed = [task.task_id for page, _ in self.task_manager.iter_task_shard({"start": 1000, "end": 1009}, progress) for task in page]
+
+        self.assertEqual([task["id"] for task in self.tasks[4:10]], resumed)
+
+    @staticmethod
+    def _utc(timestamp: int) -> datetime:
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc)
@@ -0,0 +1,219 @@
+from __future__ import absolute_import, annotations
+
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import redis
+
+from wenet.interface.exceptions import NotFound
+from wenet.storage.cache import InMemoryCache, RedisCache
+from wenet.storage.loader import CacheLoader
+
+
+class TestCacheLoader(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = InMemoryCache()
+        self.loader = CacheLoader(self.cache, soft_ttl=60, hard_ttl=600, beta=0)
+
+    def tearDown(self):
+        self.loader.close()
+        super().tearDown()
+
+    def _store(self, key: str, value, soft_expires_in: float, hard_expires_in: float, delta: float = 0.1) -> None:
+        now = time.time()
+        self.cache.cache({"value": value, "delta": delta, "softExpiresAt": now + soft_expires_in, "hardExpiresAt": now + hard_expires_in}, key=key)
+
+    def test_load_on_miss(self):
+        load = Mock(return_value={"key": "value"})
+
+        self.assertEqual({"key": "value"}, self.loader.get_or_load("key", load))
+        self.assertEqual({"key": "value"}, self.loader.get_or_load("key", load))
+        load.assert_called_once()
+
+    def test_returns_copies(self):
+        load = Mock(return_value={"ids": ["user_id"]})
+
+        self.loader.get_or_load("key", load)["ids"].append("other_user_id")
+        self.loader.get_or_load("key", load)["ids"].clear()
+
+        self.assertEqual({"ids": ["user_id"]}, self.loader.get_or_load("key", load))
+        load.assert_called_once()
+
+    def test_invalid_ttls(self):
+        with self.assertRaises(ValueError):
+            CacheLoader(self.cache, soft_ttl=60, hard_ttl=10)
+
+    def test_single_loader_for_concurrent_misses(self):
+        load = Mock(side_effect=lambda: time.sleep(0.05) or ["value"])
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(self.loader.get_or_load("key", load))) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        load.assert_called_once()
+        self.assertEqual([["value"]] * 10, results)
+        self.assertEqual(10, len(set(id(result) for result in results)))
+
+    def test_different_keys_loaded_concurrently(self):
+        other_loaded = threading.Event()
+        results = []
+
+        # The load of a key is still running while another key is loaded
+        thread = threading.Thread(target=lambda: results.append(self.loader.get_or_load("key", lambda: "value" if other_loaded.wait(2) else "timeout")))
+        thread.start()
+        self.assertEqual("other value", self.loader.get_or_load("other_key", lambda: other_loaded.set() or "other value"))
+        thread.join()
+
+        self.assertEqual(["value"], results)
+        self.assertEqual(0, self.loader._loads.in_flight())
+
+    def test_stale_value_refreshed_in_background(self):
+        self._store("key", "stale", soft_expires_in=-1, hard_expires_in=600)
+        load = Mock(return_value="fresh")
+
+        self.assertEqual("stale", self.loader.get_or_load("key", load))
+        self.loader.close()
+
+        load.assert_called_once()
+        self.assertEqual("fresh", self.loader.get_or_load("key", load))
+        load.assert_called_once()
+
+    def test_stale_value_kept_when_refresh_fails(self):
+        self._store("key", "stale", soft_expires_in=-1, hard_expires_in=600)
+        load = Mock(side_effect=Exception("unavailable"))
+
+        self.assertEqual("stale", self.loader.get_or_load("key", load))
+        self.loader.close()
+
+        self.assertEqual("stale", self.cache.get("key")["value"])
+
+    def test_expired_value_loaded(self):
+        self._store("key", "expired", soft_expires_in=-10, hard_expires_in=-1)
+        load = Mock(return_value="fresh")
+
+        self.assertEqual("fresh", self.loader.get_or_load("key", load))
+        load.assert_called_once()
+
+    def test_early_expiration(self):
+        loader = CacheLoader(self.cache, beta=1.0)
+        self._store("key", "value", soft_expires_in=5, hard_expires_in=600, delta=1)
+        load = Mock(return_value="fresh")
+
+        with patch("wenet.storage.loader.random.random", return_value=0.0):
+            self.assertEqual("value", loader.get_or_load("key", load))
+        loader.close()
+        load.assert_not_called()
+
+        with patch("wenet.storage.loader.random.random", return_value=0.999):
+            self.assertEqual("value", loader.get_or_load("key", load))
+        loader.close()
+        load.assert_called_once()
+
+    def test_cached_error(self):
+        load = Mock(side_effect=NotFound("App", "app_id", 404, "not found"))
+
+        for _ in range(2):
+            with self.assertRaises(NotFound) as context:
+                self.loader.get_or_load("key", load, cache_errors=(NotFound,))
+            self.assertEqual("app_id", context.exception.object_id)
+            self.assertEqual(404, context.exception.http_status_code)
+        load.assert_called_once()
+
+    def test_error_not_cached(self):
+        load = Mock(side_effect=NotFound("App", "app_id", 404, "not found"))
+
+        for _ in range(2):
+            with self.assertRaises(NotFound):
+                self.loader.get_or_load("key", load)
+        self.assertEqual(2, load.call_count)
+
+    def test_cached_error_expired(self):
+        loader = CacheLoader(self.cache, negative_ttl=0.01)
+        load = Mock(side_effect=NotFound("App", "app_id", 404, "not found"))
+
+        with self.assertRaises(NotFound):
+            loader.get_or_load("key", load, cache_errors=(NotFound,))
+        time.sleep(0.02)
+        load.side_effect = None
+        load.return_value = "value"
+
+        self.assertEqual("value", loader.get_or_load("key", load, cache_errors=(NotFound,)))
+
+    def test_load_unless_missing(self):
+        load = Mock(return_value="value")
+
+        self.assertEqual("value", self.loader.load_unless_missing("key", load, cache_errors=(NotFound,)))
+        self.assertEqual("value", self.loader.load_unless_missing("key", load, cache_errors=(NotFound,)))
+        self.assertEqual(2, load.call_count)
+
+        load.side_effect = NotFound("User", "user_id", 404, "not found")
+        for _ in range(2):
+            with self.assertRaises(NotFound):
+                self.loader.load_unless_missing("key", load, cache_errors=(NotFound,))
+        self.assertEqual(3, load.call_count)
+
+        self.loader.invalidate("key")
+        load.side_effect = None
+        self.assertEqual("value", self.loader.load_unless_missing("key", load, cache_errors=(NotFound,)))
+
+    def test_invalidate(self):
+        load = Mock(return_value="value")
+        self.loader.get_or_load("key", load)
+
+        self.loader.invalidate("key")
+
+        self.assertIsNone(self.cache.get("key"))
+        self.loader.get_or_load("key", load)
+        self.assertEqual(2, load.call_count)
+
+
+class TestCacheLoaderDistributedLock(TestCase):
+
+    def _cache(self, acquired: bool) -> RedisCache:
+        cache = RedisCache(redis.Redis())
+        self.lock = Mock()
+        self.lock.acquire.return_value = acquired
+        cache.lock = Mock(return_value=self.lock)
+        cache._get = Mock(return_value=None)
+        cache._set = Mock()
+        return cache
+
+    def test_requires_redis_cache(self):
+        with self.assertRaises(ValueError):
+            CacheLoader(InMemoryCache(), distributed_lock=True)
+
+    def test_lock_acquired(self):
+        cache = self._cache(acquired=True)
+        loader = CacheLoader(cache, distributed_lock=True)
+
+        self.assertEqual("value", loader.get_or_load("key", Mock(return_value="value")))
+
+        cache.lock.assert_called_once_with("key:lock", timeout=loader.lock_timeout)
+        self.lock.release.assert_called_once()
+        cache._set.assert_called_once()
+
+    def test_lock_held_by_another_process(self):
+        cache = self._cache(acquired=False)
+        loaded = f'{{"value": "loaded", "delta": 0.1, "softExpiresAt": {time.time() + 60}, "hardExpiresAt": {time.time() + 600}}}'
+        cache._get = Mock(side_effect=[None, None, loaded])
+        load = Mock(return_value="value")
+        loader = CacheLoader(cache, distributed_lock=True)
+
+        self.assertEqual("loaded", loader.get_or_load("key", load))
+        load.assert_not_called()
+
+    def test_lock_held_timeout(self):
+        cache = self._cache(acquired=False)
+        load = Mock(return_value="value")
+        loader = CacheLoader(cache, distributed_lock=True, lock_timeout=0.05)
+
+        self.assertEqual("value", loader.get_or_load("key", load))
+        load.assert_called_once()
+        self.lock.release.assert_not_called()
@@ -0,0 +1,51 @@
+from __future__ import absolute_import, annotations
+
+from json import JSONDecodeError
+from unittest import TestCase
+
+from wenet.utils import codec
+from wenet.utils.codec import CODECS, StdlibJsonCodec, build_codec
+
+
+def available_codecs() -> list:
+    codecs = []
+    for codec_builder in CODECS.values():
+        try:
+            codecs.append(codec_builder())
+        except ImportError:
+            pass
+    return codecs
+
+
+class TestJsonCodec(TestCase):
+
+    def test_round_trip(self):
+        data = {"key": "välue", "list": [1, 2.5, None, True], "nested": {"empty": {}}}
+        for json_codec in available_codecs():
+            with self.subTest(codec=json_codec.name):
+                encoded = json_codec.dumps(data)
+                self.assertIsInstance(encoded, bytes)
+                self.assertEqual(data, json_codec.loads(encoded))
+                self.assertEqual(data, json_codec.loads(encoded.decode("utf-8")))
+                self.assertEqual(data, json_codec.loads(memoryview(encoded)))
+
+    def test_invalid_document(self):
+        for json_codec in available_codecs():
+            with self.subTest(codec=json_codec.name):
+                with self.assertRaises(JSONDecodeError):
+                    json_codec.loads(b"notAJson")
+
+    def test_build(self):
+        self.assertIsInstance(build_codec("json"), StdlibJsonCodec)
+        self.assertIn(build_codec().name, CODECS)
+        with self.assertRaises(ValueError):
+            build_codec("unknown")
+
+    def test_set_codec(self):
+        default_codec = codec.get_codec()
+        try:
+            self.assertIsInstance(codec.set_codec("json"), StdlibJsonCodec)
+            self.assertEqual(b'{"key":"value"}', codec.dumps({"key": "value"}))
+        finally:
+            codec.set_codec(default_codec)
+        self.assertIs(default_codec, codec.get_codec())
@@ -0,0 +1,40 @@
+from __future__ import absolute_import, annotations
+
+import json
+import subprocess
+import sys
+from unittest import TestCase
+from unittest.mock import patch
+
+from wenet.utils.lazy import LazyModule, lazy_import
+
+
+class TestLazyModule(TestCase):
+
+    def test_attribute(self):
+        module = LazyModule("json")
+        self.assertIs(json.dumps, module.dumps)
+
+    def test_imported_module(self):
+        self.assertIs(json, lazy_import("json"))
+
+    def test_patch(self):
+        module = LazyModule("json")
+        with patch.object(module, "dumps", return_value="patched"):
+            self.assertEqual("patched", module.dumps({}))
+        self.assertIs(json.dumps, module.dumps)
+
+    def test_missing_module(self):
+        module = lazy_import("wenet_missing_module")
+        with self.assertRaises(ImportError):
+            module.attribute
+
+
+class TestStartUp(TestCase):
+
+    def test_heavy_dependencies_not_imported(self):
+        code = "import sys\n" \
+               "import wenet.interface.wenet, wenet.interface.client, wenet.model.callback_message.builder, wenet.model.user.profile\n" \
+               "print(','.join(name for name in ['requests', 'urllib3', 'redis', 'babel', 'iso639'] if name in sys.modules))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+        self.assertEqual("", output)
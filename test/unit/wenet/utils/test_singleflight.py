@@ -0,0 +1,119 @@
+from __future__ import absolute_import, annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import Mock
+
+from wenet.utils.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight(TestCase):
+
+    def test_concurrent_calls_coalesced(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        function = Mock(side_effect=lambda: release.wait() and {"key": "value"})
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(single_flight.do, "key", function) for _ in range(5)]
+            while single_flight.coalesced < 4:
+                release.wait(0.001)
+            release.set()
+            results = [future.result() for future in futures]
+
+        function.assert_called_once()
+        self.assertEqual([{"key": "value"}] * 5, results)
+        self.assertEqual(0, single_flight.in_flight())
+
+    def test_concurrent_error_shared(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        def function():
+            release.wait()
+            raise ValueError("error")
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(single_flight.do, "key", function) for _ in range(3)]
+            while single_flight.coalesced < 2:
+                release.wait(0.001)
+            release.set()
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result()
+
+    def test_sequential_calls_not_coalesced(self):
+        single_flight = SingleFlight()
+        function = Mock(return_value="value")
+
+        self.assertEqual("value", single_flight.do("key", function))
+        self.assertEqual("value", single_flight.do("key", function))
+
+        self.assertEqual(2, function.call_count)
+        self.assertEqual(0, single_flight.coalesced)
+
+    def test_nested_call_with_different_key(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        self.assertEqual("first", single_flight.do("first", lambda: single_flight.do("second", lambda: calls.append("second") or "second") and "first"))
+        self.assertEqual(["second"], calls)
+
+
+class TestAsyncSingleFlight(TestCase):
+
+    def test_concurrent_calls_coalesced(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def function():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        async def run():
+            return await asyncio.gather(*[single_flight.do("key", function) for _ in range(5)])
+
+        results = asyncio.new_event_loop().run_until_complete(run())
+
+        self.assertEqual(["value"] * 5, results)
+        self.assertEqual(1, len(calls))
+        self.assertEqual(4, single_flight.coalesced)
+        self.assertEqual(0, single_flight.in_flight())
+
+    def test_concurrent_error_shared(self):
+        single_flight = AsyncSingleFlight()
+
+        async def function():
+            await asyncio.sleep(0.01)
+            raise ValueError("error")
+
+        async def run():
+            return await asyncio.gather(*[single_flight.do("key", function) for _ in range(3)], return_exceptions=True)
+
+        results = asyncio.new_event_loop().run_until_complete(run())
+
+        self.assertEqual(3, len(results))
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_cancelled_waiter(self):
+        single_flight = AsyncSingleFlight()
+
+        async def function():
+            await asyncio.sleep(0.02)
+            return "value"
+
+        async def run():
+            leader = asyncio.ensure_future(single_flight.do("key", function))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(single_flight.do("key", function))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            return await leader, waiter.cancelled()
+
+        result, cancelled = asyncio.new_event_loop().run_until_complete(run())
+
+        self.assertEqual("value", result)
+        self.assertTrue(cancelled)